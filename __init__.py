@@ -989,8 +989,18 @@ def unregister():
             # Clear all caches
             from . import graph_index, material_cache, object_cache, debounce
             graph_index.clear_all_graph_indices()
+            from .paradata_cache import clear_paradata_memos
+            clear_paradata_memos()
+            from .visual_manager.property_mapping_cache import clear_property_mapping_memos
+            clear_property_mapping_memos()
             material_cache.clear_material_cache()
+            from .material_params import clear_material_registry
+            clear_material_registry()
+            from .em_setup.excel_helpers import clear_workbook_metadata_cache
+            clear_workbook_metadata_cache()
             object_cache.clear_object_cache()
+            from .selection_pipeline import cancel_selection_pipeline
+            cancel_selection_pipeline()
             debounce.clear_debouncers()
             logger.info("Cleared all optimization caches")
         except Exception as e:
@@ -324,8 +324,8 @@ def debounced_material_alpha_update(alpha_value):
         # Slider dragging won't spam material updates
         debounced_material_alpha_update(0.5)
     """
-    from .functions import update_property_materials_alpha
-    update_property_materials_alpha(alpha_value)
+    from .material_params import apply_material_params
+    apply_material_params(alpha=alpha_value, families=('property',))
 
 
 # Register pre-configured debouncers
@@ -0,0 +1,240 @@
+"""
+DosCo Directory Index for EM-Tools
+==================================
+
+Indexes a DosCo folder in a single walk so that matching document /
+extractor / combiner nodes to their files does not walk the folder once
+per node.
+
+Every file is indexed under its full name and under each prefix that is
+terminated by a node-id delimiter (space, underscore, hyphen). The dot is
+NOT a delimiter: "D.01" matches "D.01 fonte.jpg" but not "D.01.01 estr.jpg",
+exactly like the former find_file_in_dosco().
+
+The index is persisted in the temp folder together with the mtime of every
+directory of the tree: adding, removing or renaming a file changes the mtime
+of its directory, so an unchanged DosCo folder is validated with a handful
+of stat() calls instead of a full rescan.
+
+Usage:
+    from .dosco_index import get_dosco_index
+
+    index = get_dosco_index(dosco_dir)
+    path = index.find("D.01")
+    for full_path in index.iter_files():
+        ...
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Iterator, List, Optional
+
+
+INDEX_VERSION = 1
+
+# Characters that may follow a node id in a DosCo filename
+ID_DELIMITERS = (' ', '_', '-')
+
+# Preferred file types when several files match the same node id
+PRIORITY_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.pdf', '.doc', '.docx', '.txt', '.svg', '.mp4', '.mov']
+
+
+def _extension_priority(file_name: str) -> int:
+    ext = os.path.splitext(file_name)[1].lower()
+    try:
+        return PRIORITY_EXTENSIONS.index(ext)
+    except ValueError:
+        return len(PRIORITY_EXTENSIONS)  # Lower priority for unknown extensions
+
+
+def _name_tokens(file_name: str) -> List[str]:
+    """Keys a file answers to: its full name and each delimiter-terminated prefix."""
+    tokens = [file_name]
+    for i, char in enumerate(file_name):
+        if char in ID_DELIMITERS and i > 0:
+            tokens.append(file_name[:i])
+    return tokens
+
+
+class DoscoIndex:
+    """
+    Token → ranked relative paths for one DosCo directory.
+
+    Attributes:
+        dosco_dir: Absolute path of the indexed folder
+        files: Relative paths of every file, in walk order
+        dir_mtimes: {relative_dir: mtime_ns} fingerprint of the tree
+    """
+
+    def __init__(self, dosco_dir: str):
+        self.dosco_dir = os.path.abspath(dosco_dir)
+        self.files: List[str] = []
+        self.dir_mtimes: Dict[str, int] = {}
+        self._tokens: Dict[str, List[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Build / fingerprint
+    # ------------------------------------------------------------------
+
+    def scan(self):
+        """Walk the folder once and rebuild the token table."""
+        self.files = []
+        self.dir_mtimes = {}
+
+        for root, _dirs, files in os.walk(self.dosco_dir):
+            rel_root = os.path.relpath(root, self.dosco_dir)
+            try:
+                self.dir_mtimes[rel_root] = os.stat(root).st_mtime_ns
+            except OSError:
+                continue
+            for file_name in files:
+                self.files.append(os.path.normpath(os.path.join(rel_root, file_name)))
+
+        self._build_tokens()
+
+    def _build_tokens(self):
+        tokens: Dict[str, List[str]] = {}
+        for rel_path in self.files:
+            for token in _name_tokens(os.path.basename(rel_path)):
+                tokens.setdefault(token, []).append(rel_path)
+
+        # Rank once: stable sort keeps walk order between equal priorities
+        for token, paths in tokens.items():
+            if len(paths) > 1:
+                paths.sort(key=lambda p: _extension_priority(os.path.basename(p)))
+        self._tokens = tokens
+
+    def is_current(self) -> bool:
+        """True if no directory of the tree changed since the scan."""
+        if not self.dir_mtimes:
+            return False
+        for rel_dir, mtime_ns in self.dir_mtimes.items():
+            try:
+                if os.stat(os.path.join(self.dosco_dir, rel_dir)).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def find(self, node_name: str) -> Optional[str]:
+        """Full path of the best file for node_name, or None."""
+        paths = self._tokens.get(node_name)
+        if not paths:
+            return None
+        return os.path.join(self.dosco_dir, paths[0])
+
+    def find_all(self, node_name: str) -> List[str]:
+        """Full paths of every file matching node_name, best first."""
+        return [os.path.join(self.dosco_dir, p) for p in self._tokens.get(node_name, [])]
+
+    def iter_files(self) -> Iterator[str]:
+        """Full paths of every indexed file, in walk order."""
+        for rel_path in self.files:
+            yield os.path.join(self.dosco_dir, rel_path)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': INDEX_VERSION,
+            'dosco_dir': self.dosco_dir,
+            'dir_mtimes': self.dir_mtimes,
+            'files': self.files,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional['DoscoIndex']:
+        if data.get('version') != INDEX_VERSION:
+            return None
+        index = cls(data['dosco_dir'])
+        index.dir_mtimes = {k: int(v) for k, v in data.get('dir_mtimes', {}).items()}
+        index.files = list(data.get('files', []))
+        index._build_tokens()
+        return index
+
+
+# ============================================================================
+# GLOBAL INDEX CACHE
+# ============================================================================
+
+_dosco_indices: Dict[str, DoscoIndex] = {}
+
+
+def get_index_cache_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "EM_dosco_index")
+
+
+def _index_file_path(dosco_dir: str) -> str:
+    digest = hashlib.md5(dosco_dir.encode('utf-8')).hexdigest()
+    return os.path.join(get_index_cache_dir(), f"{digest}.json")
+
+
+def _load_persisted(dosco_dir: str) -> Optional[DoscoIndex]:
+    path = _index_file_path(dosco_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = DoscoIndex.from_dict(json.load(f))
+    except Exception as e:
+        print(f"[DosCo] Could not read index {path}: {e}")
+        return None
+    if index is None or index.dosco_dir != dosco_dir:
+        return None
+    return index
+
+
+def _save_persisted(index: DoscoIndex):
+    path = _index_file_path(index.dosco_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"[DosCo] Could not save index {path}: {e}")
+
+
+def get_dosco_index(dosco_dir: str, force_rescan: bool = False) -> DoscoIndex:
+    """
+    Get the index of dosco_dir, rescanning only if the folder changed.
+
+    Lookup order: in-memory cache, persisted index, full scan. The first two
+    are used only if every directory mtime still matches.
+    """
+    dosco_dir = os.path.abspath(dosco_dir)
+
+    if not force_rescan:
+        index = _dosco_indices.get(dosco_dir)
+        if index is not None and index.is_current():
+            return index
+
+        index = _load_persisted(dosco_dir)
+        if index is not None and index.is_current():
+            _dosco_indices[dosco_dir] = index
+            return index
+
+    index = DoscoIndex(dosco_dir)
+    index.scan()
+    print(f"[DosCo] Indexed {len(index.files)} files in {len(index.dir_mtimes)} folders: {dosco_dir}")
+
+    _dosco_indices[dosco_dir] = index
+    _save_persisted(index)
+    return index
+
+
+def invalidate_dosco_index(dosco_dir: Optional[str] = None):
+    """Drop the in-memory index of dosco_dir (all indices if None)."""
+    if dosco_dir is None:
+        _dosco_indices.clear()
+    else:
+        _dosco_indices.pop(os.path.abspath(dosco_dir), None)
@@ -58,35 +58,14 @@ from .surface_areale.data import SurfaceArealeSettings
 def update_stratigraphic_selection(self, context):
     """
     Called when the user changes the selection in the stratigraphic list.
-    Updates paradata lists if streaming mode is enabled.
-    Pre-loads thumbnails for the selected US to avoid UI lag.
+    Publishes the selected US immediately; paradata lists, document
+    thumbnails and the viewport overlay are refreshed by the debounced
+    stages of selection_pipeline once the selection settles.
     """
     try:
-        # Pre-load thumbnails for the selected US (only if needed)
-        scene = context.scene
-        strat = scene.em_tools.stratigraphy
-
-        if strat.units and strat.units_index >= 0:
-            selected_us = strat.units[strat.units_index]
-            if selected_us.id_node:
-                # Import here to avoid circular imports
-                from .thumb_utils import reload_doc_previews_for_us
-                # This will use cache if available, otherwise load once
-                reload_doc_previews_for_us(selected_us.id_node)
-
         # Import here to avoid circular imports
-        from .functions import switch_paradata_lists
-
-        # Create dummy self object for compatibility with switch_paradata_lists signature
-        class DummySelf:
-            pass
-        dummy = DummySelf()
-
-        switch_paradata_lists(dummy, context)
-
-        # Update viewport overlay text if enabled
-        from . import viewport_overlay
-        viewport_overlay.refresh_text()
+        from .selection_pipeline import publish_selection
+        publish_selection(context.scene.em_tools.stratigraphy)
     except Exception as e:
         print(f"Warning: Could not update paradata lists: {e}")
 
@@ -1,6 +1,25 @@
 # em_setup/excel_helpers.py
 """
 Helper functions for Excel file handling in EM-tools.
+
+Workbook metadata (sheet names, header row and row count of every sheet) is
+read once with a read-only openpyxl scan and cached per file, keyed by
+absolute path + size + mtime: the dropdown callbacks, the XLSX wizard and
+GenericXLSXImporter all reuse it, and a saved file is rescanned
+automatically. On Windows the workbook is copied to temp (locked files)
+only for that scan. validate_excel_file still checks file access on every
+call (a workbook may be locked after it was scanned).
+
+Performance Impact:
+- Before: every enum callback / validation reopened the workbook through
+  pandas (and copied it to temp on Windows)
+- After: one header scan per file version, then dictionary lookups
+
+Usage:
+    from .excel_helpers import get_excel_sheets, get_excel_columns, get_excel_row_count
+
+    sheets = get_excel_sheets(filepath)
+    columns = get_excel_columns(filepath, sheets[0])
 """
 
 import bpy
@@ -8,6 +27,170 @@ import os
 import tempfile
 import shutil
 import platform
+from typing import Dict, List, Optional, Tuple
+
+
+# ============================================================================
+# WORKBOOK METADATA CACHE
+# ============================================================================
+
+class WorkbookMetadata:
+    """Sheet names, header and data-row count of each sheet of one file version."""
+
+    __slots__ = ('path', 'signature', 'sheet_names', 'headers', 'row_counts')
+
+    def __init__(self, path: str, signature: Tuple[int, int]):
+        self.path = path
+        self.signature = signature
+        self.sheet_names: List[str] = []
+        self.headers: Dict[str, List[str]] = {}
+        self.row_counts: Dict[str, Optional[int]] = {}   # None = not declared in the file
+
+
+_workbook_metadata: Dict[str, WorkbookMetadata] = {}
+
+
+def header_names(row) -> List[str]:
+    """
+    Column names from a header row, as pandas names them (unnamed columns
+    "Unnamed: i", duplicates "name.1"). Shared with GenericXLSXImporter so
+    the dropdown entries match the imported columns.
+    """
+    names = []
+    seen: Dict[str, int] = {}
+    for index, value in enumerate(row):
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        name = str(value).strip() if value is not None else ''
+        if not name:
+            name = f"Unnamed: {index}"
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f"{name}.{count}")
+    return names
+
+
+def _file_signature(abs_filepath: str) -> Tuple[int, int]:
+    stat = os.stat(abs_filepath)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _scan_workbook(abs_filepath: str, signature: Tuple[int, int]) -> WorkbookMetadata:
+    """Read-only scan: workbook index, first row and declared size of each sheet."""
+    from openpyxl import load_workbook
+
+    temp_file_path = None
+    workbook = None
+    try:
+        working_path = abs_filepath
+        if platform.system() == "Windows":
+            # Windows: copia in temp (file bloccati da Excel)
+            temp_filename = f"em_meta_{os.path.basename(abs_filepath)}"
+            temp_file_path = os.path.join(tempfile.gettempdir(), temp_filename)
+            shutil.copy2(abs_filepath, temp_file_path)
+            working_path = temp_file_path
+
+        workbook = load_workbook(working_path, read_only=True, data_only=True)
+        metadata = WorkbookMetadata(abs_filepath, signature)
+        metadata.sheet_names = list(workbook.sheetnames)
+
+        for sheet_name in metadata.sheet_names:
+            worksheet = workbook[sheet_name]
+            header = next(worksheet.iter_rows(max_row=1, values_only=True), None)
+            metadata.headers[sheet_name] = header_names(header) if header else []
+            max_row = getattr(worksheet, 'max_row', None)
+            metadata.row_counts[sheet_name] = max(0, max_row - 1) if max_row else None
+
+        return metadata
+
+    finally:
+        if workbook is not None:
+            try:
+                workbook.close()
+            except Exception:
+                pass
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+            except Exception as e:
+                print(f"Warning: Could not remove temp file: {e}")
+
+
+def get_workbook_metadata(filepath) -> WorkbookMetadata:
+    """
+    Cached metadata of an Excel file, rescanned if size or mtime changed.
+
+    Args:
+        filepath: Path al file Excel (può essere relativo Blender //)
+
+    Raises:
+        OSError / ImportError / openpyxl errors if the file cannot be read
+        (failures are not cached: the next call retries)
+    """
+    abs_filepath = bpy.path.abspath(filepath)
+    signature = _file_signature(abs_filepath)
+
+    metadata = _workbook_metadata.get(abs_filepath)
+    if metadata is None or metadata.signature != signature:
+        metadata = _scan_workbook(abs_filepath, signature)
+        _workbook_metadata[abs_filepath] = metadata
+    return metadata
+
+
+def peek_workbook_metadata(filepath) -> Optional[WorkbookMetadata]:
+    """Cached metadata only if still valid for the file on disk (never scans)."""
+    try:
+        abs_filepath = bpy.path.abspath(filepath)
+        metadata = _workbook_metadata.get(abs_filepath)
+        if metadata is not None and metadata.signature == _file_signature(abs_filepath):
+            return metadata
+    except OSError:
+        pass
+    return None
+
+
+def invalidate_workbook_metadata(filepath=None):
+    """Drop the metadata of filepath (or of every file if None)."""
+    if filepath is None:
+        _workbook_metadata.clear()
+        return
+    _workbook_metadata.pop(bpy.path.abspath(filepath), None)
+
+
+def clear_workbook_metadata_cache():
+    """Drop every entry (addon reload / memory cleanup)."""
+    _workbook_metadata.clear()
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _check_file_access(abs_filepath):
+    """
+    Verifica che il file sia leggibile adesso (eseguita a ogni validazione,
+    la cache dei metadati non dice nulla sui lock successivi).
+
+    Windows: copia in temp, come la lettura vera (fallisce se Excel lo blocca).
+    Altri sistemi: apertura e lettura del primo byte.
+
+    Raises:
+        PermissionError / OSError se il file non è accessibile
+    """
+    if platform.system() == "Windows":
+        temp_filename = f"em_check_{os.path.basename(abs_filepath)}"
+        temp_file_path = os.path.join(tempfile.gettempdir(), temp_filename)
+        try:
+            shutil.copy2(abs_filepath, temp_file_path)
+        finally:
+            if os.path.exists(temp_file_path):
+                try:
+                    os.remove(temp_file_path)
+                except Exception as e:
+                    print(f"Warning: Could not remove temp file: {e}")
+    else:
+        with open(abs_filepath, 'rb') as f:
+            f.read(1)
 
 
 def validate_excel_file(filepath):
@@ -35,34 +218,19 @@ def validate_excel_file(filepath):
     if ext not in ['.xlsx', '.xls']:
         return False, f"Formato non supportato: {ext}. Usare .xlsx o .xls"
 
-    # Tenta apertura del file per verificare se è bloccato
+    # Accesso verificato a ogni chiamata: il file può essere stato bloccato
+    # dopo la prima scansione; la cache serve solo per fogli e intestazioni
     try:
-        # Strategia diversa per Windows vs macOS/Linux
-        is_windows = platform.system() == "Windows"
-
-        if is_windows:
-            # Su Windows, prova a copiare il file in temp
-            temp_dir = tempfile.gettempdir()
-            temp_filename = f"em_validate_{os.path.basename(abs_filepath)}"
-            temp_file_path = os.path.join(temp_dir, temp_filename)
-
-            try:
-                shutil.copy2(abs_filepath, temp_file_path)
-                # Pulizia
-                os.remove(temp_file_path)
-                return True, None
-            except PermissionError:
-                return False, f"File bloccato da un altro programma. Chiudere Excel o altri software che stanno usando il file:\n{os.path.basename(abs_filepath)}"
-            except Exception as e:
-                return False, f"Errore accesso file: {str(e)}"
-        else:
-            # Su macOS/Linux, prova apertura diretta
-            with open(abs_filepath, 'rb') as f:
-                f.read(1)  # Leggi un byte per verificare accesso
+        _check_file_access(abs_filepath)
+        if ext == '.xls':
+            # openpyxl non legge .xls: nessun metadato da leggere
             return True, None
-
+        get_workbook_metadata(abs_filepath)
+        return True, None
     except PermissionError:
         return False, f"File bloccato da un altro programma. Chiudere Excel o altri software che stanno usando il file:\n{os.path.basename(abs_filepath)}"
+    except ImportError:
+        return False, "pandas o openpyxl non disponibili"
     except Exception as e:
         return False, f"Errore durante validazione: {str(e)}"
 
@@ -81,45 +249,9 @@ def get_excel_sheets(filepath):
         return []
 
     try:
-        import pandas as pd
-        import io
-
-        abs_filepath = bpy.path.abspath(filepath)
-
-        if not os.path.exists(abs_filepath):
-            return []
-
-        # Strategia buffer per evitare lock su file
-        is_windows = platform.system() == "Windows"
-
-        if is_windows:
-            # Windows: usa file temporaneo
-            temp_dir = tempfile.gettempdir()
-            temp_filename = f"em_sheets_{os.path.basename(abs_filepath)}"
-            temp_file_path = os.path.join(temp_dir, temp_filename)
-
-            try:
-                shutil.copy2(abs_filepath, temp_file_path)
-                xl = pd.ExcelFile(temp_file_path, engine='openpyxl')
-                sheets = xl.sheet_names
-                xl.close()
-                os.remove(temp_file_path)
-                return sheets
-            except Exception:
-                return []
-        else:
-            # macOS/Linux: usa buffer memoria
-            try:
-                with open(abs_filepath, 'rb') as f:
-                    buffer = io.BytesIO(f.read())
-                xl = pd.ExcelFile(buffer, engine='openpyxl')
-                sheets = xl.sheet_names
-                xl.close()
-                buffer.close()
-                return sheets
-            except Exception:
-                return []
-
+        return list(get_workbook_metadata(filepath).sheet_names)
+    except FileNotFoundError:
+        return []
     except ImportError:
         print("pandas o openpyxl non disponibili")
         return []
@@ -143,52 +275,29 @@ def get_excel_columns(filepath, sheet_name):
         return []
 
     try:
-        import pandas as pd
-        import io
-
-        abs_filepath = bpy.path.abspath(filepath)
-
-        if not os.path.exists(abs_filepath):
-            return []
-
-        # Strategia buffer per evitare lock su file
-        is_windows = platform.system() == "Windows"
-
-        if is_windows:
-            # Windows: usa file temporaneo
-            temp_dir = tempfile.gettempdir()
-            temp_filename = f"em_cols_{os.path.basename(abs_filepath)}"
-            temp_file_path = os.path.join(temp_dir, temp_filename)
-
-            try:
-                shutil.copy2(abs_filepath, temp_file_path)
-                # Leggi solo la prima riga (header)
-                df = pd.read_excel(temp_file_path, sheet_name=sheet_name,
-                                 nrows=0, engine='openpyxl')
-                columns = list(df.columns)
-                os.remove(temp_file_path)
-                return columns
-            except Exception as e:
-                print(f"Errore Windows get_columns: {e}")
-                return []
-        else:
-            # macOS/Linux: usa buffer memoria
-            try:
-                with open(abs_filepath, 'rb') as f:
-                    buffer = io.BytesIO(f.read())
-                # Leggi solo la prima riga (header)
-                df = pd.read_excel(buffer, sheet_name=sheet_name,
-                                 nrows=0, engine='openpyxl')
-                columns = list(df.columns)
-                buffer.close()
-                return columns
-            except Exception as e:
-                print(f"Errore macOS get_columns: {e}")
-                return []
-
+        return list(get_workbook_metadata(filepath).headers.get(sheet_name, []))
+    except FileNotFoundError:
+        return []
     except ImportError:
         print("pandas o openpyxl non disponibili")
         return []
     except Exception as e:
         print(f"Errore lettura colonne Excel: {e}")
         return []
+
+
+def get_excel_row_count(filepath, sheet_name):
+    """
+    Numero di righe dati (header escluso) dichiarato dal foglio.
+
+    Returns:
+        int or None: None se il file non lo dichiara o non è leggibile
+    """
+    if not filepath or not sheet_name:
+        return None
+
+    try:
+        return get_workbook_metadata(filepath).row_counts.get(sheet_name)
+    except Exception as e:
+        print(f"Errore lettura righe Excel: {e}")
+        return None
@@ -391,6 +391,19 @@ class AUXILIARY_OT_import_now(Operator):
         graphml = em_tools.graphml_files[em_tools.active_file_index]
         aux_file = graphml.auxiliary_files[graphml.active_auxiliary_index]
 
+        result = self._import(context, graphml, aux_file)
+
+        # Every file type can edit node/property values in place
+        graph = get_graph(graphml.name)
+        if graph is not None:
+            from ..graph_index import invalidate_graph_values
+            invalidate_graph_values(graph)
+
+        return result
+
+    def _import(self, context, graphml, aux_file):
+        em_tools = context.scene.em_tools
+
         # Handle DosCo type differently - no database import, just harvesting
         if aux_file.file_type == "dosco":
             return self._process_dosco(context, graphml, aux_file)
@@ -11,52 +11,26 @@ from bpy.props import (
     PointerProperty
 )
 
-from .excel_helpers import get_excel_sheets, get_excel_columns
+from .excel_helpers import get_excel_sheets, get_excel_columns, invalidate_workbook_metadata
 
 # ============================================================================
 # CACHE SYSTEM FOR EXCEL DROPDOWNS
 # ============================================================================
-
-_excel_cache = {
-    'filepath': None,
-    'sheets': [],
-    'sheet_name': None,
-    'columns': []
-}
+# Sheet / column lists come from the workbook metadata cache of
+# excel_helpers (keyed by path + size + mtime), so every dropdown redraw is
+# a dictionary lookup and a saved workbook is rescanned automatically.
 
 def _get_cached_sheets(filepath):
     """Ottieni fogli con cache per evitare letture ripetute"""
-    global _excel_cache
-
-    if filepath != _excel_cache['filepath']:
-        # File cambiato, aggiorna cache
-        _excel_cache['filepath'] = filepath
-        _excel_cache['sheets'] = get_excel_sheets(filepath) if filepath else []
-        # Reset cache colonne quando cambia file
-        _excel_cache['sheet_name'] = None
-        _excel_cache['columns'] = []
-
-    return _excel_cache['sheets']
+    return get_excel_sheets(filepath) if filepath else []
 
 def _get_cached_columns(filepath, sheet_name):
     """Ottieni colonne con cache per evitare letture ripetute"""
-    global _excel_cache
+    return get_excel_columns(filepath, sheet_name) if (filepath and sheet_name) else []
 
-    if filepath != _excel_cache['filepath'] or sheet_name != _excel_cache['sheet_name']:
-        # File o foglio cambiato, aggiorna cache
-        _excel_cache['filepath'] = filepath
-        _excel_cache['sheet_name'] = sheet_name
-        _excel_cache['columns'] = get_excel_columns(filepath, sheet_name) if (filepath and sheet_name) else []
-
-    return _excel_cache['columns']
-
-def _clear_excel_cache():
+def _clear_excel_cache(filepath=None):
     """Pulisce la cache (chiamata quando si cambia file)"""
-    global _excel_cache
-    _excel_cache['filepath'] = None
-    _excel_cache['sheets'] = []
-    _excel_cache['sheet_name'] = None
-    _excel_cache['columns'] = []
+    invalidate_workbook_metadata(filepath)
 
 
 def get_pyarchinit_mappings(self=None, context=None):
@@ -144,8 +118,9 @@ def update_generic_xlsx_file(self, context):
     """
     from .excel_helpers import validate_excel_file
 
-    # ✅ PULISCI CACHE quando cambia file (importante per performance!)
-    _clear_excel_cache()
+    # ✅ Riselezionare un file forza una nuova scansione dei metadati
+    if self.generic_xlsx_file:
+        _clear_excel_cache(self.generic_xlsx_file)
 
     # Reset dei campi dipendenti
     self.generic_xlsx_sheet = "none"
@@ -0,0 +1,255 @@
+# em_setup/resource_inventory.py
+"""
+Cached filesystem inventory of a resource folder.
+
+A resource root is walked once with os.scandir; the result (sub-folders and
+files of every directory, with the directory mtime) is kept in memory and in
+a JSON sidecar in the temp folder. Later lookups re-stat each directory and
+re-list only those whose mtime changed, so an unchanged photo archive is
+validated without listing a single file.
+
+Lookups used by resource_utils:
+- folders_named(name): every folder with that name (folder-name index)
+- files_with_prefix(prefix): every file whose name starts with prefix
+  (sorted filename index + bisect)
+- list_files(folder): files directly inside a folder
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import tempfile
+
+
+INVENTORY_VERSION = 1
+
+
+class ResourceInventory:
+    """
+    Inventory of one resource root.
+
+    dirs maps a relative directory ('.' for the root) to
+    {'mtime': mtime_ns, 'subdirs': [names], 'files': [names]}.
+    """
+
+    def __init__(self, root_folder):
+        self.root_folder = os.path.abspath(root_folder)
+        self.dirs = {}
+        self._folder_index = None
+        self._prefix_index = None
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _abs(self, rel_dir):
+        return self.root_folder if rel_dir == '.' else os.path.join(self.root_folder, rel_dir)
+
+    @staticmethod
+    def _child(rel_dir, name):
+        return name if rel_dir == '.' else os.path.join(rel_dir, name)
+
+    def _list_dir(self, rel_dir, mtime_ns):
+        """List one directory with os.scandir (no recursion)."""
+        subdirs, files = [], []
+        try:
+            with os.scandir(self._abs(rel_dir)) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Error scanning {self._abs(rel_dir)}: {e}")
+        self.dirs[rel_dir] = {'mtime': mtime_ns, 'subdirs': subdirs, 'files': files}
+
+    def refresh(self):
+        """
+        Bring the inventory up to date.
+
+        Every known directory is stat()ed; only directories whose mtime
+        changed (or that are new) are listed again. Directories that
+        disappeared are dropped with their descendants.
+
+        Returns:
+            int: Number of directories that were (re)listed
+        """
+        relisted = 0
+        seen = set()
+        stack = ['.']
+
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                mtime_ns = os.stat(self._abs(rel_dir)).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(rel_dir)
+
+            cached = self.dirs.get(rel_dir)
+            if cached is None or cached['mtime'] != mtime_ns:
+                self._list_dir(rel_dir, mtime_ns)
+                relisted += 1
+
+            # Reverse so that folders are visited in listing order
+            for name in reversed(self.dirs[rel_dir]['subdirs']):
+                stack.append(self._child(rel_dir, name))
+
+        stale = [rel_dir for rel_dir in self.dirs if rel_dir not in seen]
+        for rel_dir in stale:
+            del self.dirs[rel_dir]
+
+        if relisted or stale:
+            self._folder_index = None
+            self._prefix_index = None
+        return relisted
+
+    def _ordered_dirs(self):
+        """Relative directories in walk (pre-)order."""
+        stack = ['.']
+        while stack:
+            rel_dir = stack.pop()
+            info = self.dirs.get(rel_dir)
+            if info is None:
+                continue
+            yield rel_dir, info
+            for name in reversed(info['subdirs']):
+                stack.append(self._child(rel_dir, name))
+
+    # ------------------------------------------------------------------
+    # Indices
+    # ------------------------------------------------------------------
+
+    def _build_indices(self):
+        folder_index = {}
+        prefix_index = []
+        for rel_dir, info in self._ordered_dirs():
+            for name in info['subdirs']:
+                folder_index.setdefault(name, []).append(rel_dir)
+            for name in info['files']:
+                prefix_index.append((name, rel_dir))
+        prefix_index.sort()
+        self._folder_index = folder_index
+        self._prefix_index = prefix_index
+
+    def folders_named(self, target_name):
+        """Absolute paths of every folder called target_name."""
+        if self._folder_index is None:
+            self._build_indices()
+        return [os.path.join(self._abs(parent), target_name)
+                for parent in self._folder_index.get(target_name, [])]
+
+    def files_with_prefix(self, prefix):
+        """(absolute_path, filename) of every file whose name starts with prefix."""
+        if self._prefix_index is None:
+            self._build_indices()
+        index = self._prefix_index
+        results = []
+        i = bisect.bisect_left(index, (prefix,))
+        while i < len(index) and index[i][0].startswith(prefix):
+            name, rel_dir = index[i]
+            results.append((os.path.join(self._abs(rel_dir), name), name))
+            i += 1
+        return results
+
+    def list_files(self, folder_path):
+        """Names of the files directly inside folder_path, or None if unknown."""
+        rel_dir = os.path.relpath(os.path.abspath(folder_path), self.root_folder)
+        info = self.dirs.get(rel_dir)
+        return list(info['files']) if info is not None else None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self):
+        return {
+            'version': INVENTORY_VERSION,
+            'root_folder': self.root_folder,
+            'dirs': self.dirs,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != INVENTORY_VERSION:
+            return None
+        inventory = cls(data['root_folder'])
+        inventory.dirs = data.get('dirs', {})
+        return inventory
+
+
+# ============================================================================
+# INVENTORY CACHE
+# ============================================================================
+
+_inventories = {}
+
+
+def get_inventory_cache_dir():
+    return os.path.join(tempfile.gettempdir(), "EM_resource_index")
+
+
+def _sidecar_path(root_folder):
+    digest = hashlib.md5(root_folder.encode('utf-8')).hexdigest()
+    return os.path.join(get_inventory_cache_dir(), f"{digest}.json")
+
+
+def _load_sidecar(root_folder):
+    path = _sidecar_path(root_folder)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            inventory = ResourceInventory.from_dict(json.load(f))
+    except Exception as e:
+        print(f"Could not read resource inventory {path}: {e}")
+        return None
+    if inventory is None or inventory.root_folder != root_folder:
+        return None
+    return inventory
+
+
+def _save_sidecar(inventory):
+    path = _sidecar_path(inventory.root_folder)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(inventory.to_dict(), f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Could not save resource inventory {path}: {e}")
+
+
+def get_resource_inventory(root_folder):
+    """
+    Up-to-date inventory of root_folder.
+
+    Uses the in-memory inventory, then the sidecar; either way only changed
+    directories are listed again. The sidecar is rewritten when something
+    changed.
+    """
+    root_folder = os.path.abspath(root_folder)
+
+    inventory = _inventories.get(root_folder)
+    if inventory is None:
+        inventory = _load_sidecar(root_folder) or ResourceInventory(root_folder)
+        _inventories[root_folder] = inventory
+
+    relisted = inventory.refresh()
+    if relisted:
+        print(f"Resource inventory: listed {relisted}/{len(inventory.dirs)} folders in {root_folder}")
+        _save_sidecar(inventory)
+    return inventory
+
+
+def clear_resource_inventory(root_folder=None):
+    """Forget the in-memory inventory of root_folder (all if None)."""
+    if root_folder is None:
+        _inventories.clear()
+    else:
+        _inventories.pop(os.path.abspath(root_folder), None)
@@ -12,6 +12,8 @@ import bpy
 from s3dgraphy.nodes.document_node import DocumentNode
 from s3dgraphy.nodes.link_node import LinkNode
 
+from .resource_inventory import get_resource_inventory
+
 
 # ============================================================================
 # PATH RESOLUTION
@@ -161,13 +163,15 @@ def get_target_types_from_enum(target_node_types_enum):
 # FOLDER SCANNING
 # ============================================================================
 
-def find_folders_by_name(root_folder, target_name):
+def find_folders_by_name(root_folder, target_name, inventory=None):
     """
     Recursively find all folders matching target_name inside root_folder.
 
     Args:
         root_folder: Absolute path to start scanning from
         target_name: Folder name to match
+        inventory: Optional ResourceInventory of root_folder (avoids the
+                   refresh when looking up many names)
 
     Returns:
         list: Absolute paths of matching folders
@@ -175,11 +179,11 @@ def find_folders_by_name(root_folder, target_name):
     matching_folders = []
 
     try:
-        for root, dirs, files in os.walk(root_folder):
-            if target_name in dirs:
-                match_path = os.path.join(root, target_name)
-                matching_folders.append(match_path)
-                print(f"Found matching folder: {match_path}")
+        if inventory is None:
+            inventory = get_resource_inventory(root_folder)
+        for match_path in inventory.folders_named(target_name):
+            matching_folders.append(match_path)
+            print(f"Found matching folder: {match_path}")
 
     except Exception as e:
         print(f"Error scanning {root_folder}: {e}")
@@ -187,7 +191,7 @@ def find_folders_by_name(root_folder, target_name):
     return matching_folders
 
 
-def find_files_by_prefix(root_folder, prefix, allowed_formats=None):
+def find_files_by_prefix(root_folder, prefix, allowed_formats=None, inventory=None):
     """
     Find all files whose name starts with the given prefix.
     Used for FILENAME_PREFIX scan mode.
@@ -196,6 +200,7 @@ def find_files_by_prefix(root_folder, prefix, allowed_formats=None):
         root_folder: Absolute path to scan
         prefix: Filename prefix to match (e.g. "USM100")
         allowed_formats: Optional set of allowed extensions (e.g. {'.jpg', '.png'})
+        inventory: Optional ResourceInventory of root_folder
 
     Returns:
         list: Tuples of (absolute_file_path, filename)
@@ -203,14 +208,14 @@ def find_files_by_prefix(root_folder, prefix, allowed_formats=None):
     results = []
 
     try:
-        for root, dirs, files in os.walk(root_folder):
-            for filename in files:
-                if filename.startswith(prefix):
-                    if allowed_formats:
-                        ext = os.path.splitext(filename)[1].lower()
-                        if ext not in allowed_formats:
-                            continue
-                    results.append((os.path.join(root, filename), filename))
+        if inventory is None:
+            inventory = get_resource_inventory(root_folder)
+        for file_path, filename in inventory.files_with_prefix(prefix):
+            if allowed_formats:
+                ext = os.path.splitext(filename)[1].lower()
+                if ext not in allowed_formats:
+                    continue
+            results.append((file_path, filename))
 
     except Exception as e:
         print(f"Error scanning {root_folder} for prefix {prefix}: {e}")
@@ -421,7 +426,8 @@ def create_document_for_resource(graph, target_node, file_path, filename, folder
 # HIGH-LEVEL RESOURCE PROCESSING
 # ============================================================================
 
-def process_node_resource_folder(graph, node_id, folder_path, allowed_formats, base_resource_folder):
+def process_node_resource_folder(graph, node_id, folder_path, allowed_formats, base_resource_folder,
+                                 inventory=None):
     """
     Process all files in a node's matched resource folder.
 
@@ -431,6 +437,7 @@ def process_node_resource_folder(graph, node_id, folder_path, allowed_formats, b
         folder_path: Absolute path to the matched folder
         allowed_formats: List of allowed format strings, or None
         base_resource_folder: Absolute path to the resource root
+        inventory: Optional ResourceInventory of base_resource_folder
     """
     target_node = find_node_by_name(graph, node_id)
     if not target_node:
@@ -439,16 +446,20 @@ def process_node_resource_folder(graph, node_id, folder_path, allowed_formats, b
 
     folder_suffix = get_folder_suffix(folder_path, base_resource_folder)
 
-    for filename in os.listdir(folder_path):
+    filenames = inventory.list_files(folder_path) if inventory is not None else None
+    if filenames is None:
+        filenames = [f for f in os.listdir(folder_path)
+                     if os.path.isfile(os.path.join(folder_path, f))]
+
+    for filename in filenames:
         file_path = os.path.join(folder_path, filename)
-        if os.path.isfile(file_path):
-            if is_allowed_format(filename, allowed_formats):
-                print(f"Creating DocumentNode for: {folder_suffix}/{filename}")
-                create_document_for_resource(
-                    graph, target_node, file_path, filename, folder_suffix, base_resource_folder
-                )
-            else:
-                print(f"Skipping {filename} (format not allowed)")
+        if is_allowed_format(filename, allowed_formats):
+            print(f"Creating DocumentNode for: {folder_suffix}/{filename}")
+            create_document_for_resource(
+                graph, target_node, file_path, filename, folder_suffix, base_resource_folder
+            )
+        else:
+            print(f"Skipping {filename} (format not allowed)")
 
 
 def process_from_thumbnails_json(graph, base_resource_folder, index_data, allowed_formats=None):
@@ -549,7 +560,8 @@ def process_resource_folder(graph, resource_folder_raw, source_item, graph_name,
         target_types: Optional list of node type strings to filter.
                       If None, uses legacy behavior.
     """
-    from ..thumb_utils import em_thumbs_root, load_index_json
+    from ..thumb_utils import em_thumbs_root
+    from ..thumb_index import get_thumb_index
 
     # Resolve path
     base_resource_folder = resolve_resource_path(resource_folder_raw)
@@ -567,7 +579,7 @@ def process_resource_folder(graph, resource_folder_raw, source_item, graph_name,
     # Try fast path: thumbnails JSON
     try:
         thumbs_root = em_thumbs_root(resource_folder_raw)
-        index_data = load_index_json(thumbs_root)
+        index_data = {"items": get_thumb_index(thumbs_root).items}
 
         if index_data.get("items") and len(index_data["items"]) > 0:
             print(f"Found thumbnails JSON with {len(index_data['items'])} items - using fast import")
@@ -586,14 +598,18 @@ def process_resource_folder(graph, resource_folder_raw, source_item, graph_name,
     # Get node IDs to match against
     imported_ids = get_node_ids_by_types(graph, target_types)
 
+    # One inventory for all nodes: only changed folders are listed again
+    inventory = get_resource_inventory(base_resource_folder)
+
     for node_id in imported_ids:
-        matching_folders = find_folders_by_name(base_resource_folder, node_id)
+        matching_folders = find_folders_by_name(base_resource_folder, node_id, inventory)
 
         if matching_folders:
             print(f"Found {len(matching_folders)} folder(s) for ID {node_id}:")
             for folder_path in matching_folders:
                 print(f"  - {folder_path}")
-                process_node_resource_folder(graph, node_id, folder_path, allowed_formats, base_resource_folder)
+                process_node_resource_folder(graph, node_id, folder_path, allowed_formats,
+                                             base_resource_folder, inventory)
         # No else print to avoid excessive logging
 
 
@@ -614,9 +630,10 @@ def process_resource_folder_by_prefix(graph, resource_folder_raw, target_types=N
         raise Exception(f"Resource folder not found: {base_resource_folder}")
 
     imported_ids = get_node_ids_by_types(graph, target_types)
+    inventory = get_resource_inventory(base_resource_folder)
 
     for node_id in imported_ids:
-        matched_files = find_files_by_prefix(base_resource_folder, node_id, allowed_formats)
+        matched_files = find_files_by_prefix(base_resource_folder, node_id, allowed_formats, inventory)
 
         if matched_files:
             target_node = find_node_by_name(graph, node_id)
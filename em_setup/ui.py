@@ -833,6 +833,9 @@ class EM_SetupPanel(bpy.types.Panel):
             row = layout.row(align=True)
             info_op = row.operator("wm.call_menu", text="", icon='INFO')
             info_op.name = "EM_MT_LandscapeInfo"
+            if len(em_tools.graphml_files) >= 2:
+                # Parsing parallelo di tutti i GraphML, liste popolate una volta
+                row.operator("em.load_all_graphml", text="", icon='FILE_REFRESH')
 
             if is_landscape_active:
                 row.label(text="Multigraph Mode", icon='WORLD')
@@ -1174,6 +1177,14 @@ class EM_SetupPanel(bpy.types.Panel):
                             op.url = "panels/em_setup.html#setting-up-resource-folders"
                             op.project = 'em_tools'
 
+                            # Background build progress
+                            from ..thumb_build import get_active_build
+                            thumb_build = get_active_build()
+                            if thumb_build is not None:
+                                progress_row = box.row(align=True)
+                                progress_row.label(text=thumb_build.progress_text(), icon='TIME')
+                                progress_row.operator("emtools.cancel_doc_thumbs_build", text="", icon='CANCEL')
+
                             # Thumbnails path (collapsible)
                             path_box = box.box()
                             path_row = path_box.row(align=True)
@@ -4,7 +4,8 @@ Modular structure for mesh statistics CSV export.
 
 Organization:
     materials.py   -> CSV loading, EnumProperty items, decimal formatting
-    metrics.py     -> volume/weight/surface computation (bmesh)
+    metrics.py     -> volume/weight/surface computation (NumPy, bmesh fallback)
+    batch.py       -> batch export: process pool + streamed CSV/Parquet rows
     properties.py  -> EMSceneProperties + Scene.em_properties
     operators.py   -> EMExportCSV (ExportHelper)
     ui.py          -> EM_PT_ExportPanel
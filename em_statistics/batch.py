@@ -0,0 +1,307 @@
+# em_statistics/batch.py
+"""
+Batch mesh statistics export
+============================
+
+Site-wide volume reports: metrics of many proxies computed in a process
+pool, rows streamed to CSV (or Parquet) as results come back.
+
+- stratigraphic units are looked up in a name → unit dict built once
+- mesh buffers are read with foreach_get on the main thread (bpy is not
+  available in the workers) and sent to workers/em_metrics_worker.py in
+  chunks of several meshes
+- a bounded number of chunks is in flight, so memory stays flat and rows
+  are written in object order while the pool keeps working
+- small exports (or a pool that cannot start) are computed in-process
+
+Performance Impact:
+- Before: metrics one object at a time on the main thread, plus a linear
+  scan of strat.units per object (O(objects × units))
+- After: O(objects) lookups, metrics on every spare core
+
+Usage:
+    from .batch import run_batch_export
+
+    lookup = build_unit_lookup(context)
+    objects = collect_proxy_objects(context, lookup)   # or context.selected_objects
+    written = run_batch_export(context, objects, filepath, file_format='CSV', lookup=lookup)
+"""
+
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .materials import format_decimal, load_materials
+from .metrics import read_mesh_buffers, finalize_metrics
+from ..worker_processes import import_worker_module, detached_main
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+FIELDNAMES = [
+    "Nome",
+    "Tipo_Nodo_EM",
+    "Epoca",
+    "Descrizione",
+    "Volume_(m³)",
+    "Tipo_Misurazione",
+    "Peso_(kg)",
+    "Superficie_Totale_(m²)",
+    "Superficie_Verticale_(m²)"
+]
+
+NUMERIC_FIELDS = ("Volume_(m³)", "Peso_(kg)", "Superficie_Totale_(m²)", "Superficie_Verticale_(m²)")
+
+MIN_OBJECTS_FOR_POOL = 64       # sotto questa soglia lo spawn del pool non conviene
+CHUNK_LOOPS = 200_000           # loops per chunk inviato a un worker
+IN_FLIGHT_PER_WORKER = 2
+PARQUET_ROW_GROUP = 1000
+
+
+def get_metrics_worker_count(object_count: int) -> int:
+    cpu_count = os.cpu_count() or 2
+    return max(1, min(cpu_count - 1, 8, object_count // MIN_OBJECTS_FOR_POOL + 1))
+
+
+# ============================================================================
+# UNIT LOOKUP
+# ============================================================================
+
+def build_unit_lookup(context):
+    """name → (epoch, description, EM node type), built once per export."""
+    from s3dgraphy import convert_shape2type
+
+    lookup = {}
+    for unit in context.scene.em_tools.stratigraphy.units:
+        if unit.name in lookup:
+            continue  # first match wins, as the old linear scan
+        try:
+            emnode = convert_shape2type(unit.shape, unit.border_style)[0]
+        except Exception:
+            emnode = "none"
+        lookup[unit.name] = (unit.epoch, unit.description, emnode)
+    return lookup
+
+
+def find_unit_info(lookup, obj_name):
+    """Exact name first, then the name without graph prefix."""
+    info = lookup.get(obj_name)
+    if info is None:
+        from ..operators.addon_prefix_helpers import proxy_name_to_node_name
+        info = lookup.get(proxy_name_to_node_name(obj_name))
+    return info or ("none", "none", "none")
+
+
+# ============================================================================
+# ROW WRITERS
+# ============================================================================
+
+class CSVRowWriter:
+    """Semicolon CSV, decimals with comma (same format as EMExportCSV)."""
+
+    def __init__(self, filepath):
+        self._file = open(filepath, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDNAMES, delimiter=';')
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow({key: format_decimal(value) if key in NUMERIC_FIELDS and value != "" else value
+                               for key, value in row.items()})
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetRowWriter:
+    """Parquet with one row group every PARQUET_ROW_GROUP rows (numbers as floats)."""
+
+    def __init__(self, filepath):
+        fields = [pyarrow.field(name, pyarrow.float64() if name in NUMERIC_FIELDS else pyarrow.string())
+                  for name in FIELDNAMES]
+        self._schema = pyarrow.schema(fields)
+        self._writer = pyarrow.parquet.ParquetWriter(filepath, self._schema)
+        self._rows = []
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        columns = {}
+        for name in FIELDNAMES:
+            if name in NUMERIC_FIELDS:
+                columns[name] = [None if row[name] in ("", None) else float(row[name]) for row in self._rows]
+            else:
+                columns[name] = [str(row[name]) for row in self._rows]
+        self._writer.write_table(pyarrow.table(columns, schema=self._schema))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def open_row_writer(filepath, file_format):
+    if file_format == 'PARQUET':
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Parquet export requires the pyarrow package")
+        return ParquetRowWriter(filepath)
+    return CSVRowWriter(filepath)
+
+
+# ============================================================================
+# BATCH RUN
+# ============================================================================
+
+def _make_row(obj, metrics, error, unit_info, scene_props, materials):
+    epoca, description, emnode = unit_info
+    if error is not None:
+        print(f"Mesh metrics error on {obj.name}: {error}")
+        volume, weight, measurement_type, total_surface, vertical_surface = 0, 0, "Volume Calculation Failed", 0, 0
+    elif metrics is None:
+        volume, weight, measurement_type, total_surface, vertical_surface = 0, 0, "Empty Mesh", 0, 0
+    else:
+        volume, weight, measurement_type, total_surface, vertical_surface = finalize_metrics(
+            obj, metrics, scene_props.material_list, materials)
+
+    return {
+        "Nome": obj.name,
+        "Tipo_Nodo_EM": emnode,
+        "Epoca": epoca,
+        "Descrizione": description,
+        "Volume_(m³)": volume if scene_props.export_volume else "",
+        "Tipo_Misurazione": measurement_type,
+        "Peso_(kg)": weight if scene_props.export_weight else "",
+        "Superficie_Totale_(m²)": total_surface,
+        "Superficie_Verticale_(m²)": vertical_surface,
+    }
+
+
+def _iter_chunks(objects):
+    """(objects, job) chunks; empty meshes go alone with an empty job."""
+    chunk_objects, job, loops = [], [], 0
+    for obj in objects:
+        mesh = obj.data
+        if not mesh.polygons:
+            if chunk_objects:
+                yield chunk_objects, job
+                chunk_objects, job, loops = [], [], 0
+            yield [obj], []
+            continue
+        try:
+            buffers = read_mesh_buffers(mesh)
+        except Exception as e:
+            print(f"[Statistics] Could not read mesh of {obj.name}: {e}")
+            buffers = None  # reported as a per-object error by the worker
+        chunk_objects.append(obj)
+        job.append((obj.name, buffers))
+        loops += len(mesh.loops)
+        if loops >= CHUNK_LOOPS:
+            yield chunk_objects, job
+            chunk_objects, job, loops = [], [], 0
+    if chunk_objects:
+        yield chunk_objects, job
+
+
+def collect_proxy_objects(context, lookup):
+    """Every mesh in the scene that is the proxy of a stratigraphic unit."""
+    from ..operators.addon_prefix_helpers import proxy_name_to_node_name
+
+    return [obj for obj in context.scene.objects
+            if obj.type == 'MESH' and (obj.name in lookup or proxy_name_to_node_name(obj.name) in lookup)]
+
+
+def run_batch_export(context, objects, filepath, file_format='CSV', lookup=None):
+    """
+    Compute and stream the statistics rows of objects.
+
+    Returns:
+        int: rows written
+    """
+    objects = [obj for obj in objects if obj.type == 'MESH']
+    scene_props = context.scene.em_properties
+    materials = load_materials()
+    if lookup is None:
+        lookup = build_unit_lookup(context)
+    worker = import_worker_module("em_metrics_worker")
+
+    executor = None
+    workers = get_metrics_worker_count(len(objects))
+    if len(objects) >= MIN_OBJECTS_FOR_POOL and workers > 1:
+        try:
+            import multiprocessing
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context('spawn'))
+        except Exception as e:
+            print(f"[Statistics] Process pool unavailable ({e}), computing in-process")
+
+    started = time.time()
+    written = 0
+    wm = context.window_manager
+    wm.progress_begin(0, max(1, len(objects)))
+    writer = open_row_writer(filepath, file_format)
+
+    def write_chunk(chunk_objects, results):
+        nonlocal written
+        by_name = {name: (metrics, error) for name, metrics, error in results}
+        for obj in chunk_objects:
+            metrics, error = by_name.get(obj.name, (None, None))
+            writer.write(_make_row(obj, metrics, error, find_unit_info(lookup, obj.name),
+                                   scene_props, materials))
+            written += 1
+        wm.progress_update(written)
+
+    try:
+        in_flight = deque()
+        limit = workers * IN_FLIGHT_PER_WORKER
+        for chunk_objects, job in _iter_chunks(objects):
+            if executor is None or not job:
+                in_flight.append((chunk_objects, None, job))
+            else:
+                try:
+                    with detached_main():
+                        future = executor.submit(worker.compute_metrics, job)
+                except BrokenProcessPool as e:
+                    print(f"[Statistics] Process pool failed ({e}), computing in-process")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = None
+                    future = None
+                in_flight.append((chunk_objects, future, job))
+
+            # Rows in object order: wait for the oldest chunk when the window is full
+            while in_flight and (len(in_flight) > limit or in_flight[0][1] is None):
+                write_chunk(*_resolve(in_flight.popleft(), worker))
+
+        while in_flight:
+            write_chunk(*_resolve(in_flight.popleft(), worker))
+    finally:
+        writer.close()
+        wm.progress_end()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    print(f"[Statistics] Exported {written} objects in {time.time() - started:.1f}s "
+          f"({workers if executor else 1} worker(s))")
+    return written
+
+
+def _resolve(entry, worker):
+    """(chunk_objects, results) of a queued chunk, computing it here if needed."""
+    chunk_objects, future, job = entry
+    if future is not None:
+        try:
+            return chunk_objects, future.result()
+        except Exception as e:
+            print(f"[Statistics] Worker failed ({e}), computing chunk in-process")
+    return chunk_objects, worker.compute_metrics(job)
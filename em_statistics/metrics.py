@@ -1,8 +1,18 @@
 # em_statistics/metrics.py
-"""Geometry metrics: closure check, volume/weight/surface computation."""
+"""Geometry metrics: closure check, volume/weight/surface computation.
+
+The metrics are read straight from the mesh datablock with foreach_get
+(vertex coordinates, loop triangles, polygon areas/normals) and computed
+with NumPy (workers/em_metrics_worker.py, shared with the batch export):
+no mesh copy and no per-face Python loop. The bmesh path is kept only for
+closed meshes with inconsistent face winding, where the normals must be
+recalculated before the volume is meaningful.
+"""
 
-import math
 import bmesh
+import numpy as np
+
+from ..workers.em_metrics_worker import metrics_from_buffers
 
 
 def is_mesh_closed(bm):
@@ -14,34 +24,59 @@ def is_mesh_closed(bm):
         return False
 
 
-def calculate_object_metrics(obj, selected_material, materials):
-    """Calculate volume, weight, and surface metrics for an object.
+def _read_array(collection, attr, count, width, dtype):
+    # dtype must match Blender's storage (float32 / int32) for the fast path
+    values = np.empty(count * width, dtype=dtype)
+    collection.foreach_get(attr, values)
+    return values.reshape(count, width) if width > 1 else values
 
-    Returns:
-        tuple: (volume, weight, measurement_type, total_surface, vertical_surface)
-    """
-    if not obj or obj.type != 'MESH':
-        return None, None, None, None, None
 
-    print(f"Processing object: {obj.name}")
+def read_mesh_buffers(mesh):
+    """Arrays needed by metrics_from_buffers (main thread, no mesh copy)."""
+    n_polys = len(mesh.polygons)
+    n_loops = len(mesh.loops)
+
+    mesh.calc_loop_triangles()
+    return {
+        'coords': _read_array(mesh.vertices, "co", len(mesh.vertices), 3, np.float32),
+        'areas': _read_array(mesh.polygons, "area", n_polys, 1, np.float32),
+        'normals': _read_array(mesh.polygons, "normal", n_polys, 3, np.float32),
+        'loop_edges': _read_array(mesh.loops, "edge_index", n_loops, 1, np.int32),
+        'loop_verts': _read_array(mesh.loops, "vertex_index", n_loops, 1, np.int32),
+        'loop_start': _read_array(mesh.polygons, "loop_start", n_polys, 1, np.int32),
+        'loop_total': _read_array(mesh.polygons, "loop_total", n_polys, 1, np.int32),
+        'tris': _read_array(mesh.loop_triangles, "vertices", len(mesh.loop_triangles), 3, np.int32),
+        'n_edges': len(mesh.edges),
+    }
 
-    mesh = obj.data.copy()
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
-    bm.faces.ensure_lookup_table()
 
-    # Reset bmesh to handle potential degenerate geometries
-    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+def mesh_metrics_numpy(mesh):
+    """Vectorised metrics of a mesh datablock (see metrics_from_buffers)."""
+    return metrics_from_buffers(read_mesh_buffers(mesh))
 
-    if not bm.faces or len(bm.faces) == 0:
+
+def _bmesh_volume(mesh):
+    """Volume after recalculating face normals (inconsistent winding)."""
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+        return bm.calc_volume()
+    finally:
         bm.free()
-        return 0, 0, "Empty Mesh", 0, 0
 
+
+def finalize_metrics(obj, metrics, selected_material, materials):
+    """Volume choice (closed / bounding box) and weight from raw mesh metrics.
+
+    Returns:
+        tuple: (volume, weight, measurement_type, total_surface, vertical_surface)
+    """
     # Volume
     try:
-        if is_mesh_closed(bm):
+        if metrics['closed']:
             measurement_type = "Closed Mesh"
-            volume = bm.calc_volume()
+            volume = metrics['volume'] if metrics['consistent'] else _bmesh_volume(obj.data)
         else:
             measurement_type = "Open Mesh - Bounding Box"
             dimensions = obj.dimensions
@@ -51,30 +86,6 @@ def calculate_object_metrics(obj, selected_material, materials):
         measurement_type = "Volume Calculation Failed"
         volume = 0
 
-    # Total surface
-    try:
-        total_surface = sum(f.calc_area() for f in bm.faces if f.calc_area() > 0)
-    except Exception as e:
-        print(f"Total surface calculation error: {e}")
-        total_surface = 0
-
-    # Vertical surface
-    def is_vertical_face(face):
-        try:
-            normal = face.normal.normalized()
-            return 85 <= math.degrees(normal.angle((0, 0, 1))) <= 95
-        except Exception as e:
-            print(f"Vertical face calculation error: {e}")
-            return False
-
-    try:
-        vertical_surface = sum(f.calc_area() for f in bm.faces if is_vertical_face(f))
-    except Exception as e:
-        print(f"Vertical surface calculation error: {e}")
-        vertical_surface = 0
-
-    bm.free()
-
     # Weight
     try:
         material_name = selected_material.strip().lower()
@@ -83,4 +94,26 @@ def calculate_object_metrics(obj, selected_material, materials):
         print(f"Weight calculation error: {e}")
         weight = 0
 
-    return volume, weight, measurement_type, total_surface, vertical_surface
+    return volume, weight, measurement_type, metrics['total_surface'], metrics['vertical_surface']
+
+
+def calculate_object_metrics(obj, selected_material, materials):
+    """Calculate volume, weight, and surface metrics for an object.
+
+    Returns:
+        tuple: (volume, weight, measurement_type, total_surface, vertical_surface)
+    """
+    if not obj or obj.type != 'MESH':
+        return None, None, None, None, None
+
+    mesh = obj.data
+    if not mesh.polygons:
+        return 0, 0, "Empty Mesh", 0, 0
+
+    try:
+        metrics = mesh_metrics_numpy(mesh)
+    except Exception as e:
+        print(f"Mesh metrics error on {obj.name}: {e}")
+        return 0, 0, "Volume Calculation Failed", 0, 0
+
+    return finalize_metrics(obj, metrics, selected_material, materials)
@@ -11,6 +11,22 @@ class EMSceneProperties(PropertyGroup):
     export_volume: BoolProperty(name="Calculate Volume", default=True)
     export_weight: BoolProperty(name="Calculate weight", default=False)
     material_list: EnumProperty(name="Material", items=get_material_items)
+    export_scope: EnumProperty(
+        name="Objects",
+        items=[
+            ('SELECTED', "Selected", "Selected mesh objects"),
+            ('ALL_PROXIES', "All Proxies", "Every proxy of the stratigraphic units in the scene"),
+        ],
+        default='SELECTED'
+    )
+    export_format: EnumProperty(
+        name="Format",
+        items=[
+            ('CSV', "CSV", "Semicolon separated CSV"),
+            ('PARQUET', "Parquet", "Apache Parquet (requires pyarrow)"),
+        ],
+        default='CSV'
+    )
 
 
 classes = (
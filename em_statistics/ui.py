@@ -40,6 +40,9 @@ class EM_PT_ExportPanel(Panel):
         layout.prop(scene_props, "export_weight")
         if scene_props.export_weight:
             layout.prop(scene_props, "material_list")
+        row = layout.row(align=True)
+        row.prop(scene_props, "export_scope", expand=True)
+        layout.prop(scene_props, "export_format")
         layout.operator("export_mesh.csv")
 
 
@@ -27,8 +27,10 @@ from .operators.addon_prefix_helpers import (
     node_name_to_proxy_name,
     proxy_name_to_node_name,
     get_proxy_from_node,
-    get_active_graph_code
+    get_active_graph_code,
+    get_graph_code_from_graph
 )
+from s3dgraphy.utils.utils import add_graph_prefix
 
 from .us_types import US_PROPER_TYPES
 
@@ -1002,73 +1004,46 @@ def stream_extractors(self, context):
 def create_derived_lists(node, graph=None):
     """
     Crea le liste derivate di proprietà per un nodo.
-    
-    ✅ MODIFICATO: aggiunto supporto per graph
-    
+
+    ✅ OPTIMIZED: righe dalla memo dei paradati (paradata_cache), la chiusura
+    completa della US è calcolata una sola volta per generazione dell'indice
+
     Args:
         node: Il nodo per cui creare le liste
         graph: Istanza del grafo (opzionale)
     """
-    
+
     context = bpy.context
     scene = context.scene
-    prop_index = 0
-    EM_list_clear(context, "em_v_properties_list")
 
-    is_property = False
-    
-    # Debug info
-    print(f"\nRicerca proprietà per il nodo {node.name} (ID: {node.id_node})")
-    
     # Get the active graph
     if graph is None:
         graph_exists, graph = is_graph_available(context)
         if not graph_exists:
             print("Error: Graph not available")
+            EM_list_clear(context, "em_v_properties_list")
             return
-    
+
     # Verify if the node ID exists in the graph
     found_node = graph.find_node_by_id(node.id_node)
     if not found_node:
         print(f"WARNING: Node with ID {node.id_node} not found in the graph!")
+        EM_list_clear(context, "em_v_properties_list")
         return
-    else:
-        print(f"Node found in graph: {found_node.name} (ID: {found_node.node_id})")
-    
-    # Get properties using has_property edges
-    # ✅ OPTIMIZED: Use edge index for O(1) lookup instead of O(E)
-    from .graph_index import get_or_create_graph_index
 
-    index = get_or_create_graph_index(graph)
-    property_nodes = index.get_target_nodes(
-        source_id=node.id_node,
-        edge_type="has_property",
-        node_type_filter='property'
-    )
+    from .paradata_cache import get_paradata_memo, sync_paradata_list
 
-    # Debug output
-    for prop_node in property_nodes:
-        print(f"Trovata proprietà: {prop_node.name} (ID: {prop_node.node_id}) via has_property")
+    memo = get_paradata_memo(graph)
+    memo.warm_closure(node.id_node)
+    rows = memo.related('properties', node.id_node)
 
-    is_property = len(property_nodes) > 0
-    
     # Aggiorniamo la lista delle proprietà - ✅ SENZA prefisso
-    if property_nodes:
-        for i, prop_node in enumerate(property_nodes):
-            scene.em_tools.em_v_properties_list.add()
-            property_item = scene.em_tools.em_v_properties_list[i]
-
-            # USA SEMPRE IL NOME PULITO
-            property_item.name = prop_node.name
-
-            property_item.description = prop_node.description if hasattr(prop_node, 'description') else ""
-            property_item.url = prop_node.value if hasattr(prop_node, 'value') else ""
-            property_item.id_node = prop_node.node_id
-            property_item.icon = check_objs_in_scene_and_provide_icon_for_list_element(prop_node.name, graph=graph)
-            property_item.icon_url = "WORLD" if property_item.url else "WORLD_DATA"
-            prop_index += 1
+    sync_paradata_list(
+        scene.em_tools.em_v_properties_list, rows,
+        lambda name: check_objs_in_scene_and_provide_icon_for_list_element(name, graph=graph)
+    )
 
-    print(f"Trovate {prop_index} proprietà per il nodo {node.id_node}")
+    print(f"Trovate {len(rows)} proprietà per il nodo {node.id_node}")
 
     # Reset property index if needed
     if scene.em_tools.em_v_properties_list_index >= len(scene.em_tools.em_v_properties_list):
@@ -1077,65 +1052,24 @@ def create_derived_lists(node, graph=None):
 def create_derived_combiners_list(passed_property_item):
     context = bpy.context
     scene = context.scene
-    comb_index = 0
-    is_combiner = False
-    EM_list_clear(context, "em_v_combiners_list")
 
-    print(f"La proprietà: {passed_property_item.name} ha id_nodo: {passed_property_item.id_node}")
-    
     # Recuperiamo il grafo corrente
     graph_exists, graph = is_graph_available(context)
-    
+
     if not graph_exists:
         print("Errore: Grafo non disponibile")
+        EM_list_clear(context, "em_v_combiners_list")
         return False
-    
-    # Cerchiamo combinatori collegati alla proprietà
-    # ✅ OPTIMIZED: Use edge index for O(1) lookup instead of O(E)
-    from .graph_index import get_or_create_graph_index
-
-    index = get_or_create_graph_index(graph)
-
-    # Get all edges from property (any edge type) to combiners
-    combiner_nodes = index.get_target_nodes(
-        source_id=passed_property_item.id_node,
-        edge_type="has_combiner",  # Primary edge type
-        node_type_filter='combiner'
-    )
 
-    # Fallback: some graphs may use different edge types, get all targets and filter
-    if not combiner_nodes:
-        # Get all edge types from this property
-        edge_types = index.get_edge_types_from_source(passed_property_item.id_node)
-        for edge_type in edge_types:
-            nodes = index.get_target_nodes(
-                source_id=passed_property_item.id_node,
-                edge_type=edge_type,
-                node_type_filter='combiner'
-            )
-            combiner_nodes.extend(nodes)
+    # Combinatori collegati alla proprietà (dalla memo dei paradati)
+    from .paradata_cache import get_paradata_memo, sync_paradata_list
 
-    # Debug output
-    for comb_node in combiner_nodes:
-        print(f"Trovato combinatore: {comb_node.name} (ID: {comb_node.node_id})")
+    rows = get_paradata_memo(graph).related('combiners', passed_property_item.id_node)
+    is_combiner = len(rows) > 0
 
-    is_combiner = len(combiner_nodes) > 0
-    
     # Aggiorniamo la lista dei combinatori - senza aggiungere prefissi
-    if combiner_nodes:
-        for i, comb_node in enumerate(combiner_nodes):
-            scene.em_tools.em_v_combiners_list.add()
-            combiner_item = scene.em_tools.em_v_combiners_list[i]
-
-            # Use the original name without prefixing
-            combiner_item.name = comb_node.name
-
-            combiner_item.description = comb_node.description if hasattr(comb_node, 'description') else ""
-            combiner_item.url = comb_node.sources[0] if hasattr(comb_node, 'sources') and comb_node.sources else ""
-            combiner_item.id_node = comb_node.node_id
-            combiner_item.icon_url = "WORLD" if combiner_item.url else "WORLD_DATA"
-            combiner_item.icon = check_objs_in_scene_and_provide_icon_for_list_element(combiner_item.name)
-            comb_index += 1
+    sync_paradata_list(scene.em_tools.em_v_combiners_list, rows,
+                       check_objs_in_scene_and_provide_icon_for_list_element)
 
     if is_combiner:
         if scene.em_tools.comb_paradata_streaming_mode:
@@ -1153,148 +1087,71 @@ def create_derived_combiners_list(passed_property_item):
 def create_derived_extractors_list(passed_property_item, graph=None):
     """
     Crea la lista di extractors collegati a una proprietà.
-    
-    ✅ MODIFICATO: rimosso l'aggiunta manuale del prefisso
-    
+
+    ✅ OPTIMIZED: righe dalla memo dei paradati (paradata_cache)
+
     Args:
         passed_property_item: L'item della proprietà selezionata
         graph: Istanza del grafo (opzionale)
     """
-    
+
     context = bpy.context
     scene = context.scene
-    extr_index = 0
-    is_extractor = False
-    EM_list_clear(context, "em_v_extractors_list")
 
-    print(f"La proprietà: {passed_property_item.name} ha id_nodo: {passed_property_item.id_node}")
-    
     # Recuperiamo il grafo corrente
     if graph is None:
         graph_exists, graph = is_graph_available(context)
         if not graph_exists:
             print("Errore: Grafo non disponibile")
+            EM_list_clear(context, "em_v_extractors_list")
             return False
-    
-    # Cerchiamo estrattori collegati alla proprietà
-    # ✅ OPTIMIZED: Use edge index for O(1) lookup instead of O(E)
-    from .graph_index import get_or_create_graph_index
-
-    index = get_or_create_graph_index(graph)
-
-    # Get extractors connected to this property
-    extractor_nodes = index.get_target_nodes(
-        source_id=passed_property_item.id_node,
-        edge_type="has_extractor",  # Primary edge type
-        node_type_filter='extractor'
-    )
-
-    # Fallback: try all edge types if none found
-    if not extractor_nodes:
-        edge_types = index.get_edge_types_from_source(passed_property_item.id_node)
-        for edge_type in edge_types:
-            nodes = index.get_target_nodes(
-                source_id=passed_property_item.id_node,
-                edge_type=edge_type,
-                node_type_filter='extractor'
-            )
-            extractor_nodes.extend(nodes)
 
-    # Debug output
-    for extr_node in extractor_nodes:
-        print(f"Trovato estrattore: {extr_node.name} (ID: {extr_node.node_id})")
+    from .paradata_cache import get_paradata_memo, sync_paradata_list
 
-    is_extractor = len(extractor_nodes) > 0
+    rows = get_paradata_memo(graph).related('extractors', passed_property_item.id_node)
 
     # ✅ MODIFICATO: usa sempre il nome pulito (senza prefisso)
-    if extractor_nodes:
-        for i, extr_node in enumerate(extractor_nodes):
-            scene.em_tools.em_v_extractors_list.add()
-            extractor_item = scene.em_tools.em_v_extractors_list[i]
-
-            # USA SEMPRE IL NOME PULITO
-            extractor_item.name = extr_node.name
-
-            extractor_item.description = extr_node.description if hasattr(extr_node, 'description') else ""
-            extractor_item.url = extr_node.source if hasattr(extr_node, 'source') else ""
-            extractor_item.id_node = extr_node.node_id
-            extractor_item.icon_url = "WORLD" if extractor_item.url else "WORLD_DATA"
-            extractor_item.icon = check_objs_in_scene_and_provide_icon_for_list_element(extractor_item.name, graph=graph)
-            extr_index += 1
+    sync_paradata_list(
+        scene.em_tools.em_v_extractors_list, rows,
+        lambda name: check_objs_in_scene_and_provide_icon_for_list_element(name, graph=graph)
+    )
 
-    return is_extractor
+    return len(rows) > 0
 
 
 def create_derived_sources_list(passed_extractor_item, graph=None):
     """
     Crea la lista di documenti collegati a un estrattore.
-    
-    ✅ MODIFICATO: rimosso l'aggiunta manuale del prefisso
-    
+
+    ✅ OPTIMIZED: righe dalla memo dei paradati (paradata_cache)
+
     Args:
         passed_extractor_item: L'item dell'estrattore selezionato
         graph: Istanza del grafo (opzionale)
     """
-    
+
     context = bpy.context
     scene = context.scene
-    sour_index = 0
-    EM_list_clear(context, "em_v_sources_list")
-    
-    print(f"passed_extractor_item: {passed_extractor_item.name} con id: {passed_extractor_item.id_node}")
-    
+
     # Recuperiamo il grafo corrente
     if graph is None:
         graph_exists, graph = is_graph_available(context)
         if not graph_exists:
             print("Errore: Grafo non disponibile")
+            EM_list_clear(context, "em_v_sources_list")
             return
-    
-    # Cerchiamo fonti collegate all'estrattore
-    # ✅ OPTIMIZED: Use edge index for O(1) lookup instead of O(E)
-    from .graph_index import get_or_create_graph_index
-
-    index = get_or_create_graph_index(graph)
 
-    # Get document nodes connected to this extractor
-    source_nodes = index.get_target_nodes(
-        source_id=passed_extractor_item.id_node,
-        edge_type="has_source",  # Primary edge type
-        node_type_filter='document'
-    )
-
-    # Fallback: try all edge types if none found
-    if not source_nodes:
-        edge_types = index.get_edge_types_from_source(passed_extractor_item.id_node)
-        for edge_type in edge_types:
-            nodes = index.get_target_nodes(
-                source_id=passed_extractor_item.id_node,
-                edge_type=edge_type,
-                node_type_filter='document'
-            )
-            source_nodes.extend(nodes)
+    from .paradata_cache import get_paradata_memo, sync_paradata_list
 
-    # Debug output
-    for src_node in source_nodes:
-        print(f"Trovata fonte: {src_node.name} (ID: {src_node.node_id})")
+    rows = get_paradata_memo(graph).related('documents', passed_extractor_item.id_node)
 
     # ✅ MODIFICATO: usa sempre il nome pulito (senza prefisso)
-    if source_nodes:
-        for i, src_node in enumerate(source_nodes):
-            scene.em_tools.em_v_sources_list.add()
-            source_item = scene.em_tools.em_v_sources_list[i]
-
-            # USA SEMPRE IL NOME PULITO
-            source_item.name = src_node.name
-
-            source_item.description = src_node.description if hasattr(src_node, 'description') else ""
-            source_item.url = src_node.url if hasattr(src_node, 'url') else ""
-            source_item.id_node = src_node.node_id
-            source_item.icon_url = "WORLD" if source_item.url else "WORLD_DATA"
-            source_item.icon = check_objs_in_scene_and_provide_icon_for_list_element(source_item.name, graph=graph)
-            sour_index += 1
+    sync_paradata_list(
+        scene.em_tools.em_v_sources_list, rows,
+        lambda name: check_objs_in_scene_and_provide_icon_for_list_element(name, graph=graph)
+    )
 
-    print(f"sources: {sour_index}")
+    print(f"sources: {len(rows)}")
 
 def switch_paradata_lists(self, context):
     """
@@ -1307,14 +1164,6 @@ def switch_paradata_lists(self, context):
 
     # ✅ Usa nuovo path
     if strat.units_index >= 0 and strat.units_index < len(strat.units):
-        selected_item = strat.units[strat.units_index]
-
-        # Clear paradata lists
-        EM_list_clear(context, "em_v_properties_list")
-        EM_list_clear(context, "em_v_extractors_list")
-        EM_list_clear(context, "em_v_combiners_list")
-        EM_list_clear(context, "em_v_sources_list")
-
         # Verifica se c'è un grafo attivo prima di chiamare l'operatore
         if scene.em_tools.paradata_streaming_mode:
             # Controlla se c'è un file GraphML attivo
@@ -1327,8 +1176,10 @@ def switch_paradata_lists(self, context):
                     graph = get_graph(graphml.name)
 
                     if graph:
-                        # Il grafo esiste, aggiorna le liste
+                        # Il grafo esiste: l'operatore riscrive le liste dalla
+                        # memo dei paradati (solo quelle cambiate)
                         bpy.ops.em.update_paradata_lists()
+                        return
                     else:
                         print(f"Grafo '{graphml.name}' non trovato, impossibile aggiornare le liste")
                 except Exception as e:
@@ -1336,6 +1187,12 @@ def switch_paradata_lists(self, context):
             else:
                 print("Nessun file GraphML attivo, impossibile aggiornare le liste")
 
+        # Clear paradata lists
+        EM_list_clear(context, "em_v_properties_list")
+        EM_list_clear(context, "em_v_extractors_list")
+        EM_list_clear(context, "em_v_combiners_list")
+        EM_list_clear(context, "em_v_sources_list")
+
     return
 
 ## #### #### #### #### #### #### #### #### #### #### #### ####
@@ -1477,69 +1334,37 @@ def update_icons(context, list_type):
 def update_property_materials_alpha(alpha_value):
     """
     Update alpha for all property-based materials.
-    ✅ OPTIMIZED: Uses material cache for 100× speedup (O(M×N) → O(M))
+    ✅ OPTIMIZED: One pass of the material parameter engine, unchanged
+    materials are not written.
     """
-    from .material_cache import get_material_cache
-
-    scene = bpy.context.scene
-    cache = get_material_cache()
-
-    # ✅ OPTIMIZED: Get cached property materials (O(1) instead of O(M))
-    property_materials = cache.get_property_materials()
-
-    print(f"[OPTIMIZED] Found {len(property_materials)} property materials (cached)")
-    if len(property_materials) > 0:
-        print(f"  Sample materials: {[mat.name for mat in property_materials[:5]]}")
+    from .material_params import apply_material_params
 
-    # Update alpha for all property materials
-    updated_count = 0
-
-    for mat in property_materials:
-        # ✅ OPTIMIZED: Get cached Principled node (O(1) instead of O(N))
-        principled_node = cache.get_principled_node(mat)
-
-        if principled_node:
-            # Update alpha channel
-            if 'Alpha' in principled_node.inputs:
-                principled_node.inputs['Alpha'].default_value = alpha_value
-
-            # Update base color alpha component
-            current_color = principled_node.inputs['Base Color'].default_value
-            if len(current_color) >= 3:
-                new_color = (*current_color[:3], alpha_value)
-                principled_node.inputs['Base Color'].default_value = new_color
-
-            # Set appropriate blend mode
-            if alpha_value < 1.0:
-                mat.blend_method = 'BLEND'
-            else:
-                mat.blend_method = getattr(scene, 'proxy_blend_mode', 'OPAQUE')
-
-            updated_count += 1
-
-    print(f"[OPTIMIZED] Updated alpha to {alpha_value} for {updated_count}/{len(property_materials)} materials")
+    updated_count = apply_material_params(alpha=alpha_value, families=('property',))
+    print(f"[OPTIMIZED] Updated alpha to {alpha_value} for {updated_count} property materials")
     return updated_count
 
 def update_display_mode(self, context):
-    """Updated display mode function with better error handling"""
+    """
+    Alpha slider / shader mode changed: push alpha and blend mode to every
+    EM-managed material (EM types, epochs, properties, projections) in one
+    debounced pass instead of re-running the display mode.
+    """
+    from .material_params import schedule_material_params, get_material_registry
+
     scene = bpy.context.scene
-    
+    em_tools = scene.em_tools
+
     try:
-        if scene.em_tools.proxy_display_mode == "EM":
+        # Materiali della modalità corrente assenti: serve il setup completo
+        mode = em_tools.proxy_display_mode
+        registry = get_material_registry()
+        if mode == "EM" and not registry.has_family('em'):
             bpy.ops.emset.emmaterial()
-        elif scene.em_tools.proxy_display_mode == "Epochs":
+        elif mode == "Epochs" and not registry.has_family('epoch'):
             bpy.ops.emset.epochmaterial()
-        elif scene.em_tools.proxy_display_mode == "Properties":
-            # Prima aggiorna l'alpha dei materiali esistenti
-            update_property_materials_alpha(scene.em_tools.proxy_display_alpha)
-            
-            # Poi riapplica i colori se necessario
-            if (hasattr(scene, 'selected_property') and scene.selected_property and
-                hasattr(scene, 'property_values') and len(scene.property_values) > 0):
-                try:
-                    bpy.ops.visual.apply_colors()
-                except Exception as e:
-                    print(f"Warning: Could not reapply property colors: {e}")
+
+        schedule_material_params(alpha=em_tools.proxy_display_alpha,
+                                 blend_mode=em_tools.proxy_blend_mode)
     except Exception as e:
         print(f"Error in update_display_mode: {e}")
 
@@ -1611,74 +1436,120 @@ def em_setup_mat_cycles(matname, R, G, B, A=1.0):
     mainNode.inputs['Alpha'].default_value = scene.em_tools.proxy_display_alpha
     links.new(mainNode.outputs[0], output.inputs[0])
 
+    from .material_params import invalidate_material_registry
+    invalidate_material_registry()
+
+
+# Shape → materiale per le voci legacy senza node_type
+EM_SHAPE_MATERIALS = {
+    'rectangle': 'US',
+    'ellipse_white': 'US',
+    'ellipse': 'USVn',
+    'parallelogram': 'USVs',
+    'hexagon': 'USVn',
+    'roundrectangle': 'USD',
+}
+
+# Gli ottagoni si distinguono per il colore del bordo
+EM_OCTAGON_BORDER_MATERIALS = {
+    '#D8BD30': 'SF',
+    '#B19F61': 'VSF',
+}
+
+_US_PROPER_TYPE_SET = frozenset(US_PROPER_TYPES)
+EM_MATERIAL_NAMES = (_US_PROPER_TYPE_SET | frozenset(EM_SHAPE_MATERIALS.values())
+                     | frozenset(EM_OCTAGON_BORDER_MATERIALS.values()))
+
+
+def em_material_name_for_unit(unit):
+    """
+    Name of the EM material of a stratigraphic list item.
+
+    node_type wins; legacy items without node_type fall back to the
+    shape/border tables.
+    """
+    node_type = getattr(unit, 'node_type', '')
+    if node_type:
+        return node_type if node_type in _US_PROPER_TYPE_SET else 'US'
+    if unit.shape == 'octagon':
+        return EM_OCTAGON_BORDER_MATERIALS.get(unit.border_style, 'VSF')
+    return EM_SHAPE_MATERIALS.get(unit.shape, 'US')
+
+
+def assign_single_material(obj, mat):
+    """
+    Make mat the only material slot of obj's data.
+
+    Returns:
+        bool: False if obj already had exactly that material (no change)
+    """
+    materials = obj.data.materials
+    if len(materials) == 1 and materials[0] == mat:
+        return False
+    materials.clear()
+    materials.append(mat)
+    return True
+
+
+def apply_EM_materials(context):
+    """
+    Batch EM colouring of every linked proxy in the stratigraphic list.
+
+    The EM materials are consolidated once, the proxy prefix is resolved
+    once, proxies come from the object cache and slots that already hold
+    the right material are left alone.
+
+    Returns:
+        tuple: (applied, changed) proxies with an EM material / proxies
+               whose slots were actually rewritten
+    """
+    from .object_cache import get_proxy_object
+
+    graph_exists, graph = is_graph_available(context)
+    graph_code = get_graph_code_from_graph(graph if graph_exists else None)
+    if not graph_code:
+        graph_code = get_active_graph_code(context)
+
+    consolidate_EM_material_presence(True)
+
+    materials = {}
+    for mat_name in EM_MATERIAL_NAMES:
+        mat = bpy.data.materials.get(mat_name)
+        if mat is not None:
+            materials[mat_name] = mat
+
+    applied = 0
+    changed = 0
+    missing = 0
+    for unit in context.scene.em_tools.stratigraphy.units:
+        if unit.icon != 'LINKED':
+            continue
+
+        proxy_name = add_graph_prefix(unit.name, graph_code) if graph_code else unit.name
+        proxy = get_proxy_object(proxy_name)
+        if proxy is None or proxy.data is None or not hasattr(proxy.data, 'materials'):
+            missing += 1
+            continue
+
+        mat = materials.get(em_material_name_for_unit(unit))
+        if mat is None:
+            continue
+
+        applied += 1
+        if assign_single_material(proxy, mat):
+            changed += 1
+
+    if missing:
+        print(f"Warning: {missing} linked proxies not found")
+    return applied, changed
+
 
 def set_materials_using_EM_list(context):
     """
     Set materials for proxies based on EM node types.
     ✅ FIXED: Now handles prefixed proxy names
     """
-    from .operators.addon_prefix_helpers import node_name_to_proxy_name
-    
-    # Ottieni il grafo attivo
-    graph_exists, graph = is_graph_available(context)
-    active_graph = graph if graph_exists else None
-    
-    strat = context.scene.em_tools.stratigraphy  # ✅ Nuovo
-    em_list_lenght = len(strat.units)
-    counter = 0
-    while counter < em_list_lenght:
-        current_ob_em_list = strat.units[counter]
-        overwrite_mats = True
-        consolidate_EM_material_presence(overwrite_mats)
-        
-        if current_ob_em_list.icon == 'LINKED':
-            # ✅ MODIFICATO: Converti il nome con prefisso
-            proxy_name = node_name_to_proxy_name(
-                current_ob_em_list.name,
-                context=context,
-                graph=active_graph
-            )
-            
-            # ✅ MODIFICATO: Usa get() per gestire oggetti mancanti
-            current_ob_scene = context.scene.objects.get(proxy_name)
-            
-            if not current_ob_scene:
-                print(f"Warning: Warning: Object '{proxy_name}' not found")
-                counter += 1
-                continue
-            
-            ob_material_name = 'US'  # Default
-            
-            # Resto della logica invariata...
-            if hasattr(current_ob_em_list, 'node_type') and current_ob_em_list.node_type:
-                if current_ob_em_list.node_type in US_PROPER_TYPES:
-                    ob_material_name = current_ob_em_list.node_type
-            else:
-                # Fallback con shape/border
-                if current_ob_em_list.shape == 'rectangle':
-                    ob_material_name = 'US'
-                elif current_ob_em_list.shape == 'ellipse_white':
-                    ob_material_name = 'US'
-                elif current_ob_em_list.shape == 'ellipse':
-                    ob_material_name = 'USVn'
-                elif current_ob_em_list.shape == 'parallelogram':
-                    ob_material_name = 'USVs'
-                elif current_ob_em_list.shape == 'hexagon':
-                    ob_material_name = 'USVn'
-                elif current_ob_em_list.shape == 'octagon':
-                    if current_ob_em_list.border_style == '#D8BD30':
-                        ob_material_name = 'SF'
-                    elif current_ob_em_list.border_style == '#B19F61':
-                        ob_material_name = 'VSF'
-                    else:
-                        ob_material_name = 'VSF'
-                elif current_ob_em_list.shape == 'roundrectangle':
-                    ob_material_name = 'USD'
-                
-            mat = bpy.data.materials[ob_material_name]
-            current_ob_scene.data.materials.clear()
-            current_ob_scene.data.materials.append(mat)
-        counter += 1
+    apply_EM_materials(context)
 
 def proxy_shader_mode_function(self, context):
     scene = context.scene
@@ -1925,6 +1796,10 @@ def inspect_load_dosco_files_on_graph(graph_instance, dosco_dir):
     # Track which DosCo files ended up matched; leftovers become orphans.
     matched_files = set()
 
+    # One walk (or none, if the folder is unchanged) for matching and orphans
+    from .dosco_index import get_dosco_index
+    dosco_index = get_dosco_index(dosco_dir)
+
     for node in relevant_nodes:
         node_name = node.name
 
@@ -1937,11 +1812,11 @@ def inspect_load_dosco_files_on_graph(graph_instance, dosco_dir):
                 base_name = node_name.split(f"{graph_code}_", 1)[1]
 
         # Try finding the file with the prefixed name first
-        file_path = find_file_in_dosco(dosco_dir, node_name)
+        file_path = dosco_index.find(node_name)
 
         # If not found and we have a different base name (prefix removed), try that
         if not file_path and base_name != node_name:
-            file_path = find_file_in_dosco(dosco_dir, base_name)
+            file_path = dosco_index.find(base_name)
 
         if file_path:
             rel_path = os.path.relpath(file_path, dosco_dir)
@@ -2007,46 +1882,46 @@ def inspect_load_dosco_files_on_graph(graph_instance, dosco_dir):
                             break
 
         try:
-            for root, _dirs, files in os.walk(dosco_dir):
-                for fname in files:
-                    full = os.path.abspath(os.path.join(root, fname))
-                    if full in matched_files:
-                        continue
-                    if fname.startswith("."):
-                        continue  # skip .DS_Store etc.
-
-                    stem = os.path.splitext(fname)[0].strip()
-                    _m = _ID_PREFIX.match(stem)
-                    short_id = _m.group(1) if _m else stem
-
-                    # Case A: node with this id exists — matching
-                    # failed elsewhere, but the node itself is fine.
-                    if short_id in _existing_ids:
-                        continue
-                    if graph_code and f"{graph_code}.{short_id}" in _existing_ids:
-                        continue
-
-                    # Case B: id looks like an extractor / combiner
-                    # entry — should never be surfaced as an orphan
-                    # document. Warn instead and move on.
-                    is_ext = short_id.startswith("D.") and short_id.count(".") == 2
-                    is_comb = short_id.startswith("C.")
-                    if is_ext or is_comb:
-                        kind = "extractor" if is_ext else "combiner"
-                        graph_instance.warnings.append(
-                            f"DosCo: file '{fname}' has {kind}-like id "
-                            f"'{short_id}' but no matching node is in the "
-                            f"graph — ignored (not surfaced as orphan)."
-                        )
-                        continue
-
-                    rel = os.path.relpath(full, dosco_dir)
-                    push_orphan(
-                        graph_instance,
-                        injector_id=_INJECTOR_ID,
-                        key_id=short_id,
-                        payload={"filename": fname, "rel_path": rel},
+            for full in dosco_index.iter_files():
+                full = os.path.abspath(full)
+                fname = os.path.basename(full)
+                if full in matched_files:
+                    continue
+                if fname.startswith("."):
+                    continue  # skip .DS_Store etc.
+
+                stem = os.path.splitext(fname)[0].strip()
+                _m = _ID_PREFIX.match(stem)
+                short_id = _m.group(1) if _m else stem
+
+                # Case A: node with this id exists — matching
+                # failed elsewhere, but the node itself is fine.
+                if short_id in _existing_ids:
+                    continue
+                if graph_code and f"{graph_code}.{short_id}" in _existing_ids:
+                    continue
+
+                # Case B: id looks like an extractor / combiner
+                # entry — should never be surfaced as an orphan
+                # document. Warn instead and move on.
+                is_ext = short_id.startswith("D.") and short_id.count(".") == 2
+                is_comb = short_id.startswith("C.")
+                if is_ext or is_comb:
+                    kind = "extractor" if is_ext else "combiner"
+                    graph_instance.warnings.append(
+                        f"DosCo: file '{fname}' has {kind}-like id "
+                        f"'{short_id}' but no matching node is in the "
+                        f"graph — ignored (not surfaced as orphan)."
                     )
+                    continue
+
+                rel = os.path.relpath(full, dosco_dir)
+                push_orphan(
+                    graph_instance,
+                    injector_id=_INJECTOR_ID,
+                    key_id=short_id,
+                    payload={"filename": fname, "rel_path": rel},
+                )
         except Exception as e:
             print(f"Warning: orphan file scan failed: {e}")
 
@@ -2098,6 +1973,10 @@ def inspect_load_dosco_files():
     skipped_web_urls = 0
     not_found_count = 0
     
+    # Single index of the DosCo folder shared by all lists
+    from .dosco_index import get_dosco_index
+    dosco_index = get_dosco_index(dosco_dir)
+
     # Process documents, extractors, and combiners
     for list_name in ["em_sources_list", "em_extractors_list", "em_combiners_list"]:
         node_list = getattr(scene, list_name)
@@ -2122,11 +2001,11 @@ def inspect_load_dosco_files():
                     base_name = node_name.split(f"{graph_code}_", 1)[1]
             
             # Try finding the file with the prefixed name first
-            file_path = find_file_in_dosco(dosco_dir, node_name)
+            file_path = dosco_index.find(node_name)
             
             # If not found and we have a different base name (prefix removed), try that
             if not file_path and base_name != node_name:
-                file_path = find_file_in_dosco(dosco_dir, base_name)
+                file_path = dosco_index.find(base_name)
             
             # If file found, update the URL
             if file_path:
@@ -2169,6 +2048,9 @@ def find_file_in_dosco(dosco_dir, node_name):
     Searches for a file in the DosCo directory that matches the node identifier.
     Makes a distinction between node IDs like "D.01" and "D.01.01".
 
+    Uses the DosCo index (dosco_index.py): the folder is walked only when
+    it changed since the last lookup.
+
     Args:
         dosco_dir (str): Path to the DosCo directory
         node_name (str): Name of the node to search for (like "D.01" or "C.05")
@@ -2176,46 +2058,11 @@ def find_file_in_dosco(dosco_dir, node_name):
     Returns:
         str or None: Full path to the found file, or None if not found
     """
-    matches = []
-
-    # Define a more precise pattern matching to distinguish between node IDs
-    # For example, D.01 should match "D.01 mia fonte.jpg" but NOT "D.01.01 estrattore.jpg"
-    # The key is to NOT accept '.' as a delimiter since it's used for sub-levels
-    for root, _, files in os.walk(dosco_dir):
-        for file in files:
-            # Check if file starts with the exact node name followed by:
-            # - a space, underscore, or hyphen (NOT a dot!)
-            # This ensures D.01 matches "D.01 file.jpg" but not "D.01.01 file.jpg"
-            if file.startswith(node_name):
-                # Get the character immediately after the node name
-                if len(file) > len(node_name):
-                    next_char = file[len(node_name)]
-                    # Accept only space, underscore, or hyphen as delimiters
-                    # Do NOT accept '.' to avoid matching sub-nodes like D.01.01
-                    if next_char in [' ', '_', '-']:
-                        matches.append(os.path.join(root, file))
-                # If filename is exactly the node name (edge case)
-                elif len(file) == len(node_name):
-                    matches.append(os.path.join(root, file))
-    
-    # If we found multiple matches, prioritize by common file types
-    if matches:
-        # Define priority of file extensions
-        priority_extensions = ['.jpg', '.jpeg', '.png', '.pdf', '.doc', '.docx', '.txt', '.svg', '.mp4', '.mov']
-        
-        # Sort matches by extension priority
-        def get_priority(file_path):
-            ext = os.path.splitext(file_path)[1].lower()
-            try:
-                return priority_extensions.index(ext)
-            except ValueError:
-                return len(priority_extensions)  # Lower priority for unknown extensions
-        
-        sorted_matches = sorted(matches, key=get_priority)
-        return sorted_matches[0]  # Return the highest priority match
-    
-    # No matches found
-    return None
+    from .dosco_index import get_dosco_index
+
+    # D.01 should match "D.01 mia fonte.jpg" but NOT "D.01.01 estrattore.jpg";
+    # matches are ranked by common file types
+    return get_dosco_index(dosco_dir).find(node_name)
 
 def update_or_create_link_node(graph, source_node, url, preserve_existing=True,
                                injector_id=None):
@@ -13,6 +13,7 @@ from . import operators
 from . import ui
 from . import keymap
 from . import socket_generator
+from . import virtual_view
 
 __all__ = ['register', 'unregister']
 
@@ -26,6 +27,7 @@ def register():
     dynamic_nodes.register_dynamic_nodes()  # ✅ Dynamic node generation
     properties.register_properties()  # Scene properties
     operators.register_operators()    # Operators
+    virtual_view.register_virtual_view()  # Focus view (summary nodes + operators)
     ui.register_ui()                  # UI panels
     keymap.register_keymaps()         # Keyboard shortcuts
 
@@ -41,6 +43,7 @@ def unregister():
     # Unregister in reverse order
     keymap.unregister_keymaps()
     ui.unregister_ui()
+    virtual_view.unregister_virtual_view()
     operators.unregister_operators()
     properties.unregister_properties()
     dynamic_nodes.unregister_dynamic_nodes()  # ✅ Unregister dynamic nodes
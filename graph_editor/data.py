@@ -5,7 +5,7 @@ Contains Node Tree, Socket types, and property groups.
 
 import bpy # type: ignore
 from bpy.types import NodeTree, NodeSocket # type: ignore
-from bpy.props import StringProperty, FloatProperty, FloatVectorProperty, IntProperty # type: ignore
+from bpy.props import StringProperty, FloatProperty, FloatVectorProperty, IntProperty, BoolProperty # type: ignore
 
 # ============================================================================
 # SOCKET TYPES
@@ -102,6 +102,31 @@ class EMGraphNodeTree(NodeTree):
         description="Numero di collegamenti nel grafo",
         default=0
     ) # type: ignore
+
+    # Focus view (vedi virtual_view.py)
+    is_focus_view: BoolProperty(
+        name="Focus View",
+        description="Il tree mostra solo la regione attorno a un nodo, il resto è riassunto",
+        default=False
+    ) # type: ignore
+
+    focus_node_id: StringProperty(
+        name="Focus Node",
+        description="ID del nodo al centro della focus view",
+        default=""
+    ) # type: ignore
+
+    focus_budget: IntProperty(
+        name="Focus Budget",
+        description="Numero massimo di nodi nella regione della focus view",
+        default=300
+    ) # type: ignore
+
+    expanded_clusters: StringProperty(
+        name="Expanded Clusters",
+        description="Chiavi dei cluster espansi nella focus view, separate da '|'",
+        default=""
+    ) # type: ignore
     
     # Colori globali personalizzabili
     default_us_color: FloatVectorProperty(
@@ -75,6 +75,10 @@ class EMGraphNodeBase(Node):
 _GENERATED_CLASSES = []
 _NODE_TYPE_MAP = {}  # Maps node_type string → Blender node class
 
+# Flattened edge rules, rebuilt once per datamodel load:
+# (connections_datamodel, nodes_datamodel, allowed_triples, restricted_edge_types)
+_EDGE_RULE_TABLE = None
+
 
 def get_all_node_types_from_datamodel(nodes_datamodel: Dict) -> List[Dict]:
     """
@@ -389,18 +393,98 @@ def is_edge_allowed(source_type: str, target_type: str, edge_type: str,
     return source_ok and target_ok
 
 
+def build_edge_rule_table(connections_datamodel: Dict,
+                          node_hierarchy: Dict[str, Set[str]]) -> Tuple[Set[Tuple[str, str, str]], Set[str]]:
+    """
+    Appiattisce le regole di connessione in una tabella di triple permesse.
+
+    Stessa semantica di is_edge_allowed(): i tipi permessi vengono espansi
+    ricorsivamente una sola volta per edge type, poi si enumerano le coppie.
+
+    Returns:
+        Tuple (allowed_triples, restricted_edge_types):
+        - allowed_triples: set di (source_type, target_type, edge_type)
+        - restricted_edge_types: edge type con allowed_connections; quelli
+          non presenti sono sempre permessi
+    """
+    allowed_triples = set()
+    restricted = set()
+
+    expansions = {}
+
+    def expand(node_type):
+        result = expansions.get(node_type)
+        if result is None:
+            result = _expand_node_type_recursively(node_type, node_hierarchy)
+            expansions[node_type] = result
+        return result
+
+    for edge_type, edge_info in connections_datamodel.get('edge_types', {}).items():
+        if 'allowed_connections' not in edge_info:
+            continue
+        restricted.add(edge_type)
+
+        allowed = edge_info['allowed_connections']
+        sources = set()
+        for allowed_source in allowed.get('source', []):
+            sources.update(expand(allowed_source))
+        targets = set()
+        for allowed_target in allowed.get('target', []):
+            targets.update(expand(allowed_target))
+
+        for source_type in sources:
+            for target_type in targets:
+                allowed_triples.add((source_type, target_type, edge_type))
+
+    return allowed_triples, restricted
+
+
+def get_edge_rule_table(connections_datamodel: Dict, nodes_datamodel: Dict):
+    """
+    Tabella delle regole per i datamodel dati, costruita alla prima richiesta.
+
+    Returns:
+        Tuple (allowed_triples, restricted_edge_types)
+    """
+    global _EDGE_RULE_TABLE
+
+    cached = _EDGE_RULE_TABLE
+    if (cached is not None and cached[0] is connections_datamodel
+            and cached[1] is nodes_datamodel):
+        return cached[2], cached[3]
+
+    if 'edge_types' not in connections_datamodel:
+        allowed_triples, restricted = set(), set()  # Nessuna regola: permetti tutto
+    else:
+        node_hierarchy = build_node_hierarchy(nodes_datamodel)
+        allowed_triples, restricted = build_edge_rule_table(connections_datamodel, node_hierarchy)
+
+    _EDGE_RULE_TABLE = (connections_datamodel, nodes_datamodel, allowed_triples, restricted)
+    return allowed_triples, restricted
+
+
+def clear_edge_rule_table():
+    """Scarta la tabella delle regole (chiamato quando si ricaricano i datamodel)"""
+    global _EDGE_RULE_TABLE
+    _EDGE_RULE_TABLE = None
+
+
 def validate_graph_edges(graph, connections_datamodel: Dict, nodes_datamodel: Dict):
     """
     Valida tutti gli edge del grafo e stampa quelli non permessi.
 
+    Un solo passaggio lineare: i tipi dei nodi vengono da un dizionario
+    node_id → nodo e le regole dalla tabella appiattita di get_edge_rule_table().
+
     Args:
         graph: Il grafo s3dgraphy da validare
         connections_datamodel: JSON delle connessioni
         nodes_datamodel: JSON dei nodi
     """
 
-    # Build hierarchy
-    node_hierarchy = build_node_hierarchy(nodes_datamodel)
+    allowed_triples, restricted = get_edge_rule_table(connections_datamodel, nodes_datamodel)
+
+    nodes_by_id = {node.node_id: node for node in graph.nodes}
 
     invalid_edges = []
     total_edges = 0
@@ -408,21 +492,22 @@ def validate_graph_edges(graph, connections_datamodel: Dict, nodes_datamodel: Di
     for edge in graph.edges:
         total_edges += 1
 
-        # Get node types
+        edge_type = edge.edge_type
+        if edge_type not in restricted:
+            continue  # Edge type sconosciuto o senza restrizioni
+
         # ✅ FIXED: Edge objects use edge_source/edge_target, not source/target
-        source_node = graph.find_node_by_id(edge.edge_source)
-        target_node = graph.find_node_by_id(edge.edge_target)
+        source_node = nodes_by_id.get(edge.edge_source)
+        target_node = nodes_by_id.get(edge.edge_target)
 
         if not source_node or not target_node:
             continue
 
         source_type = getattr(source_node, 'node_type', 'Unknown')
         target_type = getattr(target_node, 'node_type', 'Unknown')
-        edge_type = edge.edge_type
 
         # Validate
-        if not is_edge_allowed(source_type, target_type, edge_type,
-                              connections_datamodel, node_hierarchy):
+        if (source_type, target_type, edge_type) not in allowed_triples:
             invalid_edges.append({
                 'source': source_node.name,
                 'source_type': source_type,
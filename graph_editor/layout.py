@@ -1,147 +1,368 @@
 """
 Hierarchical layout algorithm for EMGraph nodes
 Arranges nodes in layers based on connectivity, avoiding overlaps.
+
+Layered (Sugiyama-style) layout in four steps:
+1. Cycle breaking (iterative DFS, back edges reversed) + deque-based
+   topological layering (longest path, sources pulled towards successors)
+2. Dummy nodes for edges spanning more than one layer (up to MAX_DUMMY_SPAN)
+3. Barycenter crossing reduction, alternating down/up sweeps, keeping the
+   ordering with the fewest crossings
+4. Coordinate assignment (layer → X, order → Y, pulled towards neighbours)
+
+Runs in O((V + E) · sweeps) plus O(E log V) per crossing count, and does not
+depend on bpy: compute_layered_layout() works on plain ids and edge pairs.
 """
 
-def calculate_hierarchical_layout(node_map, graph, filtered_node_ids):
-    """
-    Calcola un layout gerarchico per i nodi.
+from collections import OrderedDict, defaultdict, deque
 
-    Args:
-        node_map: Dict {node_id: blender_node}
-        graph: s3dgraphy Graph object
-        filtered_node_ids: Set di node_id da considerare
+# Parametri layout
+LAYER_SPACING_X = 400  # Spaziatura tra layer (colonne)
+NODE_SPACING_Y = 250   # Spaziatura tra nodi nello stesso layer
+DEFAULT_SWEEPS = 8     # Sweep di riduzione incroci (down + up = 2)
+MAX_DUMMY_SPAN = 8     # Edge più lunghi non generano catene di dummy
 
-    Returns:
-        Dict {node_id: (x, y)} con le posizioni calcolate
+# Layout calcolati per filtro: riaprire la stessa vista è istantaneo
+_LAYOUT_CACHE_SIZE = 16
+_layout_cache = OrderedDict()
+
+
+# ============================================================================
+# STEP 1 — CYCLE BREAKING + LAYERING
+# ============================================================================
+
+def _break_cycles(node_ids, successors):
     """
+    Return the set of (source, target) edges to reverse to make the graph acyclic.
 
-    # 1. Costruisci il grafo delle dipendenze (solo nodi filtrati)
-    dependencies = {}  # {target_id: [source_ids]}
-    reverse_deps = {}  # {source_id: [target_ids]}
+    Iterative DFS: an edge pointing to a node still on the stack is a back edge.
+    """
+    WHITE, GREY, BLACK = 0, 1, 2
+    state = dict.fromkeys(node_ids, WHITE)
+    reversed_edges = set()
 
-    for edge in graph.edges:
-        if edge.edge_source in filtered_node_ids and edge.edge_target in filtered_node_ids:
-            # Target dipende da Source (Source -> Target)
-            if edge.edge_target not in dependencies:
-                dependencies[edge.edge_target] = []
-            dependencies[edge.edge_target].append(edge.edge_source)
+    for root in node_ids:
+        if state[root] != WHITE:
+            continue
+        state[root] = GREY
+        stack = [(root, iter(successors.get(root, ())))]
+        while stack:
+            node, children = stack[-1]
+            advanced = False
+            for child in children:
+                child_state = state.get(child)
+                if child_state == WHITE:
+                    state[child] = GREY
+                    stack.append((child, iter(successors.get(child, ()))))
+                    advanced = True
+                    break
+                elif child_state == GREY:
+                    reversed_edges.add((node, child))
+            if not advanced:
+                state[node] = BLACK
+                stack.pop()
+
+    return reversed_edges
+
+
+def _assign_layers(node_ids, successors, predecessors):
+    """Longest-path layering with Kahn's algorithm (deque, O(V + E))."""
+    in_degree = {nid: len(predecessors.get(nid, ())) for nid in node_ids}
+    layers = dict.fromkeys(node_ids, 0)
+    queue = deque(nid for nid in node_ids if in_degree[nid] == 0)
 
-            # Reverse per calcolare i livelli
-            if edge.edge_source not in reverse_deps:
-                reverse_deps[edge.edge_source] = []
-            reverse_deps[edge.edge_source].append(edge.edge_target)
+    while queue:
+        current = queue.popleft()
+        next_layer = layers[current] + 1
+        for target in successors.get(current, ()):
+            if layers[target] < next_layer:
+                layers[target] = next_layer
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                queue.append(target)
 
-    # 2. Calcola i livelli (layer) di ogni nodo usando BFS
-    layers = {}  # {node_id: layer_number}
+    return layers
 
-    # Trova i nodi radice (senza dipendenze in ingresso)
-    root_nodes = [nid for nid in filtered_node_ids if nid not in dependencies or len(dependencies[nid]) == 0]
 
-    # Se non ci sono radici, usa tutti i nodi come radici (grafo ciclico)
-    if not root_nodes:
-        root_nodes = list(filtered_node_ids)
+def _compact_layers(node_ids, successors, predecessors, layers):
+    """
+    Pull every node with no predecessors next to its nearest successor.
 
-    # Assegna livello 0 alle radici
-    for node_id in root_nodes:
-        layers[node_id] = 0
+    Longest-path layering puts all sources in layer 0; moving them right
+    shortens their edges and therefore the number of dummy nodes.
+    """
+    for nid in node_ids:
+        if predecessors.get(nid) or not successors.get(nid):
+            continue
+        layers[nid] = min(layers[t] for t in successors[nid]) - 1
+    return layers
 
-    # BFS per assegnare livelli
-    queue = root_nodes[:]
-    visited = set(root_nodes)
 
-    while queue:
-        current_id = queue.pop(0)
-        current_layer = layers[current_id]
-
-        # Espandi ai nodi dipendenti
-        if current_id in reverse_deps:
-            for target_id in reverse_deps[current_id]:
-                if target_id not in visited:
-                    layers[target_id] = current_layer + 1
-                    visited.add(target_id)
-                    queue.append(target_id)
-                else:
-                    # Se già visitato, aggiorna il livello se necessario
-                    layers[target_id] = max(layers[target_id], current_layer + 1)
-
-    # Nodi non raggiunti (isolati o cicli)
-    for node_id in filtered_node_ids:
-        if node_id not in layers:
-            layers[node_id] = 0
-
-    # 3. Raggruppa nodi per layer
-    nodes_by_layer = {}
-    for node_id, layer in layers.items():
-        if layer not in nodes_by_layer:
-            nodes_by_layer[layer] = []
-        nodes_by_layer[layer].append(node_id)
-
-    # 4. Calcola posizioni
-    positions = {}
+# ============================================================================
+# STEP 2 — DUMMY NODES
+# ============================================================================
 
-    # Parametri layout
-    LAYER_SPACING_X = 400  # Spaziatura tra layer (colonne)
-    NODE_SPACING_Y = 250   # Spaziatura tra nodi nello stesso layer
-    START_X = 0
-    START_Y = 0
+def _insert_dummies(edges, layers, max_span=MAX_DUMMY_SPAN):
+    """
+    Split every edge spanning k > 1 layers into a chain with k - 1 dummies.
 
-    max_layer = max(nodes_by_layer.keys()) if nodes_by_layer else 0
+    Edges longer than max_span are left out of crossing reduction: a chain
+    of hundreds of dummies would dominate the sweeps without making the
+    drawing noticeably more readable.
 
-    for layer_num in range(max_layer + 1):
-        if layer_num not in nodes_by_layer:
+    Returns:
+        (segments, layers) where segments are (upper, lower) pairs between
+        adjacent layers and layers now includes the dummy ids.
+    """
+    segments = []
+    dummy_count = 0
+    for source, target in edges:
+        span = layers[target] - layers[source]
+        if span <= 1:
+            segments.append((source, target))
             continue
+        if span > max_span:
+            continue
+        previous = source
+        for step in range(1, span):
+            dummy = ('__dummy__', dummy_count)
+            dummy_count += 1
+            layers[dummy] = layers[source] + step
+            segments.append((previous, dummy))
+            previous = dummy
+        segments.append((previous, target))
+    return segments, layers
+
+
+# ============================================================================
+# STEP 3 — CROSSING REDUCTION
+# ============================================================================
+
+def _count_crossings(upper_order, lower_order, down_neighbours):
+    """Crossings between two adjacent layers (Fenwick tree, O(E log V))."""
+    lower_pos = {nid: i for i, nid in enumerate(lower_order)}
+    targets = []
+    for nid in upper_order:
+        targets.extend(sorted(lower_pos[t] for t in down_neighbours.get(nid, ())))
+    if not targets:
+        return 0
+
+    size = len(lower_order)
+    tree = [0] * (size + 1)
+    crossings = 0
+    for count, pos in enumerate(targets):
+        # Edges already inserted with a target strictly after pos cross this one
+        i, seen = pos + 1, 0
+        while i > 0:
+            seen += tree[i]
+            i -= i & -i
+        crossings += count - seen
+        i = pos + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return crossings
+
+
+def _total_crossings(ordering, down_neighbours):
+    return sum(_count_crossings(ordering[i], ordering[i + 1], down_neighbours)
+               for i in range(len(ordering) - 1))
+
+
+def _barycenter_sweep(ordering, neighbours, layer_range):
+    """Reorder each layer in layer_range by the mean position of its neighbours."""
+    for layer in layer_range:
+        fixed = ordering[layer - 1] if layer_range.step > 0 else ordering[layer + 1]
+        fixed_pos = {nid: i for i, nid in enumerate(fixed)}
+        current = ordering[layer]
+
+        def barycenter(item):
+            index, nid = item
+            positions = [fixed_pos[n] for n in neighbours.get(nid, ()) if n in fixed_pos]
+            if not positions:
+                return float(index)  # Keep nodes without neighbours in place
+            return sum(positions) / len(positions)
+
+        ordering[layer] = [nid for _, nid in
+                           sorted(enumerate(current), key=barycenter)]
+
+
+def _reduce_crossings(ordering, down_neighbours, up_neighbours, sweeps):
+    """Alternate down/up barycenter sweeps, return the best ordering found."""
+    n_layers = len(ordering)
+    best = [list(layer) for layer in ordering]
+    best_crossings = _total_crossings(best, down_neighbours)
+
+    for sweep in range(sweeps):
+        if best_crossings == 0:
+            break
+        if sweep % 2 == 0:
+            _barycenter_sweep(ordering, up_neighbours, range(1, n_layers))
+        else:
+            _barycenter_sweep(ordering, down_neighbours, range(n_layers - 2, -1, -1))
+        crossings = _total_crossings(ordering, down_neighbours)
+        if crossings < best_crossings:
+            best_crossings = crossings
+            best = [list(layer) for layer in ordering]
 
-        layer_nodes = nodes_by_layer[layer_num]
-        num_nodes = len(layer_nodes)
-
-        # Calcola X per questo layer
-        x = START_X + (layer_num * LAYER_SPACING_X)
+    return best, best_crossings
 
-        # Ordina i nodi nel layer per minimizzare incroci
-        # Usa euristica: ordina per numero medio di connessioni ai layer precedenti
-        if layer_num > 0:
-            layer_nodes = sort_layer_by_connections(layer_nodes, dependencies, layers, layer_num)
 
-        # Calcola Y per centrare verticalmente
-        total_height = (num_nodes - 1) * NODE_SPACING_Y
-        start_y = START_Y - (total_height / 2)
+# ============================================================================
+# STEP 4 — COORDINATE ASSIGNMENT
+# ============================================================================
 
-        for i, node_id in enumerate(layer_nodes):
-            y = start_y + (i * NODE_SPACING_Y)
-            positions[node_id] = (x, y)
+def _assign_coordinates(ordering, up_neighbours, layer_spacing, node_spacing):
+    """
+    X from the layer, Y from the order: each node is pulled towards the mean Y
+    of its upper neighbours while keeping order and minimum spacing.
+    """
+    y_of = {}
+    positions = {}
+    for layer_num, layer_nodes in enumerate(ordering):
+        n = len(layer_nodes)
+        desired = []
+        for i, nid in enumerate(layer_nodes):
+            ys = [y_of[u] for u in up_neighbours.get(nid, ()) if u in y_of]
+            desired.append(sum(ys) / len(ys) if ys else (i - (n - 1) / 2.0) * node_spacing)
+
+        # Forward pass: respect order and minimum spacing
+        ys = []
+        for i, want in enumerate(desired):
+            ys.append(want if i == 0 else max(want, ys[-1] + node_spacing))
+        # Re-center the layer on its desired mean so it does not drift downwards
+        if ys:
+            shift = sum(desired) / n - sum(ys) / n
+            ys = [y + shift for y in ys]
+
+        x = layer_num * layer_spacing
+        for nid, y in zip(layer_nodes, ys):
+            y_of[nid] = y
+            positions[nid] = (x, y)
 
     return positions
 
 
-def sort_layer_by_connections(layer_nodes, dependencies, layers, current_layer):
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def compute_layered_layout(node_ids, edges, sweeps=DEFAULT_SWEEPS,
+                           layer_spacing=LAYER_SPACING_X,
+                           node_spacing=NODE_SPACING_Y):
     """
-    Ordina i nodi in un layer per minimizzare gli incroci con il layer precedente.
-    Euristica: ordina per posizione media delle dipendenze.
+    Layered layout of an arbitrary directed graph (no bpy required).
+
+    Args:
+        node_ids: Iterable of hashable node ids
+        edges: Iterable of (source_id, target_id); edges touching unknown
+            ids and self-loops are ignored
+        sweeps: Number of barycenter sweeps
+        layer_spacing / node_spacing: Distance between layers / nodes
+
+    Returns:
+        Dict {node_id: (x, y)} for every node id
     """
+    node_ids = list(dict.fromkeys(node_ids))
+    known = set(node_ids)
+
+    successors = defaultdict(list)
+    edge_list = []
+    seen_edges = set()
+    for source, target in edges:
+        if source == target or source not in known or target not in known:
+            continue
+        if (source, target) in seen_edges:
+            continue
+        seen_edges.add((source, target))
+        edge_list.append((source, target))
+        successors[source].append(target)
+
+    # 1. Cycle breaking + layering
+    reversed_edges = _break_cycles(node_ids, successors)
+    acyclic = []
+    for source, target in edge_list:
+        if (source, target) in reversed_edges:
+            source, target = target, source
+        acyclic.append((source, target))
+    # Reversing can duplicate an existing opposite edge
+    acyclic = list(dict.fromkeys(acyclic))
+
+    successors = defaultdict(list)
+    predecessors = defaultdict(list)
+    for source, target in acyclic:
+        successors[source].append(target)
+        predecessors[target].append(source)
+    layers = _assign_layers(node_ids, successors, predecessors)
+    layers = _compact_layers(node_ids, successors, predecessors, layers)
+
+    # 2. Dummy nodes
+    segments, layers = _insert_dummies(acyclic, layers)
+
+    down_neighbours = defaultdict(list)
+    up_neighbours = defaultdict(list)
+    for upper, lower in segments:
+        down_neighbours[upper].append(lower)
+        up_neighbours[lower].append(upper)
+
+    # Initial ordering: nodes in input order, dummies in creation order
+    n_layers = (max(layers.values()) + 1) if layers else 0
+    ordering = [[] for _ in range(n_layers)]
+    for nid in node_ids:
+        ordering[layers[nid]].append(nid)
+    for nid, layer in layers.items():
+        if isinstance(nid, tuple) and nid and nid[0] == '__dummy__':
+            ordering[layer].append(nid)
+
+    # 3. Crossing reduction
+    ordering, _crossings = _reduce_crossings(ordering, down_neighbours,
+                                             up_neighbours, sweeps)
+
+    # 4. Coordinates (dummies are dropped from the result)
+    positions = _assign_coordinates(ordering, up_neighbours,
+                                    layer_spacing, node_spacing)
+    return {nid: positions[nid] for nid in node_ids}
 
-    # Calcola score per ogni nodo (posizione media delle sue dipendenze)
-    node_scores = []
-
-    for node_id in layer_nodes:
-        if node_id in dependencies:
-            # Trova le dipendenze nel layer precedente
-            deps = dependencies[node_id]
-            prev_layer_deps = [d for d in deps if d in layers and layers[d] == current_layer - 1]
-
-            if prev_layer_deps:
-                # Score = indice medio delle dipendenze
-                avg_index = sum(layer_nodes.index(d) if d in layer_nodes else 0 for d in prev_layer_deps) / len(prev_layer_deps)
-                node_scores.append((node_id, avg_index))
-            else:
-                node_scores.append((node_id, len(layer_nodes)))  # Metti alla fine
-        else:
-            node_scores.append((node_id, len(layer_nodes)))  # Nodi senza dipendenze alla fine
 
-    # Ordina per score
-    node_scores.sort(key=lambda x: x[1])
+def calculate_hierarchical_layout(node_map, graph, filtered_node_ids):
+    """
+    Calcola un layout gerarchico per i nodi.
+
+    Args:
+        node_map: Dict {node_id: blender_node}
+        graph: s3dgraphy Graph object
+        filtered_node_ids: Set di node_id da considerare
+
+    Returns:
+        Dict {node_id: (x, y)} con le posizioni calcolate
+    """
+    from ..graph_index import get_or_create_graph_index
+
+    graph_id = getattr(graph, 'graph_id', None) or str(id(graph))
+    node_key = frozenset(filtered_node_ids)
+    cache_key = (graph_id, node_key, len(graph.edges))
+
+    cached = _layout_cache.get(cache_key)
+    if cached is not None:
+        _layout_cache.move_to_end(cache_key)
+        return dict(cached)
+
+    index = get_or_create_graph_index(graph)
+    edges = [(e.edge_source, e.edge_target) for e in index.get_induced_edges(node_key)]
+
+    # Stable input order keeps layouts reproducible between sessions
+    positions = compute_layered_layout(sorted(node_key), edges)
+
+    _layout_cache[cache_key] = positions
+    while len(_layout_cache) > _LAYOUT_CACHE_SIZE:
+        _layout_cache.popitem(last=False)
+
+    return dict(positions)
+
 
-    return [node_id for node_id, _ in node_scores]
+def clear_layout_cache():
+    """Drop every cached layout (e.g. after editing the graph)."""
+    _layout_cache.clear()
 
 
 def apply_layout_to_nodes(node_map, positions):
@@ -153,7 +374,7 @@ def apply_layout_to_nodes(node_map, positions):
         positions: Dict {node_id: (x, y)}
     """
     for node_id, (x, y) in positions.items():
-        if node_id in node_map:
-            bl_node = node_map[node_id]
+        bl_node = node_map.get(node_id)
+        if bl_node is not None:
             bl_node.location = (x, y)
-            print(f"   Positioned {bl_node.label[:20]}: ({x:.0f}, {y:.0f})")
+    print(f"   Positioned {len(positions)} nodes")
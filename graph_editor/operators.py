@@ -124,6 +124,10 @@ class GRAPHEDIT_OT_draw_graph(Operator):
 
         tree.graph_id = graph_id
         tree.graph_name = tree_name
+        # Disegno completo/filtrato: non più una focus view (altrimenti la
+        # sync la ricostruirebbe con refocus_if_virtual)
+        tree.is_focus_view = False
+        tree.expanded_clusters = ""
         
         # Filtra i nodi
         filtered_nodes = self.filter_nodes_optimized(graph, context)
@@ -136,9 +140,9 @@ class GRAPHEDIT_OT_draw_graph(Operator):
 
         # ✅ Validate edges before populating
         from .dynamic_nodes import validate_graph_edges
-        from .socket_generator import load_datamodels
+        from .socket_generator import get_datamodels
 
-        nodes_dm, connections_dm = load_datamodels()
+        nodes_dm, connections_dm = get_datamodels()
         if nodes_dm and connections_dm:
             validate_graph_edges(graph, connections_dm, nodes_dm)
 
@@ -509,72 +513,16 @@ class GRAPHEDIT_OT_draw_graph(Operator):
         return None
     
     def populate_tree(self, tree, graph, filtered_nodes, context):
-        """Popola il node tree con wrapper dei nodi s3dgraphy"""
-        from .dynamic_nodes import _NODE_TYPE_MAP
+        """Popola il node tree con wrapper dei nodi s3dgraphy (batched builder)"""
+        from .tree_builder import build_graph_tree
 
-        node_map = {}
-        edge_count = 0
-
-        filtered_node_ids = {node.node_id for node in filtered_nodes}
-
-        # ✅ Build dynamic node type map from registered classes
-        node_type_map = {}
-        for node_type, node_class in _NODE_TYPE_MAP.items():
-            bl_idname = node_class.bl_idname
-            node_type_map[node_type] = bl_idname
-
-        print(f"[GraphEditor] Creating {len(filtered_nodes)} nodes ({len(node_type_map)} types available)...")
-
-        for i, s3d_node in enumerate(filtered_nodes):
-            # ✅ Use dynamic mapping with fallback to generic node
-            node_type_id = node_type_map.get(s3d_node.node_type)
-
-            if not node_type_id:
-                print(f"Warning: Unknown node type '{s3d_node.node_type}' for node {s3d_node.name}, skipping")
-                continue
-
-            try:
-                bl_node = tree.nodes.new(node_type_id)
-                bl_node.node_id = s3d_node.node_id
-                bl_node.node_type = s3d_node.node_type
-                bl_node.original_name = s3d_node.name
-                bl_node.label = s3d_node.name[:30] if len(s3d_node.name) > 30 else s3d_node.name
-
-                # Set description if available
-                if hasattr(s3d_node, 'description') and s3d_node.description:
-                    bl_node.description = s3d_node.description
-
-                # Posizionamento temporaneo (verrà aggiornato dal layout algorithm)
-                bl_node.location = (0, 0)
-
-                # Colore
-                if hasattr(s3d_node, 'attributes') and 'fill_color' in s3d_node.attributes:
-                    fill_color_hex = s3d_node.attributes.get('fill_color')
-                    if fill_color_hex and isinstance(fill_color_hex, str):
-                        rgb = self.hex_to_rgb(fill_color_hex)
-                        if rgb:
-                            bl_node.custom_node_color = rgb
-                            bl_node.use_custom_node_color = True
-
-                node_map[s3d_node.node_id] = bl_node
-
-            except Exception as e:
-                print(f"Error: Error creating node {s3d_node.node_id}: {e}")
-
-        print(f"[GraphEditor] Created {len(node_map)} nodes")
-        for edge in graph.edges:
-            try:
-                if edge.edge_source in filtered_node_ids and edge.edge_target in filtered_node_ids:
-                    if edge.edge_source in node_map and edge.edge_target in node_map:
-                        if self.create_link(tree, node_map, edge.edge_source, edge.edge_target, edge.edge_type):
-                            edge_count += 1
-            except:
-                pass
-
-        print(f"[GraphEditor] Created {edge_count} edges")
-
-        self.hide_unused_sockets(node_map)
+        node_map, edge_count = build_graph_tree(
+            tree, graph, filtered_nodes,
+            color_resolver=self.hex_to_rgb,
+            fallback_link=self.create_link,
+        )
 
+        filtered_node_ids = set(node_map.keys())
         positions = calculate_hierarchical_layout(node_map, graph, filtered_node_ids)
         apply_layout_to_nodes(node_map, positions)
 
@@ -976,6 +924,11 @@ class GRAPHEDIT_OT_sync_selection(Operator):
             if graph_synced:
                 break
 
+        if not graph_synced:
+            # Focus view: move the region onto the node instead of giving up
+            graph_synced = self._refocus_virtual_trees(
+                context, find_node_id_from_proxy(obj, context))
+
         if not graph_synced:
             print(f"   Warning: Node '{human_name}' not found in Graph Viewer")
             print(f"      (may be filtered out or not loaded)")
@@ -1029,6 +982,23 @@ class GRAPHEDIT_OT_sync_selection(Operator):
 
         bpy.app.timers.register(zoom_callback, first_interval=0.05)
 
+    def _refocus_virtual_trees(self, context, node_id):
+        """Sposta le focus view aperte sul nodo (espandendo la regione su richiesta)"""
+        from .virtual_view import refocus_if_virtual
+
+        if not node_id:
+            return False
+        refocused = False
+        for window in context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'NODE_EDITOR':
+                    space = area.spaces[0]
+                    tree = space.node_tree
+                    if tree and refocus_if_virtual(tree, node_id):
+                        area.tag_redraw()
+                        refocused = True
+        return refocused
+
     def sync_graph_editor(self, context, node_id):
         """Seleziona nodo nel graph editor"""
         for area in context.screen.areas:
@@ -1037,6 +1007,10 @@ class GRAPHEDIT_OT_sync_selection(Operator):
                 
                 if space.tree_type == 'EMGraphNodeTreeType' and space.node_tree:
                     tree = space.node_tree
+
+                    # Focus view: porta il nodo nella regione se è riassunto
+                    from .virtual_view import refocus_if_virtual
+                    refocus_if_virtual(tree, node_id)
                     
                     for node in tree.nodes:
                         node.select = False
@@ -1145,6 +1119,8 @@ class GRAPHEDIT_OT_clear_editor(Operator):
                 tree.nodes.clear()
                 tree.node_count = 0
                 tree.edge_count = 0
+                tree.is_focus_view = False
+                tree.expanded_clusters = ""
                 self.report({'INFO'}, "Graph cleared")
                 return {'FINISHED'}
         
@@ -37,6 +37,11 @@ class EdgeTypeFilter(PropertyGroup):
     )
 
 
+def _update_focus_auto_expand(self, context):
+    from .virtual_view import update_focus_auto_expand
+    update_focus_auto_expand(self, context)
+
+
 class GraphEditorSettings(PropertyGroup):
     """Settings per Graph Viewer"""
     
@@ -71,6 +76,23 @@ class GraphEditorSettings(PropertyGroup):
         default=False
     )
     
+    # Focus view settings (large graphs)
+    focus_node_budget: IntProperty(
+        name="Node Budget",
+        description="Maximum number of nodes instantiated around the focused node; "
+                    "everything else is collapsed into summary nodes",
+        default=300,
+        min=20,
+        max=5000
+    )
+
+    focus_auto_expand: BoolProperty(
+        name="Expand on Pan",
+        description="Automatically expand the summary node you pan/zoom onto in a focus view",
+        default=False,
+        update=_update_focus_auto_expand
+    )
+
     # Node + Context settings
     show_stratigraphic_context: BoolProperty(
         name="Stratigraphic Context",
@@ -464,6 +464,13 @@ def initialize_socket_system():
     """
     global _NODES_DATAMODEL, _CONNECTIONS_DATAMODEL, _SOCKET_MAP, _TYPE_FAMILY_MAP
 
+    # Le tabelle del tree builder e delle regole edge derivano dai JSON:
+    # vanno ricostruite
+    from .tree_builder import clear_socket_tables
+    from .dynamic_nodes import clear_edge_rule_table
+    clear_socket_tables()
+    clear_edge_rule_table()
+
     # Carica i JSON
     _NODES_DATAMODEL, _CONNECTIONS_DATAMODEL = load_datamodels()
 
@@ -478,6 +485,13 @@ def initialize_socket_system():
     _SOCKET_MAP = build_socket_map(_CONNECTIONS_DATAMODEL, _TYPE_FAMILY_MAP)
 
 
+def get_datamodels() -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Ritorna (nodes_datamodel, connections_datamodel) già caricati (inizializza se necessario)"""
+    if _CONNECTIONS_DATAMODEL is None:
+        initialize_socket_system()
+    return _NODES_DATAMODEL, _CONNECTIONS_DATAMODEL
+
+
 def get_socket_map() -> Dict:
     """Ritorna la socket map globale (inizializza se necessario)"""
     global _SOCKET_MAP
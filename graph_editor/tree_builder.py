@@ -0,0 +1,303 @@
+"""
+Batched tree builder for Graph Viewer
+Builds the EMGraph node tree for a filtered subgraph in one pass.
+
+- Edges come from the induced subgraph via GraphEdgeIndex (no scan of
+  graph.edges)
+- Socket names are resolved once per (source type, target type, edge type)
+  from the socket map of socket_generator, not per link
+- Links are created without per-link limit verification and the set of
+  linked sockets is tracked while building, so unused sockets are hidden
+  without querying is_linked on every socket
+"""
+
+from typing import Dict, Optional, Tuple
+
+from .socket_generator import get_socket_map, get_type_family_map, get_node_type_family
+
+
+GENERIC_SOCKET = 'generic_connection'
+
+
+# ============================================================================
+# SOCKET LOOKUP TABLES
+# ============================================================================
+
+# edge_type -> (output_socket_name, input_socket_name)
+_EDGE_SOCKET_NAMES: Dict[str, Tuple[str, str]] = {}
+
+# node_type -> {'inputs': [names], 'outputs': [names]}
+_NODE_SOCKET_NAMES: Dict[str, Dict[str, list]] = {}
+
+# (source_type, target_type, edge_type) -> (output_name, input_name)
+_LINK_SOCKETS: Dict[Tuple[str, str, str], Tuple[Optional[str], Optional[str]]] = {}
+
+
+def clear_socket_tables():
+    """Drop the cached lookup tables (call after reloading the datamodels)."""
+    _EDGE_SOCKET_NAMES.clear()
+    _NODE_SOCKET_NAMES.clear()
+    _LINK_SOCKETS.clear()
+
+
+def get_edge_socket_names(edge_type: str) -> Tuple[str, str]:
+    """
+    Resolve the (output, input) socket names for an edge type.
+
+    v1.5.3 convention: outputs use the CANONICAL name, inputs the REVERSE
+    name; symmetric edges use the same name for both.
+    """
+    names = _EDGE_SOCKET_NAMES.get(edge_type)
+    if names is not None:
+        return names
+
+    output_name = input_name = edge_type
+    try:
+        from s3dgraphy.edges import get_connections_datamodel
+        dm = get_connections_datamodel()
+        if dm.edge_exists(edge_type) and not dm.is_symmetric(edge_type):
+            if dm.is_canonical(edge_type):
+                input_name = dm.get_reverse_name(edge_type) or edge_type
+            else:
+                edge_def = dm.get_edge_definition(edge_type)
+                output_name = (edge_def.get('canonical_name') if edge_def else None) or edge_type
+    except Exception as e:
+        print(f"[GraphEditor] Could not resolve sockets for '{edge_type}': {e}")
+
+    names = (output_name, input_name)
+    _EDGE_SOCKET_NAMES[edge_type] = names
+    return names
+
+
+def get_node_socket_names(node_type: str) -> Dict[str, list]:
+    """
+    Socket names a node of node_type is generated with.
+
+    Mirrors generate_sockets_for_node(): family sockets plus the sockets
+    specific to the node type.
+    """
+    names = _NODE_SOCKET_NAMES.get(node_type)
+    if names is not None:
+        return names
+
+    socket_map = get_socket_map()
+    family = get_node_type_family(node_type, get_type_family_map())
+
+    inputs, outputs = [], []
+    for key in (family, node_type):
+        entry = socket_map.get(key)
+        if not entry:
+            continue
+        for edge_name, _label in entry['inputs']:
+            if edge_name not in inputs:
+                inputs.append(edge_name)
+        for edge_name, _label in entry['outputs']:
+            if edge_name not in outputs:
+                outputs.append(edge_name)
+
+    names = {'inputs': inputs, 'outputs': outputs}
+    _NODE_SOCKET_NAMES[node_type] = names
+    return names
+
+
+def _match_socket_name(available, wanted):
+    """
+    Pick the socket for an edge among the available names.
+
+    Same priority as GRAPHEDIT_OT_draw_graph.create_link:
+    exact, case-insensitive, keywords, generic_connection.
+    """
+    if not available:
+        return None
+    if wanted in available:
+        return wanted
+
+    wanted_lower = wanted.lower() if wanted else 'connection'
+    for name in available:
+        if name.lower() == wanted_lower:
+            return name
+
+    keywords = wanted_lower.replace('_', ' ').split()
+    for name in available:
+        if all(kw in name.lower() for kw in keywords):
+            return name
+
+    if GENERIC_SOCKET in available:
+        return GENERIC_SOCKET
+    return None
+
+
+def resolve_link_sockets(source_type: str, target_type: str,
+                         edge_type: str) -> Tuple[Optional[str], Optional[str]]:
+    """Resolve (output_name, input_name) for a link, cached per type triple."""
+    key = (source_type, target_type, edge_type)
+    result = _LINK_SOCKETS.get(key)
+    if result is None:
+        output_name, input_name = get_edge_socket_names(edge_type)
+        result = (
+            _match_socket_name(get_node_socket_names(source_type)['outputs'], output_name),
+            _match_socket_name(get_node_socket_names(target_type)['inputs'], input_name),
+        )
+        _LINK_SOCKETS[key] = result
+    return result
+
+
+# ============================================================================
+# TREE CONSTRUCTION
+# ============================================================================
+
+def _new_link(links, source_socket, target_socket):
+    """links.new without per-link limit verification where supported."""
+    try:
+        return links.new(source_socket, target_socket, verify_limits=False)
+    except TypeError:
+        return links.new(source_socket, target_socket)
+
+
+def build_tree_nodes(tree, filtered_nodes, color_resolver=None):
+    """
+    Create one Blender node per s3dgraphy node.
+
+    Args:
+        tree: EMGraph node tree (already cleared)
+        filtered_nodes: s3dgraphy nodes to show
+        color_resolver: callable(hex_str) -> rgb or None
+
+    Returns:
+        Dict {node_id: blender_node}
+    """
+    from .dynamic_nodes import _NODE_TYPE_MAP
+
+    node_type_map = {node_type: node_class.bl_idname
+                     for node_type, node_class in _NODE_TYPE_MAP.items()}
+    color_cache = {}
+    node_map = {}
+    new_node = tree.nodes.new
+    skipped_types = set()
+
+    print(f"[GraphEditor] Creating {len(filtered_nodes)} nodes ({len(node_type_map)} types available)...")
+
+    for s3d_node in filtered_nodes:
+        bl_idname = node_type_map.get(s3d_node.node_type)
+        if not bl_idname:
+            skipped_types.add(s3d_node.node_type)
+            continue
+
+        try:
+            bl_node = new_node(bl_idname)
+            bl_node.node_id = s3d_node.node_id
+            bl_node.node_type = s3d_node.node_type
+            bl_node.original_name = s3d_node.name
+            bl_node.label = s3d_node.name[:30]
+
+            description = getattr(s3d_node, 'description', None)
+            if description:
+                bl_node.description = description
+
+            attributes = getattr(s3d_node, 'attributes', None)
+            fill_color_hex = attributes.get('fill_color') if attributes else None
+            if color_resolver and fill_color_hex and isinstance(fill_color_hex, str):
+                if fill_color_hex not in color_cache:
+                    color_cache[fill_color_hex] = color_resolver(fill_color_hex)
+                rgb = color_cache[fill_color_hex]
+                if rgb:
+                    bl_node.custom_node_color = rgb
+                    bl_node.use_custom_node_color = True
+
+            node_map[s3d_node.node_id] = bl_node
+
+        except Exception as e:
+            print(f"Error: Error creating node {s3d_node.node_id}: {e}")
+
+    if skipped_types:
+        print(f"Warning: Unknown node types skipped: {sorted(skipped_types)}")
+    print(f"[GraphEditor] Created {len(node_map)} nodes")
+    return node_map
+
+
+def build_tree_links(tree, graph, node_map, fallback_link=None):
+    """
+    Link the nodes of node_map using the induced subgraph's edges.
+
+    Args:
+        tree: EMGraph node tree
+        graph: s3dgraphy graph
+        node_map: Dict {node_id: blender_node}
+        fallback_link: callable(tree, node_map, source_id, target_id, edge_type)
+            used when the precomputed tables cannot resolve a socket
+
+    Returns:
+        Tuple (edge_count, linked_sockets) where linked_sockets is a set of
+        (node_id, is_output, socket_name)
+    """
+    from ..graph_index import get_or_create_graph_index
+
+    index = get_or_create_graph_index(graph)
+    edges = index.get_induced_edges(set(node_map.keys()))
+
+    links = tree.links
+    linked_sockets = set()
+    edge_count = 0
+
+    for edge in edges:
+        source_id, target_id = edge.edge_source, edge.edge_target
+        source_node = node_map[source_id]
+        target_node = node_map[target_id]
+
+        output_name, input_name = resolve_link_sockets(
+            source_node.node_type, target_node.node_type, edge.edge_type)
+        source_socket = source_node.outputs.get(output_name) if output_name else None
+        target_socket = target_node.inputs.get(input_name) if input_name else None
+
+        try:
+            if source_socket and target_socket:
+                _new_link(links, source_socket, target_socket)
+            elif fallback_link:
+                if not fallback_link(tree, node_map, source_id, target_id, edge.edge_type):
+                    continue
+                # Sockets picked by the fallback are unknown: keep all visible
+                linked_sockets.add((source_id, True, None))
+                linked_sockets.add((target_id, False, None))
+                edge_count += 1
+                continue
+            else:
+                continue
+        except Exception as e:
+            print(f"   Error: Failed to create link: {e}")
+            continue
+
+        linked_sockets.add((source_id, True, output_name))
+        linked_sockets.add((target_id, False, input_name))
+        edge_count += 1
+
+    print(f"[GraphEditor] Created {edge_count} edges")
+    return edge_count, linked_sockets
+
+
+def hide_unlinked_sockets(node_map, linked_sockets):
+    """Hide every socket that did not receive a link while building."""
+    for node_id, bl_node in node_map.items():
+        if (node_id, True, None) in linked_sockets or (node_id, False, None) in linked_sockets:
+            # Built through the fallback path: use the real link state
+            for socket in bl_node.inputs:
+                socket.hide = not socket.is_linked
+            for socket in bl_node.outputs:
+                socket.hide = not socket.is_linked
+            continue
+        for socket in bl_node.inputs:
+            socket.hide = (node_id, False, socket.name) not in linked_sockets
+        for socket in bl_node.outputs:
+            socket.hide = (node_id, True, socket.name) not in linked_sockets
+
+
+def build_graph_tree(tree, graph, filtered_nodes, color_resolver=None, fallback_link=None):
+    """
+    Build the whole view for filtered_nodes: nodes, links, socket visibility.
+
+    Returns:
+        Tuple (node_map, edge_count)
+    """
+    node_map = build_tree_nodes(tree, filtered_nodes, color_resolver)
+    edge_count, linked_sockets = build_tree_links(tree, graph, node_map, fallback_link)
+    hide_unlinked_sockets(node_map, linked_sockets)
+    return node_map, edge_count
@@ -109,6 +109,17 @@ class GRAPHEDIT_PT_main_panel(Panel):
         col.separator(factor=0.5)
         col.label(text="Shortcut: Shift+Alt+N", icon='KEYINGSET')
         
+        layout.separator()
+
+        # Focus View Section (large graphs)
+        focus_box = layout.box()
+        focus_box.label(text="Focus View (large graphs)", icon='ZOOM_SELECTED')
+
+        col = focus_box.column(align=True)
+        col.prop(settings, "focus_node_budget")
+        col.prop(settings, "focus_auto_expand")
+        col.operator("graphedit.draw_focus_view", icon='NODETREE', text="Focus on Selected")
+
         layout.separator()
         
         # Node + Context Section
@@ -0,0 +1,528 @@
+"""
+Focus (level-of-detail) view for Graph Viewer
+Instantiates Blender nodes only around a focused node, up to a budget.
+
+Everything outside the focus region is collapsed into summary nodes, one
+per cluster (epoch, activity, paradata group, or node type for the rest).
+A summary node is linked to the region nodes that have edges into its
+cluster. Summaries expand on demand: from the node's Expand button, when
+sync moves the focus to a node that is not displayed, or (optionally) when
+the user pans/zooms in onto a summary node.
+"""
+
+from collections import deque
+from functools import partial
+
+import bpy
+from bpy.types import Operator
+from bpy.props import StringProperty, IntProperty
+
+from .dynamic_nodes import EMGraphNodeBase
+from .layout import compute_layered_layout, apply_layout_to_nodes
+
+
+DEFAULT_NODE_BUDGET = 300
+
+# Edge types that define a cluster, by priority: the first one found on a
+# node decides which summary it collapses into
+CLUSTER_EDGE_TYPES = (
+    ('is_in_paradata_nodegroup', 'paradata', "Paradata group"),
+    ('is_in_activity', 'activity', "Activity"),
+    ('has_first_epoch', 'epoch', "Epoch"),
+)
+
+# Node types that are cluster anchors even without incoming cluster edges
+_ANCHOR_PREFIX = {
+    'EpochNode': 'epoch',
+}
+
+_CLUSTER_SEPARATOR = "|"
+_AUTO_EXPAND_INTERVAL = 0.5
+# Minimum view2d zoom (region pixels per view unit) for auto expand: the
+# user must be zoomed in on a cluster, not looking at the whole view
+_AUTO_EXPAND_MIN_ZOOM = 0.75
+
+# Last view rect seen by the auto-expand timer, per node editor area
+_last_view_rects = {}
+
+
+# ============================================================================
+# SUMMARY NODE
+# ============================================================================
+
+class EMGraphSummaryNode(EMGraphNodeBase):
+    """Collapsed cluster of nodes outside the focus region"""
+    bl_idname = 'EMGraphSummaryNodeType'
+    bl_label = 'Summary'
+    bl_icon = 'OUTLINER_COLLECTION'
+
+    cluster_key: StringProperty(name="Cluster")  # type: ignore
+    member_count: IntProperty(name="Members", default=0)  # type: ignore
+
+    def init(self, context):
+        for sockets in (self.inputs, self.outputs):
+            socket = sockets.new('EMGraphSocketType', 'generic_connection')
+            socket.edge_type = 'generic_connection'
+        self.use_custom_color = True
+        self.color = (0.25, 0.25, 0.3)
+
+    def draw_buttons(self, context, layout):
+        layout.label(text=f"{self.member_count} nodes", icon=self.bl_icon)
+        op = layout.operator("graphedit.expand_summary", text="Expand", icon='FULLSCREEN_ENTER')
+        op.cluster_key = self.cluster_key
+
+
+# ============================================================================
+# REGION SELECTION + CLUSTERING
+# ============================================================================
+
+def select_focus_region(index, center_id, budget):
+    """
+    Breadth-first region around center_id with at most budget nodes.
+
+    Returns:
+        List of node ids (center first, then by distance)
+    """
+    region = {center_id: None}
+    queue = deque([center_id])
+    while queue and len(region) < budget:
+        current = queue.popleft()
+        for neighbour in sorted(index.get_neighbour_ids(current)):
+            if neighbour in region:
+                continue
+            region[neighbour] = None
+            queue.append(neighbour)
+            if len(region) >= budget:
+                break
+    return list(region)
+
+
+def get_cluster_key(node, index):
+    """
+    Cluster a node collapses into when it is outside the focus region.
+
+    Returns:
+        Cluster key, e.g. 'epoch:<epoch id>' or 'type:<node type>'
+    """
+    node_type = getattr(node, 'node_type', 'unknown')
+
+    # Anchors (groups, epochs) collapse into their own cluster
+    for edge_type, prefix, _label in CLUSTER_EDGE_TYPES:
+        if index.get_edges(target_id=node.node_id, edge_type=edge_type):
+            return f"{prefix}:{node.node_id}"
+    prefix = _ANCHOR_PREFIX.get(node_type)
+    if prefix:
+        return f"{prefix}:{node.node_id}"
+
+    for edge_type, prefix, _label in CLUSTER_EDGE_TYPES:
+        edges = index.get_edges(source_id=node.node_id, edge_type=edge_type)
+        if edges:
+            return f"{prefix}:{edges[0].edge_target}"
+
+    return f"type:{node_type}"
+
+
+def get_cluster_label(key, nodes_by_id):
+    """Human readable label for a cluster key."""
+    prefix, _sep, ref = key.partition(":")
+    if prefix == 'type':
+        return f"{ref} (other)"
+    names = {p: label for _e, p, label in CLUSTER_EDGE_TYPES}
+    anchor = nodes_by_id.get(ref)
+    anchor_name = getattr(anchor, 'name', ref) if anchor else ref
+    return f"{names.get(prefix, prefix)}: {anchor_name}"
+
+
+def build_focus_view(graph, center_id, budget=DEFAULT_NODE_BUDGET, expanded=()):
+    """
+    Split the graph into a focus region and collapsed clusters.
+
+    Args:
+        graph: s3dgraphy graph
+        center_id: id of the focused node
+        budget: max number of region nodes around the center
+        expanded: cluster keys whose members are shown in full
+
+    Returns:
+        dict with:
+            'region': list of s3dgraphy nodes to instantiate
+            'clusters': {key: {'label': str, 'members': [node ids]}}
+            'summary_links': set of (region_id, cluster_key, outgoing)
+    """
+    from ..graph_index import get_or_create_graph_index
+
+    index = get_or_create_graph_index(graph)
+    nodes_by_id = {node.node_id: node for node in graph.nodes}
+
+    region_ids = select_focus_region(index, center_id, budget)
+    region_set = set(region_ids)
+
+    clusters = {}
+    expanded = set(expanded)
+    for node in graph.nodes:
+        if node.node_id in region_set:
+            continue
+        key = get_cluster_key(node, index)
+        if key in expanded:
+            region_ids.append(node.node_id)
+            region_set.add(node.node_id)
+            continue
+        cluster = clusters.get(key)
+        if cluster is None:
+            cluster = clusters[key] = {'label': get_cluster_label(key, nodes_by_id),
+                                       'members': []}
+        cluster['members'].append(node.node_id)
+
+    member_cluster = {member: key
+                      for key, cluster in clusters.items()
+                      for member in cluster['members']}
+
+    summary_links = set()
+    for node_id in region_ids:
+        for edge in index.get_incident_edges(node_id):
+            outgoing = edge.edge_source == node_id
+            other = edge.edge_target if outgoing else edge.edge_source
+            key = member_cluster.get(other)
+            if key is not None:
+                summary_links.add((node_id, key, outgoing))
+
+    return {
+        'region': [nodes_by_id[nid] for nid in region_ids if nid in nodes_by_id],
+        'clusters': clusters,
+        'summary_links': summary_links,
+    }
+
+
+# ============================================================================
+# TREE CONSTRUCTION
+# ============================================================================
+
+def get_expanded_clusters(tree):
+    return [k for k in tree.expanded_clusters.split(_CLUSTER_SEPARATOR) if k]
+
+
+def populate_focus_tree(tree, graph, center_id, budget, expanded=(),
+                        color_resolver=None, fallback_link=None):
+    """
+    Fill tree with the focus view of graph around center_id.
+
+    Returns:
+        Tuple (node_count, edge_count)
+    """
+    from .tree_builder import build_tree_nodes, build_tree_links, hide_unlinked_sockets
+
+    view = build_focus_view(graph, center_id, budget, expanded)
+
+    tree.nodes.clear()
+    node_map = build_tree_nodes(tree, view['region'], color_resolver)
+    edge_count, linked_sockets = build_tree_links(tree, graph, node_map, fallback_link)
+
+    summary_map = {}
+    for key, cluster in view['clusters'].items():
+        summary = tree.nodes.new(EMGraphSummaryNode.bl_idname)
+        summary.node_id = key
+        summary.node_type = 'summary'
+        summary.cluster_key = key
+        summary.member_count = len(cluster['members'])
+        summary.label = f"{cluster['label']} ({len(cluster['members'])})"[:40]
+        summary_map[key] = summary
+
+    layout_edges = []
+    for node_id, key, outgoing in view['summary_links']:
+        bl_node = node_map.get(node_id)
+        summary = summary_map.get(key)
+        if bl_node is None or summary is None:
+            continue
+        if outgoing:
+            source, source_id, target, target_id = bl_node, node_id, summary, key
+        else:
+            source, source_id, target, target_id = summary, key, bl_node, node_id
+        source_socket = source.outputs.get('generic_connection')
+        target_socket = target.inputs.get('generic_connection')
+        if not source_socket or not target_socket:
+            continue
+        tree.links.new(source_socket, target_socket)
+        linked_sockets.add((source_id, True, 'generic_connection'))
+        linked_sockets.add((target_id, False, 'generic_connection'))
+        layout_edges.append((source_id, target_id))
+        edge_count += 1
+
+    hide_unlinked_sockets(node_map, linked_sockets)
+
+    from ..graph_index import get_or_create_graph_index
+    index = get_or_create_graph_index(graph)
+    layout_edges.extend((e.edge_source, e.edge_target)
+                        for e in index.get_induced_edges(set(node_map)))
+    all_nodes = dict(node_map)
+    all_nodes.update(summary_map)
+    positions = compute_layered_layout(list(node_map) + sorted(summary_map), layout_edges)
+    apply_layout_to_nodes(all_nodes, positions)
+
+    tree.is_focus_view = True
+    tree.focus_node_id = center_id
+    tree.focus_budget = budget
+    tree.expanded_clusters = _CLUSTER_SEPARATOR.join(expanded)
+
+    print(f"[GraphEditor] Focus view on {center_id}: {len(node_map)} nodes, "
+          f"{len(summary_map)} summaries, {edge_count} links")
+    return len(node_map) + len(summary_map), edge_count
+
+
+def _rebuild_focus_tree(tree, center_id=None, expanded=None):
+    """Rebuild an existing focus view (new center and/or expanded clusters)."""
+    from s3dgraphy import get_graph
+
+    graph = get_graph(tree.graph_id) if tree.graph_id else None
+    if not graph:
+        return False
+
+    from .operators import GRAPHEDIT_OT_draw_graph
+
+    center_id = center_id or tree.focus_node_id
+    if expanded is None:
+        expanded = get_expanded_clusters(tree)
+    # Same node colours and socket fallback as the full graph draw
+    node_count, edge_count = populate_focus_tree(
+        tree, graph, center_id, tree.focus_budget or DEFAULT_NODE_BUDGET, expanded,
+        color_resolver=partial(GRAPHEDIT_OT_draw_graph.hex_to_rgb, None),
+        fallback_link=partial(GRAPHEDIT_OT_draw_graph.create_link, None))
+    tree.node_count = node_count
+    tree.edge_count = edge_count
+
+    for node in tree.nodes:
+        node.select = node.node_id == center_id
+        if node.select:
+            tree.nodes.active = node
+
+    _arm_auto_expand()
+    return True
+
+
+def refocus_if_virtual(tree, node_id):
+    """
+    Move a focus view onto node_id when the node is not displayed.
+
+    Returns:
+        True if the tree is a focus view and now shows node_id
+    """
+    if not getattr(tree, 'is_focus_view', False) or not node_id:
+        return False
+    if any(getattr(n, 'node_id', None) == node_id for n in tree.nodes):
+        return True
+    return _rebuild_focus_tree(tree, center_id=node_id, expanded=[])
+
+
+# ============================================================================
+# AUTO EXPAND ON PAN
+# ============================================================================
+
+def _has_summaries(tree):
+    return any(node.bl_idname == EMGraphSummaryNode.bl_idname for node in tree.nodes)
+
+
+def _view_rect(area):
+    """(x0, y0, x1, y1, zoom) of the editor view, or None."""
+    region = next((r for r in area.regions if r.type == 'WINDOW'), None)
+    if region is None or region.width <= 0:
+        return None
+    view2d = region.view2d
+    x0, y0 = view2d.region_to_view(0, 0)
+    x1, y1 = view2d.region_to_view(region.width, region.height)
+    if x1 == x0:
+        return None
+    zoom = region.width / abs(x1 - x0)
+    return (round(x0, 1), round(y0, 1), round(x1, 1), round(y1, 1), zoom)
+
+
+def _visible_summary(rect, tree):
+    """Summary node closest to the center of the editor view, if visible."""
+    x0, y0, x1, y1, zoom = rect
+    # Only expand when the user zoomed in enough to be looking at one cluster
+    if zoom < _AUTO_EXPAND_MIN_ZOOM:
+        return None
+    cx, cy = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+    radius = min(abs(x1 - x0), abs(y1 - y0)) / 2.0
+
+    best, best_dist = None, None
+    for node in tree.nodes:
+        if node.bl_idname != EMGraphSummaryNode.bl_idname:
+            continue
+        dist = ((node.location.x - cx) ** 2 + (node.location.y - cy) ** 2) ** 0.5
+        if dist <= radius and (best_dist is None or dist < best_dist):
+            best, best_dist = node, dist
+    return best
+
+
+def _auto_expand_tick():
+    """
+    Timer: expand the summary node the user panned/zoomed onto (one per
+    tick, only when the view moved since the previous tick). Stops when no
+    open focus view has summaries left; rebuilding a focus view re-arms it.
+    """
+    try:
+        scene = bpy.context.scene
+        settings = getattr(scene, 'graph_editor_settings', None)
+        if not settings or not settings.focus_auto_expand:
+            _last_view_rects.clear()
+            return None  # Stop; re-registered when the setting is enabled
+
+        watching = False
+        seen = set()
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type != 'NODE_EDITOR':
+                    continue
+                space = area.spaces[0]
+                tree = space.node_tree
+                if not tree or not getattr(tree, 'is_focus_view', False):
+                    continue
+                if not _has_summaries(tree):
+                    continue
+                rect = _view_rect(area)
+                if rect is None:
+                    continue
+
+                watching = True
+                area_key = area.as_pointer()
+                seen.add(area_key)
+                previous = _last_view_rects.get(area_key)
+                _last_view_rects[area_key] = rect
+                if previous is None or previous == rect:
+                    continue  # View did not move
+
+                summary = _visible_summary(rect, tree)
+                if summary is not None:
+                    expanded = get_expanded_clusters(tree) + [summary.cluster_key]
+                    _rebuild_focus_tree(tree, expanded=expanded)
+                    area.tag_redraw()
+                    return _AUTO_EXPAND_INTERVAL
+
+        for area_key in [k for k in _last_view_rects if k not in seen]:
+            del _last_view_rects[area_key]
+        if not watching:
+            return None  # Nothing left to expand
+    except Exception as e:
+        print(f"[GraphEditor] Focus auto-expand error: {e}")
+    return _AUTO_EXPAND_INTERVAL
+
+
+def _arm_auto_expand():
+    """Start the auto-expand timer if enabled and not running."""
+    try:
+        settings = getattr(bpy.context.scene, 'graph_editor_settings', None)
+    except AttributeError:
+        return
+    if (settings and settings.focus_auto_expand
+            and not bpy.app.timers.is_registered(_auto_expand_tick)):
+        bpy.app.timers.register(_auto_expand_tick, first_interval=_AUTO_EXPAND_INTERVAL)
+
+
+def update_focus_auto_expand(self, context):
+    """Update callback of GraphEditorSettings.focus_auto_expand."""
+    if self.focus_auto_expand and not bpy.app.timers.is_registered(_auto_expand_tick):
+        bpy.app.timers.register(_auto_expand_tick, first_interval=_AUTO_EXPAND_INTERVAL)
+
+
+# ============================================================================
+# OPERATORS
+# ============================================================================
+
+class GRAPHEDIT_OT_draw_focus_view(Operator):
+    """Draw only the region around the selected node, collapsing the rest into summary nodes"""
+    bl_idname = "graphedit.draw_focus_view"
+    bl_label = "Draw Focus View"
+    bl_description = ("Instantiate only the nodes around the selected node (up to the node "
+                      "budget); distant epochs, activities and paradata groups become summary nodes")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    node_id: StringProperty(
+        name="Node ID",
+        description="Node to focus on (default: current selection)",
+        default=""
+    )  # type: ignore
+
+    def execute(self, context):
+        from .utils import get_active_graph, get_active_graph_code
+        from .operators import GRAPHEDIT_OT_draw_graph
+
+        graph, graph_id = get_active_graph(context)
+        if not graph:
+            self.report({'ERROR'}, "No active graph found")
+            return {'CANCELLED'}
+
+        center_id = self.node_id or GRAPHEDIT_OT_draw_graph.get_selected_node_id(self, context)
+        if not center_id:
+            self.report({'WARNING'}, "No node selected. Select a node in Graph Viewer, 3D view, or UIList")
+            return {'CANCELLED'}
+
+        graph_code = get_active_graph_code(context)
+        tree_name = f"EMGraph_{graph_code}" if graph_code else graph_id
+        tree = bpy.data.node_groups.get(tree_name)
+        if tree is None:
+            tree = bpy.data.node_groups.new(tree_name, 'EMGraphNodeTreeType')
+        tree.graph_id = graph_id
+        tree.graph_name = tree_name
+
+        settings = context.scene.graph_editor_settings
+        tree.focus_budget = settings.focus_node_budget
+        if not _rebuild_focus_tree(tree, center_id=center_id, expanded=[]):
+            self.report({'ERROR'}, "Could not build focus view")
+            return {'CANCELLED'}
+
+        GRAPHEDIT_OT_draw_graph.open_graph_editor(self, context, tree)
+        self.report({'INFO'}, f"Focus view: {tree.node_count} nodes, {tree.edge_count} edges")
+        return {'FINISHED'}
+
+
+class GRAPHEDIT_OT_expand_summary(Operator):
+    """Expand a summary node of the focus view into its member nodes"""
+    bl_idname = "graphedit.expand_summary"
+    bl_label = "Expand Summary"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    cluster_key: StringProperty(name="Cluster")  # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        tree = getattr(context.space_data, 'node_tree', None)
+        return tree is not None and getattr(tree, 'is_focus_view', False)
+
+    def execute(self, context):
+        tree = context.space_data.node_tree
+        key = self.cluster_key
+        if not key and context.active_node is not None:
+            key = getattr(context.active_node, 'cluster_key', "")
+        if not key:
+            self.report({'WARNING'}, "No summary node selected")
+            return {'CANCELLED'}
+
+        expanded = get_expanded_clusters(tree)
+        if key not in expanded:
+            expanded.append(key)
+        if not _rebuild_focus_tree(tree, expanded=expanded):
+            self.report({'ERROR'}, "Could not rebuild focus view")
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+classes = (
+    EMGraphSummaryNode,
+    GRAPHEDIT_OT_draw_focus_view,
+    GRAPHEDIT_OT_expand_summary,
+)
+
+
+def register_virtual_view():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister_virtual_view():
+    if bpy.app.timers.is_registered(_auto_expand_tick):
+        bpy.app.timers.unregister(_auto_expand_tick)
+    _last_view_rects.clear()
+    for cls in reversed(classes):
+        try:
+            bpy.utils.unregister_class(cls)
+        except RuntimeError:
+            pass
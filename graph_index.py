@@ -21,15 +21,23 @@ Date: 2025-12-20
 
 from typing import Dict, List, Tuple, Optional, Set
 from collections import defaultdict
+from itertools import count
+
+
+# Every (re)build of an index gets a new generation: caches derived from
+# the graph structure compare it to know when they are stale
+_generation_counter = count(1)
 
 
 class GraphEdgeIndex:
     """
     Indexes graph edges for fast lookups.
 
-    Maintains two indices:
+    Maintains four indices:
     1. _index_by_source_type: (source_id, edge_type) -> [edges]
     2. _index_by_target_type: (target_id, edge_type) -> [edges]
+    3. _index_by_source: source_id -> [edges] (any type)
+    4. _index_by_target: target_id -> [edges] (any type)
 
     This allows O(1) lookup of edges by source/target and type.
     """
@@ -42,8 +50,11 @@ class GraphEdgeIndex:
             graph: s3dgraphy graph instance
         """
         self.graph = graph
+        self.generation = 0
         self._index_by_source_type: Dict[Tuple[str, str], List] = defaultdict(list)
         self._index_by_target_type: Dict[Tuple[str, str], List] = defaultdict(list)
+        self._index_by_source: Dict[str, List] = defaultdict(list)
+        self._index_by_target: Dict[str, List] = defaultdict(list)
         self._build_index()
 
     def _build_index(self):
@@ -63,8 +74,14 @@ class GraphEdgeIndex:
             key_target = (edge.edge_target, edge.edge_type)
             self._index_by_target_type[key_target].append(edge)
 
+            # Index by source/target only for subgraph extraction
+            self._index_by_source[edge.edge_source].append(edge)
+            self._index_by_target[edge.edge_target].append(edge)
+
             edge_count += 1
 
+        self.edge_count = edge_count
+        self.generation = next(_generation_counter)
 
     def get_edges(self, source_id: Optional[str] = None,
                   target_id: Optional[str] = None,
@@ -166,6 +183,49 @@ class GraphEdgeIndex:
 
         return nodes
 
+    def get_induced_edges(self, node_ids) -> List:
+        """
+        Get the edges of the subgraph induced by node_ids.
+
+        Args:
+            node_ids: Set of node IDs (any iterable; converted to a set)
+
+        Returns:
+            List of edges whose source AND target are in node_ids
+
+        Complexity: O(sum of out-degrees of node_ids), independent of the
+        total number of edges in the graph.
+        """
+        if not isinstance(node_ids, (set, frozenset)):
+            node_ids = set(node_ids)
+
+        induced = []
+        for source_id in node_ids:
+            for edge in self._index_by_source.get(source_id, ()):
+                if edge.edge_target in node_ids:
+                    induced.append(edge)
+        return induced
+
+    def get_incident_edges(self, node_id: str) -> List:
+        """
+        Get every edge leaving or entering node_id (any type).
+
+        Complexity: O(k) where k = degree of node_id
+        """
+        return (self._index_by_source.get(node_id, [])
+                + self._index_by_target.get(node_id, []))
+
+    def get_neighbour_ids(self, node_id: str) -> Set[str]:
+        """
+        Get the ids of nodes connected to node_id in either direction.
+
+        Complexity: O(k) where k = degree of node_id
+        """
+        neighbours = {e.edge_target for e in self._index_by_source.get(node_id, ())}
+        neighbours.update(e.edge_source for e in self._index_by_target.get(node_id, ()))
+        neighbours.discard(node_id)
+        return neighbours
+
     def get_edge_types_from_source(self, source_id: str) -> Set[str]:
         """
         Get all edge types originating from source_id.
@@ -195,6 +255,8 @@ class GraphEdgeIndex:
         """
         self._index_by_source_type.clear()
         self._index_by_target_type.clear()
+        self._index_by_source.clear()
+        self._index_by_target.clear()
         self._build_index()
 
 
@@ -223,7 +285,10 @@ def get_or_create_graph_index(graph) -> GraphEdgeIndex:
     # Use graph_id as cache key, fallback to object id
     graph_id = graph.graph_id if hasattr(graph, 'graph_id') else str(id(graph))
 
-    if graph_id not in _graph_index_cache:
+    index = _graph_index_cache.get(graph_id)
+    if index is None or index.graph is not graph or index.edge_count != len(graph.edges):
+        # Missing, or stale (graph replaced or edges added/removed without
+        # an explicit invalidate_graph_index call)
         _graph_index_cache[graph_id] = GraphEdgeIndex(graph)
 
     return _graph_index_cache[graph_id]
@@ -254,6 +319,29 @@ def invalidate_graph_index(graph):
         del _graph_index_cache[graph_id]
 
 
+def invalidate_graph_values(graph):
+    """
+    Drop the caches derived from node values after editing them in place.
+
+    The index (and its generation) only follows the graph structure; call
+    this when names, descriptions or property values change without nodes
+    or edges being added/removed (XLSX/EMdb overwrite, auxiliary imports,
+    merge apply, ...). Drops the paradata rows and the Visual Manager
+    property mappings of graph, and marks its precomputed chronology as
+    stale (dating values may have changed with the same node/edge counts).
+
+    Args:
+        graph: s3dgraphy graph instance
+    """
+    from .paradata_cache import invalidate_paradata_memos
+    from .visual_manager.property_mapping_cache import invalidate_property_mappings
+
+    invalidate_paradata_memos(graph)
+    invalidate_property_mappings(graph)
+    # populate_lists.ensure_chronology recalculates when the signature is unset
+    graph.chronology_signature = None
+
+
 def clear_all_graph_indices():
     """
     Clear all cached indices.
@@ -152,6 +152,11 @@ class EM_OT_import_3dgis_database(bpy.types.Operator):
                 graph = importer.parse()
                 importer.display_warnings()
 
+            # I valori delle proprietà possono essere cambiati in place
+            # (sovrascrittura): paradati e mappature del Visual Manager vanno ricalcolati
+            from ..graph_index import invalidate_graph_values
+            invalidate_graph_values(graph)
+
             # Filtra log troppo verbosi (es. nodi mancanti in grafo esistente)
             noisy_tokens = [
                 "not found in existing graph - SKIPPED",
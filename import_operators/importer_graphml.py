@@ -1,15 +1,132 @@
+import os
+import threading
+import traceback
+
 import bpy # type: ignore
-from s3dgraphy import get_graph
-from s3dgraphy import remove_graph
 from s3dgraphy.nodes.group_node import GroupNode
 
 from ..populate_lists import *
 from ..functions import *
 from ..functions import normalize_path, show_popup_message
-from s3dgraphy.multigraph.multigraph import load_graph_from_file
+from ..workers.em_graph_postprocess import (
+    parse_graphml_file, connect_paradata_groups, precompute_chronology)
+from s3dgraphy.multigraph.multigraph import multi_graph_manager
+
+
+def register_graph(graph, original_id, overwrite=True):
+    """
+    Register a graph parsed by parse_graphml_file (workers/
+    em_graph_postprocess.py) in the MultiGraphManager,
+    exactly as load_graph does: under its final id and, if parsing changed
+    it, under original_id (file-stem alias).
+
+    Returns:
+        str: the final graph id
+    """
+    graphs = multi_graph_manager.graphs
+    final_id = graph.graph_id
+    graphs[final_id] = graph
+    if final_id != original_id and (overwrite or original_id not in graphs):
+        graphs[original_id] = graph
+    return final_id
+
+
+def apply_graph_metadata(graphml, graph_id, graph_instance):
+    """Copy id, graph code and import warnings of a parsed graph to its GraphMLFileItem."""
+    graphml.name = graph_id
+    # Aggiorna anche il codice del grafo se disponibile
+    if 'graph_code' in graph_instance.attributes:
+        graphml.graph_code = graph_instance.attributes['graph_code']
+    elif hasattr(graphml, 'graph_code'):  # Assicuriamoci che la proprietà esista
+        graphml.graph_code = "site_id"  # Valore di fallback
+
+    # Propagate import warnings from s3dgraphy to Blender UI property
+    if hasattr(graph_instance, 'warnings') and graph_instance.warnings:
+        graphml.import_warnings = "\n".join(graph_instance.warnings)
+        print(f"\nWarning: {len(graph_instance.warnings)} import warning(s) detected:")
+        for w in graph_instance.warnings:
+            print(f"  - {w}")
+    else:
+        graphml.import_warnings = ""
+
+
+class GraphParseJob:
+    """
+    Background phase of a GraphML import: parse the file into an s3dgraphy
+    graph, link paradata groups and compute the chronology. Touches no bpy
+    data, so it runs in a worker thread while Blender stays responsive.
+
+    The graph is not registered here: finish_import registers it on the main
+    thread once the job succeeded, so until then (and after a cancel) the
+    MultiGraphManager and the lists keep the previous version.
+
+    Progress (0-40, the rest belongs to the main-thread phase), stage and
+    outcome are plain attributes read by the modal operator.
+    """
+
+    def __init__(self, graphml_file):
+        self.graphml_file = graphml_file
+        self.progress = 0
+        self.stage = "Queued"
+        self.graph = None
+        self.original_id = None
+        self.error = None
+        self.done = False
+        self.cancelled = False
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="EMGraphMLParse", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop at the next stage boundary (parsing itself cannot be interrupted)."""
+        self.cancelled = True
+
+    def _set_stage(self, progress, stage):
+        self.progress = progress
+        self.stage = stage
+
+    def run(self):
+        try:
+            # Step 1: Load graph from file (0-30%)
+            self._set_stage(0, "Parsing GraphML")
+            graph, self.original_id = parse_graphml_file(self.graphml_file)
+            print(f"Graph parsed with final ID: {graph.graph_id}")
+            if self.cancelled:
+                return
+
+            # Step 2: Connect paradata groups (30-35%)
+            self._set_stage(30, "Linking paradata groups")
+            connect_paradata_groups(graph)
+            if self.cancelled:
+                return
+
+            # Step 2b: Chronology (35-40%), reused by populate_blender_lists_from_graph
+            self._set_stage(35, "Computing chronology")
+            precompute_chronology(graph)
+            self._set_stage(40, "Updating lists")
+            self.graph = graph
+        except Exception as e:
+            traceback.print_exc()
+            self.error = str(e)
+        finally:
+            self.done = True
+
+
+# Only one background import at a time
+_active_parse_job = None
 
 
 class EM_import_GraphML(bpy.types.Operator):
+    """
+    Import/reload a GraphML file.
+
+    invoke() (UI button, Shift+F5) is modal: the graph is parsed and
+    post-processed by a GraphParseJob in a worker thread, with live progress
+    and ESC to cancel; only the RNA phase (lists, materials) runs on the main
+    thread. execute() (scripts, bpy.ops calls) does both phases in one go.
+    """
     bl_idname = "import.em_graphml"
     bl_label = "Import EM (GraphML)"
     bl_description = "(SHIFT+F5) Load/reload this EM from disk and set it active"
@@ -18,208 +135,293 @@ class EM_import_GraphML(bpy.types.Operator):
     # Aggiungiamo una proprietà per passare l'indice del file GraphML selezionato
     graphml_index: bpy.props.IntProperty() # type: ignore
 
+    _timer = None
+    _job = None
+
+    def resolve_paths(self, context):
+        """(graphml, graphml_file, dosco_dir) or None after reporting the error."""
+        em_tools = context.scene.em_tools
+
+        if not (self.graphml_index >= 0 and em_tools.graphml_files[self.graphml_index]):
+            return None
+
+        # Ottieni il file GraphML selezionato
+        graphml = em_tools.graphml_files[self.graphml_index]
+
+        # Verifica che il campo path sia valorizzato
+        if not graphml.graphml_path:
+            error_msg = "GraphML path is not specified."
+            self.report({'ERROR'}, error_msg)
+            show_popup_message(context, "Path Error", error_msg, 'ERROR')
+            return None
+
+        print(f"Il file GraphML da caricare è {graphml.graphml_path}")
+        # Usa normalize_path invece di bpy.path.abspath
+        graphml_file = normalize_path(graphml.graphml_path)
+
+        # Verifica che il file esista
+        if not os.path.exists(graphml_file):
+            error_msg = f"GraphML file not found: {graphml_file}"
+            self.report({'ERROR'}, error_msg)
+            show_popup_message(context, "File Error", error_msg, 'ERROR')
+            return None
+
+        # Recupera gli altri percorsi (DosCo) e normalizzali
+        dosco_dir = normalize_path(graphml.dosco_dir) if graphml.dosco_dir else ""
+        return graphml, graphml_file, dosco_dir
+
     def execute(self, context):
-        # Setup scene variable
+        paths = self.resolve_paths(context)
+        if paths is None:
+            return {'CANCELLED'} if self.graphml_index >= 0 else {'FINISHED'}
+        graphml, graphml_file, dosco_dir = paths
+
+        # Clear Blender Lists
+        clear_lists(context)
+
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+
+        # Background phase, run inline
+        job = GraphParseJob(graphml_file)
+        job.run()
+        wm.progress_update(job.progress)
+
+        return self.finish_import(context, job, graphml, dosco_dir)
+
+    # ------------------------------------------------------------------
+    # Modal (non-blocking) import
+    # ------------------------------------------------------------------
+
+    def invoke(self, context, event):
+        global _active_parse_job
+
+        if _active_parse_job is not None and not _active_parse_job.done:
+            self.report({'WARNING'}, "A GraphML import is already running")
+            return {'CANCELLED'}
+
+        paths = self.resolve_paths(context)
+        if paths is None:
+            return {'CANCELLED'} if self.graphml_index >= 0 else {'FINISHED'}
+        self._graphml_name = paths[0].name
+        self._dosco_dir = paths[2]
+
+        self._job = GraphParseJob(paths[1])
+        _active_parse_job = self._job
+        self._job.start()
+
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        self._set_status(context, f"Importing {self._graphml_name}: parsing... (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        job = self._job
+
+        if event.type == 'ESC' and event.value == 'PRESS' and not job.cancelled:
+            print("[GraphML Import] Cancelling...")
+            job.cancel()
+            self._set_status(context, f"Cancelling import of {self._graphml_name}...")
+            return {'RUNNING_MODAL'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        context.window_manager.progress_update(job.progress)
+        if not job.done:
+            if not job.cancelled:
+                self._set_status(
+                    context,
+                    f"Importing {self._graphml_name}: {job.stage}... {job.progress}% (Esc to cancel)"
+                )
+            return {'RUNNING_MODAL'}
+
+        self._remove_timer(context)
+
+        if job.cancelled:
+            # Nothing was registered: dropping the parsed graph leaves the
+            # previous graph and the lists as they were
+            job.graph = None
+            context.window_manager.progress_end()
+            self._set_status(context, None)
+            self.report({'WARNING'}, "GraphML import cancelled")
+            return {'CANCELLED'}
+
+        self._set_status(context, f"Importing {self._graphml_name}: updating lists...")
+
+        # Main-thread (RNA) phase
+        em_tools = context.scene.em_tools
+        if not (0 <= self.graphml_index < len(em_tools.graphml_files)):
+            context.window_manager.progress_end()
+            self._set_status(context, None)
+            self.report({'ERROR'}, "GraphML entry removed during import")
+            return {'CANCELLED'}
+
+        clear_lists(context)
+        result = self.finish_import(context, job, em_tools.graphml_files[self.graphml_index], self._dosco_dir)
+        self._set_status(context, None)
+        return result
+
+    def cancel(self, context):
+        # Blender is closing the operator (e.g. file load): stop the job
+        if self._job is not None:
+            self._job.cancel()
+        self._remove_timer(context)
+        context.window_manager.progress_end()
+        self._set_status(context, None)
+
+    def _remove_timer(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+
+    @staticmethod
+    def _set_status(context, text):
+        try:
+            context.workspace.status_text_set(text)
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Main-thread phase (RNA, lists, materials)
+    # ------------------------------------------------------------------
+
+    def finish_import(self, context, job, graphml, dosco_dir):
+        """Populate Blender data from the graph parsed by job (progress 40-100)."""
         scene = context.scene
         em_tools = scene.em_tools
+        wm = context.window_manager
 
-        if self.graphml_index >= 0 and em_tools.graphml_files[self.graphml_index]:
-            # Ottieni il file GraphML selezionato
-            graphml = em_tools.graphml_files[self.graphml_index]
-
-            # Verifica che il campo path sia valorizzato
-            if not graphml.graphml_path:
-                error_msg = "GraphML path is not specified."
-                self.report({'ERROR'}, error_msg)
-                show_popup_message(context, "Path Error", error_msg, 'ERROR')
-                return {'CANCELLED'}
+        try:
+            if job.error:
+                raise RuntimeError(job.error)
 
-            print(f"Il file GraphML da caricare è {graphml.graphml_path}")
-            # Usa normalize_path invece di bpy.path.abspath
-            graphml_file = normalize_path(graphml.graphml_path)
-            
-            # Verifica che il file esista
-            if not os.path.exists(graphml_file):
-                error_msg = f"GraphML file not found: {graphml_file}"
+            if job.graph is None:
+                error_msg = f"Grafo non trovato: {job.graphml_file}"
+                wm.progress_end()
                 self.report({'ERROR'}, error_msg)
-                show_popup_message(context, "File Error", error_msg, 'ERROR')
+                show_popup_message(context, "Graph Error", error_msg, 'ERROR')
                 return {'CANCELLED'}
 
-            # Recupera gli altri percorsi (DosCo, XLSX, EMdb) e normalizzali
-            dosco_dir = normalize_path(graphml.dosco_dir) if graphml.dosco_dir else ""
-            xlsx_filepath = normalize_path(graphml.xlsx_filepath) if graphml.xlsx_filepath else ""
-            emdb_filepath = normalize_path(graphml.emdb_filepath) if graphml.emdb_filepath else ""
-
-            # Clear Blender Lists
-            clear_lists(context)
-            
+            # Registra il grafo (id finale + alias del nome file), sostituendo la versione precedente
+            graph_instance = job.graph
+            final_graph_id = register_graph(graph_instance, job.original_id)
+            wm.progress_update(40)
+
+            # Aggiorna UI e continua con il popolamento
+            apply_graph_metadata(graphml, final_graph_id, graph_instance)
+
+            print(f"Aggiornato ID nell'interfaccia a: {graphml.name}")
+            # Imposta esplicitamente gli indici a 0 prima di popolare
+            strat = scene.em_tools.stratigraphy  # ✅ Nuovo
+            strat.units_index = 0  # ✅ Nuovo path
+
+            em_tools.epochs.list_index = 0
+
+
+
+            if hasattr(scene, "em_sources_list_index"):
+                scene.em_tools.em_sources_list_index = 0
+            if hasattr(scene, "em_properties_list_index"):
+                scene.em_tools.em_properties_list_index = 0
+            if hasattr(scene, "em_extractors_list_index"):
+                scene.em_tools.em_extractors_list_index = 0
+            if hasattr(scene, "em_combiners_list_index"):
+                scene.em_tools.em_combiners_list_index = 0
+
+
+            # Step 3: Integrate external data (40-50%)
+            # Integrazione di dati esterni PRIMA di popolare le liste
+            em_settings = bpy.context.window_manager.em_addon_settings
+            if em_settings.overwrite_url_with_dosco_filepath:
+                inspect_load_dosco_files_on_graph(graph_instance, dosco_dir)  # ← Nuova funzione
+            wm.progress_update(50)
+
+            # Step 4: Auto-import auxiliary files (50-70%)
+            # ✅ IMPORTANTE: Auto-import dei file ausiliari PRIMA di popolare le liste
+            # In questo modo il grafo viene completamente popolato (incluso DosCo)
+            # e poi le liste vengono popolate una volta sola con tutti i dati
+            from ..em_setup import auto_import_auxiliary_files
+            imported, errors = auto_import_auxiliary_files(context, self.graphml_index)
+            wm.progress_update(70)
+
+            # Step 5: Populate Blender lists (70-85%)
+            # ✅ ORA procedi con il popolamento delle liste (grafo completamente popolato)
+            if getattr(scene, 'landscape_mode_active', False):
+                from ..landscape_system.populate_functions import populate_lists_landscape_mode
+                populate_lists_landscape_mode(context)
+            else:
+                populate_blender_lists_from_graph(context, graph_instance)
+            wm.progress_update(85)
+
+            # Step 6: Update graph statistics (85-90%)
+            # ✅ Aggiorna le statistiche del grafo (conteggi nodi per UI)
+            from ..populate_lists import update_graph_statistics
+            update_graph_statistics(context, graph_instance, graphml)
+            wm.progress_update(90)
+
+            # ✅ Usa nuovi paths centralizzati
+            strat = scene.em_tools.stratigraphy
+            ensure_valid_index(strat.units, "units_index", context, data_object=strat)
+            ensure_valid_index(em_tools.epochs.list, "list_index", context, show_popup=False, data_object=em_tools.epochs)
+            ensure_valid_index(scene.em_tools.em_sources_list, "em_sources_list_index", context, data_object=em_tools)
+            ensure_valid_index(scene.em_tools.em_properties_list, "em_properties_list_index", context, data_object=em_tools)
+            ensure_valid_index(scene.em_tools.em_extractors_list, "em_extractors_list_index", context, data_object=em_tools)
+            ensure_valid_index(scene.em_tools.em_combiners_list, "em_combiners_list_index", context, data_object=em_tools)
+
+            # verifica post importazione
+            self.check_index_coherence(scene)
+
+            #per aggiornare i nomi delle proprietà usando come prefisso in nome del nodo padre
+            #self.newnames_forproperties_from_fathernodes(scene)
+            # ho disabilitato questa funzione perchè non mi sembra utile. Se serve, si può riabilitare
+
+            # Step 7: Create derived lists (90-95%)
+            #crea liste derivate per lo streaming dei paradati
+            # ✅ Usa nuovo path
+            if strat.units_index >= 0 and strat.units_index < len(strat.units):
+                create_derived_lists(strat.units[strat.units_index])
+            wm.progress_update(95)
+
+            # Step 8: Material setup and final operations (95-100%)
+            #setup dei materiali di scena dopo l'importazione del graphml
+            self.post_import_material_setup(context)
+
+            bpy.ops.epoch_manager.update_us_list
+
+            bpy.ops.activity.refresh_list(graphml_index=self.graphml_index)
+
+            # Sync Document Manager list from em_sources_list
             try:
-                # ✅ OPTIMIZATION: Add progress bar for better UX during long operations
-                wm = context.window_manager
-                wm.progress_begin(0, 100)
-
-                # Step 1: Load graph from file (0-30%)
-                wm.progress_update(0)
-                final_graph_id = load_graph_from_file(graphml_file, overwrite=True)
-                print(f"Graph loaded with final ID: {final_graph_id}")
-                wm.progress_update(30)
-
-                # Ottieni l'istanza del grafo
-                graph_instance = get_graph(final_graph_id)
-
-                if graph_instance:
-
-                    # Step 2: Connect paradata groups (30-40%)
-                    # Nuova funzionalità per collegare PropertyNode dai ParadataNodeGroup
-                    # Questa chiamata crea collegamenti diretti tra unità stratigrafiche e PropertyNode
-                    # quando sono collegati attraverso un ParadataNodeGroup
-                    print("\nApplicazione della funzionalità di collegamento PropertyNode da ParadataNodeGroup...")
-                    try:
-                        stats = graph_instance.connect_paradatagroup_propertynode_to_stratigraphic(verbose=False)
-                        if stats["connections_created"] > 0:
-                            print(f"Creati {stats['connections_created']} nuovi collegamenti diretti tra unità stratigrafiche e PropertyNode")
-                        else:
-                            print("Nessun nuovo collegamento creato")
-                    except Exception as e:
-                        print(f"AVVISO: Errore durante il collegamento PropertyNode: {str(e)}")
-                        # Non interrompiamo l'esecuzione per questo errore
-                    wm.progress_update(40)
-
-                    # Aggiorna UI e continua con il popolamento
-                    graphml.name = final_graph_id
-                    # Aggiorna anche il codice del grafo se disponibile
-                    if 'graph_code' in graph_instance.attributes:
-                        graphml.graph_code = graph_instance.attributes['graph_code']
-                    elif hasattr(graphml, 'graph_code'):  # Assicuriamoci che la proprietà esista
-                        graphml.graph_code = "site_id"  # Valore di fallback
-
-                    # Propagate import warnings from s3dgraphy to Blender UI property
-                    if hasattr(graph_instance, 'warnings') and graph_instance.warnings:
-                        graphml.import_warnings = "\n".join(graph_instance.warnings)
-                        print(f"\nWarning: {len(graph_instance.warnings)} import warning(s) detected:")
-                        for w in graph_instance.warnings:
-                            print(f"  - {w}")
-                    else:
-                        graphml.import_warnings = ""
-                else: 
-                    error_msg = f"Grafo non trovato con ID: {final_graph_id}"
-                    self.report({'ERROR'}, error_msg)
-                    show_popup_message(context, "Graph Error", error_msg, 'ERROR')
-                    return {'CANCELLED'}
-                                
-                
-                
-                print(f"Aggiornato ID nell'interfaccia a: {graphml.name}")
-                # Imposta esplicitamente gli indici a 0 prima di popolare
-                strat = scene.em_tools.stratigraphy  # ✅ Nuovo
-                strat.units_index = 0  # ✅ Nuovo path
-
-                em_tools.epochs.list_index = 0
-                
-                
-                
-                if hasattr(scene, "em_sources_list_index"):
-                    scene.em_tools.em_sources_list_index = 0
-                if hasattr(scene, "em_properties_list_index"):
-                    scene.em_tools.em_properties_list_index = 0
-                if hasattr(scene, "em_extractors_list_index"):
-                    scene.em_tools.em_extractors_list_index = 0
-                if hasattr(scene, "em_combiners_list_index"):
-                    scene.em_tools.em_combiners_list_index = 0
-
-
-                # Step 3: Integrate external data (40-50%)
-                # Integrazione di dati esterni PRIMA di popolare le liste
-                em_settings = bpy.context.window_manager.em_addon_settings
-                if em_settings.overwrite_url_with_dosco_filepath:
-                    inspect_load_dosco_files_on_graph(graph_instance, dosco_dir)  # ← Nuova funzione
-                wm.progress_update(50)
-
-                # Step 4: Auto-import auxiliary files (50-70%)
-                # ✅ IMPORTANTE: Auto-import dei file ausiliari PRIMA di popolare le liste
-                # In questo modo il grafo viene completamente popolato (incluso DosCo)
-                # e poi le liste vengono popolate una volta sola con tutti i dati
-                from ..em_setup import auto_import_auxiliary_files
-                imported, errors = auto_import_auxiliary_files(context, self.graphml_index)
-                wm.progress_update(70)
-
-                # Step 5: Populate Blender lists (70-85%)
-                # ✅ ORA procedi con il popolamento delle liste (grafo completamente popolato)
-                if getattr(scene, 'landscape_mode_active', False):
-                    from ..landscape_system.populate_functions import populate_lists_landscape_mode
-                    populate_lists_landscape_mode(context)
-                else:
-                    populate_blender_lists_from_graph(context, graph_instance)
-                wm.progress_update(85)
-
-                # Step 6: Update graph statistics (85-90%)
-                # ✅ Aggiorna le statistiche del grafo (conteggi nodi per UI)
-                from ..populate_lists import update_graph_statistics
-                update_graph_statistics(context, graph_instance, graphml)
-                wm.progress_update(90)
-
-                # ✅ Usa nuovi paths centralizzati
-                strat = scene.em_tools.stratigraphy
-                ensure_valid_index(strat.units, "units_index", context, data_object=strat)
-                ensure_valid_index(em_tools.epochs.list, "list_index", context, show_popup=False, data_object=em_tools.epochs)
-                ensure_valid_index(scene.em_tools.em_sources_list, "em_sources_list_index", context, data_object=em_tools)
-                ensure_valid_index(scene.em_tools.em_properties_list, "em_properties_list_index", context, data_object=em_tools)
-                ensure_valid_index(scene.em_tools.em_extractors_list, "em_extractors_list_index", context, data_object=em_tools)
-                ensure_valid_index(scene.em_tools.em_combiners_list, "em_combiners_list_index", context, data_object=em_tools)
-
-                # verifica post importazione
-                self.check_index_coherence(scene)
-
-                #per aggiornare i nomi delle proprietà usando come prefisso in nome del nodo padre
-                #self.newnames_forproperties_from_fathernodes(scene)
-                # ho disabilitato questa funzione perchè non mi sembra utile. Se serve, si può riabilitare
-
-                # Step 7: Create derived lists (90-95%)
-                #crea liste derivate per lo streaming dei paradati
-                # ✅ Usa nuovo path
-                if strat.units_index >= 0 and strat.units_index < len(strat.units):
-                    create_derived_lists(strat.units[strat.units_index])
-                wm.progress_update(95)
-
-                # Step 8: Material setup and final operations (95-100%)
-                #setup dei materiali di scena dopo l'importazione del graphml
-                self.post_import_material_setup(context)
-
-                bpy.ops.epoch_manager.update_us_list
-
-                bpy.ops.activity.refresh_list(graphml_index=self.graphml_index)
-
-                # Sync Document Manager list from em_sources_list
-                try:
-                    from ..document_manager.data import sync_doc_list
-                    sync_doc_list(scene)
-                except Exception as e:
-                    print(f"[GraphML Import] doc_list sync: {e}")
-
-                wm.progress_update(100)
+                from ..document_manager.data import sync_doc_list
+                sync_doc_list(scene)
+            except Exception as e:
+                print(f"[GraphML Import] doc_list sync: {e}")
 
-                # ✅ End progress bar
-                wm.progress_end()
+            wm.progress_update(100)
 
-                if imported > 0:
-                    self.report({'INFO'}, f"GraphML loaded + {imported} auxiliary file(s) auto-imported")
-                elif errors > 0:
-                    self.report({'WARNING'}, f"GraphML loaded but {errors} auxiliary import(s) failed")
+            # ✅ End progress bar
+            wm.progress_end()
 
+            if imported > 0:
+                self.report({'INFO'}, f"GraphML loaded + {imported} auxiliary file(s) auto-imported")
+            elif errors > 0:
+                self.report({'WARNING'}, f"GraphML loaded but {errors} auxiliary import(s) failed")
 
-            except Exception as e:
-                # ✅ Ensure progress bar is closed on error
-                wm = context.window_manager
-                wm.progress_end()
+        except Exception as e:
+            # ✅ Ensure progress bar is closed on error
+            wm.progress_end()
 
-                error_msg = f"Error loading graph: {e}"
-                print(error_msg)
-                self.report({'ERROR'}, str(e))
-                show_popup_message(context, "Graph Loading Error", str(e), 'ERROR')
-                return {'CANCELLED'}
+            error_msg = f"Error loading graph: {e}"
+            print(error_msg)
+            self.report({'ERROR'}, str(e))
+            show_popup_message(context, "Graph Loading Error", str(e), 'ERROR')
+            return {'CANCELLED'}
 
         return {'FINISHED'}
-            
+
     def print_groups_and_contents(self, graph):
         """
         Stampa tutti i gruppi nel grafo e i nodi contenuti in essi,
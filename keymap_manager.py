@@ -126,10 +126,11 @@ class EMToolsReloadActiveGraphML(bpy.types.Operator):
             
             # Chiama l'operatore di import esistente
             # Uso getattr perché 'import' è una parola riservata Python
+            # INVOKE_DEFAULT: import modale (parsing in background, Esc annulla)
             import_op = getattr(bpy.ops, 'import')
-            import_op.em_graphml(graphml_index=em_tools.active_file_index)
+            import_op.em_graphml('INVOKE_DEFAULT', graphml_index=em_tools.active_file_index)
             
-            self.report({'INFO'}, f"Reloaded: {active_file.name}")
+            self.report({'INFO'}, f"Reloading: {active_file.name}")
             return {'FINISHED'}
             
         except Exception as e:
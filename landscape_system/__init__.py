@@ -8,6 +8,8 @@ import bpy
 from bpy.types import Operator, Menu
 from bpy.props import BoolProperty, StringProperty
 
+from .bulk_loader import EM_OT_LoadAllGraphML
+
 # ============================================================================
 # MENU INFORMATIVO
 # ============================================================================
@@ -144,6 +146,7 @@ def register():
     classes = [
         EM_MT_LandscapeInfo,
         EM_OT_ToggleLandscapeMode,
+        EM_OT_LoadAllGraphML,
     ]
 
     for cls in classes:
@@ -156,6 +159,7 @@ def unregister():
     """Disregistra il sistema Landscape"""
     # 1. Disregistra operatori e menu
     classes = [
+        EM_OT_LoadAllGraphML,
         EM_OT_ToggleLandscapeMode,
         EM_MT_LandscapeInfo,
     ]
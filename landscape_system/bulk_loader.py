@@ -0,0 +1,306 @@
+# landscape_system/bulk_loader.py
+"""
+Caricamento in blocco di tutti i GraphML del progetto (Multigraph/Landscape)
+
+Invece di importare un grafo dopo l'altro, tutti i file sono analizzati in
+parallelo in un pool di processi (workers/em_graphml_worker.py: parsing,
+collegamento dei ParadataNodeGroup, cronologia). Il thread principale
+registra i grafi ricevuti, aggiorna i GraphMLFileItem e popola le liste una
+volta sola, con un passaggio per grafo (populate_lists_landscape_mode).
+
+Performance Impact:
+- Before: N grafi = N import completi in sequenza (N × parsing + N ×
+  popolamento liste)
+- After: parsing in parallelo (tempo ≈ grafo più lento), liste popolate una
+  volta
+
+Usage:
+    bpy.ops.em.load_all_graphml('INVOKE_DEFAULT')
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from bpy.types import Operator
+
+from ..worker_processes import import_worker_module, detached_main
+
+
+POLL_INTERVAL = 0.1
+
+
+def get_parse_worker_count(job_count: int) -> int:
+    cpu_count = os.cpu_count() or 2
+    return max(1, min(job_count, cpu_count - 1, 8))
+
+
+class GraphMLBulkLoad:
+    """
+    Parsing parallelo di più GraphML.
+
+    start() sottomette tutti i job; poll() raccoglie i risultati completati
+    (da chiamare dal thread principale). Se i processi worker non possono
+    partire, i job rimasti sono ripetuti in un pool di thread.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.results = {}
+        self.cancelled = False
+        self.started_at = 0.0
+        self._executor = None
+        self._in_flight = {}
+        self._worker = None
+
+    @property
+    def total(self) -> int:
+        return len(self.jobs)
+
+    @property
+    def completed(self) -> int:
+        return len(self.results)
+
+    def _submit(self, jobs):
+        with detached_main():
+            for job in jobs:
+                self._in_flight[self._executor.submit(self._worker.parse_graphml, job)] = job
+
+    def start(self):
+        self._worker = import_worker_module("em_graphml_worker")
+        workers = get_parse_worker_count(len(self.jobs))
+        try:
+            import multiprocessing
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'))
+        except Exception as e:
+            print(f"[Landscape] Process pool unavailable ({e}), using threads")
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+
+        self.started_at = time.time()
+        print(f"[Landscape] Parsing {len(self.jobs)} GraphML files with {workers} workers")
+        self._submit(self.jobs)
+
+    def _fallback_to_threads(self, error):
+        print(f"[Landscape] Process pool failed ({error}), parsing in threads")
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        retry = list(self._in_flight.values())
+        self._in_flight.clear()
+        self._executor = ThreadPoolExecutor(max_workers=get_parse_worker_count(len(retry)))
+        return retry
+
+    def poll(self) -> bool:
+        """Raccoglie i job finiti. Ritorna True quando tutti sono conclusi."""
+        retry = []
+        for future in [f for f in self._in_flight if f.done()]:
+            job = self._in_flight.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                retry = self._fallback_to_threads(e) + [job]
+                break
+            except Exception as e:
+                # Never parse inline here (poll runs in the modal timer):
+                # the job is reported as failed
+                print(f"[Landscape] Worker failed for {job['path']}: {e}")
+                result = {'index': job['index'], 'path': job['path'], 'graph_id': None,
+                          'original_id': None, 'graph': None, 'error': str(e), 'seconds': 0.0}
+            self.results[job['index']] = result
+
+        if retry and not self.cancelled:
+            self._submit(retry)
+
+        return self.cancelled or not self._in_flight
+
+    def cancel(self):
+        self.cancelled = True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._in_flight.clear()
+
+
+def register_parsed_graph(result):
+    """
+    Registra nel MultiGraphManager un grafo analizzato in un altro processo,
+    come MultiGraphManager.load_graph (id finale + alias del nome file).
+
+    Returns:
+        str: l'ID finale del grafo
+    """
+    from ..import_operators.importer_graphml import register_graph
+
+    return register_graph(result['graph'], result.get('original_id') or result['graph_id'])
+
+
+def apply_bulk_results(context, results):
+    """
+    Fase sul thread principale: registra i grafi, aggiorna i GraphMLFileItem,
+    importa i file ausiliari e popola le liste una sola volta.
+
+    Returns:
+        tuple: (loaded, errors)
+    """
+    from ..import_operators.importer_graphml import apply_graph_metadata
+    from ..functions import inspect_load_dosco_files_on_graph, normalize_path
+    from ..populate_lists import update_graph_statistics, clear_lists, populate_blender_lists_from_graph
+    from ..em_setup import auto_import_auxiliary_files
+
+    scene = context.scene
+    em_tools = scene.em_tools
+    em_settings = context.window_manager.em_addon_settings
+    loaded = 0
+    errors = 0
+
+    active_index = em_tools.active_file_index
+    for index in sorted(results):
+        result = results[index]
+        if index >= len(em_tools.graphml_files):
+            continue
+        graphml = em_tools.graphml_files[index]
+
+        if result.get('error') or result.get('graph') is None:
+            errors += 1
+            print(f"[Landscape] Error loading {result['path']}: {result.get('error')}")
+            continue
+
+        graph = result['graph']
+        register_parsed_graph(result)
+        apply_graph_metadata(graphml, result['graph_id'], graph)
+        print(f"[Landscape] {result['graph_id']}: parsed in {result['seconds']:.1f}s")
+
+        if em_settings.overwrite_url_with_dosco_filepath and graphml.dosco_dir:
+            inspect_load_dosco_files_on_graph(graph, normalize_path(graphml.dosco_dir))
+
+        # L'import degli ausiliari lavora sul file attivo
+        em_tools.active_file_index = index
+        auto_import_auxiliary_files(context, index)
+
+        update_graph_statistics(context, graph, graphml)
+        loaded += 1
+
+    if 0 <= active_index < len(em_tools.graphml_files):
+        em_tools.active_file_index = active_index
+
+    # Liste: una sola volta, dopo che tutti i grafi sono pronti
+    if getattr(scene, 'landscape_mode_active', False):
+        from .populate_functions import populate_lists_landscape_mode
+        populate_lists_landscape_mode(context)
+    elif 0 <= em_tools.active_file_index < len(em_tools.graphml_files):
+        from s3dgraphy import get_graph
+        active_graph = get_graph(em_tools.graphml_files[em_tools.active_file_index].name)
+        if active_graph:
+            clear_lists(context)
+            populate_blender_lists_from_graph(context, active_graph)
+
+    return loaded, errors
+
+
+class EM_OT_LoadAllGraphML(Operator):
+    """Parse every GraphML of the project in parallel and populate the lists once"""
+    bl_idname = "em.load_all_graphml"
+    bl_label = "Load All GraphML"
+    bl_description = "Load/reload every GraphML file in parallel (Esc to cancel)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    _timer = None
+    _loader = None
+
+    def _collect_jobs(self, context):
+        from ..functions import normalize_path
+
+        jobs = []
+        for index, graphml in enumerate(context.scene.em_tools.graphml_files):
+            if not graphml.graphml_path:
+                continue
+            path = normalize_path(graphml.graphml_path)
+            if os.path.exists(path):
+                jobs.append({'index': index, 'path': path})
+            else:
+                print(f"[Landscape] GraphML file not found: {path}")
+        return jobs
+
+    def invoke(self, context, event):
+        jobs = self._collect_jobs(context)
+        if not jobs:
+            self.report({'WARNING'}, "No GraphML files to load")
+            return {'CANCELLED'}
+
+        self._loader = GraphMLBulkLoad(jobs)
+        self._loader.start()
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(jobs))
+        self._timer = wm.event_timer_add(POLL_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        self._set_status(context, f"Loading {len(jobs)} GraphML files... (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        # Non-interactive: same pipeline, waiting for the pool
+        jobs = self._collect_jobs(context)
+        if not jobs:
+            return {'CANCELLED'}
+        loader = GraphMLBulkLoad(jobs)
+        loader.start()
+        while not loader.poll():
+            time.sleep(POLL_INTERVAL)
+        loader.shutdown()
+        return self._finish(context, loader)
+
+    def modal(self, context, event):
+        loader = self._loader
+
+        if event.type == 'ESC' and event.value == 'PRESS':
+            loader.cancel()
+
+        if event.type != 'TIMER' and not loader.cancelled:
+            return {'PASS_THROUGH'}
+
+        done = loader.poll()
+        context.window_manager.progress_update(loader.completed)
+        if not done:
+            self._set_status(context, f"Loading GraphML files: {loader.completed}/{loader.total} (Esc to cancel)")
+            return {'RUNNING_MODAL'}
+
+        self._cleanup(context)
+        loader.shutdown()
+        if loader.cancelled:
+            self.report({'WARNING'}, "GraphML loading cancelled")
+            return {'CANCELLED'}
+        return self._finish(context, loader)
+
+    def cancel(self, context):
+        if self._loader is not None:
+            self._loader.cancel()
+            self._loader.shutdown()
+        self._cleanup(context)
+
+    def _finish(self, context, loader):
+        elapsed = time.time() - loader.started_at
+        loaded, errors = apply_bulk_results(context, loader.results)
+        print(f"[Landscape] Loaded {loaded}/{loader.total} graphs in {elapsed:.1f}s")
+        if errors:
+            self.report({'WARNING'}, f"Loaded {loaded} GraphML file(s), {errors} failed")
+        else:
+            self.report({'INFO'}, f"Loaded {loaded} GraphML file(s) in {elapsed:.1f}s")
+        return {'FINISHED'}
+
+    def _cleanup(self, context):
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        self._set_status(context, None)
+
+    @staticmethod
+    def _set_status(context, text):
+        try:
+            context.workspace.status_text_set(text)
+        except Exception:
+            pass
@@ -13,7 +13,8 @@ from ..populate_lists import (
     populate_property_node,
     populate_extractor_node,
     populate_combiner_node,
-    populate_epoch_node
+    populate_epoch_node,
+    ensure_chronology,
 )
 from ..us_types import US_PROPER_TYPES
 
@@ -35,26 +36,64 @@ def populate_lists_landscape_mode(context):
         print("[Landscape] No graphs loaded")
         return
 
-    # Calcola cronologia per ogni grafo (necessario per filtro temporale)
+    # Calcola cronologia per ogni grafo (necessario per filtro temporale),
+    # saltata se il bulk loader l'ha appena calcolata nei worker
     for graph_code, graph in all_graphs.items():
-        try:
-            graph.calculate_chronology(graph)
-        except Exception as e:
-            print(f"Warning: chronology calculation failed for {graph_code}: {e}")
+        ensure_chronology(graph)
+
+    # Un solo passaggio sui nodi di ogni grafo, diviso per tipo di lista
+    buckets = {graph_code: bucket_nodes_by_list(graph) for graph_code, graph in all_graphs.items()}
 
     # Pulisci tutte le liste esistenti
     clear_all_lists(context)
 
     # Popola ogni lista con elementi da tutti i grafi
-    populate_stratigraphy_list_landscape(context, all_graphs)
-    populate_properties_list_landscape(context, all_graphs)
-    populate_documents_list_landscape(context, all_graphs)
-    populate_extractors_list_landscape(context, all_graphs)
-    populate_combiners_list_landscape(context, all_graphs)
-    populate_epochs_list_landscape(context, all_graphs)
+    populate_stratigraphy_list_landscape(context, all_graphs, buckets)
+    populate_properties_list_landscape(context, all_graphs, buckets)
+    populate_documents_list_landscape(context, all_graphs, buckets)
+    populate_extractors_list_landscape(context, all_graphs, buckets)
+    populate_combiners_list_landscape(context, all_graphs, buckets)
+    populate_epochs_list_landscape(context, all_graphs, buckets)
 
     print(f"[Landscape] Populated lists from {len(all_graphs)} graphs")
 
+# node_type → lista landscape (i tipi stratigrafici sono in US_PROPER_TYPES)
+LIST_NODE_TYPES = {
+    'property': 'property',
+    'document': 'document',
+    'extractor': 'extractor',
+    'combiner': 'combiner',
+    'EpochNode': 'epoch',
+}
+
+
+def bucket_nodes_by_list(graph):
+    """Nodi del grafo divisi per lista landscape, in un solo passaggio."""
+    buckets = {'stratigraphic': [], 'property': [], 'document': [],
+               'extractor': [], 'combiner': [], 'epoch': []}
+    for node in graph.nodes:
+        node_type = getattr(node, 'node_type', None)
+        if node_type is None:
+            continue
+        if node_type in US_PROPER_TYPES:
+            buckets['stratigraphic'].append(node)
+        else:
+            key = LIST_NODE_TYPES.get(node_type)
+            if key:
+                buckets[key].append(node)
+    return buckets
+
+
+def _graph_nodes(buckets, graph_code, graph, key):
+    if buckets is None:
+        buckets = {}
+    bucket = buckets.get(graph_code)
+    if bucket is None:
+        bucket = bucket_nodes_by_list(graph)
+        buckets[graph_code] = bucket
+    return bucket[key]
+
+
 def get_all_loaded_graphs(context):
     """Ottiene tutti i grafi effettivamente caricati nel sistema"""
     scene = context.scene
@@ -94,17 +133,13 @@ def clear_all_lists(context):
     # Clear epochs from the centralized container
     scene.em_tools.epochs.list.clear()
 
-def populate_stratigraphy_list_landscape(context, all_graphs):
+def populate_stratigraphy_list_landscape(context, all_graphs, buckets=None):
     """Popola la lista unità stratigrafiche con elementi da tutti i grafi"""
     scene = context.scene
     
     for graph_code, graph in all_graphs.items():
-        # Trova tutti i nodi stratigrafici
-        stratigraphic_nodes = [
-            node for node in graph.nodes
-            if hasattr(node, 'node_type') and
-            node.node_type in US_PROPER_TYPES
-        ]
+        # Nodi stratigrafici
+        stratigraphic_nodes = _graph_nodes(buckets, graph_code, graph, 'stratigraphic')
         
         strat = scene.em_tools.stratigraphy  # ✅ Nuovo
         for node in stratigraphic_nodes:
@@ -134,16 +169,13 @@ def populate_stratigraphy_list_landscape(context, all_graphs):
             connected_epoch = get_connected_epoch_for_node(graph, node)
             item.epoch = connected_epoch if connected_epoch else ""
 
-def populate_properties_list_landscape(context, all_graphs):
+def populate_properties_list_landscape(context, all_graphs, buckets=None):
     """Popola la lista proprietà con elementi da tutti i grafi"""
     scene = context.scene
     
     for graph_code, graph in all_graphs.items():
-        # Trova tutti i nodi proprietà
-        property_nodes = [
-            node for node in graph.nodes 
-            if hasattr(node, 'node_type') and node.node_type == 'property'
-        ]
+        # Nodi proprietà
+        property_nodes = _graph_nodes(buckets, graph_code, graph, 'property')
         
         for node in property_nodes:
             item = scene.em_tools.em_properties_list.add()
@@ -166,16 +198,13 @@ def populate_properties_list_landscape(context, all_graphs):
                 item.url = ""
                 item.icon_url = "CHECKBOX_DEHLT"
 
-def populate_documents_list_landscape(context, all_graphs):
+def populate_documents_list_landscape(context, all_graphs, buckets=None):
     """Popola la lista documenti con elementi da tutti i grafi"""
     scene = context.scene
     
     for graph_code, graph in all_graphs.items():
-        # Trova tutti i nodi documento
-        document_nodes = [
-            node for node in graph.nodes 
-            if hasattr(node, 'node_type') and node.node_type == 'document'
-        ]
+        # Nodi documento
+        document_nodes = _graph_nodes(buckets, graph_code, graph, 'document')
         
         for node in document_nodes:
             item = scene.em_tools.em_sources_list.add()
@@ -198,16 +227,13 @@ def populate_documents_list_landscape(context, all_graphs):
                 item.url = ""
                 item.icon_url = "CHECKBOX_DEHLT"
 
-def populate_extractors_list_landscape(context, all_graphs):
+def populate_extractors_list_landscape(context, all_graphs, buckets=None):
     """Popola la lista estrattori con elementi da tutti i grafi"""
     scene = context.scene
     
     for graph_code, graph in all_graphs.items():
-        # Trova tutti i nodi estrattore
-        extractor_nodes = [
-            node for node in graph.nodes 
-            if hasattr(node, 'node_type') and node.node_type == 'extractor'
-        ]
+        # Nodi estrattore
+        extractor_nodes = _graph_nodes(buckets, graph_code, graph, 'extractor')
         
         for node in extractor_nodes:
             item = scene.em_tools.em_extractors_list.add()
@@ -230,16 +256,13 @@ def populate_extractors_list_landscape(context, all_graphs):
                 item.url = ""
                 item.icon_url = "CHECKBOX_DEHLT"
 
-def populate_combiners_list_landscape(context, all_graphs):
+def populate_combiners_list_landscape(context, all_graphs, buckets=None):
     """Popola la lista combinatori con elementi da tutti i grafi"""
     scene = context.scene
     
     for graph_code, graph in all_graphs.items():
-        # Trova tutti i nodi combinatore
-        combiner_nodes = [
-            node for node in graph.nodes 
-            if hasattr(node, 'node_type') and node.node_type == 'combiner'
-        ]
+        # Nodi combinatore
+        combiner_nodes = _graph_nodes(buckets, graph_code, graph, 'combiner')
         
         for node in combiner_nodes:
             item = scene.em_tools.em_combiners_list.add()
@@ -262,16 +285,13 @@ def populate_combiners_list_landscape(context, all_graphs):
                 item.url = ""
                 item.icon_url = "CHECKBOX_DEHLT"
 
-def populate_epochs_list_landscape(context, all_graphs):
+def populate_epochs_list_landscape(context, all_graphs, buckets=None):
     """Popola la lista epoche con elementi da tutti i grafi"""
     scene = context.scene
     
     for graph_code, graph in all_graphs.items():
-        # Trova tutti i nodi epoca
-        epoch_nodes = [
-            node for node in graph.nodes 
-            if hasattr(node, 'node_type') and node.node_type == 'EpochNode'
-        ]
+        # Nodi epoca
+        epoch_nodes = _graph_nodes(buckets, graph_code, graph, 'epoch')
         
         for node in epoch_nodes:
             item = scene.em_tools.epochs.list.add()
@@ -222,6 +222,10 @@ def invalidate_material_cache():
     """
     _material_cache.invalidate()
 
+    # Stessi eventi invalidano il registro del motore parametri
+    from .material_params import invalidate_material_registry
+    invalidate_material_registry()
+
 
 def clear_material_cache():
     """
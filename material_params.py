@@ -0,0 +1,242 @@
+"""
+Material Parameter Engine for EM-Tools
+======================================
+
+One registry of every EM-managed proxy material, with its Principled BSDF
+node, so that alpha / blend mode / colour changes are pushed in a single
+batched pass instead of one walk per material family.
+
+Families (by naming convention):
+- em:          EM type materials (US, USVs, USVn, SF, VSF, USD, ...)
+- epoch:       epoch / horizon materials (ep_*)
+- property:    property materials (prop_*, property_*, no_property*)
+- projection:  proxy projection overrides (*_ProxyProjection)
+
+Every write is preceded by a read: values already equal are skipped, so
+unchanged materials do not trigger shader recompilation. Slider-driven
+updates go through a debounce.Debouncer and only the last value is
+applied.
+
+Performance Impact:
+- Before: every alpha slider step re-ran the whole display mode (EM /
+  Epochs material rebuild + reassignment, or property colours re-apply)
+- After: one pass over the cached principled nodes after the slider
+  settles; only changed sockets are written
+
+Usage:
+    from .material_params import schedule_material_params, apply_material_params
+
+    schedule_material_params(alpha=0.5, blend_mode='BLEND')   # debounced
+    apply_material_params(alpha=0.5, families={'property'})   # immediate
+"""
+
+import bpy
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .debounce import get_debouncer
+from .us_types import US_PROPER_TYPES
+
+
+MATERIAL_PARAMS_DELAY = 0.05
+
+FAMILIES = ('em', 'epoch', 'property', 'projection')
+
+# Famiglie con trasparenza "per valore" (BLEND sotto 1.0, diffuse alpha
+# aggiornato); em / epoch seguono proxy_blend_mode come em_setup_mat_cycles
+_ALPHA_BLEND_FAMILIES = frozenset(('property', 'projection'))
+
+_EPSILON = 1e-4
+
+
+def material_family(name: str) -> Optional[str]:
+    """Family of an EM-managed material, None for any other material."""
+    if name in US_PROPER_TYPES:
+        return 'em'
+    if name.startswith('ep_'):
+        return 'epoch'
+    if name.startswith(('prop_', 'property_', 'no_property')):
+        return 'property'
+    if name.endswith('_ProxyProjection'):
+        return 'projection'
+    return None
+
+
+def _differs(current, wanted) -> bool:
+    return any(abs(a - b) > _EPSILON for a, b in zip(current, wanted))
+
+
+class MaterialParamEntry:
+    """A registered material with its principled node."""
+
+    __slots__ = ('material', 'family', 'principled')
+
+    def __init__(self, material, family: str, principled):
+        self.material = material
+        self.family = family
+        self.principled = principled
+
+
+class MaterialParamRegistry:
+    """
+    Registry of EM-managed materials with auto-invalidation.
+
+    Rebuilt when the number of materials changes (same rule as
+    material_cache.MaterialCache) or after invalidate().
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, MaterialParamEntry] = {}
+        self._dirty = True
+        self._last_material_count = 0
+
+    def invalidate(self):
+        self._dirty = True
+
+    def _rebuild(self):
+        self._entries.clear()
+        for mat in bpy.data.materials:
+            family = material_family(mat.name)
+            if family is None:
+                continue
+            principled = None
+            if mat.use_nodes and mat.node_tree:
+                principled = next((node for node in mat.node_tree.nodes
+                                   if node.type == 'BSDF_PRINCIPLED'), None)
+            self._entries[mat.name] = MaterialParamEntry(mat, family, principled)
+
+        self._dirty = False
+        self._last_material_count = len(bpy.data.materials)
+
+    def entries(self, families: Optional[Iterable[str]] = None,
+                names: Optional[Iterable[str]] = None) -> List[MaterialParamEntry]:
+        if self._dirty or len(bpy.data.materials) != self._last_material_count:
+            self._rebuild()
+
+        wanted = set(families) if families is not None else None
+        selected = self._entries.values() if names is None else (
+            self._entries[name] for name in names if name in self._entries)
+
+        result = []
+        for entry in selected:
+            if wanted is not None and entry.family not in wanted:
+                continue
+            try:
+                entry.material.name
+                if entry.principled is not None:
+                    entry.principled.name
+            except ReferenceError:
+                # Material or node deleted behind our back
+                self._dirty = True
+                return self.entries(families, names)
+            result.append(entry)
+        return result
+
+    def has_family(self, family: str) -> bool:
+        return bool(self.entries(families=(family,)))
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = {family: 0 for family in FAMILIES}
+        for entry in self.entries():
+            stats[entry.family] += 1
+        return stats
+
+
+_registry = MaterialParamRegistry()
+
+
+def get_material_registry() -> MaterialParamRegistry:
+    return _registry
+
+
+def invalidate_material_registry():
+    """Call after EM materials are created, renamed or rebuilt."""
+    _registry.invalidate()
+
+
+# ============================================================================
+# BATCHED UPDATE
+# ============================================================================
+
+def apply_material_params(alpha: Optional[float] = None,
+                          blend_mode: Optional[str] = None,
+                          colors: Optional[Dict[str, Tuple[float, float, float]]] = None,
+                          families: Optional[Iterable[str]] = None,
+                          names: Optional[Iterable[str]] = None) -> int:
+    """
+    Apply alpha, blend mode and colours to EM-managed materials in one pass.
+
+    Args:
+        alpha: principled Alpha (None = leave unchanged)
+        blend_mode: blend method of the em / epoch families (None = leave)
+        colors: material name -> RGB for Base Color / viewport colour
+        families: restrict to these families (default: all)
+        names: restrict to these material names (e.g. visible materials)
+
+    Returns:
+        int: number of materials that actually changed
+    """
+    targets = _registry.entries(families, names)
+
+    changed_count = 0
+    for entry in targets:
+        mat = entry.material
+        principled = entry.principled
+        alpha_blend = entry.family in _ALPHA_BLEND_FAMILIES
+        changed = False
+
+        if alpha is not None and principled is not None:
+            alpha_input = principled.inputs.get('Alpha')
+            if alpha_input is not None and abs(alpha_input.default_value - alpha) > _EPSILON:
+                alpha_input.default_value = alpha
+                changed = True
+            if alpha_blend:
+                base = principled.inputs['Base Color'].default_value
+                if abs(base[3] - alpha) > _EPSILON:
+                    principled.inputs['Base Color'].default_value = (base[0], base[1], base[2], alpha)
+                    changed = True
+                if abs(mat.diffuse_color[3] - alpha) > _EPSILON:
+                    mat.diffuse_color[3] = alpha
+                    changed = True
+
+        if alpha_blend:
+            wanted_blend = None if alpha is None else ('BLEND' if alpha < 1.0 else 'OPAQUE')
+        else:
+            wanted_blend = blend_mode
+        if wanted_blend and mat.blend_method != wanted_blend:
+            mat.blend_method = wanted_blend
+            changed = True
+
+        rgb = colors.get(mat.name) if colors else None
+        if rgb is not None:
+            if principled is not None:
+                base = principled.inputs['Base Color'].default_value
+                if _differs(base[:3], rgb):
+                    principled.inputs['Base Color'].default_value = (rgb[0], rgb[1], rgb[2], base[3])
+                    changed = True
+            if _differs(mat.diffuse_color[:3], rgb):
+                mat.diffuse_color = (rgb[0], rgb[1], rgb[2], mat.diffuse_color[3])
+                changed = True
+
+        if changed:
+            changed_count += 1
+
+    return changed_count
+
+
+def _apply_scheduled(alpha, blend_mode, families):
+    changed = apply_material_params(alpha=alpha, blend_mode=blend_mode, families=families)
+    print(f"[MaterialParams] alpha={alpha} blend={blend_mode}: {changed} materials changed")
+
+
+def schedule_material_params(alpha: Optional[float] = None,
+                             blend_mode: Optional[str] = None,
+                             families: Optional[Iterable[str]] = None):
+    """Debounced apply_material_params (slider drags collapse to one pass)."""
+    families = tuple(families) if families is not None else None
+    get_debouncer('material_params', _apply_scheduled, MATERIAL_PARAMS_DELAY)(alpha, blend_mode, families)
+
+
+def clear_material_registry():
+    """Drop the registry (addon reload / memory cleanup)."""
+    _registry._entries.clear()
+    _registry.invalidate()
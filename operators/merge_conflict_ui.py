@@ -21,6 +21,9 @@ from bpy.props import (  # type: ignore
 from s3dgraphy import get_graph
 from s3dgraphy.merge import GraphMerger, Conflict
 
+from .merge_engine import MergeEngine
+from ..graph_index import invalidate_graph_values
+
 
 # ---------------------------------------------------------------------------
 # Module-level state for active merge session
@@ -29,6 +32,8 @@ from s3dgraphy.merge import GraphMerger, Conflict
 _active_conflicts = []      # List[Conflict]
 _incoming_graph = None       # The graph imported from XLSX for comparison
 _merger = None               # GraphMerger instance
+_merge_engine = None         # MergeEngine (indexed existing/incoming graphs)
+_ui_conflicts = []           # Conflicts shown in em_tools.merge_conflicts, same order
 # Epoch remap plan: {strat_node_id: existing_epoch_node_id}
 _epoch_remap_plan = {}
 
@@ -51,24 +56,34 @@ def is_merge_active():
 # Epoch compatibility analysis
 # ---------------------------------------------------------------------------
 
-def _get_best_chronology(us_node, graph):
+def _get_best_chronology(us_node, graph, snapshot=None):
     """
     Get the best available chronology for a US node.
 
     Priority: subphase > phase > period.
     Returns (start, end, level, epoch_node) or (None, None, None, None).
+
+    snapshot: optional merge_engine.GraphSnapshot of graph (edge adjacency
+    instead of a scan of graph.edges).
     """
     from s3dgraphy.nodes.epoch_node import EpochNode
 
     epochs_by_level = {'subphase': [], 'phase': [], 'period': []}
 
-    for edge in graph.edges:
-        if edge.edge_source == us_node.node_id and edge.edge_type == 'has_first_epoch':
-            target = graph.find_node_by_id(edge.edge_target)
-            if isinstance(target, EpochNode):
-                level = getattr(target, 'epoch_level', 'period')
-                if level in epochs_by_level:
-                    epochs_by_level[level].append(target)
+    if snapshot is not None:
+        first_epochs = snapshot.first_epochs(us_node.node_id)
+    else:
+        first_epochs = []
+        for edge in graph.edges:
+            if edge.edge_source == us_node.node_id and edge.edge_type == 'has_first_epoch':
+                target = graph.find_node_by_id(edge.edge_target)
+                if isinstance(target, EpochNode):
+                    first_epochs.append(target)
+
+    for target in first_epochs:
+        level = getattr(target, 'epoch_level', 'period')
+        if level in epochs_by_level:
+            epochs_by_level[level].append(target)
 
     for level in ['subphase', 'phase', 'period']:
         if epochs_by_level[level]:
@@ -117,21 +132,26 @@ def _classify_epoch_compatibility(us_start, us_end, existing_epochs):
         return 'NO_MATCH', None, None
 
 
-def _build_epoch_report(existing_graph, incoming_graph):
+def _build_epoch_report(existing_graph, incoming_graph, engine=None):
     """
     Build a pre-merge epoch compatibility report.
 
+    engine: MergeEngine of the two graphs (built here if None); provides
+    the name join with the existing units and the epoch adjacency.
+
     Returns a list of dicts, each with:
       node_name, category, us_start, us_end, epoch_level,
       matched_epoch_name, message, matched_epoch_node
     """
-    from s3dgraphy.nodes.epoch_node import EpochNode
     from s3dgraphy.nodes.stratigraphic_node import StratigraphicNode
 
+    if engine is None:
+        engine = MergeEngine(existing_graph, incoming_graph)
+
     # Collect existing epochs (from GraphML — they have min_y/max_y)
     existing_epochs = [
-        n for n in existing_graph.nodes
-        if isinstance(n, EpochNode) and hasattr(n, 'min_y') and n.min_y is not None
+        n for n in engine.existing.epoch_nodes
+        if hasattr(n, 'min_y') and n.min_y is not None
     ]
 
     # Collect incoming stratigraphic nodes
@@ -140,21 +160,18 @@ def _build_epoch_report(existing_graph, incoming_graph):
         if isinstance(n, StratigraphicNode)
     ]
 
-    # Also check which incoming nodes are truly NEW (not in existing graph)
-    existing_names = set()
-    for n in existing_graph.nodes:
-        if isinstance(n, StratigraphicNode) and hasattr(n, 'name'):
-            existing_names.add(n.name)
+    # Many US share the same chronology (same epoch): classify each range once
+    classified = {}
 
     report = []
 
     for us_node in sorted(incoming_strat, key=lambda x: x.name):
         # Skip nodes already in the existing graph (they keep their epoch)
-        if us_node.name in existing_names:
+        if not engine.is_new_unit(us_node):
             continue
 
         us_start, us_end, level, epoch_node = _get_best_chronology(
-            us_node, incoming_graph)
+            us_node, incoming_graph, engine.incoming)
 
         if level is None:
             # No chronological data at all
@@ -180,8 +197,11 @@ def _build_epoch_report(existing_graph, incoming_graph):
         elif level == 'phase':
             completeness_note = " [subphase missing, using phase]"
 
-        category, matched, overlapping = _classify_epoch_compatibility(
-            us_start, us_end, existing_epochs)
+        chronology = (us_start, us_end)
+        if chronology not in classified:
+            classified[chronology] = _classify_epoch_compatibility(
+                us_start, us_end, existing_epochs)
+        category, matched, overlapping = classified[chronology]
 
         if category == 'EXACT_FIT':
             msg = (f"Fits in '{matched.name}' "
@@ -233,32 +253,43 @@ def _apply_epoch_remap(existing_graph, incoming_graph, remap_plan):
         remap_plan: dict {strat_node_id: existing_epoch_node_id}
     """
     import uuid as uuid_mod
-    from s3dgraphy.nodes.epoch_node import EpochNode
-    from s3dgraphy.nodes.stratigraphic_node import StratigraphicNode
+    from s3dgraphy.edges import Edge
 
-    # Remove all has_first_epoch edges for nodes in the remap plan
-    edges_to_remove = []
-    for edge in existing_graph.edges:
-        if edge.edge_type == 'has_first_epoch' and edge.edge_source in remap_plan:
-            edges_to_remove.append(edge.edge_id)
+    if not remap_plan:
+        return
 
-    for edge_id in edges_to_remove:
-        try:
-            existing_graph.remove_edge(edge_id)
-        except (ValueError, KeyError):
-            pass
+    # Remove all has_first_epoch edges for nodes in the remap plan (one pass)
+    existing_graph.edges = [
+        edge for edge in existing_graph.edges
+        if not (edge.edge_type == 'has_first_epoch' and edge.edge_source in remap_plan)
+    ]
 
     # Add new has_first_epoch edges to the correct existing epochs
+    # (same checks as Graph.add_edge, with an id dict instead of lookups)
+    nodes_by_id = {node.node_id: node for node in existing_graph.nodes}
+    allowed = {}
     for strat_id, epoch_id in remap_plan.items():
-        try:
-            existing_graph.add_edge(
-                edge_id=str(uuid_mod.uuid4()),
-                edge_source=strat_id,
-                edge_target=epoch_id,
-                edge_type='has_first_epoch'
-            )
-        except ValueError:
-            pass
+        source = nodes_by_id.get(strat_id)
+        target = nodes_by_id.get(epoch_id)
+        if source is None or target is None:
+            continue
+
+        type_key = (source.node_type, target.node_type)
+        if type_key not in allowed:
+            allowed[type_key] = existing_graph.validate_connection(
+                source.node_type, target.node_type, 'has_first_epoch')
+        edge_type = 'has_first_epoch'
+        if not allowed[type_key]:
+            existing_graph.add_warning(
+                f"Connection 'has_first_epoch' not allowed between '{source.node_type}' "
+                f"(name:{source.name}) and '{target.node_type}' (name:'{target.name}'). "
+                f"Using 'generic_connection' instead.")
+            edge_type = 'generic_connection'
+
+        existing_graph.edges.append(
+            Edge(str(uuid_mod.uuid4()), strat_id, epoch_id, edge_type))
+
+    existing_graph._indices_dirty = True
 
 
 def _export_epoch_report(xlsx_path, report_items):
@@ -388,6 +419,7 @@ class EM_OT_merge_xlsx_start(bpy.types.Operator):
 
     def execute(self, context):
         global _active_conflicts, _incoming_graph, _merger, _epoch_remap_plan
+        global _merge_engine, _ui_conflicts
 
         em_tools = context.scene.em_tools
         graphml_file = em_tools.graphml_files[em_tools.active_file_index]
@@ -402,9 +434,8 @@ class EM_OT_merge_xlsx_start(bpy.types.Operator):
         #   - Legacy stratigraphy.xlsx (24-column wide table on sheet 'Stratigraphy')
         # The schema is auto-detected by sheet presence.
         try:
-            import pandas as _pd
-            with _pd.ExcelFile(self.filepath, engine='openpyxl') as xl:
-                sheet_names = set(xl.sheet_names)
+            from ..em_setup.excel_helpers import get_workbook_metadata
+            sheet_names = set(get_workbook_metadata(self.filepath).sheet_names)
             unified_required = {'Units', 'Epochs', 'Claims', 'Authors', 'Documents'}
 
             if unified_required.issubset(sheet_names):
@@ -438,8 +469,11 @@ class EM_OT_merge_xlsx_start(bpy.types.Operator):
             self.report({'ERROR'}, f"Error importing XLSX: {str(e)}")
             return {'CANCELLED'}
 
+        # Index both graphs once: epoch report and conflicts are joins on it
+        _merge_engine = MergeEngine(existing_graph, _incoming_graph)
+
         # ── Epoch Compatibility Check ──
-        epoch_report = _build_epoch_report(existing_graph, _incoming_graph)
+        epoch_report = _build_epoch_report(existing_graph, _incoming_graph, _merge_engine)
 
         has_blocking = any(
             r['category'] in ('STRADDLING', 'NO_EPOCH', 'NO_MATCH')
@@ -463,6 +497,7 @@ class EM_OT_merge_xlsx_start(bpy.types.Operator):
             em_tools.epoch_report_active = True
             em_tools.epoch_report_has_errors = True
             _incoming_graph = None
+            _merge_engine = None
 
             # Auto-export conflict report next to the XLSX file
             report_path = _export_epoch_report(self.filepath, epoch_report)
@@ -479,15 +514,9 @@ class EM_OT_merge_xlsx_start(bpy.types.Operator):
 
         # Build epoch remap plan for non-blocking results
         _epoch_remap_plan = {}
-        from s3dgraphy.nodes.stratigraphic_node import StratigraphicNode
-        incoming_name_to_id = {
-            n.name: n.node_id for n in _incoming_graph.nodes
-            if isinstance(n, StratigraphicNode)
-        }
-
         for r in epoch_report:
             if r['matched_epoch_node'] is not None:
-                strat_id = incoming_name_to_id.get(r['node_name'])
+                strat_id = _merge_engine.incoming_unit_id(r['node_name'])
                 if strat_id:
                     _epoch_remap_plan[strat_id] = r['matched_epoch_node'].node_id
 
@@ -499,19 +528,21 @@ class EM_OT_merge_xlsx_start(bpy.types.Operator):
 
         # ── Graph comparison ──
         _merger = GraphMerger()
-        _active_conflicts = _merger.compare(existing_graph, _incoming_graph)
+        _active_conflicts = _merge_engine.conflicts()
 
         user_conflicts = _merger.get_unresolved_conflicts(_active_conflicts)
 
         if not user_conflicts:
             # No conflicts - apply all changes directly
-            _merger.apply_resolutions(existing_graph, _active_conflicts, _incoming_graph)
+            _merge_engine.apply(_merger, _active_conflicts)
 
             # Apply epoch remapping
             _apply_epoch_remap(existing_graph, _incoming_graph, _epoch_remap_plan)
+            invalidate_graph_values(existing_graph)
 
             _active_conflicts = []
             _incoming_graph = None
+            _merge_engine = None
             _epoch_remap_plan = {}
             em_tools.epoch_report_active = False
 
@@ -526,11 +557,11 @@ class EM_OT_merge_xlsx_start(bpy.types.Operator):
             self.report({'INFO'}, msg)
             return {'FINISHED'}
 
-        # Populate Blender property for UI display
+        # Populate Blender property for UI display (only the changed
+        # attributes that need a decision; auto-accepted additions stay out)
         em_tools.merge_conflicts.clear()
-        for conflict in _active_conflicts:
-            if conflict.resolved:
-                continue
+        _ui_conflicts = user_conflicts
+        for conflict in _ui_conflicts:
             item = em_tools.merge_conflicts.add()
             item.node_name = conflict.node_name
             item.field_name = conflict.display_field
@@ -582,10 +613,11 @@ class EM_OT_resolve_conflict(bpy.types.Operator):
         item.resolved = True
         item.accepted = (self.action == 'ACCEPT')
 
-        unresolved = [c for c in _active_conflicts if not c.resolved]
-        if idx < len(unresolved):
-            unresolved[idx].resolved = True
-            unresolved[idx].accepted = (self.action == 'ACCEPT')
+        # Same order as em_tools.merge_conflicts (the unresolved list shrinks
+        # as items are resolved, so it cannot be indexed with idx)
+        if idx < len(_ui_conflicts):
+            _ui_conflicts[idx].resolved = True
+            _ui_conflicts[idx].accepted = (self.action == 'ACCEPT')
 
         self._advance_to_next_unresolved(context)
         return {'FINISHED'}
@@ -686,6 +718,7 @@ class EM_OT_apply_merge(bpy.types.Operator):
 
     def execute(self, context):
         global _active_conflicts, _incoming_graph, _merger, _epoch_remap_plan
+        global _merge_engine, _ui_conflicts
         from ..functions import normalize_path
         from s3dgraphy.exporter.graphml import GraphMLPatcher
 
@@ -693,15 +726,16 @@ class EM_OT_apply_merge(bpy.types.Operator):
         graphml_file = em_tools.graphml_files[em_tools.active_file_index]
         existing_graph = get_graph(graphml_file.name)
 
-        if existing_graph is None or _merger is None:
+        if existing_graph is None or _merger is None or _merge_engine is None:
             self.report({'ERROR'}, "No active merge session")
             return {'CANCELLED'}
 
         # Apply resolved conflicts to the in-memory graph
-        _merger.apply_resolutions(existing_graph, _active_conflicts, _incoming_graph)
+        _merge_engine.apply(_merger, _active_conflicts)
 
         # Apply epoch remapping
         _apply_epoch_remap(existing_graph, _incoming_graph, _epoch_remap_plan)
+        invalidate_graph_values(existing_graph)
 
         # Save to GraphML using the patcher
         filepath = normalize_path(graphml_file.graphml_path)
@@ -734,6 +768,8 @@ class EM_OT_apply_merge(bpy.types.Operator):
         _active_conflicts = []
         _incoming_graph = None
         _merger = None
+        _merge_engine = None
+        _ui_conflicts = []
         _epoch_remap_plan = {}
         em_tools.merge_active = False
         em_tools.merge_conflicts.clear()
@@ -750,10 +786,13 @@ class EM_OT_cancel_merge(bpy.types.Operator):
 
     def execute(self, context):
         global _active_conflicts, _incoming_graph, _merger, _epoch_remap_plan
+        global _merge_engine, _ui_conflicts
 
         _active_conflicts = []
         _incoming_graph = None
         _merger = None
+        _merge_engine = None
+        _ui_conflicts = []
         _epoch_remap_plan = {}
 
         em_tools = context.scene.em_tools
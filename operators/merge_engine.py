@@ -0,0 +1,534 @@
+"""
+Merge engine for EM_OT_merge_xlsx_start
+=======================================
+
+Indexes the existing and the incoming graph once (one pass over nodes and
+one over edges each) and computes the whole merge as dictionary joins:
+
+- stratigraphic units, epochs, authors and documents keyed by normalised
+  name (NFC, surrounding whitespace stripped); incoming names are aligned
+  to the existing spelling so GraphMerger.apply_resolutions finds them
+- every unit carries an attribute digest (description + relations): units
+  whose digests match are skipped without a field-by-field comparison,
+  and only the attributes that actually differ become Conflict objects
+  (hence MergeConflictItem entries)
+- qualia, relation attribution and epoch chronology use the per-node
+  edge adjacency instead of walking graph.edges for every node
+- accepted node additions are applied in bulk with id sets
+
+The Conflict objects are the same as GraphMerger.compare (same types,
+fields and values), so resolution and apply_resolutions are unchanged.
+
+Performance Impact:
+- Before: GraphMerger attribution chains, the epoch report and node
+  additions re-scanned graph.edges per node; find_node_by_id is linear
+  while the graph indices are dirty (O(nodes × edges))
+- After: O(nodes + edges) per graph, then O(1) lookups per join key
+
+Usage:
+    from .merge_engine import MergeEngine
+
+    engine = MergeEngine(existing_graph, incoming_graph)
+    conflicts = engine.conflicts()             # list of s3dgraphy Conflict
+    # ... user resolves conflicts ...
+    engine.apply(GraphMerger(), conflicts)
+"""
+
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from s3dgraphy.edges import Edge
+from s3dgraphy.merge import GraphMerger, Conflict
+from s3dgraphy.merge.graph_merger import STRATIGRAPHIC_EDGE_TYPES, _EDGE_ATTR_KEYS
+from s3dgraphy.nodes.author_node import AuthorNode, AuthorAINode
+from s3dgraphy.nodes.document_node import DocumentNode
+from s3dgraphy.nodes.epoch_node import EpochNode
+from s3dgraphy.nodes.property_node import PropertyNode
+from s3dgraphy.nodes.stratigraphic_node import StratigraphicNode
+
+
+def normalise_name(name) -> str:
+    """Join key of a node name."""
+    if name is None:
+        return ''
+    return unicodedata.normalize('NFC', str(name)).strip()
+
+
+def _property_type(pn) -> str:
+    # Same rule as GraphMerger._build_qualia_map (legacy "string" type)
+    prop_type = pn.property_type
+    if not prop_type or prop_type == 'string':
+        prop_type = pn.name or 'definition'
+    return prop_type
+
+
+class GraphSnapshot:
+    """One-pass index of a graph for the merge join."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.by_id = {}
+        self.strat: Dict[str, StratigraphicNode] = {}
+        self.epochs: Dict[str, EpochNode] = {}
+        self.epoch_nodes: List[EpochNode] = []
+        self.authors: Dict[str, AuthorNode] = {}
+        self.documents: Dict[str, DocumentNode] = {}
+
+        named = {}   # node_id -> normalised name (any named node)
+
+        for node in graph.nodes:
+            self.by_id[node.node_id] = node
+            name = getattr(node, 'name', None)
+            key = normalise_name(name)
+            if key:
+                named[node.node_id] = key
+            # Last node wins on duplicate names, as GraphMerger's maps
+            if isinstance(node, StratigraphicNode):
+                if hasattr(node, 'name'):
+                    self.strat[key] = node
+            elif isinstance(node, EpochNode):
+                self.epoch_nodes.append(node)
+                if name:
+                    self.epochs[key] = node
+            elif isinstance(node, AuthorNode):
+                if name:
+                    self.authors[key] = node
+            elif isinstance(node, DocumentNode):
+                if name:
+                    self.documents[key] = node
+
+        strat_ids = {node.node_id: key for key, node in self.strat.items() if key}
+        host_ids = dict(strat_ids)
+        host_ids.update({node.node_id: key for key, node in self.epochs.items()})
+
+        self.out_edges = defaultdict(list)     # source id -> [edge]
+        self.incident = defaultdict(list)      # node id -> [edge], edge order
+        self.relations: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        self.edge_attrs = {}                   # (src key, tgt key, type) -> (src, tgt, attrs)
+        self.qualia = {}                       # (host key, prop type) -> (host, pn)
+
+        for edge in graph.edges:
+            source_id = edge.edge_source
+            target_id = edge.edge_target
+            edge_type = edge.edge_type
+            self.out_edges[source_id].append(edge)
+            self.incident[source_id].append(edge)
+            if target_id != source_id:
+                self.incident[target_id].append(edge)
+
+            if edge_type in STRATIGRAPHIC_EDGE_TYPES:
+                source_key = strat_ids.get(source_id)
+                target_key = strat_ids.get(target_id)
+                if source_key and target_key:
+                    self.relations[source_key].add((edge_type, target_key))
+                source_key = named.get(source_id)
+                target_key = named.get(target_id)
+                if source_key and target_key:
+                    self.edge_attrs[(source_key, target_key, edge_type)] = (
+                        self.by_id[source_id], self.by_id[target_id],
+                        getattr(edge, 'attributes', {}) or {})
+
+            elif edge_type == 'has_property':
+                host_key = host_ids.get(source_id)
+                pn = self.by_id.get(target_id)
+                if host_key and isinstance(pn, PropertyNode):
+                    self.qualia[(host_key, _property_type(pn))] = (self.by_id[source_id], pn)
+
+    def unit_digest(self, key: str) -> tuple:
+        """Digest of the compared attributes of a unit (description + relations)."""
+        node = self.strat[key]
+        return ((node.description or '').strip(), frozenset(self.relations.get(key, ())))
+
+    def first_epochs(self, node_id) -> List[EpochNode]:
+        """has_first_epoch targets of a node, in edge order."""
+        result = []
+        for edge in self.out_edges.get(node_id, ()):
+            if edge.edge_type == 'has_first_epoch':
+                target = self.by_id.get(edge.edge_target)
+                if isinstance(target, EpochNode):
+                    result.append(target)
+        return result
+
+    def attribution_signature(self, pn) -> Set[str]:
+        """GraphMerger._qualia_attribution_signature through the adjacency."""
+        sources: Set[str] = set()
+        by_id = self.by_id
+        out_edges = self.out_edges
+
+        for edge in out_edges.get(pn.node_id, ()):
+            if edge.edge_type == 'has_author':
+                target = by_id.get(edge.edge_target)
+                if isinstance(target, AuthorNode):
+                    sources.add(f'{target.name or ""}|')
+
+        def walk_extractor(ext_node):
+            author_name = ''
+            doc_name = ''
+            for e in out_edges.get(ext_node.node_id, ()):
+                if e.edge_type == 'has_author':
+                    target = by_id.get(e.edge_target)
+                    if isinstance(target, AuthorNode):
+                        author_name = target.name or ''
+                elif e.edge_type == 'extracted_from':
+                    target = by_id.get(e.edge_target)
+                    if isinstance(target, DocumentNode):
+                        doc_name = target.name or ''
+            sources.add(f'{author_name}|{doc_name}')
+
+        for edge in out_edges.get(pn.node_id, ()):
+            if edge.edge_type != 'has_data_provenance':
+                continue
+            head = by_id.get(edge.edge_target)
+            if head is None:
+                continue
+            if head.__class__.__name__ == 'CombinerNode':
+                for e in out_edges.get(head.node_id, ()):
+                    if e.edge_type == 'combines':
+                        ext = by_id.get(e.edge_target)
+                        if ext is not None:
+                            walk_extractor(ext)
+            else:
+                walk_extractor(head)
+
+        sources.discard('|')
+        return sources
+
+
+class MergeEngine:
+    """Join of an existing and an incoming graph (see module docstring)."""
+
+    def __init__(self, existing_graph, incoming_graph):
+        self.existing = GraphSnapshot(existing_graph)
+        self.incoming = GraphSnapshot(incoming_graph)
+        self._align_names()
+
+    def _align_names(self):
+        """Give matched incoming nodes the existing spelling of their name."""
+        pairs = ((self.existing.strat, self.incoming.strat),
+                 (self.existing.epochs, self.incoming.epochs),
+                 (self.existing.authors, self.incoming.authors),
+                 (self.existing.documents, self.incoming.documents))
+        aligned = 0
+        for existing_map, incoming_map in pairs:
+            for key, inc_node in incoming_map.items():
+                ex_node = existing_map.get(key)
+                if ex_node is not None and inc_node.name != ex_node.name:
+                    inc_node.name = ex_node.name
+                    aligned += 1
+        if aligned:
+            print(f"[Merge] Aligned {aligned} incoming names to the existing spelling")
+
+    def _display_name(self, key: str) -> str:
+        node = self.existing.strat.get(key) or self.incoming.strat.get(key)
+        return node.name if node is not None else key
+
+    # ------------------------------------------------------------------
+    # Conflicts
+    # ------------------------------------------------------------------
+
+    def conflicts(self) -> List[Conflict]:
+        """Conflicts equivalent to GraphMerger.compare, sorted by (node, field)."""
+        conflicts: List[Conflict] = []
+        self._join_units(conflicts)
+        self._join_qualia(conflicts)
+        self._join_catalog(conflicts, self.existing.authors, self.incoming.authors, 'author')
+        self._join_catalog(conflicts, self.existing.documents, self.incoming.documents, 'document')
+        self._join_epochs(conflicts)
+        self._join_edge_attribution(conflicts)
+
+        conflicts.sort(key=lambda c: (c.node_name, c.field, c.current_value, c.incoming_value))
+        return conflicts
+
+    def _join_units(self, conflicts):
+        existing, incoming = self.existing, self.incoming
+        skipped = 0
+
+        for key, inc_node in incoming.strat.items():
+            ex_node = existing.strat.get(key)
+            if ex_node is None:
+                conflicts.append(Conflict(
+                    node_name=inc_node.name,
+                    field='node',
+                    current_value='',
+                    incoming_value=f'{getattr(inc_node, "node_type", "US")}: {inc_node.description or ""}',
+                    conflict_type='node_added',
+                    resolved=True,
+                    accepted=True
+                ))
+                continue
+
+            if existing.unit_digest(key) == incoming.unit_digest(key):
+                skipped += 1
+                continue
+
+            name = ex_node.name
+            existing_desc = ex_node.description or ''
+            incoming_desc = inc_node.description or ''
+            if existing_desc.strip() != incoming_desc.strip():
+                conflicts.append(Conflict(
+                    node_name=name,
+                    field='description',
+                    current_value=existing_desc,
+                    incoming_value=incoming_desc,
+                    conflict_type='value_changed'
+                ))
+
+            existing_rel = existing.relations.get(key, set())
+            incoming_rel = incoming.relations.get(key, set())
+            for edge_type, target_key in incoming_rel - existing_rel:
+                conflicts.append(Conflict(
+                    node_name=name,
+                    field=f'edge:{edge_type}',
+                    current_value='',
+                    incoming_value=self._display_name(target_key),
+                    conflict_type='edge_added'
+                ))
+            for edge_type, target_key in existing_rel - incoming_rel:
+                conflicts.append(Conflict(
+                    node_name=name,
+                    field=f'edge:{edge_type}',
+                    current_value=existing.strat[target_key].name,
+                    incoming_value='',
+                    conflict_type='edge_removed'
+                ))
+
+        print(f"[Merge] Units: {len(incoming.strat)} incoming, {skipped} unchanged (digest match)")
+
+    def _join_qualia(self, conflicts):
+        existing, incoming = self.existing, self.incoming
+        display_value = GraphMerger._pn_display_value
+
+        for key, (inc_host, inc_pn) in incoming.qualia.items():
+            prop_type = key[1]
+            exist = existing.qualia.get(key)
+            if exist is None:
+                conflicts.append(Conflict(
+                    node_name=inc_host.name,
+                    field=f'qualia:{prop_type}',
+                    current_value='',
+                    incoming_value=display_value(inc_pn),
+                    conflict_type='qualia_added',
+                    resolved=True,
+                    accepted=True,
+                    extra={'property_type': prop_type},
+                ))
+                continue
+
+            ex_host, ex_pn = exist
+            exist_val = display_value(ex_pn).strip()
+            inc_val = display_value(inc_pn).strip()
+            if exist_val != inc_val:
+                conflicts.append(Conflict(
+                    node_name=ex_host.name,
+                    field=f'qualia:{prop_type}',
+                    current_value=exist_val,
+                    incoming_value=inc_val,
+                    conflict_type='qualia_changed',
+                    extra={'property_type': prop_type},
+                ))
+                continue
+
+            # Same value: does incoming bring an extra attribution source?
+            exist_sources = existing.attribution_signature(ex_pn)
+            inc_sources = incoming.attribution_signature(inc_pn)
+            extra = inc_sources - exist_sources
+            if extra:
+                conflicts.append(Conflict(
+                    node_name=ex_host.name,
+                    field=f'qualia:{prop_type}',
+                    current_value=', '.join(sorted(exist_sources)) or '—',
+                    incoming_value=', '.join(sorted(inc_sources)),
+                    conflict_type='qualia_attribution_added',
+                    extra={'property_type': prop_type,
+                           'added_sources': sorted(extra)},
+                ))
+
+    def _join_catalog(self, conflicts, exist_map, inc_map, kind_label):
+        for key, inc_node in inc_map.items():
+            exist_node = exist_map.get(key)
+            if exist_node is None:
+                conflicts.append(Conflict(
+                    node_name=inc_node.name,
+                    field=kind_label,
+                    current_value='',
+                    incoming_value=inc_node.description or '',
+                    conflict_type=f'{kind_label}_added',
+                    resolved=True,
+                    accepted=True,
+                    extra={'kind': kind_label,
+                           'cls': type(inc_node).__name__},
+                ))
+                continue
+
+            code = exist_node.name
+            exist_desc = (exist_node.description or '').strip()
+            inc_desc = (inc_node.description or '').strip()
+            if exist_desc != inc_desc:
+                conflicts.append(Conflict(
+                    node_name=code,
+                    field=f'{kind_label}:description',
+                    current_value=exist_desc,
+                    incoming_value=inc_desc,
+                    conflict_type=f'{kind_label}_changed',
+                    extra={'kind': kind_label},
+                ))
+
+            if kind_label == 'author':
+                exist_is_ai = isinstance(exist_node, AuthorAINode)
+                inc_is_ai = isinstance(inc_node, AuthorAINode)
+                if exist_is_ai != inc_is_ai:
+                    conflicts.append(Conflict(
+                        node_name=code,
+                        field=f'{kind_label}:kind',
+                        current_value='extractor' if exist_is_ai else 'author',
+                        incoming_value='extractor' if inc_is_ai else 'author',
+                        conflict_type=f'{kind_label}_changed',
+                        extra={'kind': kind_label, 'subfield': 'kind'},
+                    ))
+
+    def _join_epochs(self, conflicts):
+        exist_map = self.existing.epochs
+        for key, inc_ep in self.incoming.epochs.items():
+            exist_ep = exist_map.get(key)
+            if exist_ep is None:
+                conflicts.append(Conflict(
+                    node_name=inc_ep.name,
+                    field='epoch',
+                    current_value='',
+                    incoming_value=(f'{getattr(inc_ep, "start_time", "")} – '
+                                    f'{getattr(inc_ep, "end_time", "")}'),
+                    conflict_type='epoch_added',
+                    resolved=True,
+                    accepted=True,
+                    extra={},
+                ))
+                continue
+
+            name = exist_ep.name
+            for attr, subfield in (('start_time', 'start'), ('end_time', 'end')):
+                ev = getattr(exist_ep, attr, None)
+                iv = getattr(inc_ep, attr, None)
+                if ev != iv and iv is not None:
+                    conflicts.append(Conflict(
+                        node_name=name,
+                        field=f'epoch:{subfield}',
+                        current_value=str(ev) if ev is not None else '',
+                        incoming_value=str(iv),
+                        conflict_type='epoch_changed',
+                        extra={'subfield': subfield},
+                    ))
+
+            ev_color = (getattr(exist_ep, 'color', None)
+                        or (exist_ep.attributes or {}).get('fill_color', ''))
+            iv_color = (getattr(inc_ep, 'color', None)
+                        or (inc_ep.attributes or {}).get('fill_color', ''))
+            if ev_color != iv_color and iv_color:
+                conflicts.append(Conflict(
+                    node_name=name,
+                    field='epoch:color',
+                    current_value=ev_color or '',
+                    incoming_value=iv_color,
+                    conflict_type='epoch_changed',
+                    extra={'subfield': 'color'},
+                ))
+
+    def _join_edge_attribution(self, conflicts):
+        exist_by_key = self.existing.edge_attrs
+        for key, (_, _, inc_attrs) in self.incoming.edge_attrs.items():
+            exist = exist_by_key.get(key)
+            if exist is None:
+                continue  # the edge itself is an "edge_added" conflict
+            ex_source, ex_target, exist_attrs = exist
+            edge_type = key[2]
+            for ak in _EDGE_ATTR_KEYS:
+                ev = str(exist_attrs.get(ak) or '')
+                iv = str(inc_attrs.get(ak) or '')
+                if ev == iv:
+                    continue
+                conflicts.append(Conflict(
+                    node_name=ex_source.name,
+                    field=f'edge_attr:{edge_type}:{ak}',
+                    current_value=ev,
+                    incoming_value=iv,
+                    conflict_type=('edge_attribution_added' if not ev and iv
+                                   else 'edge_attribution_changed'),
+                    extra={'target': ex_target.name, 'edge_type': edge_type,
+                           'attr_key': ak},
+                ))
+
+    # ------------------------------------------------------------------
+    # Epochs
+    # ------------------------------------------------------------------
+
+    def is_new_unit(self, node) -> bool:
+        """Incoming unit with no same-name unit in the existing graph."""
+        return normalise_name(node.name) not in self.existing.strat
+
+    def incoming_unit_id(self, name) -> Optional[str]:
+        node = self.incoming.strat.get(normalise_name(name))
+        return node.node_id if node is not None else None
+
+    # ------------------------------------------------------------------
+    # Apply
+    # ------------------------------------------------------------------
+
+    def apply(self, merger: GraphMerger, conflicts: List[Conflict]):
+        """
+        Apply resolved conflicts: accepted node additions in bulk, every
+        other conflict through merger.apply_resolutions.
+        """
+        added = [c for c in conflicts
+                 if c.conflict_type == 'node_added' and c.resolved and c.accepted]
+        if added:
+            self._apply_node_additions(added)
+        merger.apply_resolutions(self.existing.graph,
+                                 [c for c in conflicts if c.conflict_type != 'node_added'],
+                                 self.incoming.graph)
+
+    def _apply_node_additions(self, conflicts: List[Conflict]):
+        """
+        Same result as GraphMerger's node_added branch (add the node, then
+        every incoming edge touching it whose endpoints both exist), with
+        id sets instead of find_node_by_id / find_edge_by_id scans.
+        """
+        graph = self.existing.graph
+        nodes_by_id = {node.node_id: node for node in graph.nodes}
+        edge_ids = {edge.edge_id for edge in graph.edges}
+        edge_types = {}
+        nodes_added = edges_added = 0
+
+        for conflict in conflicts:
+            inc_node = self.incoming.strat.get(normalise_name(conflict.node_name))
+            if inc_node is None:
+                continue
+            if inc_node.node_id not in nodes_by_id:
+                graph.nodes.append(inc_node)
+                nodes_by_id[inc_node.node_id] = inc_node
+                nodes_added += 1
+
+            for edge in self.incoming.incident.get(inc_node.node_id, ()):
+                source = nodes_by_id.get(edge.edge_source)
+                target = nodes_by_id.get(edge.edge_target)
+                if source is None or target is None or edge.edge_id in edge_ids:
+                    continue
+
+                type_key = (source.node_type, target.node_type, edge.edge_type)
+                edge_type = edge_types.get(type_key)
+                if edge_type is None:
+                    edge_type = edge.edge_type
+                    if not graph.validate_connection(*type_key):
+                        edge_type = "generic_connection"
+                    edge_types[type_key] = edge_type
+                if edge_type != edge.edge_type:
+                    graph.add_warning(
+                        f"Connection '{edge.edge_type}' not allowed between '{source.node_type}' "
+                        f"(name:{source.name}) and '{target.node_type}' (name:'{target.name}'). "
+                        f"Using 'generic_connection' instead.")
+
+                graph.edges.append(Edge(edge.edge_id, edge.edge_source, edge.edge_target, edge_type))
+                edge_ids.add(edge.edge_id)
+                edges_added += 1
+
+        graph._indices_dirty = True
+        print(f"[Merge] Added {nodes_added} nodes, {edges_added} edges")
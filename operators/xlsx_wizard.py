@@ -17,6 +17,7 @@ import os
 import random
 
 from ..functions import normalize_path
+from ..em_setup.excel_helpers import validate_excel_file, get_excel_sheets, get_excel_row_count
 
 
 def _random_epoch_hex_color():
@@ -52,6 +53,17 @@ class XLSX_WIZARD_OT_convert_stratigraphy(bpy.types.Operator):
             self.report({'ERROR'}, f"Stratigraphy file not found: {strat_file}")
             return {'CANCELLED'}
 
+        # Locked / unreadable workbook: fail before parsing (metadata is cached)
+        is_valid, error_msg = validate_excel_file(strat_file)
+        if not is_valid:
+            self.report({'ERROR'}, error_msg.replace('\n', ' '))
+            return {'CANCELLED'}
+
+        for sheet_name in get_excel_sheets(strat_file):
+            row_count = get_excel_row_count(strat_file, sheet_name)
+            print(f"Wizard Step 1: sheet '{sheet_name}': "
+                  f"{row_count if row_count is not None else '?'} rows")
+
         if not mapping_name:
             self.report({'ERROR'}, "No mapping name specified")
             return {'CANCELLED'}
@@ -188,55 +188,20 @@ def update_materials_visible_only(context, alpha_value: float) -> int:
     This is a viewport-culled version of update_property_materials_alpha.
     Use when you only need to update visible proxies (e.g., during interactive editing).
     """
-    from .material_cache import get_material_cache
-
-    cache = get_material_cache()
-    visible_objects = get_visible_objects(context)
-
-    # Get all property materials
-    all_materials = cache.get_property_materials()
-
-    updated_count = 0
-
-    for mat in all_materials:
-        # Check if any object using this material is visible
-        material_is_visible = False
-
-        for obj in bpy.data.objects:
-            if obj.name in visible_objects:
-                # Check if object uses this material
-                if obj.active_material and obj.active_material.name == mat.name:
-                    material_is_visible = True
-                    break
-                # Check material slots
-                for slot in obj.material_slots:
-                    if slot.material and slot.material.name == mat.name:
-                        material_is_visible = True
-                        break
-                if material_is_visible:
-                    break
-
-        if not material_is_visible:
-            continue  # Skip invisible materials
-
-        # Update visible material
-        principled_node = cache.get_principled_node(mat)
-
-        if principled_node:
-            if 'Alpha' in principled_node.inputs:
-                principled_node.inputs['Alpha'].default_value = alpha_value
-
-            current_color = principled_node.inputs['Base Color'].default_value
-            if len(current_color) >= 3:
-                new_color = (*current_color[:3], alpha_value)
-                principled_node.inputs['Base Color'].default_value = new_color
-
-            if alpha_value < 1.0:
-                mat.blend_method = 'BLEND'
-            else:
-                mat.blend_method = 'OPAQUE'
-
-            updated_count += 1
+    from .material_params import apply_material_params
+
+    # Materials used by visible objects, collected in one pass over the objects
+    visible_materials = set()
+    for name in get_visible_objects(context):
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            continue
+        for slot in obj.material_slots:
+            if slot.material:
+                visible_materials.add(slot.material.name)
+
+    updated_count = apply_material_params(alpha=alpha_value, families=('property',),
+                                          names=visible_materials)
 
     print(f"[OPTIMIZED] Updated {updated_count} visible materials (culled invisible)")
     return updated_count
@@ -0,0 +1,225 @@
+"""
+Paradata Closure Cache for EM-Tools
+===================================
+
+Memoises the paradata reachable from each stratigraphic unit so that moving
+the selection (or the property / combiner / extractor streaming target)
+copies cached rows into the UI lists instead of walking the graph again.
+
+For every graph one ParadataMemo keeps:
+- relation rows: (relation, node_id) -> rows, where relation is one of
+  'properties' (US -> property), 'combiners' (property -> combiner),
+  'extractors' (property/combiner -> extractor), 'documents'
+  (extractor -> document)
+- type rows: node_type -> rows of every node of that type (non-streaming
+  lists)
+
+A row is the plain tuple (name, description, url, id_node). The first time
+a US is requested its whole closure (properties, their combiners and
+extractors, the extractors of the combiners, the documents of every
+extractor) is resolved at once.
+
+The memo is tied to the generation of the graph's GraphEdgeIndex: any
+invalidate_graph_index() / edge count change rebuilds the index with a new
+generation and the memo of that graph is discarded. Values edited in place
+keep the generation: the editing paths call
+graph_index.invalidate_graph_values(graph).
+
+Performance Impact:
+- Before: 4 graph traversals + 4 RNA clear/refill per selection change
+- After: dict lookups; RNA lists untouched when their rows did not change
+
+Usage:
+    from .paradata_cache import get_paradata_memo, sync_paradata_list
+
+    memo = get_paradata_memo(graph)
+    rows = memo.related('properties', us_node_id)
+    sync_paradata_list(em_tools.em_v_properties_list, rows, icon_for)
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+Row = Tuple[str, str, str, str]
+
+
+# ============================================================================
+# ROW FORMATTING
+# ============================================================================
+
+def _text(node, attr: str) -> str:
+    value = getattr(node, attr, None)
+    return "" if value is None else str(value)
+
+
+def property_row(node) -> Row:
+    return (_text(node, 'name'), _text(node, 'description'), _text(node, 'value'), node.node_id)
+
+
+def combiner_row(node) -> Row:
+    url = getattr(node, 'url', None)
+    if url is None:
+        sources = getattr(node, 'sources', None)
+        url = sources[0] if sources else ""
+    return (_text(node, 'name'), _text(node, 'description'), str(url), node.node_id)
+
+
+def extractor_row(node) -> Row:
+    url = getattr(node, 'source', None)
+    if url is None:
+        url = getattr(node, 'url', None)
+    return (_text(node, 'name'), _text(node, 'description'), "" if url is None else str(url), node.node_id)
+
+
+def document_row(node) -> Row:
+    return (_text(node, 'name'), _text(node, 'description'), _text(node, 'url'), node.node_id)
+
+
+_ROW_FORMATTERS = {
+    'property': property_row,
+    'combiner': combiner_row,
+    'extractor': extractor_row,
+    'document': document_row,
+}
+
+
+# ============================================================================
+# PER-GRAPH MEMO
+# ============================================================================
+
+class ParadataMemo:
+    """Cached paradata rows of one graph, valid for one index generation."""
+
+    # relation -> (graph method, node type of the rows)
+    RELATIONS = {
+        'properties': ('get_property_nodes_for_node', 'property'),
+        'combiners': ('get_combiner_nodes_for_property', 'combiner'),
+        'extractors': ('get_extractor_nodes_for_node', 'extractor'),
+        'documents': ('get_document_nodes_for_extractor', 'document'),
+    }
+
+    def __init__(self, graph, generation: int):
+        self.graph = graph
+        self.generation = generation
+        self._relations: Dict[Tuple[str, str], List[Row]] = {}
+        self._types: Dict[str, List[Row]] = {}
+        self._closures = set()
+
+    def related(self, relation: str, node_id: str) -> List[Row]:
+        """Rows reached from node_id through relation (memoised)."""
+        key = (relation, node_id)
+        rows = self._relations.get(key)
+        if rows is None:
+            method_name, node_type = self.RELATIONS[relation]
+            try:
+                nodes = getattr(self.graph, method_name)(node_id) or []
+            except Exception as e:
+                print(f"[ParadataCache] {method_name}({node_id}) failed: {e}")
+                nodes = []
+            rows = [_ROW_FORMATTERS[node_type](node) for node in nodes
+                    if hasattr(node, 'node_id')]
+            self._relations[key] = rows
+        return rows
+
+    def nodes_of_type(self, node_type: str) -> List[Row]:
+        """Rows of every node of node_type (lists with streaming disabled)."""
+        rows = self._types.get(node_type)
+        if rows is None:
+            rows = [_ROW_FORMATTERS[node_type](node) for node in self.graph.nodes
+                    if getattr(node, 'node_type', None) == node_type]
+            self._types[node_type] = rows
+        return rows
+
+    def warm_closure(self, us_node_id: str):
+        """Resolve the full paradata closure of a US in one pass."""
+        if not us_node_id or us_node_id in self._closures:
+            return
+        self._closures.add(us_node_id)
+
+        for prop in self.related('properties', us_node_id):
+            prop_id = prop[3]
+            for comb in self.related('combiners', prop_id):
+                for extr in self.related('extractors', comb[3]):
+                    self.related('documents', extr[3])
+            for extr in self.related('extractors', prop_id):
+                self.related('documents', extr[3])
+
+
+_paradata_memos: Dict[str, ParadataMemo] = {}
+
+
+def get_paradata_memo(graph) -> ParadataMemo:
+    """
+    Memo of graph, discarded whenever its GraphEdgeIndex is rebuilt.
+
+    Args:
+        graph: s3dgraphy graph instance
+    """
+    from .graph_index import get_or_create_graph_index
+
+    index = get_or_create_graph_index(graph)
+    graph_id = graph.graph_id if hasattr(graph, 'graph_id') else str(id(graph))
+
+    memo = _paradata_memos.get(graph_id)
+    if memo is None or memo.graph is not graph or memo.generation != index.generation:
+        memo = ParadataMemo(graph, index.generation)
+        _paradata_memos[graph_id] = memo
+    return memo
+
+
+def invalidate_paradata_memos(graph=None):
+    """Drop the memo of graph (or every memo if graph is None)."""
+    if graph is None:
+        _paradata_memos.clear()
+        return
+    graph_id = graph.graph_id if hasattr(graph, 'graph_id') else str(id(graph))
+    _paradata_memos.pop(graph_id, None)
+
+
+def clear_paradata_memos():
+    """Drop every memo (addon reload / memory cleanup)."""
+    _paradata_memos.clear()
+
+
+# ============================================================================
+# RNA LIST SYNC
+# ============================================================================
+
+def sync_paradata_list(collection, rows: List[Row],
+                       icon_for: Optional[Callable[[str], str]] = None) -> bool:
+    """
+    Copy rows into a paradata UI list (EMListParadata collection).
+
+    The collection is left untouched when it already holds the same rows
+    with the same icons, so unchanged lists do not trigger RNA updates.
+
+    Returns:
+        bool: True if the collection was rewritten
+    """
+    wanted = []
+    for name, description, url, id_node in rows:
+        icon = "RESTRICT_INSTANCED_ON"
+        if icon_for is not None:
+            try:
+                icon = icon_for(name)
+            except Exception:
+                pass
+        wanted.append((name, description, url, id_node, icon))
+
+    if len(collection) == len(wanted) and all(
+        item.id_node == w[3] and item.name == w[0] and item.description == w[1]
+        and item.url == w[2] and item.icon == w[4]
+        for item, w in zip(collection, wanted)
+    ):
+        return False
+
+    collection.clear()
+    for name, description, url, id_node, icon in wanted:
+        item = collection.add()
+        item.name = name
+        item.description = description
+        item.url = url
+        item.id_node = id_node
+        item.icon = icon
+        item.icon_url = "WORLD" if url else "WORLD_DATA"
+    return True
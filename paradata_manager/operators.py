@@ -15,6 +15,7 @@ from ..functions import (
     is_valid_url,
     get_em_list_path,
 )
+from ..paradata_cache import get_paradata_memo, sync_paradata_list
 
 # Variabili globali per tracciare lo stato degli aggiornamenti
 _paradata_update_in_progress = False
@@ -356,20 +357,18 @@ class EM_OT_update_paradata_lists(bpy.types.Operator):
         _paradata_update_in_progress = True
 
         try:
-            em_tools.em_v_properties_list.clear()
-            em_tools.em_v_combiners_list.clear()
-            em_tools.em_v_extractors_list.clear()
-            em_tools.em_v_sources_list.clear()
+            graph = None
+            if em_tools.active_file_index >= 0 and em_tools.graphml_files:
+                graphml = em_tools.graphml_files[em_tools.active_file_index]
+                from s3dgraphy import get_graph
 
-            if em_tools.active_file_index < 0 or not em_tools.graphml_files:
-                set_paradata_update_state(False)
-                return {"FINISHED"}
+                graph = get_graph(graphml.name)
 
-            graphml = em_tools.graphml_files[em_tools.active_file_index]
-            from s3dgraphy import get_graph
-
-            graph = get_graph(graphml.name)
             if not graph:
+                em_tools.em_v_properties_list.clear()
+                em_tools.em_v_combiners_list.clear()
+                em_tools.em_v_extractors_list.clear()
+                em_tools.em_v_sources_list.clear()
                 set_paradata_update_state(False)
                 return {"FINISHED"}
 
@@ -378,7 +377,12 @@ class EM_OT_update_paradata_lists(bpy.types.Operator):
             if scene.em_tools.paradata_streaming_mode and strat.units_index >= 0 and len(strat.units) > 0:
                 strat_node_id = strat.units[strat.units_index].id_node
 
-            self.update_property_list(scene, graph, strat_node_id)
+            # Paradata rows come from the per-graph memo: the whole closure
+            # of the selected US is resolved once, later switches are lookups
+            memo = get_paradata_memo(graph)
+            memo.warm_closure(strat_node_id)
+
+            self.update_property_list(scene, memo, strat_node_id)
 
             if len(em_tools.em_v_properties_list) > 0:
                 if em_tools.em_v_properties_list_index >= len(em_tools.em_v_properties_list):
@@ -390,8 +394,12 @@ class EM_OT_update_paradata_lists(bpy.types.Operator):
                     and hasattr(em_tools.em_v_properties_list[em_tools.em_v_properties_list_index], "id_node")
                 ):
                     prop_node_id = em_tools.em_v_properties_list[em_tools.em_v_properties_list_index].id_node
-                    self.update_combiner_list(scene, graph, prop_node_id)
-                    self.update_extractor_list(scene, graph, prop_node_id)
+                    self.update_combiner_list(scene, memo, prop_node_id)
+                    self.update_extractor_list(scene, memo, prop_node_id)
+                else:
+                    # Lists are no longer cleared up-front: drop stale rows
+                    em_tools.em_v_combiners_list.clear()
+                    em_tools.em_v_extractors_list.clear()
 
                 if len(em_tools.em_v_extractors_list) > 0:
                     if em_tools.em_v_extractors_list_index >= len(em_tools.em_v_extractors_list):
@@ -399,7 +407,11 @@ class EM_OT_update_paradata_lists(bpy.types.Operator):
 
                     if em_tools.em_v_extractors_list_index >= 0:
                         ext_node_id = em_tools.em_v_extractors_list[em_tools.em_v_extractors_list_index].id_node
-                        self.update_document_list(scene, graph, ext_node_id)
+                        self.update_document_list(scene, memo, ext_node_id)
+                    else:
+                        em_tools.em_v_sources_list.clear()
+                else:
+                    em_tools.em_v_sources_list.clear()
             else:
                 em_tools.em_v_properties_list_index = -1
                 em_tools.em_v_combiners_list.clear()
@@ -432,64 +444,27 @@ class EM_OT_update_paradata_lists(bpy.types.Operator):
 
             _paradata_update_in_progress = False
 
-    def update_property_list(self, scene, graph, strat_node_id=None):
-        """Aggiorna la lista delle proprietà con controlli di sicurezza."""
-        em_tools = scene.em_tools
-        em_tools.em_v_properties_list.clear()
-
+    def update_property_list(self, scene, memo, strat_node_id=None):
+        """Aggiorna la lista delle proprietà dalla memo del grafo."""
         if strat_node_id:
-            prop_nodes = graph.get_property_nodes_for_node(strat_node_id)
+            rows = memo.related("properties", strat_node_id)
         else:
-            prop_nodes = [node for node in graph.nodes if hasattr(node, "node_type") and node.node_type == "property"]
-
-        for prop_node in prop_nodes:
-            item = em_tools.em_v_properties_list.add()
-            item.name = prop_node.name
-            item.description = prop_node.description if hasattr(prop_node, "description") else ""
-            raw_value = prop_node.value if hasattr(prop_node, "value") else ""
-            # Ensure string to avoid type errors on numbers
-            item.url = "" if raw_value is None else str(raw_value)
-            try:
-                item.icon = check_objs_in_scene_and_provide_icon_for_list_element(prop_node.name)
-            except Exception:
-                item.icon = "RESTRICT_INSTANCED_ON"
+            rows = memo.nodes_of_type("property")
 
-            item.icon_url = "WORLD" if item.url else "WORLD_DATA"
-            item.id_node = prop_node.node_id
+        sync_paradata_list(scene.em_tools.em_v_properties_list, rows,
+                           check_objs_in_scene_and_provide_icon_for_list_element)
 
-    def update_combiner_list(self, scene, graph, prop_node_id):
-        """Aggiorna la lista dei combiner in modo sicuro."""
+    def update_combiner_list(self, scene, memo, prop_node_id):
+        """Aggiorna la lista dei combiner dalla memo del grafo."""
         em_tools = scene.em_tools
-        em_tools.em_v_combiners_list.clear()
 
         if not scene.em_tools.prop_paradata_streaming_mode:
-            combiners = [node for node in graph.nodes if hasattr(node, "node_type") and node.node_type == "combiner"]
+            rows = memo.nodes_of_type("combiner")
         else:
-            try:
-                combiners = graph.get_combiner_nodes_for_property(prop_node_id)
-            except Exception:
-                combiners = []
-
-        for combiner in combiners:
-            item = em_tools.em_v_combiners_list.add()
-            item.name = combiner.name if hasattr(combiner, "name") and combiner.name is not None else ""
-            item.description = (
-                combiner.description if hasattr(combiner, "description") and combiner.description is not None else ""
-            )
-            if hasattr(combiner, "url") and combiner.url is not None:
-                item.url = combiner.url
-            elif hasattr(combiner, "sources") and combiner.sources and len(combiner.sources) > 0:
-                item.url = combiner.sources[0]
-            else:
-                item.url = ""
+            rows = memo.related("combiners", prop_node_id)
 
-            try:
-                item.icon = check_objs_in_scene_and_provide_icon_for_list_element(combiner.name)
-            except Exception:
-                item.icon = "RESTRICT_INSTANCED_ON"
-
-            item.icon_url = "WORLD" if item.url else "WORLD_DATA"
-            item.id_node = combiner.node_id
+        sync_paradata_list(em_tools.em_v_combiners_list, rows,
+                           check_objs_in_scene_and_provide_icon_for_list_element)
 
         if len(em_tools.em_v_combiners_list) > 0:
             if em_tools.em_v_combiners_list_index >= len(em_tools.em_v_combiners_list):
@@ -497,57 +472,33 @@ class EM_OT_update_paradata_lists(bpy.types.Operator):
         else:
             em_tools.em_v_combiners_list_index = -1
 
-    def update_extractor_list(self, scene, graph, node_id):
-        """Aggiorna la lista degli estrattori in modo sicuro."""
+    def update_extractor_list(self, scene, memo, node_id):
+        """Aggiorna la lista degli estrattori dalla memo del grafo."""
         em_tools = scene.em_tools
-        em_tools.em_v_extractors_list.clear()
-        extractors = []
 
         if em_tools.prop_paradata_streaming_mode:
-            try:
-                property_extractors = graph.get_extractor_nodes_for_node(node_id)
-                extractors.extend(property_extractors)
-
-                if (
-                    em_tools.comb_paradata_streaming_mode
-                    and em_tools.em_v_combiners_list_index >= 0
-                    and len(em_tools.em_v_combiners_list) > 0
-                ):
-                    comb_node_id = em_tools.em_v_combiners_list[em_tools.em_v_combiners_list_index].id_node
-                    combiner_extractors = graph.get_extractor_nodes_for_node(comb_node_id)
-                    extractors.extend(combiner_extractors)
-            except Exception:
-                pass
+            rows = list(memo.related("extractors", node_id))
+
+            if (
+                em_tools.comb_paradata_streaming_mode
+                and em_tools.em_v_combiners_list_index >= 0
+                and len(em_tools.em_v_combiners_list) > 0
+            ):
+                comb_node_id = em_tools.em_v_combiners_list[em_tools.em_v_combiners_list_index].id_node
+                rows.extend(memo.related("extractors", comb_node_id))
+
+            seen = set()
+            unique_rows = []
+            for row in rows:
+                if row[3] not in seen:
+                    seen.add(row[3])
+                    unique_rows.append(row)
+            rows = unique_rows
         else:
-            extractors = [node for node in graph.nodes if hasattr(node, "node_type") and node.node_type == "extractor"]
-
-        seen = set()
-        unique_extractors = []
-        for node in extractors:
-            if hasattr(node, "node_id") and node.node_id not in seen:
-                seen.add(node.node_id)
-                unique_extractors.append(node)
-
-        for extractor in unique_extractors:
-            item = em_tools.em_v_extractors_list.add()
-            item.name = extractor.name if hasattr(extractor, "name") and extractor.name is not None else ""
-            item.description = (
-                extractor.description if hasattr(extractor, "description") and extractor.description is not None else ""
-            )
-            if hasattr(extractor, "source") and extractor.source is not None:
-                item.url = extractor.source
-            elif hasattr(extractor, "url") and extractor.url is not None:
-                item.url = extractor.url
-            else:
-                item.url = ""
-
-            try:
-                item.icon = check_objs_in_scene_and_provide_icon_for_list_element(extractor.name)
-            except Exception:
-                item.icon = "RESTRICT_INSTANCED_ON"
+            rows = memo.nodes_of_type("extractor")
 
-            item.icon_url = "WORLD" if item.url else "WORLD_DATA"
-            item.id_node = extractor.node_id
+        sync_paradata_list(em_tools.em_v_extractors_list, rows,
+                           check_objs_in_scene_and_provide_icon_for_list_element)
 
         if len(em_tools.em_v_extractors_list) > 0:
             if em_tools.em_v_extractors_list_index >= len(em_tools.em_v_extractors_list):
@@ -555,32 +506,17 @@ class EM_OT_update_paradata_lists(bpy.types.Operator):
         else:
             em_tools.em_v_extractors_list_index = -1
 
-    def update_document_list(self, scene, graph, extractor_id):
-        """Aggiorna la lista dei documenti in modo sicuro."""
+    def update_document_list(self, scene, memo, extractor_id):
+        """Aggiorna la lista dei documenti dalla memo del grafo."""
         em_tools = scene.em_tools
-        em_tools.em_v_sources_list.clear()
 
         if em_tools.extr_paradata_streaming_mode:
-            try:
-                documents = graph.get_document_nodes_for_extractor(extractor_id)
-            except Exception:
-                documents = []
+            rows = memo.related("documents", extractor_id)
         else:
-            documents = [node for node in graph.nodes if hasattr(node, "node_type") and node.node_type == "document"]
-
-        for doc in documents:
-            item = em_tools.em_v_sources_list.add()
-            item.name = doc.name if hasattr(doc, "name") and doc.name is not None else ""
-            item.description = doc.description if hasattr(doc, "description") and doc.description is not None else ""
-            item.url = doc.url if hasattr(doc, "url") and doc.url is not None else ""
-
-            try:
-                item.icon = check_objs_in_scene_and_provide_icon_for_list_element(doc.name)
-            except Exception:
-                item.icon = "RESTRICT_INSTANCED_ON"
+            rows = memo.nodes_of_type("document")
 
-            item.icon_url = "WORLD" if item.url else "WORLD_DATA"
-            item.id_node = doc.node_id
+        sync_paradata_list(em_tools.em_v_sources_list, rows,
+                           check_objs_in_scene_and_provide_icon_for_list_element)
 
         if len(em_tools.em_v_sources_list) > 0:
             if em_tools.em_v_sources_list_index >= len(em_tools.em_v_sources_list):
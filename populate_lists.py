@@ -16,6 +16,8 @@ from .functions import (
     clean_value_for_ui
 )
 from .us_types import US_PROPER_TYPES
+# Shared with the GraphML worker processes (bpy-free)
+from .workers.em_graph_postprocess import graph_signature, precompute_chronology
 
 
 def get_connected_epoch_for_node(graph, node):
@@ -387,6 +389,20 @@ def update_graph_statistics(context, graph, graphml_file_item):
     print(f"Graph statistics updated: {stratigraphic_count} stratigraphic, {epoch_count} epochs, {property_count} properties, {document_count} documents")
 
 
+def ensure_chronology(graph):
+    """
+    Calculate chronology unless the background import has just done it for
+    this graph state (one-shot: later repopulations always recompute).
+    """
+    precomputed = getattr(graph, 'chronology_signature', None)
+    graph.chronology_signature = None
+    if precomputed is None or precomputed != graph_signature(graph):
+        try:
+            graph.calculate_chronology(graph)
+        except Exception as e:
+            print(f"Warning: chronology calculation failed: {e}")
+
+
 def populate_blender_lists_from_graph(context, graph):
     """
     Popola tutte le liste Blender da un grafo s3dgraphy.
@@ -437,10 +453,7 @@ def populate_blender_lists_from_graph(context, graph):
             epoch_nodes.append(node)
 
     # Calculate chronology (TPQ/TAQ propagation) for temporal filtering
-    try:
-        graph.calculate_chronology(graph)
-    except Exception as e:
-        print(f"Warning: chronology calculation failed: {e}")
+    ensure_chronology(graph)
 
     # Pre-compute instance chains from changed_from edges
     instance_chains = build_instance_chains(graph)
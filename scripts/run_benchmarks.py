@@ -0,0 +1,86 @@
+# scripts/run_benchmarks.py
+"""
+EM Tools headless benchmark suite runner.
+
+Usage:
+    blender -b --factory-startup --python scripts/run_benchmarks.py -- [options]
+
+Options:
+    --output PATH        Write results JSON to PATH
+    --baseline PATH      Baseline JSON to compare against
+                         (default: <blender config>/em_tools/benchmark_suite_baseline.json)
+    --update-baseline    Store these results as the new baseline
+    --tolerance FLOAT    Allowed slowdown before a case is a regression (default 0.25)
+    --repeat N           Repetitions per case, best time kept (default 3)
+    --only NAME [NAME..] Run only these case groups
+
+Exits with status 1 when a regression against the baseline is detected.
+"""
+
+import sys
+import argparse
+import importlib.util
+from pathlib import Path
+
+
+def import_addon():
+    """Import the add-on package from this repository checkout."""
+    root = Path(__file__).resolve().parent.parent
+    spec = importlib.util.spec_from_file_location(
+        "em_tools", root / "__init__.py",
+        submodule_search_locations=[str(root)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["em_tools"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="EM Tools benchmark suite")
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    import_addon()
+    from em_tools.surface_areale import benchmark
+
+    tolerance = args.tolerance if args.tolerance is not None else benchmark.DEFAULT_TOLERANCE
+    baseline_path = args.baseline or benchmark.get_default_baseline_path()
+
+    results = benchmark.run_benchmark_suite(repeat=args.repeat, only=args.only)
+
+    if args.output:
+        benchmark.save_suite_results(results, args.output)
+        print(f"📄 Results written to {args.output}")
+
+    status = 0
+    baseline = benchmark.load_suite_results(baseline_path)
+    if baseline is None:
+        print(f"ℹ️ No baseline at {baseline_path}")
+    else:
+        regressions = benchmark.compare_with_baseline(results, baseline, tolerance)
+        if regressions:
+            status = 1
+            print(f"❌ {len(regressions)} regression(s) (tolerance {tolerance:.0%}):")
+            for name, base_t, cur_t, ratio in regressions:
+                print(f"   {name}: {base_t * 1000:.2f} ms -> {cur_t * 1000:.2f} ms ({ratio:.2f}x)")
+        else:
+            print("✅ No regressions against baseline")
+
+    if args.update_baseline or baseline is None:
+        benchmark.save_suite_results(results, baseline_path)
+        print(f"💾 Baseline stored at {baseline_path}")
+
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
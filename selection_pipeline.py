@@ -0,0 +1,146 @@
+"""
+Stratigraphic Selection Pipeline for EM-Tools
+=============================================
+
+Coalesces the work triggered by a click (or an arrow key) in the
+stratigraphic list. The new selection is published immediately; the heavy
+follow-up stages run later, once the selection has settled, on debounced
+Blender timers (debounce.Debouncer):
+
+- overlay:   viewport overlay redraw (viewport_overlay.refresh_text)
+- thumbs:    document previews of the selected US + neighbour prefetch
+- paradata:  paradata lists rebuild (switch_paradata_lists)
+
+Every selection bumps a generation counter. A stage only runs if its
+generation is still the current one, so work queued for a US the user
+has already scrolled past is dropped instead of executed.
+
+Performance Impact:
+- Before: every list click rebuilt paradata lists and loaded previews
+  synchronously (keyboard scrolling through hundreds of US stuttered)
+- After: one rebuild per stage after the selection settles (~50-150ms)
+
+Usage:
+    from .selection_pipeline import publish_selection
+
+    def update_stratigraphic_selection(self, context):
+        publish_selection(context.scene.em_tools.stratigraphy)
+"""
+
+import bpy
+from typing import Optional
+
+from .debounce import get_debouncer, cancel_pending
+
+
+# Delay of each stage after the last selection change (seconds)
+OVERLAY_DELAY = 0.03
+THUMBS_DELAY = 0.08
+PARADATA_DELAY = 0.15
+
+_STAGE_NAMES = ('selection_overlay', 'selection_thumbs', 'selection_paradata')
+
+_selected_us_id: Optional[str] = None
+_generation = 0
+
+
+def get_selected_us_id() -> Optional[str]:
+    """id_node of the most recently selected US (published synchronously)."""
+    return _selected_us_id
+
+
+def is_current(generation: int) -> bool:
+    """True if no newer selection was published after generation."""
+    return generation == _generation
+
+
+def thumbs_pending() -> bool:
+    """True while the thumbnail stage of the current selection has not run yet."""
+    debouncer = get_debouncer('selection_thumbs', _run_thumbs_stage, THUMBS_DELAY)
+    return debouncer.pending_args is not None
+
+
+# ============================================================================
+# STAGES (run on Blender timers, main thread)
+# ============================================================================
+
+def _current_strat():
+    scene = getattr(bpy.context, "scene", None)
+    if scene is None or not hasattr(scene, "em_tools"):
+        return None
+    return scene.em_tools.stratigraphy
+
+
+def _run_overlay_stage(generation: int):
+    if not is_current(generation):
+        return
+    from . import viewport_overlay
+    viewport_overlay.refresh_text()
+
+
+def _run_thumbs_stage(generation: int, us_node_id: str):
+    if not is_current(generation) or not us_node_id:
+        return
+    strat = _current_strat()
+    if strat is None:
+        return
+
+    from .thumb_utils import reload_doc_previews_for_us, prefetch_adjacent_us_thumbs
+    # Usa la cache se disponibile, altrimenti carica una volta
+    reload_doc_previews_for_us(us_node_id)
+    # Warm the cache for the rows above/below
+    prefetch_adjacent_us_thumbs(strat)
+
+    # The documents panel was drawn with a "loading" placeholder
+    from . import viewport_overlay
+    viewport_overlay.refresh_text()
+
+
+def _run_paradata_stage(generation: int):
+    if not is_current(generation):
+        return
+
+    from .functions import switch_paradata_lists
+
+    # Dummy self for compatibility with switch_paradata_lists signature
+    class DummySelf:
+        pass
+
+    switch_paradata_lists(DummySelf(), bpy.context)
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def publish_selection(strat):
+    """
+    Publish the current row of strat.units and schedule the follow-up stages.
+
+    Cheap enough to be called from the units_index update callback: it only
+    records the id and (re)arms three debounced timers.
+    """
+    global _selected_us_id, _generation
+
+    us_node_id = None
+    if strat.units and 0 <= strat.units_index < len(strat.units):
+        us_node_id = strat.units[strat.units_index].id_node or None
+
+    _generation += 1
+    _selected_us_id = us_node_id
+    generation = _generation
+
+    get_debouncer('selection_overlay', _run_overlay_stage, OVERLAY_DELAY)(generation)
+    if us_node_id:
+        get_debouncer('selection_thumbs', _run_thumbs_stage, THUMBS_DELAY)(generation, us_node_id)
+    else:
+        cancel_pending('selection_thumbs')
+    get_debouncer('selection_paradata', _run_paradata_stage, PARADATA_DELAY)(generation)
+
+
+def cancel_selection_pipeline():
+    """Drop all pending stages (addon unregister / file load)."""
+    global _generation
+    _generation += 1
+    for name in _STAGE_NAMES:
+        cancel_pending(name)
@@ -1329,6 +1329,9 @@ class EM_set_EM_materials(Operator):
     
     def execute(self, context):
         context.scene.em_tools.proxy_display_mode = "EM"
+        # Colori nei materiali: esce dalla vista Solid "Object" del Visual Manager
+        from ..visual_manager.utils import set_viewport_object_color
+        set_viewport_object_color(context, False)
         update_icons(context, "em_list")
         bpy.ops.set_materials.using_em_list()
         return {'FINISHED'}
@@ -1342,6 +1345,9 @@ class EM_set_epoch_materials(Operator):
     def execute(self, context):
         is_landscape = getattr(context.scene, 'landscape_mode_active', False)
         context.scene.em_tools.proxy_display_mode = "Horizons" if is_landscape else "Epochs"
+        # Colori nei materiali: esce dalla vista Solid "Object" del Visual Manager
+        from ..visual_manager.utils import set_viewport_object_color
+        set_viewport_object_color(context, False)
         update_icons(context, "em_list")
         bpy.ops.set_materials.using_epoch_list()
         return {'FINISHED'}
@@ -1353,83 +1359,12 @@ class SET_materials_using_em_list(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        # ✅ AGGIUNTO: Import delle funzioni necessarie
-        from ..functions import consolidate_EM_material_presence, em_setup_mat_cycles
-        from ..functions import is_graph_available
-        from ..operators.addon_prefix_helpers import node_name_to_proxy_name
-        
-        # ✅ AGGIUNTO: Ottieni il grafo attivo una sola volta
-        graph_exists, graph = is_graph_available(context)
-        active_graph = graph if graph_exists else None
-        
-        # Prepare EM materials
-        overwrite_mats = True
-        consolidate_EM_material_presence(overwrite_mats)
-        
-        # Apply materials based on node types
-        strat = context.scene.em_tools.stratigraphy  # ✅ Nuovo
-        em_list_lenght = len(strat.units)
-        applied_count = 0  # ✅ AGGIUNTO: Counter per il report
-
-        counter = 0
-        while counter < em_list_lenght:
-            current_ob_em_list = strat.units[counter]
-            if current_ob_em_list.icon == 'LINKED':
-                # ✅ MODIFICATO: Converti il nome con prefisso
-                proxy_name = node_name_to_proxy_name(
-                    current_ob_em_list.name, 
-                    context=context, 
-                    graph=active_graph
-                )
-                
-                # Use get() instead of [] to avoid KeyError
-                current_ob_scene = context.scene.objects.get(proxy_name)
-                
-                if not current_ob_scene:
-                    counter += 1
-                    continue
-                
-                ob_material_name = 'US'  # Default
-                
-                # Check the node_type first (most reliable method)
-                if hasattr(current_ob_em_list, 'node_type') and current_ob_em_list.node_type:
-                    if current_ob_em_list.node_type in US_PROPER_TYPES:
-                        ob_material_name = current_ob_em_list.node_type
-                else:
-                    ob_material_name ='US'
-                    pass
-                    # to be removed after testing: fallback to shape-based method for legacy items without node_type
-                    if current_ob_em_list.shape == 'rectangle':
-                        ob_material_name = 'US'
-                    elif current_ob_em_list.shape == 'ellipse_white':
-                        ob_material_name = 'US'
-                    elif current_ob_em_list.shape == 'ellipse':
-                        ob_material_name = 'USVn'
-                    elif current_ob_em_list.shape == 'parallelogram':
-                        ob_material_name = 'USVs'
-                    elif current_ob_em_list.shape == 'hexagon':
-                        ob_material_name = 'USVn'
-                    elif current_ob_em_list.shape == 'octagon':
-                        # Check border style for octagon shapes
-                        if current_ob_em_list.border_style == '#D8BD30':
-                            ob_material_name = 'SF'
-                        elif current_ob_em_list.border_style == '#B19F61':
-                            ob_material_name = 'VSF'
-                        else:
-                            # Default for octagon without recognized border
-                            ob_material_name = 'VSF'
-                    elif current_ob_em_list.shape == 'roundrectangle':
-                        ob_material_name = 'USD'
-                
-                if ob_material_name in bpy.data.materials:
-                    mat = bpy.data.materials[ob_material_name]
-                    current_ob_scene.data.materials.clear()
-                    current_ob_scene.data.materials.append(mat)
-                    applied_count += 1
+        from ..functions import apply_EM_materials
 
-            counter += 1
+        # Materiali consolidati una volta, slot già corretti non riscritti
+        applied_count, changed_count = apply_EM_materials(context)
 
-        self.report({'INFO'}, f"Applied EM materials to {applied_count} objects")
+        self.report({'INFO'}, f"Applied EM materials to {applied_count} objects ({changed_count} changed)")
         
         return {'FINISHED'}
 
@@ -553,7 +553,10 @@ class EM_ToolsPanel:
         # ✅ FIXED: Use reload_doc_previews_for_us() instead of inline code
         if strat.show_documents:
             from ..functions import is_graph_available
-            from ..thumb_utils import reload_doc_previews_for_us, has_doc_thumbs
+            from ..thumb_utils import (
+                reload_doc_previews_for_us, get_cached_doc_previews_for_us, has_doc_thumbs
+            )
+            from ..selection_pipeline import thumbs_pending
 
             graph_available, graph = is_graph_available(context)
 
@@ -584,12 +587,16 @@ class EM_ToolsPanel:
                 info_box.label(text="Select 'List' or 'Gallery' to view documents")
                 return
 
-            # Get thumbnails from cache (already loaded by update_stratigraphic_selection)
-            # This avoids reloading on every UI redraw
+            # Get thumbnails from cache (loaded by the selection pipeline once
+            # the selection settles). While the user is still scrolling, draw a
+            # placeholder instead of loading previews inside draw()
             try:
-                # This will ALWAYS return from cache because update_stratigraphic_selection
-                # already loaded them when the US was selected
-                enum_items = reload_doc_previews_for_us(selected_us.id_node)
+                enum_items = get_cached_doc_previews_for_us(selected_us.id_node)
+                if enum_items is None:
+                    if thumbs_pending():
+                        docs_box.label(text="Loading documents...", icon='TIME')
+                        return
+                    enum_items = reload_doc_previews_for_us(selected_us.id_node)
 
                 if not enum_items:
                     docs_box.label(text="No documents found for this unit", icon='INFO')
@@ -3,6 +3,9 @@ Performance benchmark and time estimation for Surface Areale strategies.
 
 Runs a micro-benchmark on first use to calibrate time estimates.
 Results are saved in addon preferences for future sessions.
+
+Also hosts the headless benchmark suite for the geometry hot paths
+(see run_benchmark_suite and scripts/run_benchmarks.py).
 """
 
 import bpy
@@ -22,6 +25,30 @@ _benchmark_cache = {
     'calibrated': False
 }
 
+# Fallback coefficients used until a benchmark (or a real run) calibrates
+# the model. Same units as _benchmark_cache.
+_DEFAULT_COEFFS = {
+    'bool_coeff': 2.0,      # 2s per million polys
+    'proj_coeff': 0.001,    # 1ms per contour point
+    'shrink_coeff': 0.5,    # 0.5s per thousand verts
+}
+
+# Fixed per-strategy overhead (seconds) and the cache key of its coefficient
+_STRATEGY_COST_MODEL = {
+    'PROJECTIVE': ('proj_coeff', 0.1),    # BVH overhead
+    'SHRINKWRAP': ('shrink_coeff', 0.5),  # modifier overhead
+    'BOOLEAN': ('bool_coeff', 0.5),       # boolean solver overhead
+}
+
+# Weight of a new measurement when updating a coefficient from a real run
+_LEARNING_RATE = 0.3
+
+# Max number of predicted-vs-actual samples kept in the calibration file
+_MAX_HISTORY = 50
+
+# Predicted vs actual timings of real runs (persisted with the calibration)
+_run_history = []
+
 
 def estimate_time(strategy, rm_poly_count, contour_point_count):
     """
@@ -36,30 +63,32 @@ def estimate_time(strategy, rm_poly_count, contour_point_count):
         Tuple (seconds_estimate, confidence)
         confidence is 'calibrated' or 'estimated'
     """
+    if strategy not in _STRATEGY_COST_MODEL:
+        return 1.0, 'unknown'
+
     if _benchmark_cache['calibrated']:
         confidence = 'calibrated'
-        k_bool = _benchmark_cache['bool_coeff']
-        k_proj = _benchmark_cache['proj_coeff']
-        k_shrink = _benchmark_cache['shrink_coeff']
+        coeffs = _benchmark_cache
     else:
         # Default estimates based on typical hardware
         confidence = 'estimated'
-        k_bool = 2.0     # 2s per million polys
-        k_proj = 0.001   # 1ms per contour point
-        k_shrink = 0.5   # 0.5s per thousand verts
+        coeffs = _DEFAULT_COEFFS
+
+    key, overhead = _STRATEGY_COST_MODEL[strategy]
+    work = _strategy_work_units(strategy, rm_poly_count, contour_point_count)
+    return coeffs[key] * work + overhead, confidence
+
 
+def _strategy_work_units(strategy, rm_poly_count, contour_point_count):
+    """Size of the problem in the units the strategy coefficient is expressed in."""
     if strategy == 'PROJECTIVE':
-        t = k_proj * contour_point_count + 0.1  # BVH overhead
-        return t, confidence
+        return contour_point_count
     elif strategy == 'SHRINKWRAP':
         est_verts = contour_point_count * 10  # after subdivision
-        t = k_shrink * (est_verts / 1000.0) + 0.5  # modifier overhead
-        return t, confidence
+        return est_verts / 1000.0
     elif strategy == 'BOOLEAN':
-        t = k_bool * (rm_poly_count / 1_000_000.0) + 0.5  # boolean solver overhead
-        return t, confidence
-    else:
-        return 1.0, 'unknown'
+        return rm_poly_count / 1_000_000.0
+    return 0.0
 
 
 def format_time_estimate(seconds):
@@ -168,6 +197,110 @@ def get_strategy_estimates(rm_poly_count, contour_point_count):
     return estimates
 
 
+# ══════════════════════════════════════════════════════════════════════
+# COST-AWARE STRATEGY SELECTION
+# ══════════════════════════════════════════════════════════════════════
+
+# Strategies from cheapest/least accurate to slowest/most accurate
+STRATEGY_ORDER = ('PROJECTIVE', 'SHRINKWRAP', 'BOOLEAN')
+
+
+def estimate_strategy_quality(strategy, analysis):
+    """
+    Estimate how faithfully a strategy reproduces the surface (0..1).
+
+    Based on the metrics returned by strategies.classify_complexity():
+    Projective degrades quickly with out-of-plane spread and normal
+    variation, Shrinkwrap handles edges/corners but not fully 3D
+    surfaces, Boolean is always exact.
+    """
+    planarity = analysis['planarity']
+    normal_var = analysis['normal_variation']
+
+    if strategy == 'PROJECTIVE':
+        # 1.0 on a flat slab, ~0.5 at the scenario A/B boundary
+        penalty = planarity / 0.04 + normal_var / 40.0
+    elif strategy == 'SHRINKWRAP':
+        # ~0.5 at the scenario B/C boundary
+        penalty = planarity / 0.3 + normal_var / 180.0
+    elif strategy == 'BOOLEAN':
+        return 1.0
+    else:
+        return 0.0
+
+    return max(0.0, min(1.0, 1.0 - 0.5 * penalty))
+
+
+def select_fastest_strategy(analysis, rm_poly_count, contour_point_count,
+                            quality_threshold=0.5):
+    """
+    Pick the fastest strategy whose estimated quality meets the threshold.
+
+    Args:
+        analysis: dict from strategies.classify_complexity()
+        rm_poly_count: polygons the Boolean solver will see (LOD applied)
+        contour_point_count: number of points in the contour
+        quality_threshold: minimum acceptable quality (0..1)
+
+    Returns:
+        Tuple (strategy, predicted_seconds, candidates) where candidates is
+        a list of (strategy, seconds, quality) for every strategy.
+    """
+    candidates = []
+    for strat in STRATEGY_ORDER:
+        t, _conf = estimate_time(strat, rm_poly_count, contour_point_count)
+        candidates.append((strat, t, estimate_strategy_quality(strat, analysis)))
+
+    eligible = [c for c in candidates if c[2] >= quality_threshold]
+    if not eligible:
+        # Nothing is good enough: fall back to the most accurate strategy
+        eligible = [candidates[-1]]
+
+    best = min(eligible, key=lambda c: c[1])
+    return best[0], best[1], candidates
+
+
+def record_run(strategy, rm_poly_count, contour_point_count,
+               predicted_seconds, actual_seconds):
+    """
+    Feed the measured time of a real run back into the cost model.
+
+    The coefficient of the strategy is moved towards the value that would
+    have predicted the run exactly, and the sample is appended to the run
+    history. The result is persisted with save_calibration().
+    """
+    if strategy not in _STRATEGY_COST_MODEL or actual_seconds <= 0:
+        return
+
+    _run_history.append({
+        "strategy": strategy,
+        "rm_polys": int(rm_poly_count),
+        "contour_points": int(contour_point_count),
+        "predicted": round(float(predicted_seconds), 4),
+        "actual": round(float(actual_seconds), 4),
+    })
+    del _run_history[:-_MAX_HISTORY]
+
+    if not _benchmark_cache['calibrated']:
+        # A real measurement is a better starting point than a guess
+        for key, value in _DEFAULT_COEFFS.items():
+            if _benchmark_cache[key] is None:
+                _benchmark_cache[key] = value
+        _benchmark_cache['calibrated'] = True
+
+    key, overhead = _STRATEGY_COST_MODEL[strategy]
+    work = _strategy_work_units(strategy, rm_poly_count, contour_point_count)
+    if work > 0:
+        observed = max(actual_seconds - overhead, 0.0) / work
+        current = _benchmark_cache[key]
+        _benchmark_cache[key] = current + _LEARNING_RATE * (observed - current)
+
+    print(f"[SurfaceAreale] {strategy}: predicted "
+          f"{format_time_estimate(predicted_seconds)}, "
+          f"actual {actual_seconds:.2f}s")
+    save_calibration()
+
+
 # ══════════════════════════════════════════════════════════════════════
 # CALIBRATION PERSISTENCE
 # ══════════════════════════════════════════════════════════════════════
@@ -193,6 +326,7 @@ def save_calibration():
         "bool_coeff": _benchmark_cache['bool_coeff'],
         "proj_coeff": _benchmark_cache['proj_coeff'],
         "shrink_coeff": _benchmark_cache['shrink_coeff'],
+        "history": _run_history,
     }
 
     try:
@@ -233,6 +367,7 @@ def load_calibration():
     _benchmark_cache['proj_coeff'] = data['proj_coeff']
     _benchmark_cache['shrink_coeff'] = data['shrink_coeff']
     _benchmark_cache['calibrated'] = True
+    _run_history[:] = data.get("history", [])[-_MAX_HISTORY:]
 
     return True
 
@@ -240,3 +375,383 @@ def load_calibration():
 def is_calibrated():
     """Check if calibration data is available (in-memory or on disk)."""
     return _benchmark_cache['calibrated']
+
+
+# ══════════════════════════════════════════════════════════════════════
+# HEADLESS BENCHMARK SUITE
+# ══════════════════════════════════════════════════════════════════════
+#
+# Reproducible timings of the geometry hot paths on synthetic meshes,
+# used to catch performance regressions before rolling out add-on
+# updates. Runnable headless through scripts/run_benchmarks.py:
+#
+#     blender -b --python scripts/run_benchmarks.py -- --output results.json
+#
+# Every case builds its own seeded synthetic data, times the call
+# (best of N repeats) and removes every datablock it created.
+
+SUITE_VERSION = 1
+
+# Default regression tolerance: 25% slower than baseline
+DEFAULT_TOLERANCE = 0.25
+
+# Differences below this (seconds) are noise, never a regression
+_MIN_REGRESSION_DELTA = 0.005
+
+# Icosphere subdivisions for BVH build cases (~1k, ~20k, ~80k faces)
+_BVH_SUBDIVISIONS = (3, 5, 6)
+
+
+class _SuiteSettings:
+    """Stand-in for SurfaceArealeSettings / ProxyProjectionSettings."""
+
+    def __init__(self, **kwargs):
+        self.strategy = 'PROJECTIVE'
+        self.use_lod = False
+        self.lod_factor = 1.0
+        self.auto_quality_threshold = 0.5
+        self.conformity_threshold = 0.001
+        self.subdivision_iterations = 3
+        self.batch_size = 'MEDIUM'
+        self.max_ray_distance = 10.0
+        self.ray_casting_precision = 'MEDIUM'
+        self.blend_strength = 0.5
+        self.__dict__.update(kwargs)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+def _link_mesh_object(name, bm):
+    """Write a bmesh to a new object linked to the active collection."""
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.collection.objects.link(obj)
+    return obj
+
+
+def _make_sphere(name, subdivisions, radius=1.0, location=(0.0, 0.0, 0.0)):
+    """Synthetic closed mesh (icosphere)."""
+    bm = bmesh.new()
+    bmesh.ops.create_icosphere(bm, subdivisions=subdivisions, radius=radius)
+    obj = _link_mesh_object(name, bm)
+    obj.location = location
+    return obj
+
+
+def _make_terrain(name, size, subdivisions, seed=0, amplitude=0.02):
+    """Synthetic open RM: a seeded noisy grid (floors, slabs, frescoes)."""
+    import numpy as np
+
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=subdivisions, y_segments=subdivisions,
+                          size=size / 2.0)
+    rng = np.random.RandomState(seed)
+    noise = rng.uniform(-amplitude, amplitude, len(bm.verts))
+    for v, dz in zip(bm.verts, noise):
+        v.co.z += dz
+    return _link_mesh_object(name, bm)
+
+
+def _make_circle_contour(n_points, radius=0.5, z=0.0, seed=0, jitter=0.0):
+    """Synthetic closed contour (list of Vector) on the XY plane."""
+    import math
+    import numpy as np
+
+    rng = np.random.RandomState(seed)
+    points = []
+    for i in range(n_points):
+        a = 2.0 * math.pi * i / n_points
+        r = radius + (rng.uniform(-jitter, jitter) if jitter else 0.0)
+        points.append(Vector((r * math.cos(a), r * math.sin(a), z)))
+    return points
+
+
+def _make_star_contour(n_points, radius=0.5):
+    """Synthetic self-intersecting contour (2D), a {n/3} star polygon."""
+    import math
+
+    step = max(1, n_points // 3)
+    return [Vector((radius * math.cos(2.0 * math.pi * (i * step) / n_points),
+                    radius * math.sin(2.0 * math.pi * (i * step) / n_points)))
+            for i in range(n_points)]
+
+
+def _remove_objects(objects):
+    """Remove objects created by a case, with their mesh data."""
+    for obj in objects:
+        if obj is None or obj.name not in bpy.data.objects:
+            continue
+        mesh_data = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if mesh_data and mesh_data.users == 0:
+            bpy.data.meshes.remove(mesh_data)
+
+
+def _time_call(func, repeat):
+    """Best-of-N wall time of func() (seconds). Returns (best, last_result)."""
+    best = None
+    result = None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+# ── Cases ─────────────────────────────────────────────────────────────
+# Each case takes ``repeat`` and returns a list of
+# (case_name, seconds, size_info_dict).
+
+def _case_bvh_build(repeat):
+    from .contour_builder import create_bvh_from_object
+
+    rows = []
+    for subdiv in _BVH_SUBDIVISIONS:
+        obj = _make_sphere(f"_bench_bvh_{subdiv}", subdiv)
+        try:
+            t, _ = _time_call(lambda: create_bvh_from_object(obj), repeat)
+            rows.append((f"bvh_build_ico{subdiv}", t,
+                         {"polys": len(obj.data.polygons)}))
+        finally:
+            _remove_objects([obj])
+    return rows
+
+
+def _case_contour(repeat):
+    from .contour_builder import (resample_contour, validate_contour,
+                                  _find_self_intersections)
+
+    rows = []
+    contour = _make_circle_contour(2000, jitter=0.01)
+    t, result = _time_call(lambda: resample_contour(contour, 0.003), repeat)
+    rows.append(("contour_resample", t,
+                 {"points_in": len(contour), "points_out": len(result)}))
+
+    star = _make_star_contour(400)
+    t, result = _time_call(lambda: _find_self_intersections(star), repeat)
+    rows.append(("contour_self_intersection", t,
+                 {"points": len(star), "intersections": len(result)}))
+
+    contour_3d = _make_circle_contour(400, jitter=0.01)
+    t, _ = _time_call(lambda: validate_contour(contour_3d, auto_fix=True), repeat)
+    rows.append(("contour_validate", t, {"points": len(contour_3d)}))
+    return rows
+
+
+def _case_strategies(repeat):
+    from .contour_builder import create_bvh_from_object, reproject_on_surface
+    from .strategies import (strategy_projective, strategy_shrinkwrap,
+                             strategy_boolean, _cleanup_objects)
+
+    rows = []
+    rm_obj = _make_terrain("_bench_rm", size=2.0, subdivisions=200)
+    try:
+        bvh = create_bvh_from_object(rm_obj)
+        contour = _make_circle_contour(150, radius=0.4, seed=1, jitter=0.02)
+        projected = reproject_on_surface(contour, bvh)
+        points = [p for p, _n in projected]
+        normals = [n for _p, n in projected]
+        whisker = Vector((0.0, 0.0, 0.0))
+        settings = _SuiteSettings()
+
+        for name, func in (('PROJECTIVE', strategy_projective),
+                           ('SHRINKWRAP', strategy_shrinkwrap),
+                           ('BOOLEAN', strategy_boolean)):
+            produced = []
+
+            def run(func=func):
+                obj = func(points, normals, whisker, rm_obj, bvh, settings)
+                produced.append(obj)
+                return obj
+
+            try:
+                t, _ = _time_call(run, repeat)
+            finally:
+                _cleanup_objects([o for o in produced if o is not None
+                                  and o.name in bpy.data.objects])
+            rows.append((f"strategy_{name.lower()}", t,
+                         {"rm_polys": len(rm_obj.data.polygons),
+                          "contour_points": len(points)}))
+    finally:
+        _remove_objects([rm_obj])
+    return rows
+
+
+def _case_postprocess(repeat):
+    from .contour_builder import create_bvh_from_object
+    from .postprocess import decimate_preserving_boundary, count_overlapping_areali
+
+    rows = []
+    rm_obj = _make_terrain("_bench_rm_post", size=2.0, subdivisions=60)
+    created = [rm_obj]
+    try:
+        bvh = create_bvh_from_object(rm_obj)
+
+        def decimate():
+            obj = _make_terrain("_bench_decimate", size=0.5, subdivisions=80, seed=2)
+            created.append(obj)
+            t0 = time.perf_counter()
+            decimate_preserving_boundary(obj, 500, 0.001, bvh)
+            return time.perf_counter() - t0
+
+        t = min(decimate() for _ in range(max(1, repeat)))
+        rows.append(("decimate_preserving_boundary", t, {"faces_in": 80 * 80}))
+
+        material = bpy.data.materials.new("M_Areale_bench")
+        try:
+            n_children = 200
+            for i in range(n_children):
+                child = _make_terrain(f"_bench_areale_{i}", size=0.2,
+                                      subdivisions=2, seed=i)
+                child.location = ((i % 20) * 0.1 - 1.0, (i // 20) * 0.1 - 1.0, 0.0)
+                child.data.materials.append(material)
+                child.parent = rm_obj
+                created.append(child)
+            probe = created[-1]
+            t, result = _time_call(
+                lambda: count_overlapping_areali(probe, rm_obj), repeat)
+            rows.append(("count_overlapping_areali", t,
+                         {"children": n_children, "overlaps": result}))
+        finally:
+            bpy.data.materials.remove(material)
+    finally:
+        _remove_objects(created)
+    return rows
+
+
+def _case_proxy_projection(repeat):
+    from ..proxy_to_rm_projection.utils import calculate_vertex_proxy_intersection
+
+    rm_obj = _make_terrain("_bench_proj_rm", size=2.0, subdivisions=100)
+    proxies = [_make_sphere(f"_bench_proj_proxy_{i}", 2, radius=0.3,
+                            location=(i * 0.5 - 0.75, 0.0, 0.0))
+               for i in range(4)]
+    try:
+        proxy_data = [{'object': p, 'color': (1.0, 0.0, 0.0, 1.0),
+                       'name': p.name, 'node_type': 'US'} for p in proxies]
+        settings = _SuiteSettings()
+        t, result = _time_call(
+            lambda: calculate_vertex_proxy_intersection(
+                {'object': rm_obj}, proxy_data, settings),
+            repeat)
+        return [("proxy_to_rm_projection", t,
+                 {"rm_verts": len(rm_obj.data.vertices),
+                  "proxies": len(proxies), "hits": len(result)})]
+    finally:
+        _remove_objects([rm_obj] + proxies)
+
+
+def _case_statistics(repeat):
+    from ..em_statistics.metrics import calculate_object_metrics
+
+    obj = _make_sphere("_bench_stats", 5)
+    meshes_before = set(bpy.data.meshes)
+    try:
+        t, _ = _time_call(
+            lambda: calculate_object_metrics(obj, "none", {}), repeat)
+        return [("em_statistics_object_metrics", t,
+                 {"polys": len(obj.data.polygons)})]
+    finally:
+        _remove_objects([obj])
+        # Drop any mesh copies left behind by the metrics call
+        for mesh in set(bpy.data.meshes) - meshes_before:
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+
+
+BENCHMARK_CASES = (
+    ('bvh_build', _case_bvh_build),
+    ('contour', _case_contour),
+    ('strategies', _case_strategies),
+    ('postprocess', _case_postprocess),
+    ('proxy_projection', _case_proxy_projection),
+    ('statistics', _case_statistics),
+)
+
+
+def run_benchmark_suite(repeat=3, only=None):
+    """
+    Run every benchmark case and return a JSON-serialisable result dict.
+
+    Args:
+        repeat: repetitions per case; the best time is kept
+        only: optional iterable of case group names to run
+
+    Returns:
+        dict with 'version', 'blender_version', 'repeat' and 'results'
+        ({case_name: {'seconds': float, ...size info}})
+    """
+    results = {}
+    for group, func in BENCHMARK_CASES:
+        if only and group not in only:
+            continue
+        print(f"[SurfaceAreale] Benchmark: {group}...")
+        try:
+            for name, seconds, info in func(repeat):
+                results[name] = dict(info, seconds=round(seconds, 6))
+                print(f"[SurfaceAreale]   {name}: {seconds * 1000:.2f} ms")
+        except Exception as e:
+            print(f"[SurfaceAreale]   {group} failed: {e}")
+            results[f"{group}_error"] = {"error": str(e)}
+
+    return {
+        "version": SUITE_VERSION,
+        "blender_version": ".".join(str(v) for v in bpy.app.version[:3]),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_with_baseline(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare suite results against a baseline.
+
+    Returns:
+        List of (case_name, baseline_seconds, current_seconds, ratio) for
+        every case slower than baseline by more than ``tolerance``.
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, entry in current.get("results", {}).items():
+        base = base_results.get(name)
+        if not base or "seconds" not in base or "seconds" not in entry:
+            continue
+        base_t, cur_t = base["seconds"], entry["seconds"]
+        if cur_t - base_t < _MIN_REGRESSION_DELTA:
+            continue
+        ratio = cur_t / base_t if base_t > 0 else float('inf')
+        if ratio > 1.0 + tolerance:
+            regressions.append((name, base_t, cur_t, ratio))
+    return regressions
+
+
+def get_default_baseline_path():
+    """Return path to the stored benchmark suite baseline."""
+    return os.path.join(os.path.dirname(_get_calibration_path()),
+                        "benchmark_suite_baseline.json")
+
+
+def save_suite_results(results, path):
+    """Write suite results to a JSON file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_suite_results(path):
+    """Load suite results from JSON. Returns None if missing or invalid."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[SurfaceAreale] Failed to load benchmark results: {e}")
+        return None
+    if data.get("version") != SUITE_VERSION:
+        return None
+    return data
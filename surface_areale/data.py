@@ -92,6 +92,8 @@ class SurfaceArealeSettings(PropertyGroup):
         description="Generation strategy for the surface areale",
         items=[
             ('AUTO', 'Auto', 'Automatically classify surface complexity and choose best strategy'),
+            ('FASTEST', 'Auto (Fastest)', 'Classify surface complexity and pick the fastest strategy '
+                                          'that meets the quality threshold, using the calibrated time estimates'),
             ('PROJECTIVE', 'Projective', 'For nearly-planar surfaces — fast (frescoes, slabs, floors)'),
             ('SHRINKWRAP', 'Shrinkwrap', 'For surfaces with edges/corners — medium (architraves, cornices)'),
             ('BOOLEAN', 'Boolean', 'For fully 3D surfaces — slower but most accurate (capitals, reliefs)'),
@@ -99,6 +101,17 @@ class SurfaceArealeSettings(PropertyGroup):
         default='AUTO'
     )
 
+    auto_quality_threshold: FloatProperty(
+        name="Quality Threshold",
+        description="Minimum estimated surface fidelity for the Auto (Fastest) strategy. "
+                    "Higher values favour slower, more accurate strategies",
+        default=0.5,
+        min=0.0,
+        max=1.0,
+        precision=2,
+        subtype='FACTOR'
+    )
+
     # ── Paradata (pre-filled, editable) ──────────────────────────────
     extractor_name: StringProperty(
         name="Extractor Method",
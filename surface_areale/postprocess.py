@@ -490,6 +490,8 @@ def link_areale_to_graph(context, areale_obj, rm_obj, settings):
     assign_em_naming(areale_obj, graph, us_node.name, context)
     # Update PropertyNode value with the final proxy name
     prop_node.value = areale_obj.name
+    from ..graph_index import invalidate_graph_values
+    invalidate_graph_values(graph)
 
     # ── 8. Refresh UI lists ───────────────────────────────────────────
     # ``us_is_new=False`` is correct now: Surface Areas never creates
@@ -8,6 +8,7 @@ Three strategies with increasing complexity:
 
 import bpy
 import bmesh
+import time
 import numpy as np
 from mathutils import Vector, Matrix
 from mathutils.bvhtree import BVHTree
@@ -23,10 +24,20 @@ def generate_areale(contour_points, contour_normals, whisker_point,
     """
     Dispatch to the correct strategy based on settings.strategy.
     If strategy is 'AUTO', runs the complexity classifier first.
+    If strategy is 'FASTEST', combines the classifier with the calibrated
+    cost model and picks the fastest strategy meeting the quality threshold.
+
+    The measured run time is fed back into the benchmark calibration.
 
     Returns: bpy.types.Object (the areale mesh)
     """
+    from . import benchmark
+
     strategy = settings.strategy
+    rm_poly_count = len(rm_obj.data.polygons)
+    if settings.use_lod and settings.lod_factor < 1.0:
+        rm_poly_count = int(rm_poly_count * settings.lod_factor)
+    contour_point_count = len(contour_points)
 
     if strategy == 'AUTO':
         analysis = classify_complexity(contour_points, contour_normals, bvh_tree)
@@ -35,19 +46,41 @@ def generate_areale(contour_points, contour_normals, whisker_point,
               f"(planarity={analysis['planarity']:.3f}, "
               f"normal_var={analysis['normal_variation']:.1f}°) "
               f"→ {strategy}")
+    elif strategy == 'FASTEST':
+        analysis = classify_complexity(contour_points, contour_normals, bvh_tree)
+        strategy, _predicted, candidates = benchmark.select_fastest_strategy(
+            analysis, rm_poly_count, contour_point_count,
+            settings.auto_quality_threshold)
+        summary = ", ".join(
+            f"{name}={benchmark.format_time_estimate(t)}/q{q:.2f}"
+            for name, t, q in candidates)
+        print(f"[SurfaceAreale] Fastest-classified: {analysis['scenario']} "
+              f"({summary}) → {strategy}")
 
     if strategy == 'PROJECTIVE':
-        return strategy_projective(contour_points, contour_normals,
-                                   whisker_point, rm_obj, bvh_tree, settings)
+        func = strategy_projective
     elif strategy == 'SHRINKWRAP':
-        return strategy_shrinkwrap(contour_points, contour_normals,
-                                   whisker_point, rm_obj, bvh_tree, settings)
+        func = strategy_shrinkwrap
     elif strategy == 'BOOLEAN':
-        return strategy_boolean(contour_points, contour_normals,
-                                whisker_point, rm_obj, bvh_tree, settings)
+        func = strategy_boolean
     else:
         raise ValueError(f"Unknown strategy: {strategy}")
 
+    predicted, _conf = benchmark.estimate_time(
+        strategy, rm_poly_count, contour_point_count)
+    t0 = time.perf_counter()
+    result = func(contour_points, contour_normals,
+                  whisker_point, rm_obj, bvh_tree, settings)
+    actual = time.perf_counter() - t0
+
+    try:
+        benchmark.record_run(strategy, rm_poly_count, contour_point_count,
+                             predicted, actual)
+    except Exception as e:
+        print(f"[SurfaceAreale] Could not record timing: {e}")
+
+    return result
+
 
 # ══════════════════════════════════════════════════════════════════════
 # COMPLEXITY CLASSIFIER
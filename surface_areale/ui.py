@@ -215,9 +215,11 @@ class VIEW3D_PT_SurfaceAreale_Settings(Panel):
 
         # Strategy selection with time estimates
         layout.prop(settings, "strategy")
+        if settings.strategy == 'FASTEST':
+            layout.prop(settings, "auto_quality_threshold")
 
-        # LOD controls (only for BOOLEAN or AUTO strategy)
-        if settings.strategy in ('BOOLEAN', 'AUTO'):
+        # LOD controls (only for BOOLEAN or AUTO strategies)
+        if settings.strategy in ('BOOLEAN', 'AUTO', 'FASTEST'):
             col = layout.column(align=True)
             col.prop(settings, "use_lod")
             if settings.use_lod:
@@ -239,7 +241,7 @@ class VIEW3D_PT_SurfaceAreale_Settings(Panel):
                     box.label(text=f"  LOD: {effective_count:,} polys ({settings.lod_factor:.0%})")
                 for strat, (t, label) in estimates.items():
                     icon = 'CHECKMARK' if strat == settings.strategy else 'DOT'
-                    if settings.strategy == 'AUTO':
+                    if settings.strategy in ('AUTO', 'FASTEST'):
                         icon = 'DOT'
                     box.label(text=f"  {strat}: {label}", icon=icon)
                 row = box.row()
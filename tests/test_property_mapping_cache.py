@@ -0,0 +1,88 @@
+"""
+Property mapping memo of the Visual Manager: in-place value edits.
+
+Loads visual_manager/property_mapping_cache.py (and the bpy-free modules it
+imports) without running the addon's __init__ files, which need Blender.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("s3dgraphy")
+
+from s3dgraphy import Graph
+from s3dgraphy.nodes.property_node import PropertyNode
+from s3dgraphy.nodes.stratigraphic_node import StratigraphicUnit
+
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "em_tools_under_test"
+
+
+def _load_cache_module():
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [ADDON_DIR]
+        sys.modules[PACKAGE] = package
+        subpackage = types.ModuleType(f"{PACKAGE}.visual_manager")
+        subpackage.__path__ = [os.path.join(ADDON_DIR, "visual_manager")]
+        sys.modules[f"{PACKAGE}.visual_manager"] = subpackage
+    return importlib.import_module(f"{PACKAGE}.visual_manager.property_mapping_cache")
+
+
+@pytest.fixture
+def cache():
+    module = _load_cache_module()
+    module.clear_property_mapping_memos()
+    yield module
+    module.clear_property_mapping_memos()
+
+
+def _graph():
+    graph = Graph(graph_id="mapping_test")
+    graph.add_node(StratigraphicUnit("us1", "US1"))
+    graph.add_node(StratigraphicUnit("us2", "US2"))
+    graph.add_node(PropertyNode("p1", "material", description="stone"))
+    graph.add_edge("e1", "us1", "p1", "has_property")
+    return graph
+
+
+def test_mapping_is_memoised(cache):
+    graph = _graph()
+
+    memo = cache.get_property_mapping_memo(graph)
+    assert memo.mapping("material") == {"US1": "stone", "US2": "no property material node"}
+    assert cache.get_property_mapping_memo(graph) is memo
+
+
+def test_in_place_edit_rebuilds_after_invalidate(cache):
+    graph = _graph()
+    assert cache.get_property_mapping_memo(graph).mapping("material")["US1"] == "stone"
+
+    # Same nodes and edges: only an explicit invalidation reveals the edit
+    graph.find_node_by_id("p1").description = "brick"
+    cache.invalidate_property_mappings(graph)
+
+    memo = cache.get_property_mapping_memo(graph)
+    assert memo.mapping("material")["US1"] == "brick"
+    assert "stone" not in memo.values("material")
+
+
+def test_graph_values_change_drops_paradata_and_mappings(cache):
+    graph_index = importlib.import_module(f"{PACKAGE}.graph_index")
+    paradata_cache = importlib.import_module(f"{PACKAGE}.paradata_cache")
+    graph = _graph()
+
+    mappings = cache.get_property_mapping_memo(graph)
+    paradata = paradata_cache.get_paradata_memo(graph)
+    assert paradata.related('properties', 'us1')[0][1] == "stone"
+
+    graph.find_node_by_id("p1").description = "brick"
+    graph_index.invalidate_graph_values(graph)
+
+    assert cache.get_property_mapping_memo(graph) is not mappings
+    assert paradata_cache.get_paradata_memo(graph).related('properties', 'us1')[0][1] == "brick"
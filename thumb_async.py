@@ -8,12 +8,14 @@ Eliminates UI freezes during image loading and resizing operations.
 Performance Impact:
 - Before: 0.5-3 seconds UI freeze per US selection
 - After: Instant return, background loading, auto-refresh when ready
-- Memory: LRU cache limits to 128 thumbnails (~50-100 MB max)
+- Memory: LRU cache bounded by a byte budget (default 64 MB of decoded
+  previews), O(1) OrderedDict bookkeeping
 
 Features:
 - Background thread for PIL image operations
 - Queue-based task processing
-- LRU cache with size limit
+- LRU cache with byte budget (ByteBudgetLRU, also used by thumb_utils)
+- Low-priority prefetch of neighbouring US rows
 - Auto-refresh UI when thumbnails ready
 - Thread-safe result delivery
 
@@ -22,14 +24,17 @@ Date: 2025-12-20
 """
 
 import bpy
+import itertools
 import threading
 import queue
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional, Callable
 from pathlib import Path
 from functools import lru_cache
-import json
 import time
 
+from .thumb_index import get_thumb_index
+
 
 # Try to import PIL, handle if not available
 try:
@@ -40,6 +45,90 @@ except ImportError:
     print("[ThumbnailLoader] Warning: PIL not available, thumbnail loading disabled")
 
 
+# Decoded preview of a 256x256 RGBA thumbnail held by Blender
+THUMB_BYTES_ESTIMATE = 256 * 256 * 4
+ENTRY_OVERHEAD_BYTES = 1024
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Task priorities (lower runs first)
+PRIORITY_REQUEST = 0
+PRIORITY_PREFETCH = 1
+
+
+def estimate_thumbnails_bytes(thumbnails: List[Tuple]) -> int:
+    """Approximate memory held for a list of thumbnail tuples."""
+    return ENTRY_OVERHEAD_BYTES + len(thumbnails) * THUMB_BYTES_ESTIMATE
+
+
+class ByteBudgetLRU:
+    """
+    LRU mapping bounded by an estimated size in bytes.
+
+    OrderedDict keeps the recency order (move_to_end / popitem are O(1)).
+    on_evict(key, value) is called for every evicted entry, so owners can
+    release what the entry refers to (e.g. preview collection images).
+    Not thread-safe: callers hold their own lock.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES,
+                 size_of: Callable = estimate_thumbnails_bytes,
+                 on_evict: Optional[Callable] = None):
+        self.max_bytes = max_bytes
+        self._size_of = size_of
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[str, Tuple[object, int]]" = OrderedDict()
+        self.total_bytes = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, key):
+        value, _size = self._entries[key]
+        self._entries.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        if key not in self._entries:
+            return default
+        return self[key]
+
+    def __setitem__(self, key, value):
+        size = self._size_of(value)
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.total_bytes += size
+        self._evict()
+
+    def __delitem__(self, key):
+        _value, size = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def _evict(self):
+        # Keep at least the newest entry, even if alone it exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, (value, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            if self._on_evict:
+                try:
+                    self._on_evict(key, value)
+                except Exception as e:
+                    print(f"[ThumbnailLoader] Error releasing '{key}': {e}")
+
+    def keys(self):
+        return list(self._entries.keys())
+
+    def values(self):
+        return [value for value, _size in self._entries.values()]
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+
 class ThumbnailTask:
     """Single thumbnail loading task"""
 
@@ -63,20 +152,22 @@ class ThumbnailLoader:
     Background thumbnail loader with LRU cache.
 
     Uses a worker thread to load and process images without blocking UI.
-    Results are cached with LRU eviction to limit memory usage.
+    Results are cached with LRU eviction to limit memory usage; prefetch
+    tasks run only when no user request is waiting.
     """
 
-    def __init__(self, max_cache_size: int = 128):
+    def __init__(self, max_cache_bytes: int = DEFAULT_CACHE_BYTES):
         """
         Initialize thumbnail loader.
 
         Args:
-            max_cache_size: Maximum number of thumbnail sets to cache (default 128)
+            max_cache_bytes: Memory budget of cached thumbnail sets (default 64 MB)
         """
-        self.max_cache_size = max_cache_size
-        self._task_queue = queue.Queue()
-        self._results_cache: Dict[str, List[Tuple]] = {}
-        self._cache_order: List[str] = []  # For LRU tracking
+        self.max_cache_bytes = max_cache_bytes
+        self._task_queue = queue.PriorityQueue()
+        self._task_counter = itertools.count()
+        self._pending_ids = set()
+        self._results_cache = ByteBudgetLRU(max_cache_bytes)
         self._lock = threading.Lock()
         self._worker_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
@@ -129,20 +220,36 @@ class ThumbnailLoader:
         The function returns immediately with cached data if available.
         If not cached, it queues a background load task and returns empty list.
         """
-        # Check cache first
+        # Check cache first (also updates LRU order)
         with self._lock:
             if us_node_id in self._results_cache:
-                # Update LRU order
-                self._cache_order.remove(us_node_id)
-                self._cache_order.append(us_node_id)
                 return self._results_cache[us_node_id].copy()
+            self._pending_ids.add(us_node_id)
 
         # Not in cache, queue background load
         task = ThumbnailTask(us_node_id, aux_files, callback)
-        self._task_queue.put(task)
+        self._task_queue.put((PRIORITY_REQUEST, next(self._task_counter), task))
 
         return []  # Return empty, will update when ready
 
+    def prefetch(self, us_node_ids: List[str], aux_files: List):
+        """
+        Queue low-priority loads for US ids that are neither cached nor pending.
+
+        Args:
+            us_node_ids: US node IDs likely to be selected next
+            aux_files: List of auxiliary files to search
+        """
+        with self._lock:
+            wanted = [us_id for us_id in us_node_ids
+                      if us_id and us_id not in self._results_cache
+                      and us_id not in self._pending_ids]
+            self._pending_ids.update(wanted)
+
+        for us_id in wanted:
+            task = ThumbnailTask(us_id, aux_files)
+            self._task_queue.put((PRIORITY_PREFETCH, next(self._task_counter), task))
+
     def get_cached(self, us_node_id: str) -> List[Tuple]:
         """
         Get cached thumbnails without queuing load.
@@ -155,9 +262,6 @@ class ThumbnailLoader:
         """
         with self._lock:
             if us_node_id in self._results_cache:
-                # Update LRU order
-                self._cache_order.remove(us_node_id)
-                self._cache_order.append(us_node_id)
                 return self._results_cache[us_node_id].copy()
         return []
 
@@ -165,7 +269,6 @@ class ThumbnailLoader:
         """Clear all cached thumbnails"""
         with self._lock:
             self._results_cache.clear()
-            self._cache_order.clear()
         print("[ThumbnailLoader] Cache cleared")
 
     def _worker(self):
@@ -173,7 +276,7 @@ class ThumbnailLoader:
         while not self._stop_event.is_set():
             try:
                 # Get task from queue (timeout to check stop_event)
-                task = self._task_queue.get(timeout=0.1)
+                _priority, _seq, task = self._task_queue.get(timeout=0.1)
 
                 # Process task
                 start_time = time.time()
@@ -203,28 +306,15 @@ class ThumbnailLoader:
 
     def _cache_result(self, us_node_id: str, thumbnails: List[Tuple]):
         """
-        Cache result with LRU eviction.
+        Cache result with LRU eviction (byte budget).
 
         Args:
             us_node_id: US node ID
             thumbnails: Thumbnail data
         """
         with self._lock:
-            # Add/update cache
-            if us_node_id in self._results_cache:
-                # Already cached, just update order
-                self._cache_order.remove(us_node_id)
-            else:
-                # New entry, check cache size
-                if len(self._results_cache) >= self.max_cache_size:
-                    # Evict least recently used
-                    lru_key = self._cache_order.pop(0)
-                    del self._results_cache[lru_key]
-                    print(f"[ThumbnailLoader] Evicted LRU entry: {lru_key}")
-
-            # Add to cache and mark as most recently used
+            self._pending_ids.discard(us_node_id)
             self._results_cache[us_node_id] = thumbnails
-            self._cache_order.append(us_node_id)
 
     def _load_thumbnails_sync(self, us_node_id: str, aux_files) -> List[Tuple[str, str, str, int, int]]:
         """
@@ -250,21 +340,17 @@ class ThumbnailLoader:
                 # Resolve resource path
                 resource_path = Path(aux_file.resource_folder).resolve()
                 thumbs_dir = resource_path / 'thumbs'
-                index_file = thumbs_dir / 'index.json'
 
-                if not index_file.exists():
+                if not (thumbs_dir / 'index.json').exists():
                     continue
 
-                # Load index JSON
-                with open(index_file, 'r', encoding='utf-8') as f:
-                    index_data = json.load(f)
+                # Cached index: parsed once, then only mtime checks
+                us_docs = get_thumb_index(thumbs_dir).extra.get(us_node_id)
 
                 # Filter by us_node_id
-                if us_node_id not in index_data:
+                if not us_docs:
                     continue
 
-                us_docs = index_data[us_node_id]
-
                 # Process each document
                 for doc_info in us_docs:
                     thumb_path = thumbs_dir / doc_info.get('thumbnail', '')
@@ -297,7 +383,8 @@ class ThumbnailLoader:
             return {
                 'running': self._running,
                 'cache_size': len(self._results_cache),
-                'max_cache_size': self.max_cache_size,
+                'cache_bytes': self._results_cache.total_bytes,
+                'max_cache_bytes': self.max_cache_bytes,
                 'pending_tasks': self._task_queue.qsize(),
                 'cached_us_ids': list(self._results_cache.keys())
             }
@@ -323,7 +410,7 @@ def get_thumbnail_loader() -> ThumbnailLoader:
     global _thumbnail_loader
 
     if _thumbnail_loader is None:
-        _thumbnail_loader = ThumbnailLoader(max_cache_size=128)
+        _thumbnail_loader = ThumbnailLoader()
         _thumbnail_loader.start()
 
     return _thumbnail_loader
@@ -399,6 +486,18 @@ def load_thumbnails_async(us_node_id: str, aux_files: List,
     return loader.request_thumbnails(us_node_id, aux_files, on_ready)
 
 
+def prefetch_thumbnails_async(us_node_ids: List[str], aux_files: List):
+    """
+    Queue low-priority background loads for US ids likely to be selected next.
+
+    Args:
+        us_node_ids: US node IDs (e.g. rows adjacent to the selection)
+        aux_files: Auxiliary files to search
+    """
+    loader = get_thumbnail_loader()
+    loader.prefetch(us_node_ids, aux_files)
+
+
 def get_cached_thumbnails(us_node_id: str) -> List[Tuple]:
     """
     Get cached thumbnails without loading.
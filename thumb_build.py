@@ -0,0 +1,522 @@
+"""
+Parallel Thumbnail Build Pipeline for EM-Tools
+==============================================
+
+Generates document thumbnails in worker processes instead of serially in
+the operator, keeping Blender responsive.
+
+Performance Impact:
+- Before: one image decoded and resized at a time, UI frozen for the whole
+  build (minutes for a few thousand documents)
+- After: images decoded/resized in a process pool (one process per spare
+  core), PDFs rendered in a separate smaller pool, UI responsive
+
+Features:
+- Images and PDFs in separate pools (PyMuPDF pages are memory hungry)
+- Progress polled by bpy.app.timers on the main thread; index entries are
+  only appended from the main thread
+- Resumable: the job list is kept in thumbs_root/build_queue.json and every
+  finished job is appended to build_done.log once its index entry has been
+  written, so an interrupted build continues with the pending jobs only
+- Falls back to a thread pool when worker processes cannot be started
+
+Usage:
+    from .thumb_build import plan_thumbnail_jobs, start_thumbnail_build
+
+    jobs, stats = plan_thumbnail_jobs(resource_folder, thumbs_root, get_thumb_index(thumbs_root))
+    start_thumbnail_build(thumbs_root, jobs)
+"""
+
+import bpy
+import json
+import os
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .thumb_index import ThumbIndex, get_thumb_index
+from .worker_processes import import_worker_module, detached_main
+
+
+QUEUE_FILE = "build_queue.json"
+DONE_FILE = "build_done.log"
+QUEUE_VERSION = 1
+
+POLL_INTERVAL = 0.25        # seconds between timer ticks
+INDEX_SAVE_EVERY = 200      # completed jobs between index + done log appends
+IN_FLIGHT_PER_WORKER = 4    # submitted-but-unfinished jobs per worker
+
+SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.pdf'}
+
+
+# ============================================================================
+# WORKER MODULE
+# ============================================================================
+
+def get_worker_counts() -> Tuple[int, int]:
+    """(image_workers, pdf_workers) for this machine."""
+    cpu_count = os.cpu_count() or 2
+    image_workers = max(1, min(cpu_count - 1, 8))
+    pdf_workers = max(1, min(image_workers // 4, 2))
+    return image_workers, pdf_workers
+
+
+# ============================================================================
+# PLANNING
+# ============================================================================
+
+def _relative_src_path(file_path: str) -> str:
+    """Path of file_path relative to the .blend (absolute if not possible)."""
+    blend_path = bpy.data.filepath
+    if not blend_path:
+        return file_path
+    try:
+        return os.path.relpath(file_path, os.path.dirname(blend_path)).replace("\\", "/")
+    except ValueError:
+        # file_path e blend_dir su drive diversi (Windows)
+        return file_path
+
+
+def plan_thumbnail_jobs(resource_folder: str, thumbs_root: Path,
+                        index: ThumbIndex) -> Tuple[List[Dict], Dict]:
+    """
+    Scan resource_folder and list the thumbnails that need (re)generation.
+
+    Entries re-keyed or dropped while planning are written to the index
+    in one batch.
+
+    Returns:
+        Tuple (jobs, stats) where stats has 'found' and 'skipped'
+    """
+    from .thumb_utils import get_stat_key, resolve_doc_key, stat_matches, get_thumb_path
+
+    worker = import_worker_module("em_thumb_worker")
+    jobs = []
+    stats = {'found': 0, 'skipped': 0}
+    items = dict(index.items)
+    changes = {}
+
+    for root, _dirs, files in os.walk(resource_folder):
+        for filename in files:
+            if os.path.splitext(filename)[1].lower() not in SUPPORTED_FORMATS:
+                continue
+
+            file_path = os.path.join(root, filename)
+            stats['found'] += 1
+
+            stat_key = get_stat_key(file_path)
+            if stat_key is None:
+                print(f"  → ERROR: {filename} - not accessible")
+                continue
+
+            # Chiave basata su path + size + mtime_ns (il file non viene letto)
+            doc_key = resolve_doc_key(file_path, items, stat_key)
+            file_hash = doc_key[len("doc_"):]
+            src_path = _relative_src_path(file_path)
+
+            stored_item = items.get(doc_key)
+            if stored_item is not None and (thumbs_root / stored_item.get("thumb", "")).is_file():
+                stats['skipped'] += 1
+                continue
+
+            # Voce esistente per src_path: migrazione dalle chiavi content-hash
+            # o sostituzione della thumbnail di un file modificato
+            old_key = index.find_by_src_path(src_path)
+            if old_key is not None and old_key != doc_key and old_key in items:
+                old_item = items[old_key]
+                old_thumb = thumbs_root / old_item.get("thumb", "")
+                unchanged = (stat_matches(old_item, file_path, stat_key)
+                             or (not old_item.get("src_stat")
+                                 and old_item.get("src_mtime", 0) >= stat_key[2] / 1e9))
+                if unchanged and old_thumb.is_file():
+                    # Voce valida con la vecchia chiave: ri-indicizza senza rigenerare
+                    items[doc_key] = dict(items.pop(old_key), src_stat=[stat_key[1], stat_key[2]],
+                                          file_hash=file_hash)
+                    changes[old_key] = None
+                    changes[doc_key] = items[doc_key]
+                    stats['skipped'] += 1
+                    continue
+
+                # File modificato: la vecchia thumbnail viene sostituita
+                items.pop(old_key, None)
+                changes[old_key] = None
+                if old_thumb.is_file() and old_thumb != get_thumb_path(file_path, thumbs_root, file_hash):
+                    try:
+                        old_thumb.unlink()
+                    except OSError:
+                        pass
+
+            thumb_path = get_thumb_path(file_path, thumbs_root, file_hash)
+
+            jobs.append({
+                'doc_key': doc_key,
+                'src': file_path,
+                'thumb': str(thumb_path),
+                'thumb_rel': str(thumb_path.relative_to(thumbs_root)).replace("\\", "/"),
+                'src_path': src_path,
+                'src_stat': [stat_key[1], stat_key[2]],
+                'file_hash': file_hash,
+                'filename': filename,
+                'kind': worker.job_kind(file_path),
+            })
+
+    if changes:
+        index.update(changes)
+    return jobs, stats
+
+
+# ============================================================================
+# RESUMABLE QUEUE
+# ============================================================================
+
+def save_job_queue(thumbs_root: Path, jobs: List[Dict]):
+    """Write the job list and reset the done log."""
+    queue_path = Path(thumbs_root) / QUEUE_FILE
+    tmp_path = queue_path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': QUEUE_VERSION, 'jobs': jobs}, f)
+    os.replace(tmp_path, queue_path)
+    done_path = Path(thumbs_root) / DONE_FILE
+    if done_path.exists():
+        done_path.unlink()
+
+
+def load_pending_jobs(thumbs_root: Path) -> List[Dict]:
+    """Jobs of an interrupted build that are not in the done log yet."""
+    queue_path = Path(thumbs_root) / QUEUE_FILE
+    if not queue_path.exists():
+        return []
+    try:
+        with open(queue_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"[ThumbBuild] Could not read {queue_path}: {e}")
+        return []
+    if data.get('version') != QUEUE_VERSION:
+        return []
+
+    done = set()
+    done_path = Path(thumbs_root) / DONE_FILE
+    if done_path.exists():
+        with open(done_path, 'r', encoding='utf-8') as f:
+            done = {line.strip() for line in f if line.strip()}
+
+    return [job for job in data.get('jobs', []) if job['doc_key'] not in done]
+
+
+def clear_job_queue(thumbs_root: Path):
+    """Remove the queue files of a finished build."""
+    for name in (QUEUE_FILE, DONE_FILE):
+        path = Path(thumbs_root) / name
+        try:
+            if path.exists():
+                path.unlink()
+        except OSError as e:
+            print(f"[ThumbBuild] Could not remove {path}: {e}")
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+class ThumbnailBuildPipeline:
+    """
+    Runs a list of thumbnail jobs in two pools and merges results on the
+    main thread.
+
+    start() submits the first window of jobs and registers the timer;
+    every tick collects finished futures and tops the pools up again.
+    Index entries and done-log keys are written in batches, the index
+    first: a key in the done log always has its thumbnail indexed.
+    """
+
+    def __init__(self, thumbs_root: Path, jobs: List[Dict], index: ThumbIndex):
+        self.thumbs_root = Path(thumbs_root)
+        self.index = index
+        self.total = len(jobs)
+        self.generated = 0
+        self.errors = 0
+        self.started_at = 0.0
+        self.finished = False
+        self.cancelled = False
+
+        # Reversed: jobs are popped from the end, in scan order
+        self._pending = {
+            'image': [job for job in reversed(jobs) if job['kind'] != 'pdf'],
+            'pdf': [job for job in reversed(jobs) if job['kind'] == 'pdf'],
+        }
+        self._executors = {}
+        self._limits = {}
+        self._in_flight = {'image': {}, 'pdf': {}}
+        self._done_file = None
+        self._changes = {}
+        self._done_keys = []
+
+    # ------------------------------------------------------------------
+
+    def _create_executor(self, workers: int):
+        worker = import_worker_module("em_thumb_worker")
+        try:
+            import multiprocessing
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'))
+            return executor, worker.run_job
+        except Exception as e:
+            print(f"[ThumbBuild] Process pool unavailable ({e}), using threads")
+            return ThreadPoolExecutor(max_workers=workers), worker.run_job
+
+    def start(self):
+        image_workers, pdf_workers = get_worker_counts()
+        for kind, workers in (('image', image_workers), ('pdf', pdf_workers)):
+            if self._pending[kind]:
+                self._executors[kind] = self._create_executor(workers)
+                self._limits[kind] = workers * IN_FLIGHT_PER_WORKER
+
+        self._done_file = open(self.thumbs_root / DONE_FILE, 'a', encoding='utf-8')
+        self.started_at = time.time()
+        print(f"[ThumbBuild] Building {self.total} thumbnails "
+              f"({len(self._pending['image'])} images with {image_workers} workers, "
+              f"{len(self._pending['pdf'])} PDFs with {pdf_workers} workers)")
+        self._submit()
+
+    def _submit(self):
+        # Worker processes are started lazily by submit()
+        with detached_main():
+            self._submit_pending()
+
+    def _submit_pending(self):
+        for kind, (executor, job_func) in self._executors.items():
+            pending = self._pending[kind]
+            in_flight = self._in_flight[kind]
+            while pending and len(in_flight) < self._limits[kind]:
+                job = pending.pop()
+                try:
+                    future = executor.submit(job_func, job)
+                except Exception as e:
+                    # Pool broken (e.g. a worker crashed): count and move on
+                    print(f"[ThumbBuild] Error submitting {job['filename']}: {e}")
+                    self.errors += 1
+                    continue
+                in_flight[future] = job
+
+    def _collect(self):
+        for in_flight in self._in_flight.values():
+            for future in [f for f in in_flight if f.done()]:
+                job = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    # Worker processes cannot run here: redo the job in threads
+                    self._fallback_to_threads(e)
+                    self._pending['pdf' if job['kind'] == 'pdf' else 'image'].append(job)
+                    continue
+                except CancelledError:
+                    # Queued job of a pool shut down by _fallback_to_threads:
+                    # not done, submit it again to the new pool
+                    self._pending['pdf' if job['kind'] == 'pdf' else 'image'].append(job)
+                    continue
+                except Exception as e:
+                    result = {'ok': False, 'error': str(e)}
+
+                if result.get('ok'):
+                    self.generated += 1
+                    self._changes[job['doc_key']] = {
+                        "thumb": job['thumb_rel'],
+                        "src_path": job['src_path'],  # ✅ Path RELATIVO al .blend!
+                        "src_mtime": result['src_mtime'],
+                        "src_size": result['src_size'],
+                        # Stat del planning: è quello da cui deriva doc_key
+                        "src_stat": job.get('src_stat') or [result['src_size'], result['src_mtime_ns']],
+                        "file_hash": job['file_hash'],
+                        "filename": job['filename'],
+                    }
+                else:
+                    self.errors += 1
+                    print(f"[ThumbBuild] Error generating {job['filename']}: {result.get('error')}")
+
+                # Errors are done too: a resumed build does not retry them
+                self._done_keys.append(job['doc_key'])
+
+        if len(self._done_keys) >= INDEX_SAVE_EVERY:
+            self._save_index()
+
+    def _fallback_to_threads(self, error):
+        for kind, (executor, job_func) in list(self._executors.items()):
+            if isinstance(executor, ThreadPoolExecutor):
+                continue
+            print(f"[ThumbBuild] Process pool failed ({error}), using threads for {kind}")
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executors[kind] = (ThreadPoolExecutor(max_workers=self._limits[kind] // IN_FLIGHT_PER_WORKER),
+                                     job_func)
+
+    def _save_index(self):
+        # Append-only: only the new entries are written. The done keys of
+        # the batch follow the index: after a crash the unsaved batch is
+        # simply rebuilt on resume
+        self.index.update(self._changes)
+        self._changes = {}
+        if self._done_keys and self._done_file:
+            self._done_file.write("".join(key + "\n" for key in self._done_keys))
+            self._done_file.flush()
+        self._done_keys = []
+
+    @property
+    def completed(self) -> int:
+        return self.generated + self.errors
+
+    def is_idle(self) -> bool:
+        return (not any(self._pending.values())
+                and not any(self._in_flight.values()))
+
+    def tick(self) -> bool:
+        """Timer step. Returns True while the build is running."""
+        self._collect()
+        if self.cancelled or self.is_idle():
+            self._finish()
+            return False
+        self._submit()
+        return True
+
+    def cancel(self):
+        self.cancelled = True
+        for pending in self._pending.values():
+            pending.clear()
+
+    def _finish(self):
+        for executor, _job_func in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+
+        # Jobs still running when cancelled are not in the done log: they
+        # stay pending in the queue file and are rebuilt on resume
+        for in_flight in self._in_flight.values():
+            in_flight.clear()
+
+        self._save_index()
+        if self._done_file:
+            self._done_file.close()
+            self._done_file = None
+        if not self.cancelled:
+            clear_job_queue(self.thumbs_root)
+
+        self.finished = True
+        elapsed = time.time() - self.started_at
+        state = "cancelled" if self.cancelled else "completed"
+        print(f"[ThumbBuild] Build {state}: {self.generated} generated, "
+              f"{self.errors} errors, {self.total - self.completed} pending "
+              f"in {elapsed:.1f}s")
+
+    def progress_text(self) -> str:
+        percent = (100.0 * self.completed / self.total) if self.total else 100.0
+        return f"Thumbnails: {self.completed}/{self.total} ({percent:.0f}%)"
+
+
+# ============================================================================
+# GLOBAL BUILD + TIMER
+# ============================================================================
+
+_active_build: Optional[ThumbnailBuildPipeline] = None
+
+
+def get_active_build() -> Optional[ThumbnailBuildPipeline]:
+    """Running build, if any."""
+    if _active_build is not None and not _active_build.finished:
+        return _active_build
+    return None
+
+
+def _redraw_ui():
+    try:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type in ('VIEW_3D', 'PROPERTIES'):
+                    area.tag_redraw()
+    except Exception:
+        pass
+
+
+def _build_timer():
+    build = _active_build
+    if build is None or build.finished:
+        return None
+
+    try:
+        running = build.tick()
+    except Exception as e:
+        print(f"[ThumbBuild] Build failed: {e}")
+        build.cancel()
+        build.tick()
+        running = False
+
+    _redraw_ui()
+
+    if running:
+        return POLL_INTERVAL
+
+    # Le thumbnails sono cambiate: pulisci le cache
+    from .thumb_utils import clear_all_thumbs_caches
+    clear_all_thumbs_caches()
+    try:
+        from .thumb_async import clear_thumbnail_cache
+        clear_thumbnail_cache()
+    except Exception:
+        pass
+    return None
+
+
+def start_thumbnail_build(thumbs_root: Path, jobs: List[Dict],
+                          index: Optional[ThumbIndex] = None,
+                          resume: bool = False) -> Optional[ThumbnailBuildPipeline]:
+    """
+    Start building jobs in the background.
+
+    Args:
+        thumbs_root: Thumbnail cache folder (holds index.json and the queue)
+        jobs: Jobs from plan_thumbnail_jobs() or load_pending_jobs()
+        index: ThumbIndex of thumbs_root (looked up if None)
+        resume: True if jobs come from an existing queue file
+
+    Returns:
+        The pipeline, or None if a build is already running
+    """
+    global _active_build
+
+    if get_active_build() is not None:
+        print("[ThumbBuild] A thumbnail build is already running")
+        return None
+
+    if index is None:
+        index = get_thumb_index(thumbs_root)
+
+    if not resume:
+        save_job_queue(thumbs_root, jobs)
+
+    _active_build = ThumbnailBuildPipeline(thumbs_root, jobs, index)
+    _active_build.start()
+
+    if not bpy.app.timers.is_registered(_build_timer):
+        bpy.app.timers.register(_build_timer, first_interval=POLL_INTERVAL)
+    return _active_build
+
+
+def cancel_thumbnail_build() -> bool:
+    """Cancel the running build (pending jobs stay in the queue file)."""
+    build = get_active_build()
+    if build is None:
+        return False
+    build.cancel()
+    return True
+
+
+def unregister_thumbnail_build():
+    """Stop the timer and the pools (addon unregister)."""
+    global _active_build
+    if bpy.app.timers.is_registered(_build_timer):
+        bpy.app.timers.unregister(_build_timer)
+    if _active_build is not None and not _active_build.finished:
+        _active_build.cancel()
+        _active_build.tick()
+    _active_build = None
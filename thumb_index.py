@@ -0,0 +1,268 @@
+"""
+Append-only Thumbnail Index for EM-Tools
+========================================
+
+Replaces the read-everything / rewrite-everything index.json with:
+
+- index.json: compacted snapshot (same {"version", "items"} layout as
+  before, written without indentation)
+- index.log.jsonl: append-only log of changes since the snapshot, one JSON
+  object per line: {"op": "put", "key": ..., "item": {...}} or
+  {"op": "del", "key": ...}
+
+Indices are cached in process per thumbs folder. A lookup stats the two
+files: an unchanged cache costs a dict lookup, a grown log is read from
+the last offset only, and the snapshot is re-parsed only when it was
+replaced (e.g. by compaction in another Blender instance).
+
+The log is folded into the snapshot when it grows past COMPACT_MIN_OPS
+entries and a quarter of the index size.
+
+Usage:
+    from .thumb_index import get_thumb_index
+
+    index = get_thumb_index(thumbs_root)
+    item = index.get(doc_key)
+    doc_key = index.find_by_src_path("US02/01.jpg")
+    index.put(doc_key, {...})
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+INDEX_FILE = "index.json"
+LOG_FILE = "index.log.jsonl"
+INDEX_VERSION = 1
+
+COMPACT_MIN_OPS = 500
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _normalize_src(src_path: str) -> str:
+    return src_path.replace("\\", "/")
+
+
+class ThumbIndex:
+    """
+    In-process view of one thumbs folder's index.
+
+    items: {doc_key: item_data}; extra: other top-level keys of the
+    snapshot (legacy per-US sections read by ThumbnailLoader).
+    """
+
+    def __init__(self, thumbs_root):
+        self.thumbs_root = Path(thumbs_root)
+        self.items: Dict[str, Dict] = {}
+        self.extra: Dict = {}
+        self._by_src: Dict[str, str] = {}
+        self._index_sig = None
+        self._log_offset = 0
+        self._log_ops = 0
+        self._lock = threading.RLock()
+
+    @property
+    def index_path(self) -> Path:
+        return self.thumbs_root / INDEX_FILE
+
+    @property
+    def log_path(self) -> Path:
+        return self.thumbs_root / LOG_FILE
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        """Bring the cache up to date with the files on disk."""
+        with self._lock:
+            index_sig = _stat_signature(self.index_path)
+            if index_sig != self._index_sig:
+                self._load_snapshot(index_sig)
+
+            log_sig = _stat_signature(self.log_path)
+            log_size = log_sig[1] if log_sig else 0
+            if log_size < self._log_offset:
+                # Log truncated by a compaction elsewhere: start over
+                self._load_snapshot(_stat_signature(self.index_path))
+            elif log_size > self._log_offset:
+                self._read_log_tail()
+
+    def _load_snapshot(self, index_sig):
+        data = {}
+        if index_sig is not None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"[ThumbIndex] Could not read {self.index_path}: {e}")
+                data = {}
+
+        self.items = data.pop("items", {}) or {}
+        data.pop("version", None)
+        self.extra = data
+        self._by_src = {}
+        for key, item in self.items.items():
+            self._index_src(key, item)
+        self._index_sig = index_sig
+        self._log_offset = 0
+        self._log_ops = 0
+
+    def _read_log_tail(self):
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._log_offset)
+                chunk = f.read()
+        except IOError as e:
+            print(f"[ThumbIndex] Could not read {self.log_path}: {e}")
+            return
+
+        # Only complete lines: a writer may be half-way through the last one
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                op = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._apply(op)
+            self._log_ops += 1
+        self._log_offset += end
+
+    def _index_src(self, key, item):
+        src_path = item.get("src_path")
+        if src_path:
+            self._by_src[_normalize_src(src_path)] = key
+
+    def _apply(self, op):
+        key = op.get("key")
+        if not key:
+            return
+        old = self.items.get(key)
+        if old is not None and old.get("src_path"):
+            self._by_src.pop(_normalize_src(old["src_path"]), None)
+        if op.get("op") == "del":
+            self.items.pop(key, None)
+        else:
+            item = op.get("item") or {}
+            self.items[key] = item
+            self._index_src(key, item)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, doc_key: str) -> Optional[Dict]:
+        return self.items.get(doc_key)
+
+    def find_by_src_path(self, src_path: str) -> Optional[str]:
+        """doc_key of the entry recorded for src_path, if any."""
+        return self._by_src.get(_normalize_src(src_path))
+
+    def iter_items(self) -> Iterator[Tuple[str, Dict]]:
+        return iter(list(self.items.items()))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, doc_key):
+        return doc_key in self.items
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _append(self, ops):
+        if not ops:
+            return
+        self.thumbs_root.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops)
+        with self._lock:
+            # Pick up concurrent appends first, so the offset stays exact
+            self.refresh()
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(payload)
+            for op in ops:
+                self._apply(op)
+            self._log_ops += len(ops)
+            log_sig = _stat_signature(self.log_path)
+            self._log_offset = log_sig[1] if log_sig else 0
+
+            if self._log_ops >= max(COMPACT_MIN_OPS, len(self.items) // 4):
+                self.compact()
+
+    def put(self, doc_key: str, item: Dict):
+        self._append([{"op": "put", "key": doc_key, "item": item}])
+
+    def delete(self, doc_key: str):
+        if doc_key in self.items:
+            self._append([{"op": "del", "key": doc_key}])
+
+    def update(self, changes: Dict[str, Optional[Dict]]):
+        """Batch put/delete: {doc_key: item} (None deletes)."""
+        ops = []
+        for key, item in changes.items():
+            if item is None:
+                if key in self.items:
+                    ops.append({"op": "del", "key": key})
+            else:
+                ops.append({"op": "put", "key": key, "item": item})
+        self._append(ops)
+
+    def compact(self):
+        """Write the snapshot and empty the log."""
+        with self._lock:
+            self.thumbs_root.mkdir(parents=True, exist_ok=True)
+            data = dict(self.extra)
+            data["version"] = INDEX_VERSION
+            data["items"] = self.items
+            tmp_path = self.index_path.with_suffix(".json.tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, self.index_path)
+                with open(self.log_path, 'w', encoding='utf-8'):
+                    pass
+            except IOError as e:
+                print(f"[ThumbIndex] Errore salvando {self.index_path}: {e}")
+                return
+            self._index_sig = _stat_signature(self.index_path)
+            self._log_offset = 0
+            self._log_ops = 0
+
+
+# ============================================================================
+# GLOBAL INDEX CACHE
+# ============================================================================
+
+_thumb_indices: Dict[str, ThumbIndex] = {}
+_indices_lock = threading.Lock()
+
+
+def get_thumb_index(thumbs_root) -> ThumbIndex:
+    """Cached, up-to-date index of thumbs_root (thread-safe)."""
+    key = os.path.normpath(os.path.abspath(str(thumbs_root)))
+    with _indices_lock:
+        index = _thumb_indices.get(key)
+        if index is None:
+            index = ThumbIndex(key)
+            _thumb_indices[key] = index
+    index.refresh()
+    return index
+
+
+def clear_thumb_index_cache():
+    """Forget all cached indices (they are reloaded on next access)."""
+    with _indices_lock:
+        _thumb_indices.clear()
@@ -8,10 +8,11 @@ import subprocess
 from pathlib import Path
 import bpy
 from bpy.types import Operator
-from .thumb_utils import (
-    em_thumbs_root, load_index_json, save_index_json, 
-    generate_thumbnail, get_thumb_path, reload_doc_previews_from_cache,
-    get_file_hash  
+from .thumb_utils import em_thumbs_root
+from .thumb_index import get_thumb_index
+from .thumb_build import (
+    plan_thumbnail_jobs, load_pending_jobs, start_thumbnail_build,
+    cancel_thumbnail_build, get_active_build, unregister_thumbnail_build
 )
 
 class EMTOOLS_OT_build_doc_thumbs(Operator):
@@ -21,8 +22,18 @@ class EMTOOLS_OT_build_doc_thumbs(Operator):
     bl_description = "Scan the resource_folder and generate thumbnails in the local cache"
     bl_options = {'REGISTER', 'UNDO'}
 
+    rescan: bpy.props.BoolProperty(
+        name="Rescan",
+        description="Ignore an interrupted build and scan the resource folder again",
+        default=False
+    )
+
     def execute(self, context):
         scene = context.scene
+
+        if get_active_build() is not None:
+            self.report({'WARNING'}, "Thumbnail generation already running")
+            return {'CANCELLED'}
         em_tools = scene.em_tools
         
         # Ottieni file ausiliare attivo per prendere la resource_folder
@@ -85,140 +96,54 @@ class EMTOOLS_OT_build_doc_thumbs(Operator):
         
         print(f"Gernerating thumbs from: {resource_folder}")
         print(f"Thumbs saved in: {thumbs_root}")
-        
+
         # Carica indice esistente
-        index_data = load_index_json(thumbs_root)
-        
-        # Contatori
-        total_images_found = 0
-        thumbs_generated = 0
-        thumbs_skipped = 0
-        thumbs_errors = 0
-        
-        # Formati supportati
-        supported_formats = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.pdf'}
-        
+        thumb_index = get_thumb_index(thumbs_root)
+
+        # Build interrotto: riprendi dai job pendenti invece di riscansionare
+        pending_jobs = [] if self.rescan else load_pending_jobs(thumbs_root)
+        if pending_jobs:
+            start_thumbnail_build(thumbs_root, pending_jobs, thumb_index, resume=True)
+            self.report({'INFO'}, f"Resuming thumbnail build: {len(pending_jobs)} pending")
+            return {'FINISHED'}
+
         # Scansiona TUTTE le immagini nella resource_folder (ricorsivamente)
         print(f"Scanning folder: {resource_folder}")
-        
-        for root, dirs, files in os.walk(resource_folder):
-            for filename in files:
-                file_path = os.path.join(root, filename)
-                file_ext = os.path.splitext(filename)[1].lower()
-                
-                # Salta se non è un formato supportato
-                if file_ext not in supported_formats:
-                    continue
-                
-                total_images_found += 1
-                
-                # Genera chiave univoca basata sul file
-                file_hash = get_file_hash(file_path)
-                doc_key = f"doc_{file_hash}"
-                
-                # Ottieni percorso thumbnail
-                thumb_path = get_thumb_path(file_path, thumbs_root)
-                
-                # Controlla se serve rigenerare
-                needs_regen = True
-                if doc_key in index_data["items"]:
-                    stored_item = index_data["items"][doc_key]
-                    stored_mtime = stored_item.get("src_mtime", 0)
-                    
-                    try:
-                        current_mtime = os.path.getmtime(file_path)
-                        
-                        if thumb_path.exists() and stored_mtime >= current_mtime:
-                            needs_regen = False
-                            thumbs_skipped += 1
-                            print(f"  → SKIP: {filename} (already updated)")
-                        else:
-                            print(f"  → REGEN: {filename} (to be updated)")
-                    except OSError as e:
-                        # File non accessibile
-                        print(f"  → ERROR: {filename} - {e}")
-                        thumbs_errors += 1
-                        continue
-                else:
-                    print(f"NEW: {filename} (key {doc_key} not in index)")
-                
-                # Genera thumbnail se necessario
-                if needs_regen:
-                    try:
-                        if generate_thumbnail(file_path, thumb_path):
-                            thumbs_generated += 1
-                            
-                            # ✅ Calcola path RELATIVO alla directory del .blend
-                            blend_path = bpy.data.filepath
-                            if blend_path:
-                                blend_dir = os.path.dirname(blend_path)
-                                try:
-                                    # Path relativo al .blend
-                                    relative_src_path = os.path.relpath(file_path, blend_dir)
-                                    # Normalizza gli slash per essere cross-platform
-                                    relative_src_path = relative_src_path.replace("\\", "/")
-                                except ValueError:
-                                    # Se file_path e blend_dir sono su drive diversi (Windows)
-                                    # usa il path assoluto come fallback
-                                    relative_src_path = file_path
-                                    print(f"[Thumbs] Unable to calculate relative path for {filename}, using absolute path instead.")
-                            else:
-                                # File blend non salvato - usa path assoluto
-                                relative_src_path = file_path
-                                print(f"[Thumbs] Un-saved .blend file, use absolute path for {filename}")
-                            
-                            # Salva nell'indice con path relativo
-                            thumb_rel_path = thumb_path.relative_to(thumbs_root)
-                            index_data["items"][doc_key] = {
-                                "thumb": str(thumb_rel_path).replace("\\", "/"),
-                                "src_path": relative_src_path,  # ✅ Path RELATIVO al .blend!
-                                "src_mtime": os.path.getmtime(file_path),
-                                "src_size": os.path.getsize(file_path),
-                                "file_hash": file_hash,
-                                "filename": filename
-                            }
-                            
-                            print(f"[Thumbs] Generata: {filename}")
-                            
-                            if thumbs_generated % 10 == 0:  # Log ogni 10
-                                print(f"Generate {thumbs_generated} thumbnails...")
-                        else:
-                            thumbs_errors += 1
-                            print(f"Error generating: {filename}")
-                    except Exception as e:
-                        thumbs_errors += 1
-                        print(f"Error on {filename}: {e}")
-        
-        # Salva indice aggiornato
-        save_index_json(thumbs_root, index_data)
-        
-        # Ricarica preview per UI (opzionale)
-        try:
-            reload_doc_previews_from_cache()
-        except:
-            pass
-        
-        # Report finale dettagliato
-        total_processed = thumbs_generated + thumbs_skipped
-        
-        if total_images_found == 0:
+        jobs, stats = plan_thumbnail_jobs(resource_folder, thumbs_root, thumb_index)
+
+        if stats['found'] == 0:
             self.report({'WARNING'}, f"No image found in: {os.path.basename(resource_folder)}")
-        elif thumbs_generated > 0:
-            self.report({'INFO'}, 
-                    f"✓ Created {thumbs_generated} new thumbnails | "
-                    f"{thumbs_skipped} already updated | "
-                    f"{thumbs_errors} errors | "
-                    f"Total images: {total_images_found}")
-        else:
-            self.report({'INFO'}, 
-                    f"✓ All {total_processed} thumbnails were already up-to-date | "
-                    f"Total images: {total_images_found}")
+            return {'FINISHED'}
+
+        if not jobs:
+            self.report({'INFO'},
+                    f"✓ All {stats['skipped']} thumbnails were already up-to-date | "
+                    f"Total images: {stats['found']}")
+            return {'FINISHED'}
 
-        # ✅ PULISCI LA CACHE dopo la rigenerazione
-        from .thumb_utils import clear_all_thumbs_caches
-        clear_all_thumbs_caches()
+        # Generazione in background (process pool), progresso nel pannello
+        start_thumbnail_build(thumbs_root, jobs, thumb_index)
+        self.report({'INFO'},
+                f"Generating {len(jobs)} thumbnails in background | "
+                f"{stats['skipped']} already updated | "
+                f"Total images: {stats['found']}")
 
         return {'FINISHED'}
+
+
+class EMTOOLS_OT_cancel_doc_thumbs_build(Operator):
+    """Stop the running thumbnail generation (it can be resumed later)"""
+    bl_idname = "emtools.cancel_doc_thumbs_build"
+    bl_label = "Stop thumbnails generation"
+    bl_description = "Stop the background thumbnail generation. Run (Re)generate again to resume"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        if not cancel_thumbnail_build():
+            self.report({'WARNING'}, "No thumbnail generation running")
+            return {'CANCELLED'}
+        self.report({'INFO'}, "Thumbnail generation stopped")
+        return {'FINISHED'}
     
 
 class EMTOOLS_OT_open_doc_thumbs_folder(Operator):
@@ -372,6 +297,7 @@ class EMTOOLS_OT_debug_thumbs_check(Operator):
 # Lista operatori per registrazione
 classes = [
     EMTOOLS_OT_build_doc_thumbs,
+    EMTOOLS_OT_cancel_doc_thumbs_build,
     EMTOOLS_OT_open_doc_thumbs_folder,
     EMTOOLS_OT_select_doc_from_thumb,
     EMTOOLS_OT_open_original_doc,
@@ -383,5 +309,6 @@ def register():
         bpy.utils.register_class(cls)
 
 def unregister():
+    unregister_thumbnail_build()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
\ No newline at end of file
@@ -7,22 +7,46 @@ Gestisce cache locale, generazione thumbnails e preview collections
 """
 
 import os
-import json
 import hashlib
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import bpy
 import bpy.utils.previews
-from PIL import Image, ImageOps
+
+from .workers.em_thumb_worker import render_thumbnail, render_placeholder
+from .thumb_index import get_thumb_index
 
 # ✅ OPTIMIZED: Import async thumbnail loader
-from .thumb_async import load_thumbnails_async, get_cached_thumbnails
+from .thumb_async import (
+    load_thumbnails_async, get_cached_thumbnails, prefetch_thumbnails_async, ByteBudgetLRU
+)
 
 # Collezione globale per le preview
 preview_collections = {}
 
-# Cache per evitare loop infiniti nel caricamento thumbnails
-_cached_us_thumbs = {}  # {us_node_id: [(doc_key, name, desc, icon_id, i), ...]}
+# US vicine alla selezione da pre-caricare (righe sopra e sotto)
+PREFETCH_RADIUS = 2
+US_THUMBS_CACHE_BYTES = 128 * 1024 * 1024
+
+
+def _release_evicted_previews(cache_key, enum_items):
+    """
+    Rilascia dalla preview collection le immagini di una US uscita dalla cache,
+    se nessun'altra US in cache le usa.
+    """
+    pcoll = preview_collections.get("doc_previews")
+    if pcoll is None or not enum_items:
+        return
+    still_used = {item[0] for items in _cached_us_thumbs.values() for item in items}
+    for item in enum_items:
+        doc_key = item[0]
+        if doc_key not in still_used and doc_key in pcoll:
+            del pcoll[doc_key]
+
+
+# Cache per evitare loop infiniti nel caricamento thumbnails (LRU a budget di memoria)
+_cached_us_thumbs = ByteBudgetLRU(US_THUMBS_CACHE_BYTES, on_evict=_release_evicted_previews)
+# {us_node_id_resource_folder: [(doc_key, name, desc, icon_id, i), ...]}
 _last_us_id = None
 _last_resource_folder = None
 
@@ -227,9 +251,76 @@ def get_file_hash(file_path: str, content_based: bool = True) -> str:
         return hash_sha1.hexdigest()
 
 
-def get_thumb_path(file_path: str, thumbs_root: Path) -> Path:
+def get_stat_key(file_path: str) -> Optional[Tuple[str, int, int]]:
+    """
+    (path normalizzato, size, mtime_ns) del file, o None se non accessibile.
+
+    Usa solo os.stat: non apre il file (nessun download OneDrive).
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    normalized_path = os.path.normcase(os.path.normpath(os.path.abspath(file_path)))
+    return normalized_path, stat.st_size, stat.st_mtime_ns
+
+
+def get_file_cache_key(file_path: str, content_based: bool = False,
+                       stat_key: Optional[Tuple[str, int, int]] = None) -> str:
+    """
+    Chiave di cache della thumbnail di un file.
+
+    Di default è l'hash SHA1 di path normalizzato + size + mtime_ns: un file
+    modificato cambia chiave, un file invariato non viene mai letto.
+    content_based=True usa l'hash del contenuto (collisioni / richiesta esplicita).
+    """
+    if content_based:
+        return get_file_hash(file_path, content_based=True)
+
+    if stat_key is None:
+        stat_key = get_stat_key(file_path)
+    if stat_key is None:
+        # File non accessibile: solo path
+        return get_file_hash(file_path, content_based=False)
+
+    normalized_path, size, mtime_ns = stat_key
+    return hashlib.sha1(f"{normalized_path}|{size}|{mtime_ns}".encode('utf-8')).hexdigest()
+
+
+def stat_matches(item_data: Dict, file_path: str,
+                 stat_key: Optional[Tuple[str, int, int]]) -> bool:
+    """True se la voce di index.json descrive questo file (stessa size/mtime_ns e nome)."""
+    if stat_key is None:
+        return False
+    src_stat = item_data.get("src_stat")
+    if not src_stat:
+        return False
+    return (list(src_stat) == [stat_key[1], stat_key[2]]
+            and item_data.get("filename", os.path.basename(file_path)) == os.path.basename(file_path))
+
+
+def resolve_doc_key(file_path: str, items: Dict,
+                    stat_key: Optional[Tuple[str, int, int]] = None) -> str:
+    """
+    Chiave "doc_<hash>" di un file per index.json.
+
+    Usa la chiave stat; se la stessa chiave è già usata da un file diverso
+    (collisione) ricade sull'hash del contenuto.
+    """
+    if stat_key is None:
+        stat_key = get_stat_key(file_path)
+    doc_key = f"doc_{get_file_cache_key(file_path, stat_key=stat_key)}"
+    item_data = items.get(doc_key)
+    if item_data is not None and item_data.get("src_stat") and not stat_matches(item_data, file_path, stat_key):
+        print(f"[Thumbs] Cache key collision for {os.path.basename(file_path)}, using content hash")
+        doc_key = f"doc_{get_file_cache_key(file_path, content_based=True)}"
+    return doc_key
+
+
+def get_thumb_path(file_path: str, thumbs_root: Path, file_hash: Optional[str] = None) -> Path:
     """Genera percorso per thumbnail usando bucket hash structure"""
-    file_hash = get_file_hash(file_path)
+    if file_hash is None:
+        file_hash = get_file_cache_key(file_path)
     # Crea struttura bucket: ab/cd/hash.png
     bucket_path = thumbs_root / file_hash[:2] / file_hash[2:4]
     bucket_path.mkdir(parents=True, exist_ok=True)
@@ -237,115 +328,58 @@ def get_thumb_path(file_path: str, thumbs_root: Path) -> Path:
 
 
 def load_index_json(thumbs_root: Path) -> Dict:
-    """Carica l'indice JSON dalla cache"""
-    index_path = thumbs_root / "index.json"
-    if index_path.exists():
-        try:
-            with open(index_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-    
+    """
+    Carica l'indice dalla cache (copia, per compatibilità).
+
+    Il parsing avviene una sola volta per processo (thumb_index.py); per sola
+    lettura usare direttamente get_thumb_index(thumbs_root).
+    """
+    thumb_index = get_thumb_index(thumbs_root)
     return {
         "version": 1,
-        "items": {}
+        "items": {key: dict(item) for key, item in thumb_index.items.items()}
     }
 
 
 def save_index_json(thumbs_root: Path, index_data: Dict):
-    """Salva l'indice JSON nella cache"""
-    index_path = thumbs_root / "index.json"
+    """
+    Salva l'indice nella cache.
+
+    Solo le voci cambiate rispetto all'indice vengono accodate al log
+    (index.log.jsonl); nessuna riscrittura completa di index.json.
+    """
     try:
-        with open(index_path, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
+        thumb_index = get_thumb_index(thumbs_root)
+        items = index_data.get("items", {})
+        changes = {key: item for key, item in items.items()
+                   if thumb_index.get(key) != item}
+        for key in thumb_index.items:
+            if key not in items:
+                changes[key] = None
+        thumb_index.update(changes)
     except IOError as e:
         print(f"Errore salvando index.json: {e}")
 
 
 def generate_thumbnail(src_path: str, thumb_path: Path, size: Tuple[int, int] = (256, 256)) -> bool:
-    """Genera thumbnail da file immagine/documento"""
-    try:
-        src_path = bpy.path.abspath(src_path)
-        
-        if not os.path.exists(src_path):
-            print(f"File sorgente non trovato: {src_path}")
-            return False
-        
-        # Estensioni supportate
-        ext = os.path.splitext(src_path)[1].lower()
-        
-        if ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tga']:
-            # Immagini dirette
-            with Image.open(src_path) as img:
-                # Converti in RGB se necessario
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    img = img.convert('RGB')
-                
-                # Ridimensiona mantenendo aspect ratio
-                img_resized = ImageOps.fit(img, size, Image.Resampling.LANCZOS)
-                img_resized.save(thumb_path, 'PNG', quality=90)
-                return True
-        
-        elif ext == '.pdf':
-            # Per PDF usa preview della prima pagina
-            try:
-                import fitz  # PyMuPDF
-                doc = fitz.open(src_path)
-                page = doc[0]
-                mat = fitz.Matrix(1.0, 1.0)  # Scala 1:1
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("ppm")
-                
-                import io
-                with Image.open(io.BytesIO(img_data)) as img:
-                    img_resized = ImageOps.fit(img, size, Image.Resampling.LANCZOS)
-                    img_resized.save(thumb_path, 'PNG', quality=90)
-                doc.close()
-                return True
-            except ImportError:
-                print("PyMuPDF non disponibile per PDF thumbnails")
-                return create_placeholder_thumb(thumb_path, "PDF", size)
+    """
+    Genera thumbnail da file immagine/documento.
 
-        else:
-            # File non supportato - crea placeholder
-            return create_placeholder_thumb(thumb_path, ext.upper(), size)
-            
-    except Exception as e:
-        print(f"Errore generando thumbnail per {src_path}: {e}")
-        return create_placeholder_thumb(thumb_path, "ERR", size)
+    Il rendering è in workers/em_thumb_worker.py, condiviso con la pipeline
+    multiprocesso di thumb_build.py.
+    """
+    src_path = bpy.path.abspath(src_path)
+
+    if not os.path.exists(src_path):
+        print(f"File sorgente non trovato: {src_path}")
+        return False
+
+    return render_thumbnail(src_path, thumb_path, size)
 
 
 def create_placeholder_thumb(thumb_path: Path, text: str, size: Tuple[int, int] = (256, 256)) -> bool:
     """Crea thumbnail placeholder per file non supportati"""
-    try:
-        from PIL import Image, ImageDraw, ImageFont
-        
-        # Crea immagine placeholder
-        img = Image.new('RGB', size, color=(100, 100, 100))
-        draw = ImageDraw.Draw(img)
-        
-        # Tenta di usare font predefinito
-        try:
-            font = ImageFont.truetype("arial.ttf", 24)
-        except (IOError, OSError):
-            font = ImageFont.load_default()
-        
-        # Testo centrato
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        x = (size[0] - text_width) // 2
-        y = (size[1] - text_height) // 2
-        
-        draw.text((x, y), text, fill=(200, 200, 200), font=font)
-        
-        img.save(thumb_path, 'PNG')
-        return True
-        
-    except Exception as e:
-        print(f"Errore creando placeholder: {e}")
-        return False
+    return render_placeholder(thumb_path, text, size)
 
 
 def _check_resource_source_has_thumbs(source, source_index, verbose=False):
@@ -379,8 +413,7 @@ def _check_resource_source_has_thumbs(source, source_index, verbose=False):
             print(f"  [{source_index}] {source.name}: Thumbs folder does not exist - skipping")
         return False
 
-    index_data = load_index_json(thumbs_root)
-    items = index_data.get("items", {})
+    items = get_thumb_index(thumbs_root).items
 
     if not items:
         if verbose:
@@ -448,13 +481,6 @@ def has_doc_thumbs(verbose: bool = False) -> bool:
         return False
 
 
-# thumb_utils.py - AGGIUNGI QUESTE VARIABILI GLOBALI ALL'INIZIO DEL FILE
-
-# Cache per evitare loop infiniti nel caricamento thumbnails
-_cached_us_thumbs = {}  # {us_node_id: [(doc_key, name, desc, icon_id, i), ...]}
-_last_us_id = None
-_last_resource_folder = None
-
 # ✅ OPTIMIZED: Async-aware wrapper for thumbnail loading
 def reload_doc_previews_for_us_async(us_node_id: str, on_ready_callback=None) -> List[Tuple[str, str, str, int, int]]:
     """
@@ -619,8 +645,8 @@ def reload_doc_previews_for_us(us_node_id: str) -> List[Tuple[str, str, str, int
             else:
                 pcoll = preview_collections["doc_previews"]
 
-            # Carica indice
-            index_data = load_index_json(thumbs_root)
+            # Indice in cache (nessun parsing se invariato)
+            thumb_index = get_thumb_index(thumbs_root)
 
             enum_items = []
             i = 0
@@ -671,27 +697,18 @@ def reload_doc_previews_for_us(us_node_id: str) -> List[Tuple[str, str, str, int
                             # Path su drive diversi (Windows), usa path assoluto
                             file_path_rel = file_path
 
-                        # Cerca nell'indice usando src_path
-                        doc_key = None
-                        for key, item_data in index_data.get("items", {}).items():
-                            if "src_path" in item_data:
-                                indexed_path = item_data["src_path"].replace("\\", "/")
+                        # Cerca nell'indice usando src_path (lookup O(1))
+                        doc_key = thumb_index.find_by_src_path(file_path_rel)
 
-                                # Confronta path relativi normalizzati
-                                if indexed_path == file_path_rel:
-                                    doc_key = key
-                                    break
-
-                        # Se non trovato, calcola hash (triggera download OneDrive se file non locale)
+                        # Se non trovato, usa la chiave stat (non apre il file)
                         if doc_key is None:
-                            file_hash = get_file_hash(file_path)
-                            doc_key = f"doc_{file_hash}"
+                            doc_key = resolve_doc_key(file_path, thumb_index.items)
 
                         # Verifica che il doc_key esista nell'indice
-                        if doc_key not in index_data.get("items", {}):
+                        item_data = thumb_index.get(doc_key)
+                        if item_data is None:
                             continue
 
-                        item_data = index_data["items"][doc_key]
                         thumb_rel_path = item_data.get("thumb", "")
 
                         if not thumb_rel_path:
@@ -740,6 +757,92 @@ def reload_doc_previews_for_us(us_node_id: str) -> List[Tuple[str, str, str, int
         traceback.print_exc()
         return []
 
+def get_cached_doc_previews_for_us(us_node_id: str) -> Optional[List[Tuple[str, str, str, int, int]]]:
+    """
+    Preview della US solo se già in cache, senza toccare disco o grafo.
+
+    Returns:
+        La lista di reload_doc_previews_for_us(), oppure None se almeno un
+        file ausiliario non è ancora stato esaminato per questa US.
+    """
+    if not us_node_id:
+        return []
+    try:
+        em_tools = bpy.context.scene.em_tools
+        if em_tools.active_file_index < 0 or not em_tools.graphml_files:
+            return []
+        graphml = em_tools.graphml_files[em_tools.active_file_index]
+    except Exception:
+        return None
+
+    for aux_file in graphml.auxiliary_files:
+        if not aux_file.resource_folder:
+            continue
+        cache_key = f"{us_node_id}_{aux_file.resource_folder}"
+        if cache_key not in _cached_us_thumbs:
+            return None
+        cached_result = _cached_us_thumbs[cache_key]
+        if cached_result:
+            return cached_result
+    return []
+
+
+def get_adjacent_us_ids(strat, radius: int = PREFETCH_RADIUS) -> List[str]:
+    """id_node delle US vicine a strat.units_index, dalla più vicina."""
+    index = strat.units_index
+    count = len(strat.units)
+    us_ids = []
+    for offset in range(1, radius + 1):
+        for row in (index + offset, index - offset):
+            if 0 <= row < count:
+                us_id = strat.units[row].id_node
+                if us_id:
+                    us_ids.append(us_id)
+    return us_ids
+
+
+_prefetch_queue: List[str] = []
+
+
+def _prefetch_tick():
+    """Timer: carica in cache una US vicina per tick, senza bloccare la UI."""
+    while _prefetch_queue:
+        us_id = _prefetch_queue.pop(0)
+        try:
+            reload_doc_previews_for_us(us_id)
+        except Exception as e:
+            print(f"[Thumbs] Prefetch error for {us_id}: {e}")
+        if _prefetch_queue:
+            return 0.05
+    return None
+
+
+def prefetch_adjacent_us_thumbs(strat, radius: int = PREFETCH_RADIUS):
+    """
+    Pre-carica speculativamente le thumbnails delle righe vicine alla US
+    selezionata, così scorrere la lista con le frecce trova la cache pronta.
+
+    Il caricamento nei preview (bpy) avviene su timer, una US per tick;
+    in parallelo il ThumbnailLoader legge gli indici in background.
+    """
+    if not strat.units or strat.units_index < 0:
+        return
+
+    us_ids = get_adjacent_us_ids(strat, radius)
+    _prefetch_queue[:] = us_ids
+    if us_ids and not bpy.app.timers.is_registered(_prefetch_tick):
+        bpy.app.timers.register(_prefetch_tick, first_interval=0.1)
+
+    try:
+        em_tools = bpy.context.scene.em_tools
+        if em_tools.active_file_index >= 0 and em_tools.graphml_files:
+            graphml = em_tools.graphml_files[em_tools.active_file_index]
+            if graphml.auxiliary_files:
+                prefetch_thumbnails_async(us_ids, graphml.auxiliary_files)
+    except Exception as e:
+        print(f"[Thumbs] Prefetch error: {e}")
+
+
 # ✅  FUNZIONE PER PULIRE LA CACHE QUANDO NECESSARIO
 def clear_us_thumbs_cache():
     """Pulisce la cache delle thumbnails US. Da chiamare quando si rigenera."""
@@ -828,12 +931,12 @@ def reload_doc_previews_from_cache() -> List[Tuple[str, str, str, int, int]]:
         pcoll = preview_collections["doc_previews"]
     
     # Carica indice
-    index_data = load_index_json(thumbs_root)
+    thumb_index = get_thumb_index(thumbs_root)
     
     enum_items = []
     i = 0
     
-    for doc_key, item_data in index_data.get("items", {}).items():
+    for doc_key, item_data in thumb_index.iter_items():
         thumb_rel_path = item_data.get("thumb", "")
         if not thumb_rel_path:
             continue
@@ -913,10 +1016,9 @@ def get_src_path_from_doc_key(doc_key: str) -> Optional[str]:
 
         # ✅ FIXED: Usa il path RAW per calcolare thumbs_root (per consistenza hash)
         thumbs_root = em_thumbs_root(resource_folder_raw)
-        index_data = load_index_json(thumbs_root)
         
         # Ottieni src_path dall'indice
-        item_data = index_data.get("items", {}).get(doc_key, {})
+        item_data = get_thumb_index(thumbs_root).get(doc_key) or {}
         relative_src_path = item_data.get("src_path")
         
         if not relative_src_path:
@@ -961,6 +1063,10 @@ def get_src_path_from_doc_key(doc_key: str) -> Optional[str]:
 def cleanup_preview_collections():
     """Pulisce le preview collections e tutte le cache (per unregister)"""
     global preview_collections
+
+    _prefetch_queue.clear()
+    if bpy.app.timers.is_registered(_prefetch_tick):
+        bpy.app.timers.unregister(_prefetch_tick)
     
     for pcoll in preview_collections.values():
         bpy.utils.previews.remove(pcoll)
@@ -39,6 +39,13 @@ class PropertyValueItem(PropertyGroup):
     ) # type: ignore
 
 
+def update_property_color_mode(self, context):
+    """Leaving "Object Color": restore the Solid colour type of the 3D views."""
+    if self.property_color_mode != 'OBJECT_COLOR':
+        from .utils import set_viewport_object_color
+        set_viewport_object_color(context, False)
+
+
 def get_ramp_types(self, context):
     """Return color ramp types for the enum property"""
     from .color_ramps import COLOR_RAMPS
@@ -182,6 +189,21 @@ def register_data():
             default=False
         )
     
+    if not hasattr(bpy.types.Scene, "property_color_mode"):
+        bpy.types.Scene.property_color_mode = EnumProperty(
+            name="Color Mode",
+            description="How property colors are applied to proxies",
+            items=[
+                ('MATERIALS', "Materials", "One material per property value"),
+                ('OBJECT_COLOR', "Object Color",
+                 "One shared material reading each proxy's Object color "
+                 "(no material rebuilds, best for many values; switches the "
+                 "Solid viewport colour to Object)"),
+            ],
+            default='MATERIALS',
+            update=update_property_color_mode
+        )
+
     if not hasattr(bpy.types.Scene, "color_ramp_props"):
         bpy.types.Scene.color_ramp_props = PointerProperty(type=ColorRampProperties)
     
@@ -211,6 +233,7 @@ def unregister_data():
         "property_values",
         "active_value_index", 
         "show_all_graphs",
+        "property_color_mode",
         "color_ramp_props",
         "camera_em_list",
         "active_camera_em_index",
@@ -15,8 +15,11 @@ from s3dgraphy.multigraph.multigraph import multi_graph_manager
 
 from .utils import (
     create_property_value_mapping, 
+    get_property_values,
     create_property_materials_for_scene_values,
     apply_materials_to_objects,
+    apply_object_colors,
+    set_viewport_object_color,
     save_color_scheme, 
     load_color_scheme,
     get_available_properties,
@@ -107,11 +110,11 @@ class VISUAL_OT_update_property_values(Operator):
                 graph = get_graph(graph_name)
                 if graph:
                     print(f"Processing graph '{graph_name}'")
-                    # USA LA STESSA FUNZIONE DI APPLY_COLORS PER COERENZA
-                    mapping = create_property_value_mapping(graph, scene.selected_property)
-                    values.update(mapping.values())
+                    # Stessa mappatura (in cache) usata da apply_colors
+                    graph_values = get_property_values(graph, scene.selected_property)
+                    values.update(graph_values)
                     processed_graphs = 1
-                    print(f"Found {len(set(mapping.values()))} unique values")
+                    print(f"Found {len(graph_values)} unique values")
                 else:
                     message = f"3D GIS graph '{graph_name}' not accessible"
                     self.report({'ERROR'}, message)
@@ -127,11 +130,11 @@ class VISUAL_OT_update_property_values(Operator):
                         try:
                             graph = get_graph(graph_id)
                             if graph:
-                                # USA LA STESSA FUNZIONE DI APPLY_COLORS PER COERENZA
-                                mapping = create_property_value_mapping(graph, scene.selected_property)
-                                values.update(mapping.values())
+                                # Stessa mappatura (in cache) usata da apply_colors
+                                graph_values = get_property_values(graph, scene.selected_property)
+                                values.update(graph_values)
                                 processed_graphs += 1
-                                print(f"Processed graph '{graph_id}': {len(set(mapping.values()))} unique values")
+                                print(f"Processed graph '{graph_id}': {len(graph_values)} unique values")
                         except Exception as e:
                             print(f"Error processing graph '{graph_id}': {e}")
                             continue
@@ -142,11 +145,11 @@ class VISUAL_OT_update_property_values(Operator):
                         graph = get_graph(active_file.name)
                         if graph:
                             print(f"Advanced EM single graph mode: processing '{active_file.name}'")
-                            # USA LA STESSA FUNZIONE DI APPLY_COLORS PER COERENZA
-                            mapping = create_property_value_mapping(graph, scene.selected_property)
-                            values.update(mapping.values())
+                            # Stessa mappatura (in cache) usata da apply_colors
+                            graph_values = get_property_values(graph, scene.selected_property)
+                            values.update(graph_values)
                             processed_graphs = 1
-                            print(f"Found {len(set(mapping.values()))} unique values")
+                            print(f"Found {len(graph_values)} unique values")
                         else:
                             message = f"Graph '{active_file.name}' not found"
                             self.report({'ERROR'}, message)
@@ -276,17 +279,29 @@ class VISUAL_OT_apply_colors(Operator):
             property_mapping = create_property_value_mapping(graph, scene.selected_property)
             print(f"\nSTEP 1: Created property mapping with {len(property_mapping)} entries")
             
-            # STEP 2: Crea i materiali per tutti i valori presenti in scene.property_values
-            materials_by_value = create_property_materials_for_scene_values(context)
-            print(f"STEP 2: Created {len(materials_by_value)} materials")
+            if getattr(scene, 'property_color_mode', 'MATERIALS') == 'OBJECT_COLOR':
+                # STEP 2-3: Materiale condiviso, colore scritto su Object.color
+                colors_by_value = {item.value: tuple(item.color) for item in scene.property_values}
+                colored_count = apply_object_colors(context, property_mapping, colors_by_value)
+
+                from ..material_cache import invalidate_material_cache
+                invalidate_material_cache()
+                print("STEP 2-3: Applied object colors")
+            else:
+                # Colori nei materiali: ripristina lo shading Solid delle viste
+                set_viewport_object_color(context, False)
+
+                # STEP 2: Crea i materiali per tutti i valori presenti in scene.property_values
+                materials_by_value = create_property_materials_for_scene_values(context)
+                print(f"STEP 2: Created {len(materials_by_value)} materials")
 
-            # ✅ OPTIMIZATION: Invalidate material cache after creating new materials
-            from ..material_cache import invalidate_material_cache
-            invalidate_material_cache()
+                # ✅ OPTIMIZATION: Invalidate material cache after creating new materials
+                from ..material_cache import invalidate_material_cache
+                invalidate_material_cache()
 
-            # STEP 3: Applica i materiali agli oggetti
-            colored_count = apply_materials_to_objects(context, property_mapping, materials_by_value)
-            print(f"STEP 3: Applied materials to objects")
+                # STEP 3: Applica i materiali agli oggetti
+                colored_count = apply_materials_to_objects(context, property_mapping, materials_by_value)
+                print(f"STEP 3: Applied materials to objects")
             
             # Report risultato
             total_meshes = len([obj for obj in scene.objects if obj.type == 'MESH'])
@@ -445,6 +460,12 @@ class VISUAL_OT_apply_color_ramp(Operator):
                 color_idx = min(int(i * num_colors / num_values), num_colors - 1)
             
             value.color = (*colors[color_idx], 1.0)  # Add alpha channel
+
+        # In modalità Object Color il cambio di rampa è solo una scrittura
+        # di Object.color: riapplica subito, nessun materiale da ricostruire
+        if (getattr(scene, 'property_color_mode', 'MATERIALS') == 'OBJECT_COLOR' and
+                scene.em_tools.proxy_display_mode == "Properties"):
+            bpy.ops.visual.apply_colors()
         
         self.report({'INFO'}, f"Applied {props.ramp_name} color ramp to {num_values} values")
         return {'FINISHED'}
@@ -0,0 +1,196 @@
+"""
+Property Mapping Cache for the Visual Manager
+=============================================
+
+Memoises, per graph, the mapping "stratigraphic node name -> property
+value" used to colour proxies, so that switching between properties in the
+Visual Manager (update values, apply colors, select proxies) walks the graph
+only the first time a property is requested.
+
+For every graph one PropertyMappingMemo keeps:
+- a node table: node names in a fixed order (stratigraphic nodes first,
+  any other node carrying a property appended when met)
+- for each property name a column: array of value ids, one per node
+  (-1 = node not in the mapping), plus the table of distinct values
+- the property names of the graph (enum of the Visual Manager)
+
+The special values "empty property X node" / "no property X node" are
+ordinary entries of the value table.
+
+The memo is tied to the generation of the graph's GraphEdgeIndex and to
+the node count: any invalidate_graph_index() / edge or node count change
+discards it. Values edited in place change neither, so every path that
+edits them (database/XLSX and auxiliary imports, merge apply, Surface
+Areale) calls graph_index.invalidate_graph_values(graph), which drops this
+memo through invalidate_property_mappings(graph).
+
+Performance Impact:
+- Before: full property/edge walk + one print per node on every apply
+- After: one walk per (graph, property), then array -> dict copies
+
+Usage:
+    from .property_mapping_cache import get_property_mapping_memo
+
+    memo = get_property_mapping_memo(graph)
+    mapping = memo.mapping("material")      # {node_name: value}
+    values = memo.values("material")        # distinct values
+    names = memo.property_names()
+"""
+
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from ..us_types import US_PROPER_TYPES
+
+
+ABSENT = -1
+
+
+class PropertyColumn:
+    """Value ids of one property, indexed like the memo's node table."""
+
+    __slots__ = ('value_ids', 'values')
+
+    def __init__(self, value_ids: array, values: List[str]):
+        self.value_ids = value_ids
+        self.values = values
+
+
+class PropertyMappingMemo:
+    """Cached property mappings of one graph, valid for one signature."""
+
+    def __init__(self, graph, signature: Tuple[int, int]):
+        self.graph = graph
+        self.signature = signature
+        self._node_names: List[str] = []
+        self._node_index: Dict[str, int] = {}
+        self._columns: Dict[str, PropertyColumn] = {}
+        self._property_names: Optional[List[str]] = None
+
+    def _index_of(self, name: str) -> int:
+        index = self._node_index.get(name)
+        if index is None:
+            index = len(self._node_names)
+            self._node_names.append(name)
+            self._node_index[name] = index
+        return index
+
+    def _strat_nodes(self):
+        indices = self.graph.indices
+        for node_type in US_PROPER_TYPES:
+            for node in indices.nodes_by_type.get(node_type, []):
+                if hasattr(node, 'node_id') and hasattr(node, 'name'):
+                    yield node
+
+    def _build_column(self, property_name: str) -> PropertyColumn:
+        """Graph walk for one property (same rules as the operators)."""
+        graph = self.graph
+        indices = graph.indices
+
+        # Node table: stratigraphic nodes first, so every column shares them
+        if not self._node_names:
+            for node in self._strat_nodes():
+                self._index_of(node.name)
+
+        assigned: Dict[int, str] = {}
+        connected = set()
+
+        property_nodes = [node for node in indices.nodes_by_type.get('property', [])
+                          if hasattr(node, 'name') and node.name == property_name]
+
+        for prop_node in property_nodes:
+            value = getattr(prop_node, 'description', '')
+            if not (value and value.strip()):
+                value = f"empty property {property_name} node"
+
+            target_key = (prop_node.node_id, "has_property")
+            for edge in indices.edges_by_target_type.get(target_key, []):
+                strat_node = graph.find_node_by_id(edge.edge_source)
+                if strat_node and hasattr(strat_node, 'name'):
+                    connected.add(strat_node.node_id)
+                    assigned[self._index_of(strat_node.name)] = value
+
+        no_property = f"no property {property_name} node"
+        for node in self._strat_nodes():
+            if node.node_id not in connected:
+                assigned[self._node_index[node.name]] = no_property
+
+        values: List[str] = []
+        value_ids_by_value: Dict[str, int] = {}
+        value_ids = array('i', [ABSENT]) * len(self._node_names)
+        for index, value in assigned.items():
+            value_id = value_ids_by_value.get(value)
+            if value_id is None:
+                value_id = len(values)
+                values.append(value)
+                value_ids_by_value[value] = value_id
+            value_ids[index] = value_id
+
+        print(f"[VisualManager] Mapped '{property_name}': {len(assigned)} nodes, "
+              f"{len(values)} values ({len(connected)} with property)")
+        return PropertyColumn(value_ids, values)
+
+    def column(self, property_name: str) -> PropertyColumn:
+        column = self._columns.get(property_name)
+        if column is None:
+            column = self._build_column(property_name)
+            self._columns[property_name] = column
+        return column
+
+    def mapping(self, property_name: str) -> Dict[str, str]:
+        """{node_name: value} for property_name (a fresh dict)."""
+        column = self.column(property_name)
+        names = self._node_names
+        values = column.values
+        return {names[index]: values[value_id]
+                for index, value_id in enumerate(column.value_ids)
+                if value_id != ABSENT}
+
+    def values(self, property_name: str) -> List[str]:
+        """Distinct values of property_name (special values included)."""
+        return list(self.column(property_name).values)
+
+    def property_names(self) -> List[str]:
+        """Property names of the graph (Visual Manager enum)."""
+        if self._property_names is None:
+            self._property_names = sorted(self.graph.indices.get_property_names())
+        return self._property_names
+
+
+_property_mapping_memos: Dict[str, PropertyMappingMemo] = {}
+
+
+def _graph_signature(graph) -> Tuple[int, int]:
+    from ..graph_index import get_or_create_graph_index
+    return (get_or_create_graph_index(graph).generation, len(graph.nodes))
+
+
+def get_property_mapping_memo(graph) -> PropertyMappingMemo:
+    """
+    Memo of graph, discarded whenever the graph structure changes.
+
+    Args:
+        graph: s3dgraphy graph instance
+    """
+    graph_id = graph.graph_id if hasattr(graph, 'graph_id') else str(id(graph))
+    signature = _graph_signature(graph)
+
+    memo = _property_mapping_memos.get(graph_id)
+    if memo is None or memo.graph is not graph or memo.signature != signature:
+        memo = PropertyMappingMemo(graph, signature)
+        _property_mapping_memos[graph_id] = memo
+    return memo
+
+
+def invalidate_property_mappings(graph=None):
+    """Drop the memo of graph (or every memo if graph is None)."""
+    if graph is None:
+        _property_mapping_memos.clear()
+        return
+    graph_id = graph.graph_id if hasattr(graph, 'graph_id') else str(id(graph))
+    _property_mapping_memos.pop(graph_id, None)
+
+
+def clear_property_mapping_memos():
+    """Drop every memo (addon reload / memory cleanup)."""
+    _property_mapping_memos.clear()
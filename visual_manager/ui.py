@@ -162,6 +162,10 @@ class VIEW3D_PT_visual_panel(Panel):
 
         if hasattr(scene, 'selected_property') and scene.selected_property:
 
+            if hasattr(scene, 'property_color_mode'):
+                row = box.row()
+                row.prop(scene, "property_color_mode", expand=True)
+
             row = box.row()
             row.template_list("VISUAL_UL_property_values", "", 
                             scene, "property_values",
@@ -12,13 +12,22 @@ from s3dgraphy.nodes.stratigraphic_node import StratigraphicNode
 from s3dgraphy import get_graph, get_all_graph_ids
 
 from ..us_types import US_PROPER_TYPES
+from .property_mapping_cache import get_property_mapping_memo
 
 DEFAULT_COLOR = (0.5, 0.5, 0.5, 1.0)  # Grigio medio
 
-# Cache variables per get_available_properties
-CACHE_DURATION = 5.0  # Cache duration in seconds
+# Materiale unico della modalità "Object Color": il colore arriva da
+# Object.color tramite il nodo Object Info (prefisso prop_ → gestito
+# anche da update_property_materials_alpha)
+SHARED_PROPERTY_MATERIAL = "prop_shared_object_color"
+
+# Viste 3D messe in shading Solid "Object" dalla modalità Object Color:
+# space pointer -> color_type precedente (ripristinato all'uscita)
+_solid_color_types = {}
+
+# Cache di get_available_properties: (graph_id, firma del memo) -> nomi
 _cached_properties = []
-_last_cache_time = 0
+_cached_properties_key = None
 
 
 def create_property_value_mapping(graph, property_name):
@@ -33,10 +42,6 @@ def create_property_value_mapping(graph, property_name):
     Returns:
         dict: mapping from stratigraphic node names to property values
     """
-    print(f"\n=== Creating Property Value Mapping for '{property_name}' ===")
-    
-    mapping = {}
-    
     try:
         # APPROCCIO DIRETTO: usa la stessa logica dell'operatore per consistenza
         return create_property_value_mapping_direct(graph, property_name)
@@ -50,64 +55,19 @@ def create_property_value_mapping_direct(graph, property_name):
     """
     Direct implementation that matches the operator logic exactly.
     This ensures consistency between update_property_values and apply_colors.
-    ✅ OPTIMIZATION: Uses graph.indices for O(1) lookups instead of O(n) and O(E) iterations.
+    ✅ OPTIMIZATION: Memoised per (graph, property) in property_mapping_cache:
+    the graph is walked only the first time a property is requested.
     """
-    print(f"Using direct mapping method for '{property_name}'")
-
-    mapping = {}
-
-    # ✅ OPTIMIZATION: O(1) lookup using indices instead of O(n) iteration
-    property_nodes = [node for node in graph.indices.nodes_by_type.get('property', [])
-                    if hasattr(node, 'name') and node.name == property_name]
-
-    print(f"Found {len(property_nodes)} property nodes for '{property_name}'")
-
-    # 2. Track stratigraphic nodes that have this property
-    connected_strat_nodes = set()
+    return get_property_mapping_memo(graph).mapping(property_name)
 
-    # 3. Process each property node and find connected US
-    for prop_node in property_nodes:
-        value = getattr(prop_node, 'description', '')
-        is_empty = not (value and value.strip())
 
-        print(f"Processing property node {prop_node.node_id}: empty={is_empty}, value='{value}'")
-
-        # ✅ OPTIMIZATION: O(1) lookup using composite index instead of O(E) edge iteration
-        # Use edges_by_target_type to find all edges where this property is the target
-        connected_us = []
-        target_key = (prop_node.node_id, "has_property")
-        for edge in graph.indices.edges_by_target_type.get(target_key, []):
-            strat_node = graph.find_node_by_id(edge.edge_source)
-            if strat_node and hasattr(strat_node, 'name'):
-                connected_us.append(strat_node)
-                connected_strat_nodes.add(strat_node.node_id)
-
-        print(f"  Connected to {len(connected_us)} US: {[us.name for us in connected_us]}")
-
-        # Assign appropriate value
-        for us_node in connected_us:
-            if is_empty:
-                mapping[us_node.name] = f"empty property {property_name} node"
-                print(f"  -> {us_node.name}: EMPTY PROPERTY")
-            else:
-                mapping[us_node.name] = value
-                print(f"  -> {us_node.name}: '{value}'")
-
-    # ✅ OPTIMIZATION: Iterate only stratigraphic node types instead of all graph.nodes
-    no_property_count = 0
-    for node_type in US_PROPER_TYPES:
-        for node in graph.indices.nodes_by_type.get(node_type, []):
-            if (hasattr(node, 'node_id') and
-                node.node_id not in connected_strat_nodes and
-                hasattr(node, 'name')):
-                mapping[node.name] = f"no property {property_name} node"
-                no_property_count += 1
-
-    print(f"Direct mapping created with {len(mapping)} entries")
-    print(f"  - With property: {len(connected_strat_nodes)}")
-    print(f"  - Without property: {no_property_count}")
-
-    return mapping
+def get_property_values(graph, property_name):
+    """Distinct values of property_name in graph (cached, special values included)."""
+    try:
+        return get_property_mapping_memo(graph).values(property_name)
+    except Exception as e:
+        print(f"Warning: cached values failed ({e}), falling back to legacy method")
+        return list(set(create_property_value_mapping_legacy(graph, property_name).values()))
 
 
 def create_property_value_mapping_legacy(graph, property_name):
@@ -327,6 +287,133 @@ def apply_materials_to_objects(context, property_mapping, materials_by_value):
     return colored_count
 
 
+def ensure_shared_property_material(alpha_value):
+    """
+    Get (or build once) the shared material of the "Object Color" mode.
+
+    Base Color is read from Object.color through an Object Info node, so
+    recolouring proxies never touches the material itself.
+    """
+    mat = bpy.data.materials.get(SHARED_PROPERTY_MATERIAL)
+    if mat is None:
+        mat = bpy.data.materials.new(name=SHARED_PROPERTY_MATERIAL)
+        mat.use_nodes = True
+        mat.node_tree.nodes.clear()
+        mat.show_transparent_back = False
+        mat.use_backface_culling = False
+
+        nodes = mat.node_tree.nodes
+        links = mat.node_tree.links
+        output = nodes.new('ShaderNodeOutputMaterial')
+        output.location = (0, 0)
+        principled = nodes.new('ShaderNodeBsdfPrincipled')
+        principled.location = (-300, 0)
+        object_info = nodes.new('ShaderNodeObjectInfo')
+        object_info.location = (-600, 0)
+
+        links.new(object_info.outputs['Color'], principled.inputs['Base Color'])
+        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+        print(f"[VisualManager] Created shared material '{SHARED_PROPERTY_MATERIAL}'")
+
+    principled = next((node for node in mat.node_tree.nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    if principled and principled.inputs['Alpha'].default_value != alpha_value:
+        principled.inputs['Alpha'].default_value = alpha_value
+    blend_method = 'BLEND' if alpha_value < 1.0 else 'OPAQUE'
+    if mat.blend_method != blend_method:
+        mat.blend_method = blend_method
+    if mat.diffuse_color[3] != alpha_value:
+        mat.diffuse_color[3] = alpha_value
+
+    return mat
+
+
+def set_viewport_object_color(context, enabled):
+    """
+    Solid shading of the 3D views for the "Object Color" mode.
+
+    In Solid mode the viewport shows the material's diffuse_color (the
+    shared material's grey) unless shading.color_type is 'OBJECT'. enabled
+    switches every 3D view to 'OBJECT', remembering the previous colour
+    type; disabled restores it on the views switched here.
+    """
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != 'VIEW_3D':
+                continue
+            for space in area.spaces:
+                if space.type != 'VIEW_3D':
+                    continue
+                shading = space.shading
+                key = space.as_pointer()
+                if enabled:
+                    if key not in _solid_color_types and shading.color_type != 'OBJECT':
+                        _solid_color_types[key] = shading.color_type
+                        shading.color_type = 'OBJECT'
+                else:
+                    previous = _solid_color_types.pop(key, None)
+                    if previous and shading.color_type == 'OBJECT':
+                        shading.color_type = previous
+            area.tag_redraw()
+
+    if not enabled:
+        _solid_color_types.clear()
+
+
+def apply_object_colors(context, property_mapping, colors_by_value):
+    """
+    "Object Color" mode: one shared material, the colour of each proxy
+    written to Object.color.
+
+    Args:
+        context: Blender context
+        property_mapping: dict mapping node names to property values
+        colors_by_value: dict mapping property values to RGBA tuples
+
+    Returns:
+        int: number of objects that were colored
+    """
+    from ..operators.addon_prefix_helpers import proxy_name_to_node_name
+    from ..functions import is_graph_available as check_graph
+
+    scene = context.scene
+    alpha_value = getattr(scene.em_tools, 'proxy_display_alpha', 1.0)
+    shared_mat = ensure_shared_property_material(alpha_value)
+
+    graph_exists, graph = check_graph(context)
+    active_graph = graph if graph_exists else None
+
+    colored_count = 0
+    recolored_count = 0
+    for obj in scene.objects:
+        if obj.type != 'MESH':
+            continue
+
+        node_name = proxy_name_to_node_name(obj.name, context=context, graph=active_graph)
+        if node_name not in property_mapping:
+            continue
+        color = colors_by_value.get(str(property_mapping[node_name]))
+        if color is None:
+            continue
+
+        rgba = (color[0], color[1], color[2], alpha_value)
+        if any(abs(a - b) > 1e-4 for a, b in zip(obj.color, rgba)):
+            obj.color = rgba
+            recolored_count += 1
+
+        materials = obj.data.materials
+        if not materials:
+            materials.append(shared_mat)
+        elif materials[0] != shared_mat:
+            materials[0] = shared_mat
+        colored_count += 1
+
+    # Il colore è solo su Object.color: la vista Solid deve mostrarlo
+    set_viewport_object_color(context, True)
+
+    print(f"[VisualManager] Object colors: {colored_count} proxies, {recolored_count} recolored")
+    return colored_count
+
+
 def save_color_scheme(filepath, property_name, color_mapping):
     """Saves color mapping to .emc file."""
     data = {
@@ -363,52 +450,45 @@ def hex_to_rgb(value):
 
 def get_available_properties(context):
     """
-    Get list of available property names using optimized indices.
+    Get list of available property names from the property mapping memos.
     Supporta modalità 3D GIS (grafo hardcodato) e Advanced EM (grafo attivo/multigrafo).
     """
+    global _cached_properties, _cached_properties_key
+
     scene = context.scene
     em_tools = scene.em_tools
-    properties = set()
-    
-    # Cache check
-    global _cached_properties, _last_cache_time
-    current_time = time.time()
-    if _cached_properties and (current_time - _last_cache_time) < CACHE_DURATION:
-        return _cached_properties
 
     if not em_tools.mode_em_advanced:  # Modalità 3D GIS
         # Nome hardcodato per modalità 3D GIS
-        graph = get_graph("3dgis_graph")
+        graph_ids = ["3dgis_graph"]
+    elif hasattr(scene, 'show_all_graphs') and scene.show_all_graphs:  # Modalità multigrafo
+        graph_ids = list(get_all_graph_ids())
+    elif 0 <= em_tools.active_file_index < len(em_tools.graphml_files):  # Solo grafo attivo
+        graph_ids = [em_tools.graphml_files[em_tools.active_file_index].name]
+    else:
+        graph_ids = []
+
+    memos = []
+    for graph_id in graph_ids:
+        graph = get_graph(graph_id)
         if graph and hasattr(graph, 'indices'):
-            properties.update(graph.indices.get_property_names())
-            print(f"3D GIS mode: found {len(properties)} properties from hardcoded graph")
-        else:
-            print("3D GIS mode: hardcoded graph '3dgis_graph' not found")
-    else:  # Modalità Advanced EM
-        if hasattr(scene, 'show_all_graphs') and scene.show_all_graphs:  # Modalità multigrafo
-            graph_ids = get_all_graph_ids()
-            print(f"Advanced EM multigrafo mode: processing {len(graph_ids)} graphs")
-            for graph_id in graph_ids:
-                graph = get_graph(graph_id)
-                if graph and hasattr(graph, 'indices'):
-                    properties.update(graph.indices.get_property_names())
-        else:  # Solo grafo attivo
-            if em_tools.active_file_index >= 0:
-                active_file = em_tools.graphml_files[em_tools.active_file_index]
-                graph = get_graph(active_file.name)
-                if graph and hasattr(graph, 'indices'):
-                    properties.update(graph.indices.get_property_names())
-                    print(f"Advanced EM mode: found {len(properties)} properties from active graph '{active_file.name}'")
-            else:
-                print("Advanced EM mode: no active GraphML file selected")
+            memo = get_property_mapping_memo(graph)
+            memos.append((graph_id, memo))
 
-    result = sorted(list(properties))
-    print(f"Total: {len(result)} properties found")
+    # Same graphs with the same structure: names unchanged
+    key = tuple((graph_id, memo.signature) for graph_id, memo in memos)
+    if key == _cached_properties_key:
+        return _cached_properties
 
-    # Update cache
-    _cached_properties = result
-    _last_cache_time = current_time
+    properties = set()
+    for graph_id, memo in memos:
+        properties.update(memo.property_names())
 
+    result = sorted(properties)
+    print(f"[VisualManager] {len(result)} properties found in {len(memos)} graph(s)")
+
+    _cached_properties = result
+    _cached_properties_key = key
     return result
 
 
@@ -0,0 +1,59 @@
+"""
+Worker Process Helpers for EM-Tools
+===================================
+
+Shared plumbing for the process pools of thumb_build.py and the landscape
+bulk loader.
+
+Job functions live in the workers/ folder and are imported as top-level
+modules (em_thumb_worker, em_graphml_worker): worker processes unpickle
+them by module name, and importing them through the addon package would
+make every worker import bpy.
+
+Usage:
+    from .worker_processes import import_worker_module, detached_main
+
+    worker = import_worker_module("em_graphml_worker")
+    with detached_main():
+        future = executor.submit(worker.parse_graphml, job)
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+
+WORKERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workers")
+
+
+def import_worker_module(module_name: str):
+    """
+    Import workers/<module_name>.py as a top-level module.
+
+    Only the workers folder is added to sys.path (spawned processes
+    inherit it).
+    """
+    if WORKERS_DIR not in sys.path:
+        sys.path.append(WORKERS_DIR)
+    import importlib
+    return importlib.import_module(module_name)
+
+
+@contextmanager
+def detached_main():
+    """
+    Hide __main__'s file while worker processes start.
+
+    Spawned processes re-run the parent's main script; under
+    `blender --python script.py` that would be the user's script.
+    """
+    main_module = sys.modules.get('__main__')
+    saved = {name: getattr(main_module, name) for name in ('__file__', '__spec__')
+             if hasattr(main_module, name)}
+    for name in saved:
+        delattr(main_module, name)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(main_module, name, value)
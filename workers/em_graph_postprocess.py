@@ -0,0 +1,71 @@
+"""
+GraphML parse and post-processing steps for EM-Tools
+====================================================
+
+No bpy: shared by the addon (import_operators/importer_graphml.py,
+populate_lists.py) and, as the top-level module ``em_graph_postprocess``,
+by the worker processes of em_graphml_worker.py, so the single import and
+the bulk load run the same code. Keep it free of package-relative imports.
+"""
+
+import os
+
+
+def parse_graphml_file(filepath, graph_id=None):
+    """
+    Parse a GraphML file into a new Graph without registering it.
+
+    Same parsing as MultiGraphManager.load_graph, so the graph can be built
+    off the main thread (or in another process) while the registry still
+    holds the previous version.
+
+    Returns:
+        tuple: (graph, original_id), original_id being the id the graph was
+        created with (the file stem unless graph_id is given)
+    """
+    from s3dgraphy.graph import Graph
+    from s3dgraphy.importer.import_graphml import GraphMLImporter
+
+    original_id = graph_id if graph_id else os.path.splitext(os.path.basename(filepath))[0]
+    graph = GraphMLImporter(filepath, Graph(graph_id=original_id)).parse()
+    return graph, original_id
+
+
+def connect_paradata_groups(graph):
+    """
+    Collega direttamente unità stratigrafiche e PropertyNode quando sono
+    collegati attraverso un ParadataNodeGroup. Non solleva eccezioni.
+    """
+    print("\nApplicazione della funzionalità di collegamento PropertyNode da ParadataNodeGroup...")
+    try:
+        stats = graph.connect_paradatagroup_propertynode_to_stratigraphic(verbose=False)
+        if stats["connections_created"] > 0:
+            print(f"Creati {stats['connections_created']} nuovi collegamenti diretti tra unità stratigrafiche e PropertyNode")
+        else:
+            print("Nessun nuovo collegamento creato")
+    except Exception as e:
+        print(f"AVVISO: Errore durante il collegamento PropertyNode: {str(e)}")
+        # Non interrompiamo l'esecuzione per questo errore
+
+
+def graph_signature(graph):
+    """Node/edge counts the precomputed chronology is valid for."""
+    return (len(graph.nodes), len(graph.edges))
+
+
+def precompute_chronology(graph):
+    """
+    Calculate chronology (TPQ/TAQ propagation) ahead of list population.
+
+    Needs no bpy: the GraphML import runs it in its worker thread (or
+    process). The next populate_blender_lists_from_graph skips its own
+    calculation if no node or edge was added in between and nothing edited
+    values in place (auxiliary imports call
+    graph_index.invalidate_graph_values, which clears chronology_signature).
+    """
+    try:
+        graph.calculate_chronology(graph)
+        graph.chronology_signature = graph_signature(graph)
+    except Exception as e:
+        graph.chronology_signature = None
+        print(f"Warning: chronology calculation failed: {e}")
@@ -0,0 +1,50 @@
+"""
+GraphML parsing worker for EM-Tools
+===================================
+
+No bpy: imported as the top-level module ``em_graphml_worker`` by the
+worker processes of landscape_system/bulk_loader.py (and in-process when
+worker processes are not available). Keep it free of package-relative
+imports.
+
+The finished s3dgraphy graph is returned to the parent process (pickled by
+the pool), which registers it in its own MultiGraphManager. The worker never
+registers it itself: with the thread fallback it would share (and
+overwrite) the parent's registry.
+"""
+
+import time
+
+from em_graph_postprocess import (
+    parse_graphml_file, connect_paradata_groups, precompute_chronology)
+
+
+def parse_graphml(job):
+    """
+    Process-pool entry point.
+
+    Args:
+        job: dict with 'index' (position in em_tools.graphml_files) and
+             'path' (absolute GraphML path)
+
+    Returns:
+        dict: {'index', 'path', 'graph_id', 'original_id', 'graph', 'error',
+        'seconds'}; original_id is the file-stem id the graph was created
+        with (registered as alias, as MultiGraphManager.load_graph does)
+    """
+    started = time.time()
+    result = {'index': job['index'], 'path': job['path'], 'graph_id': None,
+              'original_id': None, 'graph': None, 'error': None, 'seconds': 0.0}
+    try:
+        # Same steps as the single import (not registered here)
+        graph, original_id = parse_graphml_file(job['path'])
+        connect_paradata_groups(graph)
+        precompute_chronology(graph)
+        result['graph_id'] = graph.graph_id
+        result['original_id'] = original_id
+        result['graph'] = graph
+    except Exception as e:
+        result['error'] = str(e)
+
+    result['seconds'] = time.time() - started
+    return result
@@ -0,0 +1,91 @@
+"""
+Mesh metrics worker for EM-Tools
+================================
+
+Pure NumPy, no bpy: imported by em_statistics/metrics.py (single object,
+in-process) and, as the top-level module ``em_metrics_worker``, by the
+worker processes of em_statistics/batch.py. Keep it free of
+package-relative imports.
+
+Input buffers are the arrays read with foreach_get on the main thread
+(see em_statistics.metrics.read_mesh_buffers).
+"""
+
+import math
+
+import numpy as np
+
+
+# A face is "vertical" if its normal is 85°-95° from +Z, i.e. |n.z| <= cos(85°)
+VERTICAL_NZ_LIMIT = math.cos(math.radians(85))
+
+
+def metrics_from_buffers(buffers):
+    """
+    Vectorised metrics of one mesh (local coordinates).
+
+    Args:
+        buffers: dict with 'coords' (V×3), 'areas' (P), 'normals' (P×3),
+                 'loop_edges' (L), 'loop_verts' (L), 'loop_start' (P),
+                 'loop_total' (P), 'tris' (T×3), 'n_edges'
+
+    Returns:
+        dict: 'closed', 'consistent' (winding), 'volume' (abs of the signed
+              volume, meaningful only if closed and consistent),
+              'total_surface', 'vertical_surface'
+    """
+    coords = buffers['coords'].astype(np.float64)
+    areas = buffers['areas'].astype(np.float64)
+    normals = buffers['normals']
+    n_verts = len(coords)
+    n_loops = len(buffers['loop_verts'])
+
+    # Surfaces from the polygon data Blender already keeps up to date
+    total_surface = float(areas[areas > 0].sum())
+    nz = np.abs(normals[:, 2])
+    has_normal = np.einsum('ij,ij->i', normals, normals) > 0.25
+    vertical_surface = float(areas[has_normal & (nz <= VERTICAL_NZ_LIMIT)].sum())
+
+    # Closed: every edge used by exactly two faces
+    edge_use = np.bincount(buffers['loop_edges'], minlength=buffers['n_edges'])
+    closed = bool(len(edge_use) and np.all(edge_use == 2))
+
+    # Consistent winding: each directed edge (a -> b) appears only once
+    loop_verts = buffers['loop_verts'].astype(np.int64)
+    loop_start = buffers['loop_start']
+    next_loop = np.arange(1, n_loops + 1, dtype=np.int64)
+    next_loop[loop_start + buffers['loop_total'] - 1] = loop_start
+    directed = loop_verts * n_verts + loop_verts[next_loop]
+    consistent = len(np.unique(directed)) == len(directed)
+
+    # Signed volume: sum of the tetrahedra (origin, v0, v1, v2) / 6
+    tris = buffers['tris']
+    v0, v1, v2 = coords[tris[:, 0]], coords[tris[:, 1]], coords[tris[:, 2]]
+    signed_volume = float(np.einsum('ij,ij->i', v0, np.cross(v1, v2)).sum()) / 6.0
+
+    return {
+        'closed': closed,
+        'consistent': consistent,
+        'volume': abs(signed_volume),
+        'total_surface': total_surface,
+        'vertical_surface': vertical_surface,
+    }
+
+
+def compute_metrics(job):
+    """
+    Process-pool entry point: metrics of a chunk of meshes.
+
+    Args:
+        job: list of (name, buffers)
+
+    Returns:
+        list: (name, metrics dict or None, error or None), in job order
+    """
+    results = []
+    for name, buffers in job:
+        try:
+            results.append((name, metrics_from_buffers(buffers), None))
+        except Exception as e:
+            results.append((name, None, str(e)))
+    return results
@@ -0,0 +1,154 @@
+"""
+Thumbnail rendering worker for EM-Tools
+=======================================
+
+Pure PIL / PyMuPDF code, no bpy: this module is imported both by the addon
+(thumb_utils.generate_thumbnail) and, as the top-level module
+``em_thumb_worker``, by the worker processes of thumb_build.py. Keep it free
+of package-relative imports so the worker processes can load it without
+importing the addon.
+"""
+
+import io
+import os
+
+try:
+    from PIL import Image, ImageOps, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.tga'}
+PDF_EXTENSIONS = {'.pdf'}
+
+DEFAULT_SIZE = (256, 256)
+
+
+def job_kind(src_path):
+    """'image', 'pdf' or 'other' from the file extension."""
+    ext = os.path.splitext(src_path)[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in PDF_EXTENSIONS:
+        return 'pdf'
+    return 'other'
+
+
+def render_image(src_path, thumb_path, size=DEFAULT_SIZE):
+    """Thumbnail of an image file."""
+    with Image.open(src_path) as img:
+        # Riduce la decodifica per JPEG grandi (draft mode)
+        img.draft('RGB', (size[0] * 2, size[1] * 2))
+
+        # Converti in RGB se necessario
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGB')
+
+        # Ridimensiona mantenendo aspect ratio
+        img_resized = ImageOps.fit(img, size, Image.Resampling.LANCZOS)
+        img_resized.save(thumb_path, 'PNG', quality=90)
+    return True
+
+
+def render_pdf(src_path, thumb_path, size=DEFAULT_SIZE):
+    """Thumbnail of the first page of a PDF (placeholder without PyMuPDF)."""
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        print("PyMuPDF non disponibile per PDF thumbnails")
+        return render_placeholder(thumb_path, "PDF", size)
+
+    doc = fitz.open(src_path)
+    try:
+        page = doc[0]
+        mat = fitz.Matrix(1.0, 1.0)  # Scala 1:1
+        pix = page.get_pixmap(matrix=mat)
+        img_data = pix.tobytes("ppm")
+    finally:
+        doc.close()
+
+    with Image.open(io.BytesIO(img_data)) as img:
+        img_resized = ImageOps.fit(img, size, Image.Resampling.LANCZOS)
+        img_resized.save(thumb_path, 'PNG', quality=90)
+    return True
+
+
+def render_placeholder(thumb_path, text, size=DEFAULT_SIZE):
+    """Thumbnail placeholder per file non supportati."""
+    try:
+        img = Image.new('RGB', size, color=(100, 100, 100))
+        draw = ImageDraw.Draw(img)
+
+        # Tenta di usare font predefinito
+        try:
+            font = ImageFont.truetype("arial.ttf", 24)
+        except (IOError, OSError):
+            font = ImageFont.load_default()
+
+        # Testo centrato
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+
+        x = (size[0] - text_width) // 2
+        y = (size[1] - text_height) // 2
+
+        draw.text((x, y), text, fill=(200, 200, 200), font=font)
+
+        img.save(thumb_path, 'PNG')
+        return True
+
+    except Exception as e:
+        print(f"Errore creando placeholder: {e}")
+        return False
+
+
+def render_thumbnail(src_path, thumb_path, size=DEFAULT_SIZE):
+    """Render the thumbnail of src_path into thumb_path (placeholder on error)."""
+    kind = job_kind(src_path)
+    try:
+        if kind == 'image':
+            return render_image(src_path, thumb_path, size)
+        if kind == 'pdf':
+            return render_pdf(src_path, thumb_path, size)
+        ext = os.path.splitext(src_path)[1]
+        return render_placeholder(thumb_path, ext.upper(), size)
+    except Exception as e:
+        print(f"Errore generando thumbnail per {src_path}: {e}")
+        return render_placeholder(thumb_path, "ERR", size)
+
+
+def run_job(job):
+    """
+    Process-pool entry point.
+
+    Args:
+        job: dict with 'doc_key', 'src', 'thumb' (absolute paths) and
+             optional 'size'
+
+    Returns:
+        dict: {'doc_key', 'ok', 'src_mtime', 'src_mtime_ns', 'src_size', 'error'}
+    """
+    result = {'doc_key': job['doc_key'], 'ok': False,
+              'src_mtime': 0.0, 'src_mtime_ns': 0, 'src_size': 0, 'error': None}
+    src_path = job['src']
+    thumb_path = job['thumb']
+    size = tuple(job.get('size') or DEFAULT_SIZE)
+
+    try:
+        stat = os.stat(src_path)
+    except OSError as e:
+        result['error'] = f"File sorgente non trovato: {src_path} ({e})"
+        return result
+
+    try:
+        os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+        result['ok'] = bool(render_thumbnail(src_path, thumb_path, size))
+    except Exception as e:
+        result['error'] = str(e)
+
+    result['src_mtime'] = stat.st_mtime
+    result['src_mtime_ns'] = stat.st_mtime_ns
+    result['src_size'] = stat.st_size
+    return result